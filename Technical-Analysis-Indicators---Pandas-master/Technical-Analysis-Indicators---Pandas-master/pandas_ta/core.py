@@ -1,12 +1,14 @@
 # -*- coding: utf-8 -*-
 from dataclasses import dataclass, field
-from multiprocessing import cpu_count, Pool
+from multiprocessing import cpu_count, Pool, shared_memory
 from time import perf_counter
 from typing import List, Tuple
 
 import pandas as pd
 from numpy import log10 as npLog10
 from numpy import ndarray as npNdarray
+from numpy import float64 as npFloat64
+from numpy import int64 as npInt64
 from pandas.core.base import PandasObject
 
 from pandas_ta import Category, version
@@ -24,6 +26,90 @@ from pandas_ta.utils import *
 
 df = pd.DataFrame()
 
+
+# Shared Memory for the strategy() Multiprocessing Pool
+# The DataFrame is published once per strategy() call and every worker attaches
+# to it, rather than receiving a pickled copy of it with every chunk of indicators.
+_shm_df = None
+_shm_segments = []
+
+
+def _shm_open(name: str):
+    """Attaches to a published segment. Only the publisher unlinks it."""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError: # Python < 3.13 has no 'track'
+        return shared_memory.SharedMemory(name=name)
+
+
+def _shm_publish(df: pd.DataFrame) -> Tuple[list, dict]:
+    """Copies the float64 columns of df (and its DatetimeIndex) into shared memory
+
+    Returns the segments, which the caller must close and unlink, and the spec
+    the workers attach with. Any other columns, and any other kind of index, are
+    small enough to travel in the spec: pickled once per worker, not per chunk.
+    """
+    rows = df.shape[0]
+    shared = [i for i, dtype in enumerate(df.dtypes) if dtype == npFloat64]
+    segments = [shared_memory.SharedMemory(create=True, size=max(8, 8 * rows * len(shared)))]
+    # Column by column: the layout of a float block in pandas, so workers adopt it without a copy.
+    values = npNdarray((len(shared), rows), dtype=npFloat64, buffer=segments[0].buf)
+    for j, i in enumerate(shared):
+        values[j] = df.iloc[:, i].to_numpy()
+    del values
+
+    spec = {
+        "rows": rows,
+        "columns": [df.columns[i] for i in shared],
+        "others": [(i, df.columns[i], df.iloc[:, i].to_numpy()) for i in range(df.shape[1]) if i not in shared],
+        "index": df.index, "index_name": df.index.name, "tz": None,
+    }
+    if isinstance(df.index, pd.DatetimeIndex):
+        segments.append(shared_memory.SharedMemory(create=True, size=max(8, 8 * rows)))
+        stamps = npNdarray((rows,), dtype=npInt64, buffer=segments[1].buf)
+        stamps[:] = df.index.values.astype("datetime64[ns]").view(npInt64) # UTC when tz aware
+        del stamps
+        spec["index"], spec["tz"] = None, str(df.index.tz) if df.index.tz is not None else None
+    spec["segments"] = [segment.name for segment in segments]
+    return segments, spec
+
+
+def _shm_release(segments: list) -> None:
+    """Closes and unlinks the segments published by _shm_publish."""
+    for segment in segments:
+        segment.close()
+        segment.unlink()
+
+
+def _shm_attach(spec: dict, state: dict) -> None:
+    """Multiprocessing Pool initializer: Rebuilds the DataFrame from shared memory
+
+    The float64 columns are read-only views of the published segment. Indicators
+    appended by the worker's tasks are its own columns; the shared data is never
+    written to.
+    """
+    global _shm_df, _shm_segments
+    _shm_segments = [_shm_open(name) for name in spec["segments"]]
+    values = npNdarray((len(spec["columns"]), spec["rows"]), dtype=npFloat64, buffer=_shm_segments[0].buf)
+    values.flags.writeable = False
+
+    index = spec["index"]
+    if index is None:
+        stamps = npNdarray((spec["rows"],), dtype=npInt64, buffer=_shm_segments[1].buf)
+        index = pd.DatetimeIndex(stamps.view("datetime64[ns]"), name=spec["index_name"])
+        if spec["tz"] is not None:
+            index = index.tz_localize("UTC").tz_convert(spec["tz"])
+
+    _shm_df = pd.DataFrame(values.T, index=index, columns=spec["columns"], copy=False)
+    for position, column, data in spec["others"]:
+        _shm_df.insert(position, column, data, allow_duplicates=True)
+    _shm_df.ta.__dict__.update(state)
+
+
+def _shm_mp_worker(arguments: tuple):
+    """Multiprocessing Worker for a DataFrame attached by _shm_attach."""
+    return _shm_df.ta._mp_worker(arguments)
+
 # Strategy DataClass
 @dataclass
 class Strategy:
@@ -622,6 +708,9 @@ class AnalysisIndicators(BasePandasObject):
                 "performance", "statistics", "trend", "volatility", "volume", or
                 "all". Default: "all"
             ordered (bool): Whether to run "all" in order. Default: True
+            shared (bool): Publish the DataFrame once to shared memory for the
+                Multiprocessing Pool, instead of pickling it with every chunk.
+                Default: True
             timed (bool): Show the process time of the strategy().
                 Default: False
             verbose (bool): Provide some additional insight on the progress of
@@ -632,6 +721,7 @@ class AnalysisIndicators(BasePandasObject):
         kwargs["append"] = True
         all_ordered = kwargs.pop("ordered", True)
         mp_chunksize = kwargs.pop("chunksize", self.cores)
+        use_shared_memory = kwargs.pop("shared", True)
 
         # Initialize
         initial_column_count = len(self._df.columns)
@@ -708,7 +798,15 @@ class AnalysisIndicators(BasePandasObject):
 
         if use_multiprocessing:
             _total_ta = len(ta)
-            pool = Pool(self.cores)
+            shm_segments, pool_kwargs, mp_worker = [], {}, self._mp_worker
+            if use_shared_memory:
+                shm_segments, shm_spec = _shm_publish(self._df)
+                state = {k: v for k, v in self.__dict__.items() if k != "_df"}
+                pool_kwargs, mp_worker = {"initializer": _shm_attach, "initargs": (shm_spec, state)}, _shm_mp_worker
+                if verbose:
+                    print(f"[i] Shared memory: {len(shm_spec['columns'])} columns x {shm_spec['rows']} rows published once for the Pool.")
+
+            pool = Pool(self.cores, **pool_kwargs)
             # Some magic to optimize chunksize for speed based on total ta indicators
             _chunksize = mp_chunksize - 1 if mp_chunksize > _total_ta else int(npLog10(_total_ta)) + 1
             if verbose:
@@ -724,20 +822,23 @@ class AnalysisIndicators(BasePandasObject):
                 ) for ind in ta]
                 # Custom multiprocessing pool. Must be ordered for Chained Strategies
                 # May fix this to cpus if Chaining/Composition if it remains
-                results = pool.imap(self._mp_worker, custom_ta, _chunksize)
+                results = pool.imap(mp_worker, custom_ta, _chunksize)
             else:
                 default_ta = [(ind, tuple(), kwargs) for ind in ta]
                 # All and Categorical multiprocessing pool.
                 if all_ordered:
-                    results = pool.imap(self._mp_worker, default_ta, _chunksize) # Order over Speed
+                    results = pool.imap(mp_worker, default_ta, _chunksize) # Order over Speed
                 else:
-                    results = pool.imap_unordered(self._mp_worker, default_ta, _chunksize) # Speed over Order
+                    results = pool.imap_unordered(mp_worker, default_ta, _chunksize) # Speed over Order
             if results is None:
                 print(f"[X] ta.strategy('{name}') has no results.")
+                _shm_release(shm_segments)
                 return
 
             pool.close()
             pool.join()
+            # Every task has finished, so the segments can go.
+            _shm_release(shm_segments)
             self._last_run = get_time(self.exchange, to_string=True)
 
         else:
@@ -1,15 +1,16 @@
 # F:\ShadowVanguard_Legion_Godspeed\analyst_ai\fibonacci_helper.py
-# Version 5.0 - Prometheus, The Confluence Sniper
+# Version 5.2 - Prometheus, The Confluence Sniper
 
 import logging
 from typing import Dict, Any, Optional, List, Tuple
 from dataclasses import dataclass, field
 import pandas as pd
 import numpy as np
-from scipy.signal import argrelextrema
 
 # [SURGICAL UPGRADE]: The Sniper now imports the universal blueprints for perfect protocol alignment.
 from core.data_models import MarketDataFrame, OrderBlockReport, LiquidityReport, FibonacciReport, FibonacciZone, FibonacciSignal
+from core.swing_engine import SwingEngine
+from core.signal_memory import SignalMemory
 
 logger = logging.getLogger("FibonacciHelper")
 
@@ -39,8 +40,11 @@ class FibonacciHelper:
         
         self.active_zones: Dict[str, List[FibonacciZone]] = {tf: [] for tf in self.analysis_timeframes}
         self.last_swing_analyzed_idx: Dict[str, int] = {tf: 0 for tf in self.analysis_timeframes}
-        self.triggered_signals: Dict[str, int] = {}
-        logger.info(f"[FibonacciHelper] The Confluence Sniper v5.0 is online. Awaiting high-probability targets.")
+        # [SURGICAL UPGRADE]: A bounded, oldest-first memory; a long session no longer rescans all of it every tick.
+        self.triggered_signals = SignalMemory(self.signal_memory_lifespan_candles, self.config.get('signal_memory_max_entries', 5000))
+        # [SURGICAL UPGRADE]: Swings come from the provider's shared Pivot Sentinel (this one serves bare frames).
+        self.swing_engine = SwingEngine(base_timeframe=self.tactical_timeframe)
+        logger.info(f"[FibonacciHelper] The Confluence Sniper v5.2 is online. Awaiting high-probability targets.")
 
     def analyze(self, mdf: MarketDataFrame) -> FibonacciReport:
         # [PACT KEPT]: The analysis loop structure is preserved.
@@ -87,7 +91,7 @@ class FibonacciHelper:
         if timeframe not in self.active_zones: self.active_zones[timeframe] = []
         if timeframe not in self.last_swing_analyzed_idx: self.last_swing_analyzed_idx[timeframe] = 0
             
-        swings = self._find_significant_swings(ohlcv)
+        swings = self._find_significant_swings(ohlcv, mdf.swing_engine, timeframe)
         if not swings: return
         
         last_swing = swings[-1]
@@ -155,20 +159,19 @@ class FibonacciHelper:
             elif not zone.is_bullish and current_candle['high'] >= zone_low:
                 if current_candle['close'] < current_candle['open'] and (current_candle['open'] - current_candle['close']) >= confirmation_body_size:
                     signals.append(FibonacciSignal(signal_type='BEARISH_FIB_CONFIRMATION', triggering_zone=zone, confidence_score=zone.strength)); signal_fired = True
-            if signal_fired: self.triggered_signals[signal_id] = current_candle_index
+            if signal_fired: self.triggered_signals.remember(signal_id, current_candle_index)
         return signals
 
     def _manage_signal_memory(self, current_index: int):
-        if not self.triggered_signals: return
-        old_signals = [sig_id for sig_id, index in self.triggered_signals.items() if current_index - index > self.signal_memory_lifespan_candles]
-        if old_signals:
-            for sig_id in old_signals: del self.triggered_signals[sig_id]
-            logger.debug(f"Sniper cleared {len(old_signals)} old signals from memory.")
+        expired = self.triggered_signals.expire(current_index)
+        if expired: logger.debug(f"Sniper cleared {expired} old signals from memory.")
 
-    def _find_significant_swings(self, ohlcv: pd.DataFrame) -> List[Dict[str, Any]]:
+    def _find_significant_swings(self, ohlcv: pd.DataFrame, swing_engine: Optional[SwingEngine] = None, timeframe: Optional[str] = None) -> List[Dict[str, Any]]:
         try:
-            highs_idx=argrelextrema(ohlcv['high'].values,np.greater_equal,order=self.swing_order)[0]; lows_idx=argrelextrema(ohlcv['low'].values,np.less_equal,order=self.swing_order)[0]
-            all_points = sorted([{'idx': i, 'price': ohlcv['high'].iloc[i], 'type': 'high'} for i in highs_idx] + [{'idx': i, 'price': ohlcv['low'].iloc[i], 'type': 'low'} for i in lows_idx], key=lambda x: x['idx'])
+            # [SURGICAL UPGRADE]: Confirmed pivots of strength >= swing_order, instead of a full argrelextrema pass per tick.
+            pivots = (swing_engine or self.swing_engine).pivots(timeframe or self.tactical_timeframe, ohlcv, self.swing_order)
+            positions = np.searchsorted(ohlcv.index.asi8, np.array([p.stamp for p in pivots], dtype=np.int64))
+            all_points = [{'idx': int(i), 'price': p.price, 'type': p.kind} for i, p in zip(positions, pivots)]
             if len(all_points) < 2: return []
             impulses = []
             for i in range(len(all_points)-1):
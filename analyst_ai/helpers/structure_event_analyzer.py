@@ -8,6 +8,7 @@ import numpy as np
 
 from core.data_models import MarketDataFrame, StructureEvent, PowerReport
 from core.market_enums import PositionSide
+from core.swing_engine import find_swing_points
 
 logger = logging.getLogger("StructureEventAnalyzer")
 
@@ -43,26 +44,9 @@ def _resample_ohlcv(df: pd.DataFrame, timeframe: str) -> pd.DataFrame:
     return df_resampled.reset_index()
 
 def _find_swing_points_for_timeframe(df: pd.DataFrame, order: int) -> Tuple[List[int], List[int]]:
-    """(This logic is PRESERVED EXACTLY from your v5.1 blueprint)"""
+    """AI-UPGRADE: The O(n * order) window loop now defers to the shared Pivot Sentinel's one-pass detector."""
     if len(df) < order * 2 + 1: return [], []
-    
-    highs, lows = df['high'], df['low']
-    swing_highs_indices, swing_lows_indices = [], []
-    
-    highs_arr = highs.to_numpy(); lows_arr = lows.to_numpy()
-    
-    for i in range(order, len(df) - order):
-        window = highs_arr[i-order : i+order+1]
-        if highs_arr[i] >= window.max():
-             if np.sum(window == highs_arr[i]) == 1:
-                swing_highs_indices.append(i)
-
-        window = lows_arr[i-order : i+order+1]
-        if lows_arr[i] <= window.min():
-             if np.sum(window == lows_arr[i]) == 1:
-                swing_lows_indices.append(i)
-
-    return swing_highs_indices, swing_lows_indices
+    return find_swing_points(df['high'].to_numpy(dtype=np.float64), df['low'].to_numpy(dtype=np.float64), order)
 
 def _analyze_timeframe(df: pd.DataFrame, power_report: 'PowerReport', timeframe_suffix: str, config: Dict) -> List[StructureEvent]:
     """(This logic is PRESERVED EXACTLY from your v5.1 blueprint)"""
@@ -1,16 +1,73 @@
 # F:\ShadowVanguard_Legion_Godspeed\analyst_ai\liquidity_analyzer.py
-# Version 15.0 - Prometheus, The Silent Ghost Hunter
+# Version 16.6 - Prometheus, The Silent Ghost Hunter
 
 import logging
-from typing import List, Tuple, Dict, Any, Optional
+from collections import deque
+from typing import List, Tuple, Dict, Any, Optional, Deque
 import pandas as pd
 import numpy as np
 
 # [PACT KEPT]: All core data model imports are PRESERVED.
 from core.data_models import MarketDataFrame, FairValueGap, LiquiditySignal, LiquidityReport
+from core.indicator_cache import IndicatorCache
+from core.zone_index import ZoneIndex
+from core.signal_memory import SignalMemory
 
 logger = logging.getLogger("LiquidityAnalyzer")
 
+
+def scan_fair_value_gaps(high: np.ndarray, low: np.ndarray, volume: np.ndarray, atr: np.ndarray, volume_ma: np.ndarray,
+                         min_size_atr_multiplier: float, min_volume_multiplier: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    The vectorized three-candle ritual. For every triplet (A, B, C) it applies exactly the
+    v15.0 loop's rules: a bullish gap when C.low > A.high, a bearish gap when A.low > C.high,
+    the gap must be at least `atr[B] * min_size_atr_multiplier` tall, and C's volume must reach
+    `volume_ma[B] * min_volume_multiplier`. Returns (B positions, is_bullish, gap lows, gap highs).
+    """
+    if len(high) < 3:
+        empty = np.empty(0); return empty.astype(np.int64), empty.astype(bool), empty, empty
+    a_high, a_low, c_high, c_low, c_volume = high[:-2], low[:-2], high[2:], low[2:], volume[2:]
+    atr_b, volume_ma_b = atr[1:-1], volume_ma[1:-1]
+    is_bullish = c_low > a_high; is_bearish = a_low > c_high
+    gap_high = np.where(is_bullish, c_low, a_low); gap_low = np.where(is_bullish, a_high, c_high)
+    # Comparisons against NaN are False, so an unwarmed filter lets the gap through, just as the loop did.
+    too_small = (atr_b == 0) | ((gap_high - gap_low) < atr_b * min_size_atr_multiplier)
+    too_quiet = (volume_ma_b == 0) | (c_volume < volume_ma_b * min_volume_multiplier)
+    hits = np.flatnonzero((is_bullish | is_bearish) & ~too_small & ~too_quiet)
+    return hits + 1, is_bullish[hits], gap_low[hits], gap_high[hits]
+
+
+class FairValueGapStream:
+    """
+    THE GHOST TRAIL: The per-timeframe memory of the hunt. It remembers the last candle it
+    has judged and the two before it, so each tick only the newly closed candles are scanned.
+    The ATR (EWM, alpha=1/period) and the volume moving average arrive from the `IndicatorCache`.
+    """
+    __slots__ = ("last_stamp", "ordinal", "last_atr", "tail")
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.last_stamp: Optional[int] = None; self.ordinal = 0
+        self.last_atr: Optional[float] = None; self.tail: Dict[str, np.ndarray] = {}
+
+    def new_rows(self, stamps: np.ndarray) -> int:
+        """Position of the first unseen candle; a rewind or a gap in the stream starts a fresh trail."""
+        if self.last_stamp is None: return 0
+        seen = int(np.searchsorted(stamps, self.last_stamp, side='right'))
+        if seen == 0 or int(stamps[seen - 1]) != self.last_stamp: self.reset(); return 0
+        return seen
+
+    def extend(self, stamps: np.ndarray, high: np.ndarray, low: np.ndarray, volume: np.ndarray, atr: np.ndarray, volume_ma: np.ndarray) -> Dict[str, np.ndarray]:
+        """Folds new candles into the trail and returns the arrays (tail + new) the gap ritual must scan."""
+        fresh = {'stamp': stamps, 'high': high, 'low': low, 'volume': volume, 'atr': atr, 'volume_ma': volume_ma,
+                 'ordinal': self.ordinal + np.arange(len(stamps))}
+        scan = {key: np.concatenate((self.tail[key], fresh[key])) if self.tail else fresh[key] for key in fresh}
+        self.tail = {key: values[-2:].copy() for key, values in scan.items()}  # Copied, so the trail never pins a whole scan
+        self.last_atr = float(atr[-1]); self.last_stamp = int(stamps[-1]); self.ordinal += len(stamps)
+        return scan
+
 class LiquidityAnalyzer:
     """
     THE SILENT GHOST HUNTER: This version marks a major upgrade in intelligence discipline.
@@ -19,6 +76,12 @@ class LiquidityAnalyzer:
     ensure it only reports Fair Value Gaps that are strategically significant. This
     dramatically reduces noise, enhances analytical clarity, and focuses the Legion's
     attention on high-impact liquidity voids. Operation: Radio Silence is complete.
+    v16.0: The hunt is now a vectorized, incremental ritual. Each timeframe keeps a
+    `FairValueGapStream`, only newly closed candles are scanned, every void lives once in a
+    persistent registry keyed by its birth candle, and the market frames are never written to.
+    v16.2: Open voids are also indexed by price, so fills and reactions are bisect lookups.
+    v16.4: A `harvest` pass (Phase 0) only collects voids: it neither settles them against the
+    last close nor hunts reactions, so harvesting a history in one pass or in two is the same.
     """
     def __init__(self, config: Dict[str, Any]):
         # [SURGICAL UPGRADE]: New parameters for noise reduction filters are added.
@@ -32,12 +95,20 @@ class LiquidityAnalyzer:
         self.min_fvg_size_atr_multiplier = self.config.get('min_fvg_size_atr_multiplier', 0.3)
         self.min_volume_multiplier = self.config.get('min_volume_multiplier', 1.5)
         self.volume_ma_period = self.config.get('volume_ma_period', 20)
+        self.atr_period = self.config.get('atr_period', 14)
         
         self.active_fvgs_by_tf: Dict[str, List[FairValueGap]] = {tf: [] for tf in self.analysis_timeframes}
-        self.triggered_signals: Dict[str, int] = {}
-        logger.info("[LiquidityAnalyzer] The Silent Ghost Hunter v15.0 is online. Noise filters engaged.")
-
-    def analyze(self, mdf: MarketDataFrame) -> LiquidityReport:
+        # [SURGICAL UPGRADE]: Mitigated voids are retired into a bounded ledger instead of vanishing.
+        self.filled_fvgs_by_tf: Dict[str, Deque[FairValueGap]] = {tf: deque(maxlen=self.config.get('filled_fvg_memory', 200)) for tf in self.analysis_timeframes}
+        self.gap_streams: Dict[str, FairValueGapStream] = {tf: FairValueGapStream() for tf in self.analysis_timeframes}
+        self.fvg_index: Dict[str, Dict[str, ZoneIndex]] = {tf: {'bullish': ZoneIndex(), 'bearish': ZoneIndex()} for tf in self.analysis_timeframes}
+        # [SURGICAL UPGRADE]: ATR and volume MA come from the provider's shared almanac (this one serves bare frames).
+        self.indicator_cache = IndicatorCache()
+        # [SURGICAL UPGRADE]: Reactions already reported, oldest first and capped at `signal_memory_max_entries`.
+        self.triggered_signals = SignalMemory(self.signal_memory_lifespan_candles, self.config.get('signal_memory_max_entries', 5000))
+        logger.info("[LiquidityAnalyzer] The Silent Ghost Hunter v16.6 is online. Noise filters engaged.")
+
+    def analyze(self, mdf: MarketDataFrame, harvest: bool = False) -> LiquidityReport:
         # [PACT KEPT]: The high-level analysis flow is 100% PRESERVED.
         report = LiquidityReport()
         tactical_df = mdf.ohlcv_multidim.get(self.tactical_timeframe)
@@ -46,29 +117,25 @@ class LiquidityAnalyzer:
         current_candle_index = len(tactical_df) - 1
         self._manage_signal_memory(current_candle_index)
 
+        cache = mdf.indicator_cache or self.indicator_cache
         available_tfs = [tf for tf in mdf.ohlcv_multidim.keys() if tf in self.analysis_timeframes]
         for tf in available_tfs:
             df = mdf.ohlcv_multidim.get(tf)
             if df is not None and not df.empty and len(df) > self.volume_ma_period:
-                # Pre-calculate necessary indicators for efficiency
-                df['atr'] = self._calculate_atr(df)
-                df['volume_ma'] = df['volume'].rolling(window=self.volume_ma_period).mean()
-                self._update_fvgs_for_timeframe(df, timeframe=tf)
+                self._update_fvgs_for_timeframe(df, timeframe=tf, cache=cache, settle=not harvest)
 
-        # [PACT KEPT]: The reporting logic is PRESERVED.
+        # [PACT KEPT]: The reporting logic is PRESERVED (the price indexes travel with it).
         for tf, fvgs in self.active_fvgs_by_tf.items():
             if fvgs:
-                if tf not in report.unfilled_fvgs:
-                    report.unfilled_fvgs[tf] = {'bullish': [], 'bearish': []}
-                for fvg in fvgs:
-                    if fvg.event_type == 'BULLISH_FVG':
-                        report.unfilled_fvgs[tf]['bullish'].append(fvg)
-                    elif fvg.event_type == 'BEARISH_FVG':
-                        report.unfilled_fvgs[tf]['bearish'].append(fvg)
-        
-        all_active_fvgs_flat_list: List[FairValueGap] = [fvg for tf_fvgs in self.active_fvgs_by_tf.values() for fvg in tf_fvgs]
-        last_candle = tactical_df.iloc[-1]
-        confirmation_signals_flat_list = self._hunt_for_confirmation_signals(all_active_fvgs_flat_list, last_candle, current_candle_index)
+                report.unfilled_fvgs[tf] = {side: index.zones() for side, index in self.fvg_index[tf].items()}
+                report.fvg_index[tf] = self.fvg_index[tf]
+        if harvest: return report  # Reactions belong to the engagement, not to the archive.
+
+        # [SURGICAL UPGRADE]: The tactical ATR comes from the trail, not from a column forced onto the frame.
+        tactical_stream = self.gap_streams.get(self.tactical_timeframe)
+        last_candle = tactical_df.iloc[-1].to_dict()
+        last_candle['atr'] = tactical_stream.last_atr if tactical_stream is not None and tactical_stream.last_stamp == tactical_df.index[-1].value else np.nan
+        confirmation_signals_flat_list = self._hunt_for_confirmation_signals(self.fvg_index, last_candle, current_candle_index)
 
         if confirmation_signals_flat_list:
             for signal in confirmation_signals_flat_list:
@@ -83,82 +150,77 @@ class LiquidityAnalyzer:
 
         return report
 
-    def _update_fvgs_for_timeframe(self, df: pd.DataFrame, timeframe: str):
-        # [SURGICAL INTERVENTION]: FVG detection logic is now hardened with noise filters.
+    def _update_fvgs_for_timeframe(self, df: pd.DataFrame, timeframe: str, cache: Optional[IndicatorCache] = None, settle: bool = True):
+        # [SURGICAL INTERVENTION]: Mitigation first (as before), then a vectorized scan of only the new candles.
         if timeframe not in self.active_fvgs_by_tf: self.active_fvgs_by_tf[timeframe] = []
-            
+        if timeframe not in self.filled_fvgs_by_tf: self.filled_fvgs_by_tf[timeframe] = deque(maxlen=self.config.get('filled_fvg_memory', 200))
+        stream = self.gap_streams.setdefault(timeframe, FairValueGapStream())
+        index = self.fvg_index.setdefault(timeframe, {'bullish': ZoneIndex(), 'bearish': ZoneIndex()})
+
+        # [SURGICAL UPGRADE]: The index names the voids the close went through; the list is only walked when there are some.
         last_close = df['close'].iloc[-1]
-        surviving_fvgs = [fvg for fvg in self.active_fvgs_by_tf.get(timeframe, []) 
-                          if not ((fvg.event_type == 'BULLISH_FVG' and last_close < fvg.price_low) or \
-                                  (fvg.event_type == 'BEARISH_FVG' and last_close > fvg.price_high))]
-        self.active_fvgs_by_tf[timeframe] = surviving_fvgs
-        
+        filled = index['bullish'].evict_lows_above(last_close) + index['bearish'].evict_highs_below(last_close) if settle else []
+        if filled:
+            for fvg in filled: fvg.status = 'filled'
+            surviving_fvgs: List[FairValueGap] = []
+            for fvg in self.active_fvgs_by_tf[timeframe]:
+                if fvg.status == 'filled': self.filled_fvgs_by_tf[timeframe].append(fvg)
+                else: surviving_fvgs.append(fvg)
+            self.active_fvgs_by_tf[timeframe] = surviving_fvgs
+
+        # Only the base stream delivers closed candles in its last row; a higher-timeframe tail bar is still forming.
+        settled = len(df) if timeframe == self.tactical_timeframe else len(df) - 1
+        stamps = df.index.asi8[:settled]
+        if settled < 1: return
+        first_new = stream.new_rows(stamps)
+        if first_new >= settled: return
+        # The almanac's values at settled rows never depend on the forming tail bar, so its series can be sliced directly.
+        cache = cache or self.indicator_cache
+        atr = cache.atr_series(timeframe, df, self.atr_period); volume_ma = cache.sma_series(timeframe, df, self.volume_ma_period, column='volume')
+        new = df.iloc[first_new:settled]
+        scan = stream.extend(stamps[first_new:], new['high'].to_numpy(dtype=np.float64), new['low'].to_numpy(dtype=np.float64),
+                             new['volume'].to_numpy(dtype=np.float64), atr[first_new:settled], volume_ma[first_new:settled])
+
+        positions, is_bullish, gap_lows, gap_highs = scan_fair_value_gaps(
+            scan['high'], scan['low'], scan['volume'], scan['atr'], scan['volume_ma'],
+            self.min_fvg_size_atr_multiplier, self.min_volume_multiplier)
+        if len(positions) == 0: return
+
         existing_void_ids = {v.void_id for v in self.active_fvgs_by_tf[timeframe]}
-        
-        for i in range(len(df) - 2):
-            candle_A, candle_B, candle_C = df.iloc[i], df.iloc[i+1], df.iloc[i+2]
-            new_fvg: Optional[FairValueGap] = None
-
-            is_bullish_gap = candle_C['low'] > candle_A['high']
-            is_bearish_gap = candle_A['low'] > candle_C['high']
-
-            if is_bullish_gap or is_bearish_gap:
-                fvg_high = candle_C['low'] if is_bullish_gap else candle_A['low']
-                fvg_low = candle_A['high'] if is_bullish_gap else candle_C['high']
-                fvg_height = fvg_high - fvg_low
-                
-                # --- Filter 1: Relative Size Check ---
-                atr_at_creation = df['atr'].iloc[i+1]
-                if atr_at_creation == 0 or fvg_height < (atr_at_creation * self.min_fvg_size_atr_multiplier):
-                    continue # Skip FVG if it's too small relative to volatility
-
-                # --- Filter 2: Volume Significance Check ---
-                volume_ma_at_creation = df['volume_ma'].iloc[i+1]
-                if volume_ma_at_creation == 0 or candle_C['volume'] < (volume_ma_at_creation * self.min_volume_multiplier):
-                    continue # Skip if the confirming candle has insignificant volume
-                
-                # If filters passed, create the FVG
-                event_type = 'BULLISH_FVG' if is_bullish_gap else 'BEARISH_FVG'
-                void_id = f"{event_type[:4]}_{timeframe}_{i+1}"
-                
-                if void_id not in existing_void_ids:
-                    new_fvg = FairValueGap(
-                        void_id=void_id, event_type=event_type,
-                        price_low=fvg_low, price_high=fvg_high,
-                        timeframe=timeframe, created_at_index=i + 1)
-            
-            if new_fvg:
-                self.active_fvgs_by_tf[timeframe].append(new_fvg)
-                existing_void_ids.add(new_fvg.void_id)
-                # This log will now be much rarer and more significant
-                logger.info(f"STRATEGIC VOID DETECTED: New {new_fvg.event_type} on {new_fvg.timeframe} at ({new_fvg.price_low:.2f}, {new_fvg.price_high:.2f})")
+        for position, bullish, fvg_low, fvg_high in zip(positions, is_bullish, gap_lows, gap_highs):
+            event_type = 'BULLISH_FVG' if bullish else 'BEARISH_FVG'
+            # The void is named after its middle candle's time, so it keeps one identity as the window slides.
+            void_id = f"{event_type[:4]}_{timeframe}_{pd.Timestamp(int(scan['stamp'][position])):%Y%m%d%H%M}"
+            if void_id in existing_void_ids: continue
+            new_fvg = FairValueGap(
+                void_id=void_id, event_type=event_type,
+                price_low=float(fvg_low), price_high=float(fvg_high),
+                timeframe=timeframe, created_at_index=int(scan['ordinal'][position]))
+            self.active_fvgs_by_tf[timeframe].append(new_fvg); index['bullish' if bullish else 'bearish'].add(new_fvg)
+            existing_void_ids.add(void_id)
+            # This log will now be much rarer and more significant
+            logger.info(f"STRATEGIC VOID DETECTED: New {new_fvg.event_type} on {new_fvg.timeframe} at ({new_fvg.price_low:.2f}, {new_fvg.price_high:.2f})")
 
     # [PACT KEPT]: All remaining methods are preserved.
-    def _calculate_atr(self, ohlcv_df: pd.DataFrame, period: int = 14) -> pd.Series:
-        df = ohlcv_df.copy(); df['h-l'] = df['high'] - df['low']; df['h-pc'] = abs(df['high'] - df['close'].shift(1)); df['l-pc'] = abs(df['low'] - df['close'].shift(1))
-        tr = df[['h-l', 'h-pc', 'l-pc']].max(axis=1)
-        return tr.ewm(alpha=1/period, adjust=False).mean()
-
-    def _hunt_for_confirmation_signals(self, all_active_fvgs: List[FairValueGap], current_candle: pd.Series, current_candle_index: int) -> List[LiquiditySignal]:
+    def _hunt_for_confirmation_signals(self, fvg_index: Dict[str, Dict[str, ZoneIndex]], current_candle: Dict[str, Any], current_candle_index: int) -> List[LiquiditySignal]:
+        # [SURGICAL UPGRADE]: A reaction needs a decisive body first; only then are the touched voids looked up by price.
         signals: List[LiquiditySignal] = []
         if pd.isna(current_candle.get('atr')): return signals
         confirmation_body_size = current_candle['atr'] * self.confirmation_atr_multiplier
-        for fvg in all_active_fvgs:
-            signal_id = f"{fvg.void_id}_{current_candle_index}"
-            if signal_id in self.triggered_signals: continue
-            signal_fired = False
-            if fvg.event_type == 'BULLISH_FVG' and current_candle['low'] <= fvg.price_high:
-                if current_candle['close'] > current_candle['open'] and (current_candle['close'] - current_candle['open']) >= confirmation_body_size:
-                    signals.append(LiquiditySignal(signal_type='BULLISH_FVG_CONFIRMATION', triggering_void=fvg, confidence_score=0.8)); signal_fired = True
-            elif fvg.event_type == 'BEARISH_FVG' and current_candle['high'] >= fvg.price_low:
-                if current_candle['close'] < current_candle['open'] and (current_candle['open'] - current_candle['close']) >= confirmation_body_size:
-                    signals.append(LiquiditySignal(signal_type='BEARISH_FVG_CONFIRMATION', triggering_void=fvg, confidence_score=0.8)); signal_fired = True
-            if signal_fired: self.triggered_signals[signal_id] = current_candle_index
+        body = current_candle['close'] - current_candle['open']
+        for index in fvg_index.values():
+            touched = []
+            if body > 0 and body >= confirmation_body_size:
+                touched += [('BULLISH_FVG_CONFIRMATION', fvg) for fvg in index['bullish'].highs_at_or_above(current_candle['low'])]
+            if body < 0 and -body >= confirmation_body_size:
+                touched += [('BEARISH_FVG_CONFIRMATION', fvg) for fvg in index['bearish'].lows_at_or_below(current_candle['high'])]
+            for signal_type, fvg in touched:
+                signal_id = f"{fvg.void_id}_{current_candle_index}"
+                if signal_id in self.triggered_signals: continue
+                signals.append(LiquiditySignal(signal_type=signal_type, triggering_void=fvg, confidence_score=0.8))
+                self.triggered_signals.remember(signal_id, current_candle_index)
         return signals
         
     def _manage_signal_memory(self, current_index: int):
-        if not self.triggered_signals: return
-        old_signals = [sig_id for sig_id, index in self.triggered_signals.items() if current_index - index > self.signal_memory_lifespan_candles]
-        if old_signals:
-            for sig_id in old_signals: del self.triggered_signals[sig_id]
-            logger.debug(f"Ghost Buster cleared {len(old_signals)} old signals from memory.")
\ No newline at end of file
+        expired = self.triggered_signals.expire(current_index)
+        if expired: logger.debug(f"Ghost Buster cleared {expired} old signals from memory.")
\ No newline at end of file
@@ -1,11 +1,13 @@
 # F:\ShadowVanguard_Legion_Godspeed\analyst_ai\multi_timeframe_synthesizer.py
-# Version 15.0 - Prometheus, The Timeless Oracle
+# Version 16.1 - Prometheus, The Timeless Oracle
 
 import logging
+import numpy as np
 import pandas as pd
 from typing import Dict, Any, List
 
 from core.data_models import MarketDataFrame
+from core.data_provider import MultiTimeframeAggregator
 
 logger = logging.getLogger("MultiTimeframeSynthesizer")
 
@@ -17,6 +19,11 @@ class MultiTimeframeSynthesizer:
     It takes the base tactical data (e.g., 5m) and, on the fly, forges the
     1h and 4h strategic charts, making them available to all other analysts.
     This unit is the heart of the Watchtower.
+    v16.0: The Oracle no longer re-resamples the whole window every tick. It reads the
+    bars from the shared, incremental `MultiTimeframeAggregator` that the provider keeps
+    current, and only keeps a private one for streams that arrive without it.
+    v16.1: A provider that shares its aggregator already hands over the folded bars, and the
+    Oracle takes them as they are; it only forges the timeframes a packet arrives without.
     """
     def __init__(self, config: Dict[str, Any]):
         # The configuration is read from the new, dedicated section in settings.yaml
@@ -24,16 +31,11 @@ class MultiTimeframeSynthesizer:
         self.target_timeframes = self.config.get('target_timeframes', ['1h', '4h'])
         self.base_timeframe = self.config.get('base_timeframe', '5m')
         
-        # This mapping is crucial for pandas' resample function.
-        self.aggregation_rules = {
-            'open': 'first',
-            'high': 'max',
-            'low': 'min',
-            'close': 'last',
-            'volume': 'sum'
-        }
+        # [SURGICAL UPGRADE]: A private clockwork for streams whose provider does not share one.
+        base_minutes = int(pd.Timedelta(self.base_timeframe.replace('m', 'min')).total_seconds() // 60)
+        self.own_aggregator = MultiTimeframeAggregator(base_minutes, self.target_timeframes)
         
-        logger.info(f"[MultiTimeframeSynthesizer] The Timeless Oracle v15.0 is online. Synthesizing {self.target_timeframes} from base '{self.base_timeframe}'.")
+        logger.info(f"[MultiTimeframeSynthesizer] The Timeless Oracle v16.1 is online. Synthesizing {self.target_timeframes} from base '{self.base_timeframe}'.")
 
     def synthesize(self, mdf: MarketDataFrame) -> MarketDataFrame:
         """
@@ -49,26 +51,24 @@ class MultiTimeframeSynthesizer:
 
         try:
             # --- The Sacred Ritual of Time Synthesis ---
-            for tf in self.target_timeframes:
-                # pandas' resample is the scientifically correct and industry-standard
-                # method for this conversion. It is fast, accurate, and battle-hardened.
-                # 'T' is used for minute-based frequencies ('15T', '60T'), 'H' for hourly.
-                # We need to map '5m' to '5T', '1h' to '1H' or '60T' etc.
-                pandas_freq = tf.replace('m', 'T').replace('h', 'H')
-                
-                # Perform the resampling based on the sacred rules.
-                resampled_df = base_df.resample(pandas_freq).agg(self.aggregation_rules)
-                
-                # Remove any rows that might be empty due to resampling gaps.
-                resampled_df.dropna(inplace=True)
-                
+            # [SURGICAL UPGRADE]: A provider sharing its clockwork has already put the bars it folded this tick on the
+            # packet; those are taken as they are. Only the missing timeframes are read from the clockwork, which
+            # matches `resample().agg().dropna()` exactly; streams without one get the private clockwork for all of them.
+            aggregator = mdf.timeframe_aggregator; missing = list(self.target_timeframes)
+            if isinstance(aggregator, MultiTimeframeAggregator) and set(self.target_timeframes) <= set(aggregator.strategic_timeframes):
+                missing = [tf for tf in self.target_timeframes if tf not in mdf.ohlcv_multidim]
+            else:
+                aggregator = self.own_aggregator
+            if not missing: return mdf
+            stamps = base_df.index.asi8; values = base_df[['open', 'high', 'low', 'close', 'volume']].to_numpy(dtype=np.float64)
+            for tf, synthesized_df in aggregator.window_frames(stamps, values, missing).items():
                 # Add the newly forged strategic chart to the central intelligence packet.
-                if not resampled_df.empty:
-                    mdf.ohlcv_multidim[tf] = resampled_df
-                    logger.debug(f"Successfully synthesized '{tf}' timeframe with {len(resampled_df)} candles.")
+                if not synthesized_df.empty:
+                    mdf.ohlcv_multidim[tf] = synthesized_df
+                    logger.debug(f"Successfully synthesized '{tf}' timeframe with {len(synthesized_df)} candles.")
 
         except Exception as e:
-            logger.error(f"A critical error occurred during time synthesis for timeframe '{tf}': {e}", exc_info=True)
+            logger.error(f"A critical error occurred during time synthesis: {e}", exc_info=True)
         
         # Return the enriched MDF, now carrying multi-timeframe wisdom.
-        return mdf
\ No newline at end of file
+        return mdf
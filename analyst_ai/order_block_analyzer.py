@@ -1,5 +1,5 @@
 # F:\ShadowVanguard_Legion_Godspeed\analyst_ai\order_block_analyzer.py
-# Version 8.3 - Prometheus, The Universal Cipher
+# Version 8.5 - Prometheus, The Universal Cipher
 
 import logging
 from typing import List, Dict, Tuple, Optional, Any
@@ -8,6 +8,8 @@ import pandas as pd
 # [SURGICAL INTERVENTION]: The Cipher now speaks the universal language of the Legion.
 # It imports its blueprints directly from the central encyclopedia, ensuring perfect protocol synchronization.
 from core.data_models import MarketDataFrame, OrderBlock, OBInteractionSignal, OrderBlockReport
+from core.zone_index import ZoneIndex
+from core.signal_memory import SignalMemory
 
 logger = logging.getLogger("OrderBlockAnalyzer")
 
@@ -18,7 +20,8 @@ class OrderBlockAnalyzer:
     the universal data models defined in `core.data_models`. This surgical change
     eliminates the `AttributeError` by ensuring the produced `OrderBlockReport`
     perfectly matches the format expected by the `StructureAnalyzer`.
-    The Legion now speaks with one voice.
+    The Legion now speaks with one voice. Every timeframe's blocks also live in a bisect
+    `ZoneIndex` per side, so mitigation and the interaction hunt are logarithmic lookups.
     """
     def __init__(self, config: Dict[str, Any]):
         # [PACT KEPT]: The core configuration logic is PRESERVED.
@@ -29,10 +32,13 @@ class OrderBlockAnalyzer:
         
         # Internal state now uses the official OrderBlock model.
         self.active_blocks_by_tf: Dict[str, List[OrderBlock]] = {tf: [] for tf in self.analysis_timeframes}
+        # [SURGICAL UPGRADE]: The same blocks, sorted by price: {'5m': {'bullish': ZoneIndex, 'bearish': ZoneIndex}}.
+        self.block_index: Dict[str, Dict[str, ZoneIndex]] = {tf: {'bullish': ZoneIndex(), 'bearish': ZoneIndex()} for tf in self.analysis_timeframes}
         
         self.last_impulse_index: Dict[str, int] = {tf: 0 for tf in self.analysis_timeframes}
-        self.triggered_signals: Dict[str, int] = {}
-        logger.info("[OrderBlockAnalyzer] The Universal Cipher v8.3 is online. Speaking Legion Standard Protocol.")
+        # [SURGICAL UPGRADE]: Expiry pops the oldest IDs off the front instead of scanning every signal ever fired.
+        self.triggered_signals = SignalMemory(self.signal_memory_lifespan_candles, self.config.get('signal_memory_max_entries', 5000))
+        logger.info("[OrderBlockAnalyzer] The Universal Cipher v8.5 is online. Speaking Legion Standard Protocol.")
 
     def analyze(self, mdf: MarketDataFrame) -> OrderBlockReport:
         # [SURGICAL INTERVENTION]: The reporting logic is updated to use the official, synchronized format.
@@ -50,22 +56,16 @@ class OrderBlockAnalyzer:
                 self._update_blocks_for_timeframe(df, timeframe=tf)
 
         # --- REPORTING RECONSTRUCTION ---
-        # 1. Populate the `all_blocks` field in the new, correct format.
+        # 1. Populate the `all_blocks` field in the new, correct format (and hand over the price indexes behind it).
         for tf, blocks in self.active_blocks_by_tf.items():
             if blocks:
-                if tf not in report.all_blocks:
-                    report.all_blocks[tf] = {'bullish': [], 'bearish': []}
-                for block in blocks:
-                    if block.event_type == 'BULLISH_OB':
-                        report.all_blocks[tf]['bullish'].append(block)
-                    elif block.event_type == 'BEARISH_OB':
-                        report.all_blocks[tf]['bearish'].append(block)
-
-        # 2. Hunt for signals using the unified block list.
-        all_active_blocks_flat_list: List[OrderBlock] = [block for tf_blocks in self.active_blocks_by_tf.values() for block in tf_blocks]
+                report.all_blocks[tf] = {side: index.zones() for side, index in self.block_index[tf].items()}
+                report.block_index[tf] = self.block_index[tf]
+
+        # 2. Hunt for signals using the price indexes.
         current_candle = tactical_df.iloc[-1]
         interaction_signals_flat_list = self._hunt_for_interaction_signals(
-            all_active_blocks_flat_list, current_candle, current_candle_index
+            self.block_index, current_candle, current_candle_index
         )
         
         # 3. Populate the `interaction_signals` field.
@@ -87,21 +87,20 @@ class OrderBlockAnalyzer:
         # Minor adjustments for new data model fields (`price_low`, `price_high`).
         if len(df) < 2: return
         if timeframe not in self.active_blocks_by_tf: self.active_blocks_by_tf[timeframe] = []
+        if timeframe not in self.block_index: self.block_index[timeframe] = {'bullish': ZoneIndex(), 'bearish': ZoneIndex()}
         if timeframe not in self.last_impulse_index: self.last_impulse_index[timeframe] = 0
+        index = self.block_index[timeframe]
             
         mitigation_candle = df.iloc[-2]
         mitigation_type = self.config.get('mitigation_type', 'Close')
         bullish_mitigation_price = mitigation_candle['close'] if mitigation_type == "Close" else mitigation_candle['low']
         bearish_mitigation_price = mitigation_candle['close'] if mitigation_type == "Close" else mitigation_candle['high']
 
-        surviving_blocks = []
-        for ob in self.active_blocks_by_tf[timeframe]:
-            is_mitigated = False
-            # Using new fields: price_low, price_high
-            if ob.event_type == 'BULLISH_OB' and bullish_mitigation_price < ob.price_low: is_mitigated = True
-            elif ob.event_type == 'BEARISH_OB' and bearish_mitigation_price > ob.price_high: is_mitigated = True
-            if not is_mitigated: surviving_blocks.append(ob)
-        self.active_blocks_by_tf[timeframe] = surviving_blocks
+        # [SURGICAL UPGRADE]: Only the blocks the close went through are visited: demand entirely above it, supply entirely below it.
+        mitigated = index['bullish'].evict_lows_above(bullish_mitigation_price) + index['bearish'].evict_highs_below(bearish_mitigation_price)
+        if mitigated:
+            for ob in mitigated: ob.status = 'mitigated'
+            self.active_blocks_by_tf[timeframe] = [ob for ob in self.active_blocks_by_tf[timeframe] if ob.status != 'mitigated']
 
         sensitivity = self.config.get('sensitivity', 0.28)
         roc_period = 4
@@ -141,32 +140,24 @@ class OrderBlockAnalyzer:
                     timeframe=timeframe,
                     created_at_index=source_candle_index
                 )
-                self.active_blocks_by_tf[timeframe].append(new_ob)
+                self.active_blocks_by_tf[timeframe].append(new_ob); index[impulse_type_suffix.lower()].add(new_ob)
                 logger.info(f"SONAR LOCK: New {new_ob.event_type} OB created on {new_ob.timeframe} at ({new_ob.price_low}, {new_ob.price_high})")
 
-    def _hunt_for_interaction_signals(self, all_active_blocks: List[OrderBlock], current_candle: pd.Series, current_candle_index: int) -> List[OBInteractionSignal]:
+    def _hunt_for_interaction_signals(self, block_index: Dict[str, Dict[str, ZoneIndex]], current_candle: pd.Series, current_candle_index: int) -> List[OBInteractionSignal]:
         # [PACT KEPT]: Core signaling logic is preserved, now returns official signal type.
+        # [SURGICAL UPGRADE]: The index hands over only the touched blocks: demand whose top the low reached, supply whose floor the high reached.
         signals: List[OBInteractionSignal] = []
-        for ob in all_active_blocks:
-            signal_id = f"{ob.block_id}_{current_candle_index}"
-            if signal_id in self.triggered_signals: continue
-            
-            signal_fired = False
-            # Using new fields: price_low, price_high
-            if ob.event_type == 'BULLISH_OB' and current_candle['low'] <= ob.price_high:
-                signals.append(OBInteractionSignal(signal_type='BULLISH_OB_INTERACTION', triggering_ob=ob, confidence_score=1.0)); signal_fired = True
-            
-            elif ob.event_type == 'BEARISH_OB' and current_candle['high'] >= ob.price_low:
-                signals.append(OBInteractionSignal(signal_type='BEARISH_OB_INTERACTION', triggering_ob=ob, confidence_score=1.0)); signal_fired = True
-            
-            if signal_fired:
-                self.triggered_signals[signal_id] = current_candle_index
+        for index in block_index.values():
+            touched = [('BULLISH_OB_INTERACTION', ob) for ob in index['bullish'].highs_at_or_above(current_candle['low'])]
+            touched += [('BEARISH_OB_INTERACTION', ob) for ob in index['bearish'].lows_at_or_below(current_candle['high'])]
+            for signal_type, ob in touched:
+                signal_id = f"{ob.block_id}_{current_candle_index}"
+                if signal_id in self.triggered_signals: continue
+                signals.append(OBInteractionSignal(signal_type=signal_type, triggering_ob=ob, confidence_score=1.0))
+                self.triggered_signals.remember(signal_id, current_candle_index)
         return signals
 
     def _manage_signal_memory(self, current_index: int):
         # [PACT KEPT]: The discipline enforcer is 100% PRESERVED.
-        if not self.triggered_signals: return
-        old_signals = [sig_id for sig_id, index in self.triggered_signals.items() if current_index - index > self.signal_memory_lifespan_candles]
-        if old_signals:
-            for sig_id in old_signals: del self.triggered_signals[sig_id]
-            logger.debug(f"Cipher cleared {len(old_signals)} old signals from memory.")
\ No newline at end of file
+        expired = self.triggered_signals.expire(current_index)
+        if expired: logger.debug(f"Cipher cleared {expired} old signals from memory.")
\ No newline at end of file
@@ -0,0 +1,408 @@
+# F:\ShadowVanguard_Legion_Godspeed\analyst_ai\signal_matrix.py
+# Version 1.1 - Prometheus, The Hindsight Engine
+
+import logging
+from collections import Counter
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from core.indicator_cache import AverageTrueRange, MovingAverage, RelativeStrength, IndicatorStream
+from core.streaming_window import OHLCV_COLUMNS
+from analyst_ai.liquidity_analyzer import scan_fair_value_gaps
+
+logger = logging.getLogger("HindsightEngine")
+
+ANALYSTS = ('ob', 'liq', 'fib', 'div')
+SIDES = ('bull', 'bear')
+OPEN, HIGH, LOW, CLOSE, VOLUME = range(len(OHLCV_COLUMNS))
+
+
+def signal_column(analyst: str, timeframe: str, side: str) -> str:
+    return f"{analyst}_{timeframe}_{side}"
+
+
+def _fold(indicator: IndicatorStream, rows: np.ndarray) -> np.ndarray:
+    """An almanac indicator over a whole series in one fold, exactly as the streaming ledger settles it."""
+    return indicator.fold(indicator.initial_state(), rows)[0]
+
+
+def _first_hit(values: np.ndarray, start: int, stop: int, compare: Any, level: float) -> int:
+    """
+    The first position in [start, stop) where `compare(value, level)` holds, or `stop`. The scan
+    gallops through growing chunks, so a hit a few bars away costs one small comparison and a
+    zone that lives for the whole history costs one pass, never a Python loop over bars.
+    """
+    step = 32
+    while start < stop:
+        end = min(stop, start + step); hits = np.flatnonzero(compare(values[start:end], level))
+        if len(hits): return start + int(hits[0])
+        start = end; step *= 4
+    return stop
+
+
+def _pivot_mask(values: np.ndarray, strength: int) -> np.ndarray:
+    """Bars that no bar within `strength` on either side exceeds (ties allowed): the Pivot Sentinel's pivots of that strength."""
+    n = len(values); mask = np.zeros(n, dtype=bool)
+    if n < 2 * strength + 1: return mask
+    peaks = np.lib.stride_tricks.sliding_window_view(values, strength).max(axis=1)  # peaks[i] = max(values[i:i + strength])
+    inner = np.arange(strength, n - strength)
+    mask[inner] = (values[inner] >= peaks[inner - strength]) & (values[inner] >= peaks[inner + 1])
+    return mask
+
+
+def _first_per_key(keys: np.ndarray, ticks: np.ndarray) -> np.ndarray:
+    """The earliest tick of every key: a signal ID fires once, however many zones carry it."""
+    if len(keys) == 0: return np.empty(0, dtype=np.int64)
+    order = np.lexsort((ticks, keys)); keys, ticks = keys[order], ticks[order]
+    return ticks[np.r_[True, keys[1:] != keys[:-1]]]
+
+
+class WindowGeometry:
+    """
+    One timeframe as the Oracle's sliding windows present it, for every tick at once. Base
+    candles are bucketed exactly as the `MultiTimeframeAggregator` buckets them, so the window
+    at a tick shows a partial head bar (the window's first candle to the end of its bucket),
+    the closed bars, and the bar still forming. Bars are numbered once; window row `p` at a
+    tick is bar `head[tick] + p`. Tick `k` is the window over base candles [k, k + window).
+    """
+    def __init__(self, stamps: np.ndarray, values: np.ndarray, window_size: int, tf_ns: Optional[int] = None):
+        n = len(stamps); self.values = values; self.window_size = window_size; self.is_base = tf_ns is None
+        buckets = stamps if self.is_base else stamps - stamps % tf_ns
+        self.starts = np.arange(n) if self.is_base else np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+        self.ends = np.r_[self.starts[1:], n]
+        self.stamps = buckets[self.starts]
+        self.bars = values if self.is_base else self._fold_bars(values)
+        rank = np.repeat(np.arange(len(self.starts)), self.ends - self.starts)
+        self.head = rank[:n - window_size + 1]; self.last = rank[window_size - 1:]
+        self.length = self.last - self.head + 1
+        # The last closed bar at each tick: the base candle itself, or the bar before the one still forming.
+        self.settled = self.last if self.is_base else self.last - 1
+
+    def _fold_bars(self, values: np.ndarray) -> np.ndarray:
+        starts, sizes = self.starts, self.ends - self.starts
+        bars = np.empty((len(starts), len(OHLCV_COLUMNS)))
+        bars[:, OPEN] = values[starts, OPEN]; bars[:, CLOSE] = values[self.ends - 1, CLOSE]
+        bars[:, HIGH] = np.maximum.reduceat(values[:, HIGH], starts); bars[:, LOW] = np.minimum.reduceat(values[:, LOW], starts)
+        volume = values[starts, VOLUME].copy()
+        for k in range(1, int(sizes.max())):  # Summed candle by candle, in the aggregator's order
+            grows = sizes > k; volume[grows] += values[starts[grows] + k, VOLUME]
+        bars[:, VOLUME] = volume
+        return bars
+
+    def row(self, tick: int, position: int) -> np.ndarray:
+        """Window row `position` at `tick`: the partial head bar, a closed bar or the forming bar."""
+        if self.is_base: return self.values[tick + position]
+        bar = self.head[tick] + position; now = tick + self.window_size
+        if bar == self.head[tick]: segment = self.values[tick:min(self.ends[bar], now)]
+        elif bar == self.last[tick]: segment = self.values[self.starts[bar]:now]
+        else: return self.bars[bar]
+        return np.array([segment[0, OPEN], segment[:, HIGH].max(), segment[:, LOW].min(), segment[-1, CLOSE], segment[:, VOLUME].sum()])
+
+    def window_extreme(self, tick: int, start: int, stop: int, column: int, reduce: Any) -> float:
+        """`reduce` (np.min, np.max) of one column over window rows [start, stop) at `tick`."""
+        if self.is_base: return float(reduce(self.values[tick + start:tick + stop, column]))
+        length = int(self.length[tick]); head = int(self.head[tick]); edges = []
+        if start == 0: edges.append(self.row(tick, 0)[column])
+        if stop == length and length > 1: edges.append(self.row(tick, length - 1)[column])
+        inner = self.bars[head + max(start, 1):head + min(stop, length - 1), column]
+        return float(reduce(np.concatenate((inner, edges))))
+
+    def stream(self, tick: int) -> Tuple[int, np.ndarray]:
+        """The bars a streaming unit first called at `tick` folds over its life: that window's head, then every later bar."""
+        head = int(self.head[tick])
+        if self.is_base: return head, self.values[head:]
+        return head, np.vstack((self.row(tick, 0), self.bars[head + 1:]))
+
+
+class HindsightEngine:
+    """
+    THE HINDSIGHT ENGINE: The order block, liquidity, fibonacci and divergence analysts, run
+    once over the whole history in array form instead of once per tick. Every tick's window
+    is described by array arithmetic (`WindowGeometry`), every streaming indicator and pivot
+    ledger is one fold over the series it would have seen, and every zone's fate (its birth,
+    the first candle that fires it, the close that retires it) is a search over arrays. The
+    result is the per-bar signal matrix a tick-by-tick replay of the four analysts produces,
+    including their window-relative bookkeeping, in seconds instead of an hour.
+    It starts from fresh analysts (no Phase 0 map) and reads the base candles and the
+    synthesized timeframes, exactly as `replay_signal_matrix` feeds them.
+    v1.1: An analyst that fires more signals than its `signal_memory_max_entries` is flagged:
+    the replay forgets its oldest IDs, so a zone could fire twice there and once here.
+    """
+    def __init__(self, config: Dict[str, Any], history: pd.DataFrame):
+        self.analyst_config = config.get('analyst_ai', {}) or {}
+        provider_config = config.get('data_provider', {}) or {}
+        self.window_size = int(provider_config.get('data_window_size', 200))
+        self.base_timeframe = f"{provider_config.get('timeframe_minutes', 5)}m"
+        synthesized = (self.analyst_config.get('multi_timeframe_synthesizer', {}) or {}).get('target_timeframes', ['1h', '4h'])
+        skipped = [tf for tf in provider_config.get('strategic_timeframes', []) if tf not in synthesized]
+        if skipped: logger.warning(f"Timeframes {skipped} are not synthesized; the Hindsight Engine leaves them out.")
+        self.timeframes = [self.base_timeframe] + [tf for tf in synthesized if tf != self.base_timeframe]
+        frame = history[OHLCV_COLUMNS]
+        self.stamps = np.ascontiguousarray(frame.index.asi8, dtype=np.int64)
+        self.values = np.ascontiguousarray(frame.to_numpy(dtype=np.float64))
+        self.ticks = max(0, len(self.stamps) - self.window_size + 1)
+        self.candles = self.values[self.window_size - 1:]  # The tactical candle of every tick
+        self._geometry: Dict[str, WindowGeometry] = {}
+        self.counts: Dict[str, np.ndarray] = {}
+        logger.info(f"[HindsightEngine] The Hindsight Engine v1.1 is online: {self.ticks} ticks over {self.timeframes}.")
+
+    # --- Shape ---
+    def geometry(self, timeframe: str) -> WindowGeometry:
+        if timeframe not in self._geometry:
+            tf_ns = None if timeframe == self.base_timeframe else pd.Timedelta(timeframe.replace('m', 'min')).value
+            self._geometry[timeframe] = WindowGeometry(self.stamps, self.values, self.window_size, tf_ns)
+        return self._geometry[timeframe]
+
+    def _section(self, name: str) -> Dict[str, Any]:
+        return self.analyst_config.get(name, {}) or {}
+
+    def _timeframes(self, config: Dict[str, Any], default: List[str]) -> List[str]:
+        if config.get('tactical_timeframe', '5m') != self.base_timeframe:
+            logger.warning(f"Tactical timeframe {config.get('tactical_timeframe')} is not the base stream; the analyst stays silent."); return []
+        return [tf for tf in config.get('analysis_timeframes', default) if tf in self.timeframes]
+
+    def columns(self) -> List[str]:
+        sections = (('ob', 'order_block_analyzer', ['5m', '15m', '1h']), ('liq', 'liquidity_analyzer', ['5m', '15m', '1h']),
+                    ('fib', 'fibonacci_helper', ['15m', '1h']), ('div', 'divergence_detector', ['15m', '1h']))
+        return [signal_column(analyst, tf, side) for analyst, section, default in sections
+                for tf in self._timeframes(self._section(section), default) for side in SIDES]
+
+    def _record(self, analyst: str, timeframe: str, bullish: bool, ticks: np.ndarray):
+        column = self.counts.setdefault(signal_column(analyst, timeframe, 'bull' if bullish else 'bear'), np.zeros(self.ticks, dtype=np.int32))
+        np.add.at(column, np.asarray(ticks, dtype=np.int64), 1)
+
+    def _swing_seed(self, timeframe: str) -> int:
+        """The tick the Pivot Sentinel's ledger for `timeframe` is first extended: the first fibonacci or divergence pass over it."""
+        geometry = self.geometry(timeframe); seeds = []
+        fib, div = self._section('fibonacci_helper'), self._section('divergence_detector')
+        if timeframe in self._timeframes(fib, ['15m', '1h']):
+            seeds.append(np.flatnonzero(geometry.length >= fib.get('swing_order', 15) * 2 + 1)[:1])
+        if timeframe in self._timeframes(div, ['15m', '1h']):
+            seeds.append(np.flatnonzero(geometry.length >= div.get('rsi_period', 14) + div.get('swing_order', 10) * 2)[:1])
+        seeds = np.concatenate(seeds) if seeds else np.empty(0, dtype=np.int64)
+        return int(seeds.min()) if len(seeds) else -1
+
+    def run(self) -> pd.DataFrame:
+        """The signal matrix: one row per tick (labelled with its candle's time), one count column per analyst, timeframe and side."""
+        self.counts = {column: np.zeros(self.ticks, dtype=np.int32) for column in self.columns()}
+        if self.ticks:
+            for analyst, scan in (('ob', self._order_blocks), ('liq', self._liquidity), ('fib', self._fibonacci), ('div', self._divergence)):
+                try: scan()
+                except Exception as e: logger.error(f"The {analyst} hindsight scan failed: {e}", exc_info=True)
+            for analyst, section in (('ob', 'order_block_analyzer'), ('liq', 'liquidity_analyzer'), ('fib', 'fibonacci_helper'), ('div', 'divergence_detector')):
+                fired = sum(int(counts.sum()) for column, counts in self.counts.items() if column.startswith(analyst + '_'))
+                cap = self._section(section).get('signal_memory_max_entries', 5000)
+                if cap and fired > cap: logger.warning(f"The {analyst} analyst fired {fired} signals, over its memory of {cap}: a replay may re-fire forgotten zones.")
+        index = pd.DatetimeIndex(self.stamps[self.window_size - 1:].view('M8[ns]'))
+        return pd.DataFrame(self.counts, index=index)
+
+    # --- The four analysts ---
+    def _order_blocks(self):
+        config = self._section('order_block_analyzer')
+        sensitivity = config.get('sensitivity', 0.28); by_close = config.get('mitigation_type', 'Close') == 'Close'
+        blocks = []  # (signal ID, timeframe, bullish, low, high, born, retired)
+        for tf in self._timeframes(config, ['5m', '15m', '1h']):
+            geometry = self.geometry(tf); gated = np.flatnonzero(geometry.length > 15)
+            if not len(gated): continue
+            last = geometry.last[gated]; opens = [geometry.bars[last - back, OPEN] for back in range(6)]
+            roc, prev_roc = (opens[0] - opens[4]) / opens[4], (opens[1] - opens[5]) / opens[5]
+            bearish = (prev_roc >= -sensitivity) & (roc < -sensitivity); bullish = (prev_roc <= sensitivity) & (roc > sensitivity)
+            # The mitigation candle is the window's second-to-last row: the previous candle, or the last closed bar.
+            previous = geometry.bars[last - 1]
+            demand_price = previous[:, CLOSE] if by_close else previous[:, LOW]; supply_price = previous[:, CLOSE] if by_close else previous[:, HIGH]
+            last_impulse = 0
+            for k in np.flatnonzero(bullish | bearish):
+                current = int(geometry.length[gated[k]]) - 1
+                if current - last_impulse <= 5: continue  # The Cipher's impulse spacing counts window rows
+                last_impulse = current; bull = bool(bullish[k]); tick = int(gated[k])
+                for back in range(4, 16):
+                    position = current - back
+                    if position < 0: break
+                    row = geometry.row(tick, position)
+                    if (row[CLOSE] < row[OPEN]) if bull else (row[CLOSE] > row[OPEN]):
+                        start = k + 1
+                        retired = (_first_hit(demand_price, start, len(gated), np.less, row[LOW]) if bull
+                                   else _first_hit(supply_price, start, len(gated), np.greater, row[HIGH]))
+                        blocks.append((f"{tf}_{'bullish' if bull else 'bearish'}_{position}", tf, bull, row[LOW], row[HIGH], tick,
+                                       int(gated[retired]) if retired < len(gated) else self.ticks))
+                        break
+        fired: Dict[str, Tuple[int, str, bool]] = {}
+        for block_id, tf, bull, low, high, born, retired in blocks:
+            touch = (_first_hit(self.candles[:, LOW], born, retired, np.less_equal, high) if bull
+                     else _first_hit(self.candles[:, HIGH], born, retired, np.greater_equal, low))
+            if touch < retired and (block_id not in fired or touch < fired[block_id][0]): fired[block_id] = (touch, tf, bull)
+        for touch, tf, bull in fired.values(): self._record('ob', tf, bull, [touch])
+
+    def _liquidity(self):
+        config = self._section('liquidity_analyzer')
+        ma_period = config.get('volume_ma_period', 20); atr_period = config.get('atr_period', 14)
+        tactical_atr = np.full(self.ticks, np.nan); voids = []  # (timeframe, bullish, low, high, born, filled)
+        for tf in self._timeframes(config, ['5m', '15m', '1h']):
+            geometry = self.geometry(tf); gated = np.flatnonzero(geometry.length > ma_period)
+            if not len(gated): continue
+            head, rows = geometry.stream(int(gated[0]))
+            atr = _fold(AverageTrueRange(1, atr_period), rows); volume_ma = _fold(MovingAverage(1, ma_period, 'volume'), rows)
+            settled = geometry.settled[gated] - head
+            if tf == self.base_timeframe: tactical_atr[gated] = atr[settled]
+            positions, is_bullish, gap_lows, gap_highs = scan_fair_value_gaps(
+                rows[:, HIGH], rows[:, LOW], rows[:, VOLUME], atr, volume_ma,
+                config.get('min_fvg_size_atr_multiplier', 0.3), config.get('min_volume_multiplier', 1.5))
+            # A void is born on the first pass that sees its third candle closed; it is filled by a later pass's close.
+            born_at = np.searchsorted(settled, positions + 1)
+            closes = self.candles[gated, CLOSE]
+            for at, bull, low, high in zip(born_at.tolist(), is_bullish.tolist(), gap_lows.tolist(), gap_highs.tolist()):
+                if at >= len(gated): continue
+                filled = _first_hit(closes, at + 1, len(gated), np.less, low) if bull else _first_hit(closes, at + 1, len(gated), np.greater, high)
+                voids.append((tf, bull, low, high, int(gated[at]), int(gated[filled]) if filled < len(gated) else self.ticks))
+        # A reaction needs a decisive tactical body first; each void fires once, on the first such candle that touches it.
+        body = self.candles[:, CLOSE] - self.candles[:, OPEN]; size = tactical_atr * config.get('confirmation_atr_multiplier', 1.0)
+        reactions = {True: np.flatnonzero((body > 0) & (body >= size)), False: np.flatnonzero((body < 0) & (-body >= size))}
+        reach = {True: self.candles[reactions[True], LOW], False: self.candles[reactions[False], HIGH]}
+        for tf, bull, low, high, born, filled in voids:
+            ticks = reactions[bull]; first, stop = np.searchsorted(ticks, [born, filled])
+            hit = _first_hit(reach[bull], int(first), int(stop), np.less_equal, high) if bull else _first_hit(reach[bull], int(first), int(stop), np.greater_equal, low)
+            if hit < stop: self._record('liq', tf, bull, [ticks[hit]])
+
+    def _fibonacci(self):
+        config = self._section('fibonacci_helper')
+        order = config.get('swing_order', 15); levels = np.asarray(config.get('levels', [0.382, 0.5, 0.618, 0.705, 0.786, 0.886]), dtype=np.float64)
+        tolerance_pct = config.get('confluence_tolerance_pct', 0.05) / 100.0
+        # The Sniper's ATR is an EWM of the candle range over its window; after a few dozen candles the window's seed is forgotten.
+        atr = pd.Series(np.abs(self.values[:, HIGH] - self.values[:, LOW])).ewm(span=14, adjust=False).mean().to_numpy()[self.window_size - 1:]
+        size = atr * config.get('confirmation_atr_multiplier', 0.8)
+        opens, closes, lows, highs = self.candles[:, OPEN], self.candles[:, CLOSE], self.candles[:, LOW], self.candles[:, HIGH]
+        bull_body = (closes > opens) & ((closes - opens) >= size); bear_body = (closes < opens) & ((opens - closes) >= size)
+        for tf in self._timeframes(config, ['15m', '1h']):
+            geometry = self.geometry(tf); gated = np.flatnonzero(geometry.length >= order * 2 + 1)
+            if not len(gated): continue
+            head, rows = geometry.stream(self._swing_seed(tf))
+            high_pivots = np.flatnonzero(_pivot_mask(rows[:, HIGH], order)); low_pivots = np.flatnonzero(_pivot_mask(-rows[:, LOW], order))
+            ordinals = np.r_[high_pivots, low_pivots]; kinds = np.r_[np.zeros(len(high_pivots), int), np.ones(len(low_pivots), int)]
+            prices = np.r_[rows[high_pivots, HIGH], rows[low_pivots, LOW]]
+            order_by = np.lexsort((kinds, ordinals)); ordinals, kinds, prices = ordinals[order_by], kinds[order_by], prices[order_by]
+            if len(ordinals) < 2: continue
+            # Visible pivots: inside the window and confirmed `order` bars later. The swing is the last pair of unlike neighbours.
+            first = np.searchsorted(ordinals, geometry.head[gated] - head, 'left')
+            stop = np.searchsorted(ordinals, geometry.settled[gated] - head - order, 'right')
+            turns = np.where(kinds[1:] != kinds[:-1], np.arange(len(kinds) - 1), -1)
+            last_turn = np.where(stop >= 2, np.maximum.accumulate(turns)[np.clip(stop - 2, 0, None)], -1)
+            valid = last_turn >= first
+            if not valid.any(): continue
+            at, turn = gated[valid], last_turn[valid]
+            end_idx = ordinals[turn + 1] + head - geometry.head[at]
+            redrawn = end_idx != np.r_[0, end_idx[:-1]]  # The zones are redrawn whenever the swing's window row moves
+            at, turn, end_idx = at[redrawn], turn[redrawn], end_idx[redrawn]
+            start_price, end_price = prices[turn], prices[turn + 1]; bull = (kinds[turn] == 1) & (kinds[turn + 1] == 0)
+            span = np.abs(end_price - start_price)
+            fib = np.where(bull[:, None], end_price[:, None] - span[:, None] * levels, end_price[:, None] + span[:, None] * levels)
+            tolerance = (closes[at] * tolerance_pct) / 2
+            zone_low, zone_high = fib - tolerance[:, None], fib + tolerance[:, None]
+            epoch = np.searchsorted(at, np.arange(self.ticks), 'right') - 1; live = epoch >= 0
+            epoch = np.where(live, epoch, 0); live &= span[epoch] >= 1e-9
+            ep_bull = bull[epoch]
+            hits = live[:, None] & ((ep_bull[:, None] & bull_body[:, None] & (lows[:, None] <= zone_high[epoch]))
+                                    | (~ep_bull[:, None] & bear_body[:, None] & (highs[:, None] >= zone_low[epoch])))
+            tick, level = np.nonzero(hits)
+            keys = (end_idx[epoch[tick]] * 2 + ep_bull[tick]) * len(levels) + level  # The zone's signal ID
+            for side in (True, False):
+                mask = ep_bull[tick] == side
+                self._record('fib', tf, side, _first_per_key(keys[mask], tick[mask]))
+
+    def _divergence(self):
+        config = self._section('divergence_detector')
+        period = config.get('rsi_period', 14); order = config.get('swing_order', 10); max_active = config.get('max_active_patterns', 20)
+        overbought, oversold = config.get('overbought_threshold', 65), config.get('oversold_threshold', 35)
+        closes = self.candles[:, CLOSE]
+        for tf in self._timeframes(config, ['15m', '1h']):
+            geometry = self.geometry(tf); gated = np.flatnonzero((geometry.length >= period + order * 2) & (geometry.length >= period))
+            if not len(gated): continue
+            rsi_head, rsi_rows = geometry.stream(int(gated[0])); rsi = _fold(RelativeStrength(1, period), rsi_rows)
+            swing_head, swing_rows = geometry.stream(self._swing_seed(tf))
+            swing_settled = geometry.settled[gated] - swing_head; rsi_settled = geometry.settled[gated] - rsi_head
+            swing_since = geometry.head[gated] - swing_head
+            rsi_since = geometry.head[gated] + np.minimum(order, geometry.length[gated] - 1) - rsi_head
+            events = []  # (gated position, side, (p1, p2, r1, r2) as (bar, value) pairs)
+            for side, sign, column in (('high', 1.0, HIGH), ('low', -1.0, LOW)):
+                price_pivots = np.flatnonzero(_pivot_mask(sign * swing_rows[:, column], order))
+                rsi_pivots = np.flatnonzero(_pivot_mask(sign * rsi, order))
+                price_stop = np.searchsorted(price_pivots, swing_settled - order, 'right'); price_first = np.searchsorted(price_pivots, swing_since, 'left')
+                rsi_stop = np.searchsorted(rsi_pivots, rsi_settled - order, 'right'); rsi_first = np.searchsorted(rsi_pivots, rsi_since, 'left')
+                eligible = np.flatnonzero((price_stop - price_first >= 2) & (rsi_stop - rsi_first >= 2))
+                if not len(eligible): continue
+                pair = np.stack((price_pivots[price_stop[eligible] - 1], rsi_pivots[rsi_stop[eligible] - 1]), axis=1)
+                judged = eligible[np.r_[True, (pair[1:] != pair[:-1]).any(axis=1)]]  # Judged once per new pivot pair
+                for k in judged.tolist():
+                    p1, p2 = price_pivots[price_stop[k] - 2:price_stop[k]]; r1, r2 = rsi_pivots[rsi_stop[k] - 2:rsi_stop[k]]
+                    events.append((k, side, (swing_head + p1, swing_rows[p1, column]), (swing_head + p2, swing_rows[p2, column]),
+                                   (rsi_head + r1, rsi[r1]), (rsi_head + r2, rsi[r2])))
+            events.sort(key=lambda event: (event[0], event[1] == 'low'))
+            patterns: List[list] = []; active: List[list] = []  # [ID, bullish, level, enlisted, retired]
+            for k, side, (p1, p1_price), (p2, p2_price), (r1, r1_value), (r2, r2_value) in events:
+                tick = int(gated[k]); window_head = int(geometry.head[tick]); length = int(geometry.length[tick])
+                p1_i, p2_i, r2_i = p1 - window_head, p2 - window_head, r2 - window_head
+                candidates = []
+                if side == 'high':
+                    if p2_price > p1_price and r2_value < r1_value and r2_value > overbought:
+                        candidates.append(('CL_BEAR', False, geometry.window_extreme(tick, p1_i, p2_i, LOW, np.min)))
+                    if p2_price < p1_price and r2_value > r1_value and r2_value > overbought:
+                        candidates.append(('HD_BEAR', False, geometry.window_extreme(tick, r2_i, length, LOW, np.min)))
+                else:
+                    if p2_price < p1_price and r2_value > r1_value and r2_value < oversold:
+                        candidates.append(('CL_BULL', True, geometry.window_extreme(tick, p1_i, p2_i, HIGH, np.max)))
+                    if p2_price > p1_price and r2_value < r1_value and r2_value < oversold:
+                        candidates.append(('HD_BULL', True, geometry.window_extreme(tick, r2_i, length, HIGH, np.max)))
+                for tag, bull, level in candidates:
+                    pattern_id = (tag, int(p2))
+                    if any(pattern[0] == pattern_id for pattern in active): continue
+                    pattern = [pattern_id, bull, level, k, len(gated)]; patterns.append(pattern); active.append(pattern)
+                    if len(active) > max_active:
+                        for closed in active[:len(active) - max_active]: closed[4] = k  # The oldest cases are closed
+                        del active[:len(active) - max_active]
+            gated_closes = closes[gated]; fired: Dict[Tuple, Tuple[int, bool]] = {}
+            for pattern_id, bull, level, enlisted, retired in patterns:
+                hit = _first_hit(gated_closes, enlisted, retired, np.greater if bull else np.less, level)
+                if hit < retired and (pattern_id not in fired or hit < fired[pattern_id][0]): fired[pattern_id] = (hit, bull)
+            for hit, bull in fired.values(): self._record('div', tf, bull, [gated[hit]])
+
+
+def build_signal_matrix(config: Dict[str, Any], history: pd.DataFrame, max_ticks: int = 0) -> pd.DataFrame:
+    """The research fast path: the four analysts' per-bar signals over `history` (the first `max_ticks` ticks, if given)."""
+    window_size = int((config.get('data_provider', {}) or {}).get('data_window_size', 200))
+    if max_ticks and max_ticks > 0: history = history.iloc[:window_size - 1 + max_ticks]
+    return HindsightEngine(config, history).run()
+
+
+def replay_signal_matrix(config: Dict[str, Any], history: Optional[pd.DataFrame] = None, max_ticks: int = 0) -> pd.DataFrame:
+    """
+    The reference the fast path answers to: the same four analysts, fed tick by tick through the
+    provider's windows and the time synthesis, exactly as the Oracle's analysis half feeds them.
+    """
+    from core.data_provider import DataProvider
+    from analyst_ai.multi_timeframe_synthesizer import MultiTimeframeSynthesizer
+    from analyst_ai.order_block_analyzer import OrderBlockAnalyzer
+    from analyst_ai.liquidity_analyzer import LiquidityAnalyzer
+    from analyst_ai.fibonacci_helper import FibonacciHelper
+    from analyst_ai.divergence_detector import DivergenceDetector
+    analyst_config = config.get('analyst_ai', {}) or {}
+    provider = DataProvider(dict(config.get('data_provider', {}) or {}), strategic_memory=None, history=history)
+    synthesizer = MultiTimeframeSynthesizer(analyst_config)
+    ob_analyzer, liq_analyzer = OrderBlockAnalyzer(analyst_config), LiquidityAnalyzer(analyst_config)
+    fib_sniper, interrogator = FibonacciHelper(analyst_config), DivergenceDetector(analyst_config)
+    rows: List[Counter] = []; stamps: List[pd.Timestamp] = []
+    while provider.has_more_data() and (not max_ticks or max_ticks <= 0 or len(rows) < max_ticks):
+        mdf = provider.fetch_next_market_data()
+        if mdf is None: break
+        mdf = synthesizer.synthesize(mdf); counts: Counter = Counter()
+        mdf.ob_report = ob_analyzer.analyze(mdf); mdf.liq_report = liq_analyzer.analyze(mdf)
+        mdf.fib_report = fib_sniper.analyze(mdf); mdf.div_report = interrogator.analyze(mdf)
+        for analyst, signals_by_tf in (('ob', mdf.ob_report.interaction_signals), ('liq', mdf.liq_report.confirmation_signals),
+                                       ('fib', mdf.fib_report.confirmation_signals), ('div', mdf.div_report.confirmation_signals)):
+            for tf, signals in signals_by_tf.items():
+                for signal in signals: counts[signal_column(analyst, tf, 'bull' if 'BULLISH' in signal.signal_type else 'bear')] += 1
+        rows.append(counts); stamps.append(mdf.timestamp)
+    columns = HindsightEngine(config, provider.full_df_5m.iloc[:0]).columns()
+    columns += sorted({column for counts in rows for column in counts} - set(columns))
+    matrix = pd.DataFrame([[counts.get(column, 0) for column in columns] for counts in rows], columns=columns, dtype=np.int32)
+    matrix.index = pd.DatetimeIndex(stamps); return matrix
@@ -1,5 +1,5 @@
 # F:\ShadowVanguard_Legion_Godspeed\analyst_ai\structure_analyzer.py
-# Version 15.1 - Prometheus, The Comprehensive Historian (CORRECTED & VERIFIED)
+# Version 15.3 - Prometheus, The Comprehensive Historian (CORRECTED & VERIFIED)
 
 import logging
 import pandas as pd
@@ -10,6 +10,7 @@ import numpy as np
 # [PACT KEPT]: All original model imports are PRESERVED.
 from core.data_models import MarketDataFrame, StructureReport, StructuralEvent, OrderBlock, FairValueGap
 from core.market_enums import MarketRegime, PositionSide, MarketPersonality
+from core.zone_index import side_index
 
 logger = logging.getLogger("StructureAnalyzer")
 
@@ -37,11 +38,12 @@ class StructureAnalyzer:
     def __init__(self, config: Dict[str, Any]):
         # [PACT KEPT]: The structure of this method is 100% PRESERVED.
         self.config = config
-        self.context_config = self.config.get('context_awareness', {})
+        # [SURGICAL INTERVENTION]: The Historian is handed the whole analyst_ai chapter; its own doctrine lives under `structure_analyzer`.
+        self.context_config = self.config.get('structure_analyzer', {}).get('context_awareness', self.config.get('context_awareness', {}))
         self.proximity_threshold_percent = self.context_config.get('proximity_threshold_percent', 0.5) 
         # [NEW DOCTRINE]: Define the mandatory tactical timeframe.
         self.tactical_timeframe = '5m'
-        logger.info(f"[StructureAnalyzer] The Comprehensive Historian v15.1 is online. Reports are now dual-perspective.")
+        logger.info(f"[StructureAnalyzer] The Comprehensive Historian v15.3 is online. Reports are now dual-perspective.")
 
     def analyze(self, mdf: MarketDataFrame) -> StructureReport:
         # [SURGICAL INTERVENTION]: The reporting logic is now dual-perspective.
@@ -96,30 +98,23 @@ class StructureAnalyzer:
         last_price = df['close'].iloc[-1]
         context = StrategicContext(timeframe=timeframe, last_price=last_price)
 
+        # [SURGICAL UPGRADE]: Nearest levels are bisect lookups on the reports' price indexes, not scans of every zone.
         # Find nearest support (Bullish OB)
-        bullish_obs = mdf.ob_report.all_blocks.get(timeframe, {}).get('bullish', [])
-        if bullish_obs:
-            valid_supports = [ob for ob in bullish_obs if ob.price_high < last_price]
-            if valid_supports:
-                context.nearest_support = min(valid_supports, key=lambda ob: last_price - ob.price_high)
-                context.distance_to_support = (last_price - context.nearest_support.price_high) / last_price * 100
+        ob_report = mdf.ob_report
+        context.nearest_support = side_index(ob_report.block_index, ob_report.all_blocks, timeframe, 'bullish').nearest_below(last_price)
+        if context.nearest_support:
+            context.distance_to_support = (last_price - context.nearest_support.price_high) / last_price * 100
 
         # Find nearest resistance (Bearish OB)
-        bearish_obs = mdf.ob_report.all_blocks.get(timeframe, {}).get('bearish', [])
-        if bearish_obs:
-            valid_resistances = [ob for ob in bearish_obs if ob.price_low > last_price]
-            if valid_resistances:
-                context.nearest_resistance = min(valid_resistances, key=lambda ob: ob.price_low - last_price)
-                context.distance_to_resistance = (context.nearest_resistance.price_low - last_price) / last_price * 100
+        context.nearest_resistance = side_index(ob_report.block_index, ob_report.all_blocks, timeframe, 'bearish').nearest_above(last_price)
+        if context.nearest_resistance:
+            context.distance_to_resistance = (context.nearest_resistance.price_low - last_price) / last_price * 100
         
         # Check for nearby FVGs (these act as magnets)
-        if mdf.liq_report and mdf.liq_report.unfilled_fvgs:
-            bullish_fvgs = mdf.liq_report.unfilled_fvgs.get(timeframe, {}).get('bullish', [])
-            bearish_fvgs = mdf.liq_report.unfilled_fvgs.get(timeframe, {}).get('bearish', [])
-            if bullish_fvgs:
-                context.nearby_bullish_fvg = min(bullish_fvgs, key=lambda fvg: abs(fvg.price_high - last_price))
-            if bearish_fvgs:
-                context.nearby_bearish_fvg = min(bearish_fvgs, key=lambda fvg: abs(fvg.price_low - last_price))
+        liq_report = mdf.liq_report
+        if liq_report and liq_report.unfilled_fvgs:
+            context.nearby_bullish_fvg = side_index(liq_report.fvg_index, liq_report.unfilled_fvgs, timeframe, 'bullish').nearest_to(last_price, 'high')
+            context.nearby_bearish_fvg = side_index(liq_report.fvg_index, liq_report.unfilled_fvgs, timeframe, 'bearish').nearest_to(last_price, 'low')
 
         return context
 
@@ -0,0 +1,214 @@
+# F:\ShadowVanguard_Legion_Godspeed\core\candle_store.py
+# Version 1.1 - Prometheus, The Candle Vault
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Iterable
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger("CandleStore")
+
+STORE_COLUMNS: List[str] = ["timestamp", "open", "high", "low", "close", "volume"]
+DAY_NS = 86_400 * 1_000_000_000
+
+
+@dataclass(slots=True)
+class CandleGap:
+    start: pd.Timestamp          # Last candle before the hole
+    end: pd.Timestamp            # First candle after the hole
+    missing_candles: int
+
+
+class CandleStore:
+    """
+    THE CANDLE VAULT: A columnar, memory-mapped archive of the Legion's market history.
+    Candles are partitioned as `<root>/<symbol>/<timeframe>/<YYYY-MM-DD>/`, one `.npy`
+    file per column plus a `manifest.json` holding row counts, time bounds and a SHA-256
+    checksum for every column. CSVs are parsed exactly once, at import; every later
+    campaign maps the partitions straight into memory.
+    v1.1: Each series keeps an `imports.json` of the files it was imported from (path, size,
+          mtime), so a source that changed or was added since is known to be stale.
+    """
+    def __init__(self, root: Any):
+        self.root = Path(root)
+
+    # --- Layout ---
+    @staticmethod
+    def _safe_symbol(symbol: str) -> str:
+        return symbol.replace('/', '').replace(':', '_')
+
+    def _series_dir(self, symbol: str, timeframe: str) -> Path:
+        return self.root / self._safe_symbol(symbol) / timeframe
+
+    def partitions(self, symbol: str, timeframe: str) -> List[Path]:
+        series_dir = self._series_dir(symbol, timeframe)
+        if not series_dir.is_dir(): return []
+        return sorted(p for p in series_dir.iterdir() if (p / "manifest.json").is_file())
+
+    def has_series(self, symbol: str, timeframe: str) -> bool:
+        return bool(self.partitions(symbol, timeframe))
+
+    @staticmethod
+    def _read_manifest(partition: Path) -> Dict[str, Any]:
+        with open(partition / "manifest.json", 'r', encoding='utf-8') as f: return json.load(f)
+
+    @staticmethod
+    def _file_checksum(path: Path) -> str:
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''): digest.update(chunk)
+        return digest.hexdigest()
+
+    # --- Import ---
+    def _imports_path(self, symbol: str, timeframe: str) -> Path:
+        return self._series_dir(symbol, timeframe) / "imports.json"
+
+    def imported_sources(self, symbol: str, timeframe: str) -> Dict[str, Dict[str, int]]:
+        """The files the series was imported from: resolved path -> {'size', 'mtime_ns'} as they stood at import."""
+        path = self._imports_path(symbol, timeframe)
+        if not path.is_file(): return {}
+        try:
+            with open(path, 'r', encoding='utf-8') as f: return json.load(f)
+        except (OSError, ValueError) as e: logger.error(f"[CandleStore] Unreadable import record '{path}': {e}"); return {}
+
+    @staticmethod
+    def _source_stamp(path: Path) -> Dict[str, int]:
+        stat = path.stat(); return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+    def stale_sources(self, symbol: str, timeframe: str, csv_files: Iterable[Any]) -> List[str]:
+        """The existing files among `csv_files` that were never imported into the series, or changed since they were."""
+        imported = self.imported_sources(symbol, timeframe)
+        return [str(csv_file) for csv_file in csv_files if Path(csv_file).is_file()
+                and imported.get(str(Path(csv_file).resolve())) != self._source_stamp(Path(csv_file))]
+
+    @staticmethod
+    def _read_exchange_csv(csv_path: Path) -> pd.DataFrame:
+        """Parses a Binance-style kline CSV (open time in s/ms/us, then OHLCV) into epoch-ns stamps + float columns."""
+        raw = pd.read_csv(csv_path, header=None, usecols=range(6), names=STORE_COLUMNS)
+        open_time = pd.to_numeric(raw['timestamp'], errors='coerce').to_numpy(dtype=np.float64)
+        magnitude = np.nanmax(open_time) if len(open_time) else 0
+        scale = 1_000 if magnitude > 1e14 else 1_000_000 if magnitude > 1e11 else 1_000_000_000  # us / ms / s
+        frame = pd.DataFrame({'timestamp': (open_time * scale).astype(np.int64)})
+        for col in STORE_COLUMNS[1:]: frame[col] = pd.to_numeric(raw[col], errors='coerce').astype(np.float64)
+        frame['volume'] = frame['volume'].fillna(0.0)
+        return frame.dropna()
+
+    def _write_partition(self, partition: Path, frame: pd.DataFrame, symbol: str, timeframe: str, sources: List[str]):
+        partition.mkdir(parents=True, exist_ok=True)
+        columns_meta: Dict[str, Dict[str, str]] = {}
+        for col in STORE_COLUMNS:
+            array = np.ascontiguousarray(frame[col].to_numpy(dtype=np.int64 if col == 'timestamp' else np.float64))
+            tmp_path = partition / f"{col}.tmp.npy"; np.save(tmp_path, array); os.replace(tmp_path, partition / f"{col}.npy")
+            columns_meta[col] = {'dtype': str(array.dtype), 'sha256': self._file_checksum(partition / f"{col}.npy")}
+        manifest = {
+            'symbol': symbol, 'timeframe': timeframe, 'day': partition.name, 'rows': int(len(frame)),
+            'first_ts': int(frame['timestamp'].iloc[0]), 'last_ts': int(frame['timestamp'].iloc[-1]),
+            'columns': columns_meta, 'sources': sorted(set(sources))}
+        tmp_manifest = partition / "manifest.tmp.json"
+        with open(tmp_manifest, 'w', encoding='utf-8') as f: json.dump(manifest, f, indent=2)
+        os.replace(tmp_manifest, partition / "manifest.json")
+
+    def import_csv_files(self, symbol: str, timeframe: str, csv_files: Iterable[Any]) -> int:
+        """One-time ingestion ritual: parses the CSVs and (re)writes every day partition they touch."""
+        frames = []; sources = []; stamps: Dict[str, Dict[str, int]] = {}
+        for csv_file in csv_files:
+            path = Path(csv_file)
+            if not path.is_file(): logger.warning(f"[CandleStore] Skipping missing file '{path}'."); continue
+            stamp = self._source_stamp(path)
+            frames.append(self._read_exchange_csv(path)); sources.append(path.name); stamps[str(path.resolve())] = stamp
+        if not frames: logger.error("[CandleStore] Nothing to import."); return 0
+        incoming = pd.concat(frames, ignore_index=True)
+        incoming['day'] = incoming['timestamp'] // DAY_NS
+        series_dir = self._series_dir(symbol, timeframe); written = 0
+        for day, day_frame in incoming.groupby('day', sort=True):
+            partition = series_dir / pd.Timestamp(int(day) * DAY_NS).strftime('%Y-%m-%d')
+            day_frame = day_frame[STORE_COLUMNS]; day_sources = list(sources)
+            if (partition / "manifest.json").is_file():
+                # Re-imports merge with what the vault already holds; the newest copy of a candle wins.
+                day_frame = pd.concat([self._load_partition(partition, mmap=False), day_frame], ignore_index=True)
+                day_sources += self._read_manifest(partition).get('sources', [])
+            day_frame = day_frame.drop_duplicates('timestamp', keep='last').sort_values('timestamp')
+            self._write_partition(partition, day_frame, symbol, timeframe, day_sources); written += len(day_frame)
+        # Recorded last, once every partition is written: an import cut short is redone on the next run.
+        record = {**self.imported_sources(symbol, timeframe), **stamps}; tmp_record = series_dir / "imports.tmp.json"
+        with open(tmp_record, 'w', encoding='utf-8') as f: json.dump(record, f, indent=2)
+        os.replace(tmp_record, self._imports_path(symbol, timeframe))
+        logger.info(f"[CandleStore] Imported {len(incoming)} candles for {symbol} {timeframe} into {series_dir}.")
+        return written
+
+    # --- Read ---
+    def _load_partition(self, partition: Path, mmap: bool = True) -> pd.DataFrame:
+        arrays = {col: np.load(partition / f"{col}.npy", mmap_mode='r' if mmap else None) for col in STORE_COLUMNS}
+        return pd.DataFrame(arrays)
+
+    def load(self, symbol: str, timeframe: str, start: Optional[Any] = None, end: Optional[Any] = None) -> pd.DataFrame:
+        """Maps the requested day partitions into memory and returns one OHLCV frame indexed by candle open time."""
+        start_ts = pd.Timestamp(start) if start is not None else None
+        end_ts = pd.Timestamp(end) if end is not None else None
+        stamps: List[np.ndarray] = []; columns: Dict[str, List[np.ndarray]] = {col: [] for col in STORE_COLUMNS[1:]}
+        for partition in self.partitions(symbol, timeframe):
+            manifest = self._read_manifest(partition)
+            if start_ts is not None and manifest['last_ts'] < start_ts.value: continue
+            if end_ts is not None and manifest['first_ts'] > end_ts.value: continue
+            partition_stamps = np.load(partition / "timestamp.npy", mmap_mode='r')
+            if len(partition_stamps) != manifest['rows']:
+                logger.error(f"[CandleStore] Partition {partition} is truncated ({len(partition_stamps)} of {manifest['rows']} rows). Run 'verify'."); continue
+            stamps.append(partition_stamps)
+            for col in columns: columns[col].append(np.load(partition / f"{col}.npy", mmap_mode='r'))
+        if not stamps: return pd.DataFrame(columns=STORE_COLUMNS[1:])
+        index = pd.DatetimeIndex(np.concatenate(stamps).view('M8[ns]'))
+        frame = pd.DataFrame({col: np.concatenate(parts) for col, parts in columns.items()}, index=index)
+        if start_ts is not None or end_ts is not None:
+            frame = frame.loc[start_ts:end_ts]
+        return frame
+
+    # --- Integrity ---
+    def verify(self, symbol: str, timeframe: str) -> List[str]:
+        """Recomputes every column checksum; returns the partitions that no longer match their manifest."""
+        corrupted: List[str] = []
+        for partition in self.partitions(symbol, timeframe):
+            manifest = self._read_manifest(partition)
+            for col, meta in manifest.get('columns', {}).items():
+                path = partition / f"{col}.npy"
+                if not path.is_file() or self._file_checksum(path) != meta['sha256']:
+                    corrupted.append(partition.name); logger.error(f"[CandleStore] Checksum mismatch in {partition.name}/{col}."); break
+        return corrupted
+
+    def find_gaps(self, symbol: str, timeframe: str) -> List[CandleGap]:
+        """Detects holes in the series (consecutive candles further apart than one timeframe step)."""
+        stamps = [np.load(p / "timestamp.npy", mmap_mode='r') for p in self.partitions(symbol, timeframe)]
+        if not stamps: return []
+        stamps = np.concatenate(stamps); step = pd.Timedelta(timeframe.replace('m', 'min')).value
+        deltas = np.diff(stamps); holes = np.flatnonzero(deltas > step)
+        return [CandleGap(start=pd.Timestamp(int(stamps[i])), end=pd.Timestamp(int(stamps[i + 1])), missing_candles=int(deltas[i] // step - 1)) for i in holes]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="ShadowVanguard - The Candle Vault")
+    parser.add_argument("command", choices=["import", "verify", "gaps"], help="Ritual to perform on the vault.")
+    parser.add_argument("csv_files", nargs="*", help="CSV files to ingest (import only).")
+    parser.add_argument("--root", default="data/candle_store", help="Vault root directory.")
+    parser.add_argument("--symbol", default="BTCUSDT"); parser.add_argument("--timeframe", default="5m")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    store = CandleStore(args.root)
+    if args.command == "import":
+        store.import_csv_files(args.symbol, args.timeframe, args.csv_files)
+    elif args.command == "verify":
+        corrupted = store.verify(args.symbol, args.timeframe)
+        logger.info(f"Verified {len(store.partitions(args.symbol, args.timeframe))} partitions; {len(corrupted)} corrupted.")
+        if corrupted: return 1
+    for gap in store.find_gaps(args.symbol, args.timeframe):
+        logger.warning(f"GAP: {gap.missing_candles} candle(s) missing between {gap.start} and {gap.end}.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,7 +1,7 @@
 # F:\ShadowVanguard_Legion_Godspeed\core\data_models.py
-# Version 7.4 - Prometheus, The Final Blueprint
+# Version 7.6 - Prometheus, The Final Blueprint
 
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass, field, is_dataclass
 from datetime import datetime
 from typing import Dict, Any, List, Optional, Tuple
 import pandas as pd
@@ -52,6 +52,7 @@ class OrderBlockReport:
     """ This report now stores intelligence organized by timeframe. """
     all_blocks: Dict[str, Dict[str, List[OrderBlock]]] = field(default_factory=dict) # {'5m': {'bullish': [], 'bearish': []}}
     interaction_signals: Dict[str, List[OBInteractionSignal]] = field(default_factory=dict)
+    block_index: Dict[str, Dict[str, Any]] = field(default_factory=dict) # Live `ZoneIndex` per timeframe and side, same shape as `all_blocks`
 
 # --- Fibonacci Intelligence ---
 # [FINAL ENCYCLOPEDIA CORRECTION]: The `zone_id` field is added to the official FibonacciZone blueprint.
@@ -114,6 +115,7 @@ class LiquidityReport:
     """ This report now stores intelligence organized by timeframe. """
     unfilled_fvgs: Dict[str, Dict[str, List[FairValueGap]]] = field(default_factory=dict) # {'5m': {'bullish': [], 'bearish': []}}
     confirmation_signals: Dict[str, List[LiquiditySignal]] = field(default_factory=dict)
+    fvg_index: Dict[str, Dict[str, Any]] = field(default_factory=dict) # Live `ZoneIndex` per timeframe and side, same shape as `unfilled_fvgs`
 
 
 # --- Structural Event Base Model ---
@@ -122,6 +124,14 @@ class StructuralEvent:
     event_type: str
     price_level: float; timestamp: pd.Timestamp; confidence: float = 1.0
 
+# --- Swing Pivot Model (confirmed by the `SwingEngine`) ---
+@dataclass(slots=True)
+class SwingPivot:
+    kind: str                      # 'high' or 'low'
+    price: float; stamp: int; ordinal: int
+    left: int                      # Bars on its left it dominates (capped at the engine's max strength)
+    right: Optional[int] = None    # Bars on its right it dominated before being broken; None while unbroken
+
 # -----------------------------------------------------------------------------
 # SECTION 3: The Grand Strategic Battle Map (Structure Report)
 # -----------------------------------------------------------------------------
@@ -180,9 +190,13 @@ class Experience:
     state: Dict[str, Any] = field(default_factory=dict)
     action: TacticalDecision = TacticalDecision.WAIT
     outcome: float = 0.0
-    position_details: Optional[Dict[str, Any]] = None
+    # The closed position itself, as the Scribe handed it over; `details()` serializes it only when it is read.
+    position_details: Optional[Any] = None
     timestamp: datetime = field(default_factory=datetime.utcnow)
 
+    def details(self) -> Optional[Dict[str, Any]]:
+        return asdict(self.position_details) if is_dataclass(self.position_details) else self.position_details
+
 # -----------------------------------------------------------------------------
 # SECTION 5: The Unified Intelligence Packet (The Vessel)
 # -----------------------------------------------------------------------------
@@ -199,4 +213,10 @@ class MarketDataFrame:
     ob_report: Optional[OrderBlockReport] = None
     fib_report: Optional[FibonacciReport] = None
     div_report: Optional[DivergenceReport] = None
-    liq_report: Optional[LiquidityReport] = None
\ No newline at end of file
+    liq_report: Optional[LiquidityReport] = None
+    # The shared incremental higher-timeframe clockwork (see `MultiTimeframeAggregator`), when the provider has one.
+    timeframe_aggregator: Optional[Any] = None
+    # The provider's shared incremental indicator ledger (see `IndicatorCache`): ATR, moving averages and RSI.
+    indicator_cache: Optional[Any] = None
+    # The provider's shared streaming pivot detector (see `SwingEngine`): one pivot set for every swing-based analyzer.
+    swing_engine: Optional[Any] = None
@@ -1,51 +1,114 @@
 # F:\ShadowVanguard_Legion_Godspeed\core\data_provider.py
-# Version 9.1 - Prometheus, The Faithful World Smith
+# Version 9.9 - Prometheus, The Faithful World Smith
 
 import logging
 import pandas as pd
 import numpy as np
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Union
 
 from pathlib import Path
 from .data_models import MarketDataFrame
+from .streaming_window import StreamingWindowEngine, CandleRingBuffer, OHLCV_COLUMNS
+from .candle_store import CandleStore
+from .shared_candles import SharedCandlesHandle, attach_frame
+from .market_simulator import MicrostructureSimulator
+from .indicator_cache import IndicatorCache
+from .swing_engine import SwingEngine
 from memory.strategic_memory import StrategicMemory 
 
 logger = logging.getLogger("DataProvider")
 
 class MultiTimeframeAggregator:
     """
-    [PACT KEPT]: This entire class is PRESERVED exactly as submitted in your v8.0.
-    Its purpose for future live trading scenarios is respected and protected.
+    THE LIVING CLOCKWORK: The original v8.0 aggregator, reforged to be truly incremental.
+    Each base candle updates only the currently open bar of every timeframe (running
+    open/high/low/close/volume) and a bar is appended to its ring only when it closes.
+    The provider's single instance puts its `window_frames` on every MarketDataFrame, and the
+    `MultiTimeframeSynthesizer` takes them as they are, so higher-timeframe bars are forged
+    exactly once per tick, never re-resampled.
     """
-    def __init__(self, base_timeframe_minutes: int, strategic_timeframes: List[str]):
-        self.base_freq = f"{base_timeframe_minutes}T" 
-        self.strategic_timeframes = strategic_timeframes
-        self.timeframe_dfs: Dict[str, pd.DataFrame] = {tf: pd.DataFrame() for tf in strategic_timeframes}
-        self.incomplete_candles: Dict[str, Dict[str, Any]] = {tf: {} for tf in strategic_timeframes}
+    def __init__(self, base_timeframe_minutes: int, strategic_timeframes: List[str], capacity: int = 1000):
+        self.base_freq = f"{base_timeframe_minutes}min"
+        self.strategic_timeframes = list(strategic_timeframes)
+        self.capacity = max(1, int(capacity))
+        self._tf_ns: Dict[str, int] = {tf: pd.Timedelta(tf.replace('m', 'min')).value for tf in self.strategic_timeframes}
+        self._closed_bars: Dict[str, CandleRingBuffer] = {tf: CandleRingBuffer(self.capacity) for tf in self.strategic_timeframes}
+        self._open_bars: Dict[str, np.ndarray] = {tf: np.zeros(len(OHLCV_COLUMNS), dtype=np.float64) for tf in self.strategic_timeframes}
+        self._open_stamps: Dict[str, Optional[int]] = {tf: None for tf in self.strategic_timeframes}
+        self.last_stamp: Optional[int] = None
         logger.info(f"[TimeEngine] Ready to construct timeframes: {', '.join(strategic_timeframes)}")
 
+    # [PACT KEPT]: The original public surface (`update_with_new_candle`, `timeframe_dfs`, `incomplete_candles`) is honored.
     def update_with_new_candle(self, new_candle: pd.Series):
-        timestamp = new_candle.name
-        for tf in self.strategic_timeframes:
-            resampled_timestamp = timestamp.floor(tf)
-            if not self.incomplete_candles[tf] or resampled_timestamp > self.incomplete_candles[tf]['timestamp']:
-                if self.incomplete_candles[tf]:
-                    self._finalize_and_store_candle(tf)
-                self.incomplete_candles[tf] = {
-                    'timestamp': resampled_timestamp, 'open': new_candle['open'],
-                    'high': new_candle['high'], 'low': new_candle['low'],
-                    'close': new_candle['close'], 'volume': new_candle['volume']
-                }
+        self.push(pd.Timestamp(new_candle.name).value, new_candle[OHLCV_COLUMNS].to_numpy(dtype=np.float64))
+
+    @property
+    def timeframe_dfs(self) -> Dict[str, pd.DataFrame]:
+        return {tf: ring.as_frame() for tf, ring in self._closed_bars.items()}
+
+    @property
+    def incomplete_candles(self) -> Dict[str, Dict[str, Any]]:
+        return {tf: ({'timestamp': pd.Timestamp(stamp), **dict(zip(OHLCV_COLUMNS, self._open_bars[tf].tolist()))} if stamp is not None else {})
+                for tf, stamp in self._open_stamps.items()}
+
+    def reset(self):
+        for tf in self.strategic_timeframes: self._closed_bars[tf].reset(); self._open_stamps[tf] = None
+        self.last_stamp = None
+
+    def push(self, stamp: int, row: np.ndarray):
+        """Folds one base candle (epoch-ns stamp, OHLCV row) into every timeframe's open bar."""
+        for tf, tf_ns in self._tf_ns.items():
+            bar_stamp = stamp - stamp % tf_ns; open_bar = self._open_bars[tf]; open_stamp = self._open_stamps[tf]
+            if open_stamp is None or bar_stamp > open_stamp:
+                if open_stamp is not None: self._closed_bars[tf].push(open_stamp, open_bar)
+                open_bar[:] = row; self._open_stamps[tf] = bar_stamp
             else:
-                self.incomplete_candles[tf]['high'] = max(self.incomplete_candles[tf]['high'], new_candle['high'])
-                self.incomplete_candles[tf]['low'] = min(self.incomplete_candles[tf]['low'], new_candle['low'])
-                self.incomplete_candles[tf]['close'] = new_candle['close']
-                self.incomplete_candles[tf]['volume'] += new_candle['volume']
-    
-    def _finalize_and_store_candle(self, tf: str):
-        completed_candle_data = self.incomplete_candles[tf]
-        new_row = pd.DataFrame([completed_candle_data]).set_index('timestamp')
-        self.timeframe_dfs[tf] = pd.concat([self.timeframe_dfs[tf], new_row])
+                if row[1] > open_bar[1]: open_bar[1] = row[1]
+                if row[2] < open_bar[2]: open_bar[2] = row[2]
+                open_bar[3] = row[3]; open_bar[4] += row[4]
+        self.last_stamp = stamp
+
+    def prime(self, stamps: np.ndarray, values: np.ndarray):
+        """Rebuilds all state from a base window (used on seeks, rewinds and gaps)."""
+        if len(stamps) > self.capacity:
+            self.capacity = len(stamps); self._closed_bars = {tf: CandleRingBuffer(self.capacity) for tf in self.strategic_timeframes}
+        self.reset()
+        for i in range(len(stamps)): self.push(int(stamps[i]), values[i])
+
+    def sync(self, stamps: np.ndarray, values: np.ndarray):
+        """Brings the clockwork up to the end of a base window, pushing only the candles it has not yet seen."""
+        if len(stamps) == 0: return
+        if self.last_stamp is not None and int(stamps[-1]) == self.last_stamp: return
+        seen = int(np.searchsorted(stamps, self.last_stamp, side='right')) if self.last_stamp is not None else 0
+        if seen == 0 or int(stamps[seen - 1]) != self.last_stamp: self.prime(stamps, values); return
+        for i in range(seen, len(stamps)): self.push(int(stamps[i]), values[i])
+
+    def window_frames(self, stamps: np.ndarray, values: np.ndarray, timeframes: Optional[List[str]] = None) -> Dict[str, pd.DataFrame]:
+        """
+        Returns, per timeframe, the bars covering the given base window: a freshly folded head bar
+        (the window may start mid-bar), the stored closed bars, and the running open bar. This is
+        identical to `base_df.resample(tf).agg(...).dropna()`, at O(window / tf) instead of a resample.
+        """
+        self.sync(stamps, values)
+        frames: Dict[str, pd.DataFrame] = {}
+        if len(stamps) == 0: return frames
+        window_start = int(stamps[0])
+        for tf in (timeframes or self.strategic_timeframes):
+            tf_ns = self._tf_ns.get(tf)
+            if tf_ns is None: continue
+            head_stamp = window_start - window_start % tf_ns
+            head = values[:int(np.searchsorted(stamps, head_stamp + tf_ns, side='left'))]
+            head_bar = np.array([head[0, 0], head[:, 1].max(), head[:, 2].min(), head[-1, 3], head[:, 4].sum()])
+            open_stamp = self._open_stamps[tf]
+            if open_stamp == head_stamp:
+                bar_stamps = np.array([head_stamp], dtype=np.int64); bar_values = head_bar[None, :]
+            else:
+                closed_stamps, closed_values = self._closed_bars[tf].view()
+                first = int(np.searchsorted(closed_stamps, head_stamp, side='right'))
+                bar_stamps = np.concatenate(([head_stamp], closed_stamps[first:], [open_stamp]))
+                bar_values = np.vstack((head_bar, closed_values[first:], self._open_bars[tf]))
+            frames[tf] = pd.DataFrame(bar_values, index=pd.DatetimeIndex(bar_stamps.view('M8[ns]')), columns=OHLCV_COLUMNS, copy=False)
+        return frames
 
 
 class DataProvider:
@@ -55,9 +118,12 @@ class DataProvider:
     simulation engine. All original structures, including the `MultiTimeframeAggregator`,
     are 100% PRESERVED. The Smith now forges a living soul, while honoring the pact.
     """
-    def __init__(self, config: Dict[str, Any], strategic_memory: StrategicMemory):
+    def __init__(self, config: Dict[str, Any], strategic_memory: StrategicMemory, history: Optional[Union[pd.DataFrame, SharedCandlesHandle]] = None):
         # [FAITHFUL RECONSTRUCTION]: __init__ now accepts and stores the strategic memory.
+        # [SURGICAL UPGRADE]: An already-forged base history (e.g. shared by a sweep's parent process) skips ingestion.
+        # [SURGICAL UPGRADE - THE COMMON WELL]: So does a handle to one published in shared memory; its candles are attached, not copied.
         self.config = config
+        self.preloaded_history = history
         self.strategic_memory = strategic_memory
         self.sim_config = self.config.get('simulation_engine', {}) # New config chapter
         self.window_size = self.config.get('data_window_size', 200)
@@ -65,24 +131,40 @@ class DataProvider:
         self.training_days = self.config.get('training_days', 45)
         self.symbol = self.config.get('target_symbol', 'BTCUSDT')
         self.campaign_start_date = self.config.get('campaign_start_date', None)
+        self.data_source = self.config.get('source', 'csv')
+        self.store_symbol = self.config.get('store_symbol', 'BTCUSDT')
+        self.candle_store = CandleStore(self.config.get('candle_store_path', 'data/candle_store')) if self.data_source == 'store' else None
         self.base_timeframe_minutes = self.config.get('timeframe_minutes', 5)
         self.strategic_timeframes = self.config.get('strategic_timeframes', ['15m', '1h', '4h'])
         self.full_strategic_dfs: Dict[str, pd.DataFrame] = {}
         self.random_seed = self.config.get('random_seed', 42)
-        self.rng = np.random.RandomState(self.random_seed) 
+        # [SURGICAL UPGRADE - THE MICROSTRUCTURE FORGE]: One seeded Generator drives batched book and tape draws.
+        self.market_simulator = MicrostructureSimulator(self.sim_config, seed=self.random_seed)
         logger.info(f"Randomness Chained. Using local simulation seed: {self.random_seed}")
         self.full_df_5m = pd.DataFrame()
         self.live_phase_start_index = 0
         self._load_and_reconstruct_time()
         self.current_index = 0
         # [PACT KEPT]: The original aggregator is still initialized, preserving your original architecture.
-        self.time_aggregator = MultiTimeframeAggregator(self.base_timeframe_minutes, self.strategic_timeframes)
+        self.time_aggregator = MultiTimeframeAggregator(self.base_timeframe_minutes, self.strategic_timeframes, capacity=self.window_size)
+        # [SURGICAL UPGRADE - THE SHARED ALMANAC]: ATR, moving averages and RSI are folded in once per candle for every analyzer.
+        self.indicator_cache = IndicatorCache(capacity=self.window_size)
+        # [SURGICAL UPGRADE - THE PIVOT SENTINEL]: Swing pivots are confirmed once, as bars close, for every analyzer.
+        self.swing_engine = SwingEngine(base_timeframe=f'{self.base_timeframe_minutes}m')
         self._prime_time_aggregator()
-        logger.info(f"[DataProvider] The Faithful World Smith v9.1 is online. All pacts honored.")
+        # [SURGICAL UPGRADE - THE RING WARDEN]: Per-tick base windows are served from a preallocated ring buffer.
+        # Higher timeframes are folded by the shared aggregator alone.
+        self.window_engine = StreamingWindowEngine(self.full_df_5m, self.window_size, f'{self.base_timeframe_minutes}m')
+        logger.info(f"[DataProvider] The Faithful World Smith v9.9 is online. All pacts honored.")
 
     # [PACT KEPT]: All methods from _load_and_reconstruct_time to has_more_data are 100% PRESERVED from your v8.0.
     def _load_and_reconstruct_time(self):
         if not self.campaign_start_date: logger.critical("Config error: 'campaign_start_date' must be set."); return
+        if isinstance(self.preloaded_history, SharedCandlesHandle): self.preloaded_history = attach_frame(self.preloaded_history)
+        if self.preloaded_history is not None and not self.preloaded_history.empty:
+            self._adopt_base_history(self.preloaded_history, "the shared campaign history"); self.preloaded_history = None; return
+        # [SURGICAL UPGRADE - THE CANDLE VAULT]: Parsed candles are mapped from the columnar store when configured.
+        if self.candle_store is not None and self._load_from_candle_store(): return
         all_dfs = [pd.read_csv(f,header=None,usecols=range(1,7),names=["open","high","low","close","volume","close_time_ignored"]) for f in self.campaign_files if Path(f).is_file()]
         if not all_dfs: logger.critical("No valid data files were loaded."); return
         self.full_df_5m=pd.concat(all_dfs,ignore_index=True)
@@ -91,6 +173,30 @@ class DataProvider:
         candles_per_day = (24*60)//self.base_timeframe_minutes; self.live_phase_start_index = min(len(self.full_df_5m),self.training_days*candles_per_day)
         logger.info(f"Base 5m timestamps reconstructed. Total: {len(self.full_df_5m)}. Training ends at index {self.live_phase_start_index-1}.")
 
+    def _load_from_candle_store(self) -> bool:
+        base_tf = f'{self.base_timeframe_minutes}m'
+        if not self.candle_store.has_series(self.store_symbol, base_tf):
+            logger.info(f"Candle Vault is empty for {self.store_symbol} {base_tf}. Performing the one-time CSV import...")
+            self.candle_store.import_csv_files(self.store_symbol, base_tf, self.campaign_files)
+        # A csv_files entry added or rewritten since the import is merged in again; a file dropped from it is only reported.
+        elif stale := self.candle_store.stale_sources(self.store_symbol, base_tf, self.campaign_files):
+            logger.info(f"Candle Vault is behind {len(stale)} of its source file(s) ({', '.join(Path(f).name for f in stale)}). Re-importing them...")
+            self.candle_store.import_csv_files(self.store_symbol, base_tf, stale)
+        configured = {str(Path(f).resolve()) for f in self.campaign_files}
+        if self.campaign_files and (dropped := [Path(p).name for p in self.candle_store.imported_sources(self.store_symbol, base_tf) if p not in configured]):
+            logger.warning(f"Candle Vault still serves candles imported from {len(dropped)} file(s) no longer in csv_files: {', '.join(sorted(dropped))}.")
+        df = self.candle_store.load(self.store_symbol, base_tf, start=self.campaign_start_date, end=self.config.get('campaign_end_date'))
+        if df.empty: logger.warning("Candle Vault returned no candles. Falling back to CSV ingestion."); return False
+        for gap in self.candle_store.find_gaps(self.store_symbol, base_tf):
+            logger.warning(f"Candle Vault gap: {gap.missing_candles} candle(s) missing between {gap.start} and {gap.end}.")
+        self._adopt_base_history(df[~df.index.duplicated(keep='last')], "the Candle Vault")
+        return True
+
+    def _adopt_base_history(self, df: pd.DataFrame, origin: str):
+        self.full_df_5m = df
+        candles_per_day = (24*60)//self.base_timeframe_minutes; self.live_phase_start_index = min(len(self.full_df_5m),self.training_days*candles_per_day)
+        logger.info(f"Base candles adopted from {origin}. Total: {len(self.full_df_5m)}. Training ends at index {self.live_phase_start_index-1}.")
+
     def _prime_time_aggregator(self):
         logger.info("Priming the Time Engine with historical data...")
         if self.full_df_5m.empty: return
@@ -116,73 +222,34 @@ class DataProvider:
     def fetch_next_market_data(self) -> Optional[MarketDataFrame]:
         # [FAITHFUL RECONSTRUCTION]: This method now invokes the new, context-aware simulation logic.
         if not self.has_more_data(): return None 
-        start_idx = self.current_index; end_idx = start_idx + self.window_size
-        ohlcv_5m_slice = self.full_df_5m.iloc[start_idx:end_idx]; self.current_index += 1
-        if ohlcv_5m_slice.empty or len(ohlcv_5m_slice)<self.window_size: return None
-        current_timestamp = ohlcv_5m_slice.index[-1]
-        multidim_ohlcv: Dict[str, pd.DataFrame]={f'{self.base_timeframe_minutes}m': ohlcv_5m_slice}
-        for tf in self.strategic_timeframes:
-            historical_strategic_df = self.full_strategic_dfs.get(tf)
-            if historical_strategic_df is not None: multidim_ohlcv[tf] = historical_strategic_df[historical_strategic_df.index <= current_timestamp].tail(self.window_size)
+        # [SURGICAL UPGRADE - THE RING WARDEN]: No more O(history) iloc slices or `index <= ts` masks.
+        # The engine advances each timeframe's ring by one tick and hands back zero-copy frames.
+        window = self.window_engine.window_at(self.current_index); self.current_index += 1
+        if window is None: return None
+        current_timestamp, multidim_ohlcv = window
+        ohlcv_5m_slice = multidim_ohlcv[f'{self.base_timeframe_minutes}m']
+        # [SURGICAL UPGRADE - THE LIVING CLOCKWORK]: The shared aggregator folds in only the new candle and hands back
+        # the higher-timeframe bars covering the window; these are the only ones forged this tick.
+        multidim_ohlcv.update(self.time_aggregator.window_frames(ohlcv_5m_slice.index.asi8, ohlcv_5m_slice.to_numpy(dtype=np.float64, copy=False)))
         
-        strategic_map = self.strategic_memory.get_strategic_map()
+        strategic_map = self.strategic_memory.get_strategic_map() if self.strategic_memory else {}
         order_book_data = self._simulate_order_book(ohlcv_5m_slice, strategic_map)
         tape_data = self._simulate_tape(ohlcv_5m_slice, strategic_map)
         
         return MarketDataFrame(
             timestamp=current_timestamp, symbol=self.symbol, ohlcv_multidim=multidim_ohlcv,
-            order_book_snapshot=order_book_data, tape_snapshot=tape_data)
+            order_book_snapshot=order_book_data, tape_snapshot=tape_data, timeframe_aggregator=self.time_aggregator,
+            indicator_cache=self.indicator_cache, swing_engine=self.swing_engine)
         
     def _simulate_order_book(self, df_slice: pd.DataFrame, strategic_map: Dict) -> Dict[str, Any]:
         # [THE WORLD SMITH'S RITUAL]: This ritual is no longer blind. It is context-aware.
+        # [SURGICAL UPGRADE]: Forged as price/size arrays; order blocks and voids shape it through array masks.
         if df_slice.empty: return {"bids": [], "asks": []}
-        last_row = df_slice.iloc[-1]; last_close = last_row['close']
-        volatility = (last_row['high'] - last_row['low']) or (last_close * 0.001)
-        base_bid_strength=self.sim_config.get('base_bid_strength',[0.1,2.0]); base_ask_strength=self.sim_config.get('base_ask_strength',[0.1,2.0])
-        bids = [(last_close - (volatility*i*0.2), self.rng.uniform(*base_bid_strength)) for i in range(1, 51)]
-        asks = [(last_close + (volatility*i*0.2), self.rng.uniform(*base_ask_strength)) for i in range(1, 51)]
-
-        ob_strengths = self.sim_config.get('ob_simulation_strength',{'4h':[30,60],'1h':[15,35]}); fvg_vacuum_factor=self.sim_config.get('fvg_vacuum_factor', 0.1)
-
-        for tf, ob_list in strategic_map.get('order_blocks',{}).items():
-            strength = ob_strengths.get(tf, [5,15])
-            for ob in ob_list:
-                price_low, price_high = ob.price_range
-                if 'BULLISH' in ob.event_type and price_high < last_close: bids.append((self.rng.uniform(price_low, price_high), self.rng.uniform(*strength)))
-                elif 'BEARISH' in ob.event_type and price_low > last_close: asks.append((self.rng.uniform(price_low, price_high), self.rng.uniform(*strength)))
-
-        if 'liquidity_voids' in strategic_map:
-            for tf, fvg_list in strategic_map['liquidity_voids'].items():
-                for fvg in fvg_list:
-                    price_low, price_high = fvg.price_range
-                    if 'BULLISH' in fvg.event_type and price_high < last_close: asks = [(p, s * fvg_vacuum_factor) if price_low < p < price_high else (p, s) for p, s in asks]
-                    elif 'BEARISH' in fvg.event_type and price_low > last_close: bids = [(p, s * fvg_vacuum_factor) if price_low < p < price_high else (p, s) for p, s in bids]
-
-        bids.sort(key=lambda x: x[0], reverse=True); asks.sort(key=lambda x: x[0])
-        return {"bids": bids, "asks": asks}
+        last_candle = np.array([df_slice[col].iat[-1] for col in OHLCV_COLUMNS], dtype=np.float64)
+        return self.market_simulator.order_book(last_candle, self.market_simulator.zones(strategic_map))
         
-    def _simulate_tape(self, df_slice: pd.DataFrame, strategic_map: Dict) -> List[Dict[str, Any]]:
+    def _simulate_tape(self, df_slice: pd.DataFrame, strategic_map: Dict) -> Any:
         # [THE WORLD SMITH'S RITUAL]: The tape now narrates the candle's story.
         if df_slice.empty: return []
-        last_row = df_slice.iloc[-1]; buy_probability = 0.60 if last_row['close']>last_row['open'] else 0.40
-        atr = (last_row['high'] - last_row['low']) or (last_row['close'] * 0.001); proximity_threshold = atr * 0.5
-
-        for tf, ob_list in strategic_map.get('order_blocks', {}).items():
-            for ob in ob_list:
-                price_low, price_high = ob.price_range
-                if 'BULLISH' in ob.event_type and last_row['low'] <= price_high + proximity_threshold: buy_probability += 0.20
-                elif 'BEARISH' in ob.event_type and last_row['high'] >= price_low - proximity_threshold: buy_probability -= 0.20
-        
-        for tf, fvg_list in strategic_map.get('liquidity_voids', {}).items():
-            for fvg in fvg_list:
-                price_low, price_high = fvg.price_range
-                if 'BULLISH' in fvg.event_type and price_low <= last_row['close'] <= price_high: buy_probability += 0.15
-                elif 'BEARISH' in fvg.event_type and price_low <= last_row['close'] <= price_high: buy_probability -= 0.15
-
-        buy_probability = np.clip(buy_probability, 0.05, 0.95)
-        trades = []; volume = int(last_row.get('volume', 0)); num_trades = max(5, volume // 1000 if volume > 0 else 5)
-        for _ in range(num_trades):
-            trades.append({'side': 'buy' if self.rng.rand() < buy_probability else 'sell',
-                           'price': self.rng.uniform(last_row['low'], last_row['high']),
-                           'size': self.rng.uniform(0.01, 1.0)})
-        return trades
\ No newline at end of file
+        last_candle = np.array([df_slice[col].iat[-1] for col in OHLCV_COLUMNS], dtype=np.float64)
+        return self.market_simulator.tape(last_candle, self.market_simulator.zones(strategic_map))
\ No newline at end of file
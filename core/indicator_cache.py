@@ -0,0 +1,181 @@
+# F:\ShadowVanguard_Legion_Godspeed\core\indicator_cache.py
+# Version 1.1 - Prometheus, The Shared Almanac
+
+import logging
+from typing import Dict, Any, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy.signal import lfilter
+
+from .streaming_window import CandleRingBuffer, OHLCV_COLUMNS
+
+logger = logging.getLogger("IndicatorCache")
+
+HIGH, LOW, CLOSE = OHLCV_COLUMNS.index('high'), OHLCV_COLUMNS.index('low'), OHLCV_COLUMNS.index('close')
+
+
+def _ewm(x: np.ndarray, alpha: float, seed: Optional[float]) -> np.ndarray:
+    """`Series.ewm(alpha=alpha, adjust=False).mean()` continued from `seed` (the first input seeds a fresh filter)."""
+    if len(x) == 0: return x
+    seed = x[0] if seed is None else seed
+    return lfilter([alpha], [1.0, alpha - 1.0], x, zi=[(1.0 - alpha) * seed])[0]
+
+
+class IndicatorStream:
+    """
+    One indicator on one timeframe, folded candle by candle. It remembers the last candle it
+    has seen and its running state, so each tick only the newly closed candles are computed.
+    A forming bar that changed since the last call is recomputed from the state before it;
+    a rewind or a gap in the stream starts a fresh fold over the whole window.
+    """
+    __slots__ = ("values", "last_stamp", "last_row", "state", "prev_state")
+
+    def __init__(self, capacity: int):
+        self.values = CandleRingBuffer(capacity, columns=['value'])
+        self.reset()
+
+    def reset(self):
+        self.values.reset(); self.last_stamp: Optional[int] = None; self.last_row: Optional[np.ndarray] = None
+        self.state = self.prev_state = self.initial_state()
+
+    # --- Per-indicator math ---
+    def initial_state(self) -> Any:
+        return None
+
+    def fold(self, state: Any, rows: np.ndarray) -> Tuple[np.ndarray, Any]:
+        """Returns the indicator over `rows` (OHLCV) and the state after the last of them."""
+        raise NotImplementedError
+
+    # --- Bookkeeping ---
+    def _first_unseen(self, stamps: np.ndarray, rows: np.ndarray) -> int:
+        if self.last_stamp is None: return 0
+        seen = int(np.searchsorted(stamps, self.last_stamp, side='right'))
+        if seen == 0 or int(stamps[seen - 1]) != self.last_stamp or self.values.count < seen: self.reset(); return 0
+        if not np.array_equal(rows[seen - 1], self.last_row):  # The forming bar moved: take it back.
+            self.state = self.prev_state; self.values.pop(); seen -= 1
+        return seen
+
+    def update(self, stamps: np.ndarray, rows: np.ndarray) -> np.ndarray:
+        """Brings the stream up to the end of the window and returns the indicator aligned with its rows."""
+        n = len(stamps)
+        if n == 0: return np.empty(0)
+        if n > self.values.capacity: self.values = CandleRingBuffer(n, columns=['value']); self.reset()
+        first = self._first_unseen(stamps, rows)
+        if first < n:
+            # The state before the newest row is kept, in case that row is a bar still forming.
+            head, self.prev_state = self.fold(self.state, rows[first:n - 1])
+            tail, self.state = self.fold(self.prev_state, rows[n - 1:])
+            fresh = np.concatenate((head, tail))
+            if first == 0: self.values.load(stamps, fresh[:, None])
+            else:
+                for i in range(first, n): self.values.push(int(stamps[i]), fresh[i - first:i - first + 1])
+            self.last_stamp = int(stamps[-1]); self.last_row = rows[-1].copy()
+        return self.values.view()[1][-n:, 0]
+
+
+class AverageTrueRange(IndicatorStream):
+    """ATR as an EWM of the true range: Wilder's `alpha = 1/period`, or `span = period` when `wilder` is False."""
+    __slots__ = ("alpha",)
+
+    def __init__(self, capacity: int, period: int, wilder: bool = True):
+        self.alpha = 1.0 / period if wilder else 2.0 / (period + 1.0)
+        super().__init__(capacity)
+
+    def initial_state(self): return (np.nan, None)  # (previous close, last ATR)
+
+    def fold(self, state, rows):
+        if len(rows) == 0: return np.empty(0), state
+        prev_close, last_atr = state
+        prev_closes = np.concatenate(([prev_close], rows[:-1, CLOSE]))
+        high, low = rows[:, HIGH], rows[:, LOW]
+        true_range = np.fmax(high - low, np.fmax(np.abs(high - prev_closes), np.abs(low - prev_closes)))
+        atr = _ewm(true_range, self.alpha, last_atr)
+        return atr, (rows[-1, CLOSE], float(atr[-1]))
+
+
+class RelativeStrength(IndicatorStream):
+    """RSI from Wilder-smoothed gains and losses (the first candle of a fresh fold contributes neither)."""
+    __slots__ = ("alpha",)
+
+    def __init__(self, capacity: int, period: int):
+        self.alpha = 1.0 / period
+        super().__init__(capacity)
+
+    def initial_state(self): return (np.nan, None, None)  # (previous close, average gain, average loss)
+
+    def fold(self, state, rows):
+        if len(rows) == 0: return np.empty(0), state
+        prev_close, last_gain, last_loss = state
+        delta = np.diff(rows[:, CLOSE], prepend=prev_close)
+        gain = _ewm(np.where(delta > 0, delta, 0.0), self.alpha, last_gain)
+        loss = _ewm(np.where(delta < 0, -delta, 0.0), self.alpha, last_loss)
+        rsi = 100.0 - 100.0 / (1.0 + gain / (loss + 1e-9))
+        return rsi, (rows[-1, CLOSE], float(gain[-1]), float(loss[-1]))
+
+
+class MovingAverage(IndicatorStream):
+    """Simple moving average of one column; NaN until `period` candles have been seen, like `rolling(period)`."""
+    __slots__ = ("period", "column")
+
+    def __init__(self, capacity: int, period: int, column: str = 'volume'):
+        self.period = int(period); self.column = OHLCV_COLUMNS.index(column)
+        super().__init__(capacity)
+
+    def initial_state(self): return np.empty(0)  # The last `period - 1` inputs
+
+    def fold(self, state, rows):
+        if len(rows) == 0: return np.empty(0), state
+        inputs = np.concatenate((state, rows[:, self.column]))
+        averages = np.full(len(rows), np.nan)
+        if len(inputs) >= self.period:
+            windows = np.lib.stride_tricks.sliding_window_view(inputs, self.period).mean(axis=1)
+            averages[len(averages) - len(windows):] = windows[-len(averages):]
+        return averages, inputs[-(self.period - 1):] if self.period > 1 else np.empty(0)
+
+
+class IndicatorCache:
+    """
+    THE SHARED ALMANAC: One incremental indicator ledger per data provider, keyed by timeframe,
+    indicator and parameters. Every analyzer that needs an ATR, a moving average or an RSI
+    reads it here instead of copying the frame and re-running a full rolling pass, so each
+    value is computed once per closed candle and every module sees exactly the same number.
+    v1.1: The EMA of a column, which no analyzer read, is retired.
+    """
+    def __init__(self, capacity: int = 1000):
+        self.capacity = max(1, int(capacity))
+        self.streams: Dict[Tuple, IndicatorStream] = {}
+        self._arrays: Dict[str, Tuple[pd.DataFrame, np.ndarray, np.ndarray]] = {}  # timeframe -> (frame, stamps, rows)
+
+    def reset(self):
+        self.streams.clear(); self._arrays.clear()
+
+    def _frame_arrays(self, timeframe: str, df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+        # A tick's frame is read by several analyzers; it is turned into arrays once.
+        cached = self._arrays.get(timeframe)
+        if cached is not None and cached[0] is df: return cached[1], cached[2]
+        rows = df.to_numpy(dtype=np.float64, copy=False) if list(df.columns) == OHLCV_COLUMNS else df[OHLCV_COLUMNS].to_numpy(dtype=np.float64)
+        stamps = df.index.asi8; self._arrays[timeframe] = (df, stamps, rows)
+        return stamps, rows
+
+    def _series(self, key: Tuple, factory, timeframe: str, df: pd.DataFrame) -> np.ndarray:
+        stream = self.streams.get((timeframe,) + key)
+        if stream is None: stream = self.streams[(timeframe,) + key] = factory(self.capacity)
+        return stream.update(*self._frame_arrays(timeframe, df))
+
+    # --- Aligned series (one value per row of `df`) ---
+    def atr_series(self, timeframe: str, df: pd.DataFrame, period: int = 14, wilder: bool = True) -> np.ndarray:
+        return self._series(('atr', period, wilder), lambda c: AverageTrueRange(c, period, wilder), timeframe, df)
+
+    def rsi_series(self, timeframe: str, df: pd.DataFrame, period: int = 14) -> np.ndarray:
+        return self._series(('rsi', period), lambda c: RelativeStrength(c, period), timeframe, df)
+
+    def sma_series(self, timeframe: str, df: pd.DataFrame, period: int, column: str = 'volume') -> np.ndarray:
+        return self._series(('sma', period, column), lambda c: MovingAverage(c, period, column), timeframe, df)
+
+    # --- Latest values ---
+    def atr(self, timeframe: str, df: pd.DataFrame, period: int = 14, wilder: bool = True) -> float:
+        series = self.atr_series(timeframe, df, period, wilder); return float(series[-1]) if len(series) else np.nan
+
+    def sma(self, timeframe: str, df: pd.DataFrame, period: int, column: str = 'volume') -> float:
+        series = self.sma_series(timeframe, df, period, column); return float(series[-1]) if len(series) else np.nan
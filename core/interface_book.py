@@ -26,10 +26,10 @@ class IOrderExecutor(ABC):
         pass
         
     @abstractmethod
-    def close_order(self, order_id: str, size: float, symbol: str, price: float) -> Optional[Dict[str, Any]]:
+    def close_order(self, order_id: str, size: float, symbol: str, price: float, **kwargs) -> Optional[Dict[str, Any]]:
         """Closes an existing order (often a market order)."""
 
     @abstractmethod
-    def check_triggered_stops(self, current_high: float, current_low: float) -> List[Dict[str, Any]]:
-        """Checks if any pending stop orders have been triggered."""
+    def check_triggered_stops(self, current_high: float, current_low: float, symbol: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Checks if any pending stop orders (of `symbol`, when given) have been triggered."""
         pass
\ No newline at end of file
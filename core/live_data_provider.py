@@ -1,5 +1,5 @@
 # F:\ShadowVanguard_Legion_Godspeed\core\live_data_provider.py
-# Version 2.9 - The MEXC Ambassador
+# Version 3.0 - The MEXC Ambassador
 
 import logging
 import time
@@ -12,6 +12,8 @@ from collections import deque
 # [PACT KEPT]: Core model imports are preserved.
 from .data_models import MarketDataFrame
 from .interface_book import IDataProvider
+from .indicator_cache import IndicatorCache
+from .swing_engine import SwingEngine
 
 logger = logging.getLogger("LiveDataProvider")
 
@@ -41,6 +43,9 @@ class LiveDataProvider(IDataProvider):
         self.last_candle_timestamp = None
         self.is_warmed_up = False
         self.data_buffer = deque(maxlen=self.data_window_size)
+        # [SURGICAL UPGRADE]: Indicators are folded in once per closed candle and shared by every analyzer.
+        self.indicator_cache = IndicatorCache(capacity=self.data_window_size)
+        self.swing_engine = SwingEngine(base_timeframe=self.base_timeframe_str)
 
         try:
             exchange_class = getattr(ccxt, self.exchange_id)
@@ -165,7 +170,9 @@ class LiveDataProvider(IDataProvider):
         return MarketDataFrame(
             timestamp=latest_timestamp,
             symbol=self.symbol,
-            ohlcv_multidim={self.base_timeframe_str: df}
+            ohlcv_multidim={self.base_timeframe_str: df},
+            indicator_cache=self.indicator_cache,
+            swing_engine=self.swing_engine
         )
         
     def has_more_data(self) -> bool:
@@ -0,0 +1,190 @@
+# F:\ShadowVanguard_Legion_Godspeed\core\market_simulator.py
+# Version 1.1 - Prometheus, The Microstructure Forge
+
+import logging
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger("MarketSimulator")
+
+
+# --- Pluggable size distributions ---
+class SizeModel:
+    """Draws `n` order or trade sizes inside `[low, high]` from one batched call on the Generator."""
+    def draw(self, rng: np.random.Generator, n: int, low: Any, high: Any) -> np.ndarray:
+        raise NotImplementedError
+
+
+class UniformSizeModel(SizeModel):
+    def draw(self, rng: np.random.Generator, n: int, low: Any, high: Any) -> np.ndarray:
+        return rng.uniform(low, high, n)
+
+
+class LogNormalSizeModel(SizeModel):
+    """Heavy-tailed sizes: most orders are small, a few are whales. Centered on the geometric mid of the range."""
+    def __init__(self, sigma: float = 0.75):
+        self.sigma = sigma
+
+    def draw(self, rng: np.random.Generator, n: int, low: Any, high: Any) -> np.ndarray:
+        low = np.maximum(np.asarray(low, dtype=np.float64), 1e-9); high = np.asarray(high, dtype=np.float64)
+        return np.clip(rng.lognormal(np.log(np.sqrt(low * high)), self.sigma, n), low, high)
+
+
+class ExponentialSizeModel(SizeModel):
+    """Sizes decaying away from the lower bound, with a mean at a quarter of the range."""
+    def draw(self, rng: np.random.Generator, n: int, low: Any, high: Any) -> np.ndarray:
+        low = np.asarray(low, dtype=np.float64); high = np.asarray(high, dtype=np.float64)
+        return np.minimum(low + rng.exponential((high - low) / 4.0, n), high)
+
+
+SIZE_MODELS = {'uniform': UniformSizeModel, 'lognormal': LogNormalSizeModel, 'exponential': ExponentialSizeModel}
+
+
+def build_size_model(spec: Any) -> SizeModel:
+    """`spec` is a model name or `{'model': name, **params}`; unknown names fall back to uniform."""
+    if isinstance(spec, SizeModel): return spec
+    params = dict(spec) if isinstance(spec, dict) else {'model': spec or 'uniform'}
+    model_class = SIZE_MODELS.get(params.pop('model', 'uniform'))
+    if model_class is None:
+        logger.error(f"Unknown size model '{spec}'. Falling back to 'uniform'."); model_class = UniformSizeModel; params = {}
+    return model_class(**params)
+
+
+# --- Array-backed snapshots ---
+@dataclass(slots=True)
+class TapeArrays:
+    """A tick's trade prints as parallel arrays. `to_trades()` renders the legacy list-of-dicts view."""
+    prices: np.ndarray
+    sizes: np.ndarray
+    is_buy: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.prices)
+
+    def buy_volume(self) -> float:
+        return float(self.sizes[self.is_buy].sum())
+
+    def sell_volume(self) -> float:
+        return float(self.sizes[~self.is_buy].sum())
+
+    def to_trades(self) -> List[Dict[str, Any]]:
+        return [{'side': 'buy' if buy else 'sell', 'price': price, 'size': size}
+                for buy, price, size in zip(self.is_buy.tolist(), self.prices.tolist(), self.sizes.tolist())]
+
+
+@dataclass(slots=True)
+class ZoneArrays:
+    """The strategic map's order blocks and voids flattened into parallel arrays (one row per zone)."""
+    ob_low: np.ndarray; ob_high: np.ndarray; ob_bullish: np.ndarray; ob_bearish: np.ndarray
+    ob_strength_low: np.ndarray; ob_strength_high: np.ndarray
+    fvg_low: np.ndarray; fvg_high: np.ndarray; fvg_bullish: np.ndarray; fvg_bearish: np.ndarray
+
+
+def _zone_bounds(zone: Any) -> Tuple[float, float]:
+    if hasattr(zone, 'price_low'): return zone.price_low, zone.price_high
+    return tuple(zone.price_range)  # Legacy `LiquidityVoid`
+
+
+class MicrostructureSimulator:
+    """
+    THE MICROSTRUCTURE FORGE: Forges each tick's depth ladder and trade prints in a few
+    batched draws from one seeded `numpy.random.Generator`. The strategic map is flattened
+    into zone arrays once per map version; order-block liquidity walls and void vacuums are
+    then applied with array masks instead of Python loops. Same seed, same market.
+    """
+    def __init__(self, sim_config: Dict[str, Any], seed: Optional[int] = None):
+        self.sim_config = sim_config
+        self.rng = np.random.default_rng(seed)
+        self.book_levels = self.sim_config.get('book_levels', 50)
+        self.level_spacing = self.sim_config.get('level_spacing_volatility', 0.2)
+        self.base_bid_strength = self.sim_config.get('base_bid_strength', [0.1, 2.0])
+        self.base_ask_strength = self.sim_config.get('base_ask_strength', [0.1, 2.0])
+        self.ob_strengths = self.sim_config.get('ob_simulation_strength', {'4h': [30, 60], '1h': [15, 35]})
+        self.fvg_vacuum_factor = self.sim_config.get('fvg_vacuum_factor', 0.1)
+        self.trade_size_range = self.sim_config.get('trade_size_range', [0.01, 1.0])
+        self.book_size_model = build_size_model(self.sim_config.get('book_size_model', 'uniform'))
+        self.trade_size_model = build_size_model(self.sim_config.get('trade_size_model', 'uniform'))
+        self._level_steps = np.arange(1, self.book_levels + 1, dtype=np.float64) * self.level_spacing
+        self._zones_key: Optional[Tuple] = None; self._zones: Optional[ZoneArrays] = None
+
+    # The zone cache is keyed by the identity of the map's lists, which a snapshot does not carry over.
+    def __getstate__(self) -> Dict[str, Any]:
+        return dict(self.__dict__, _zones_key=None, _zones=None)
+
+    # --- Strategic map flattening (cached per map version) ---
+    def zones(self, strategic_map: Dict[str, Any]) -> ZoneArrays:
+        order_blocks = strategic_map.get('order_blocks', {}) or {}
+        voids = strategic_map.get('fvgs', strategic_map.get('liquidity_voids', {})) or {}
+        key = tuple((tf, id(zs), len(zs)) for tf, zs in order_blocks.items()) + tuple((tf, id(zs), len(zs)) for tf, zs in voids.items())
+        if key == self._zones_key: return self._zones
+
+        obs = [(ob, tf) for tf, ob_list in order_blocks.items() for ob in ob_list]
+        fvgs = [fvg for fvg_list in voids.values() for fvg in fvg_list]
+        ob_bounds = np.array([_zone_bounds(ob) for ob, _ in obs], dtype=np.float64).reshape(-1, 2)
+        fvg_bounds = np.array([_zone_bounds(fvg) for fvg in fvgs], dtype=np.float64).reshape(-1, 2)
+        strengths = np.array([self.ob_strengths.get(tf, [5, 15]) for _, tf in obs], dtype=np.float64).reshape(-1, 2)
+        self._zones = ZoneArrays(
+            ob_low=ob_bounds[:, 0], ob_high=ob_bounds[:, 1],
+            ob_bullish=np.array(['BULLISH' in ob.event_type for ob, _ in obs], dtype=bool),
+            ob_bearish=np.array(['BEARISH' in ob.event_type for ob, _ in obs], dtype=bool),
+            ob_strength_low=strengths[:, 0], ob_strength_high=strengths[:, 1],
+            fvg_low=fvg_bounds[:, 0], fvg_high=fvg_bounds[:, 1],
+            fvg_bullish=np.array(['BULLISH' in fvg.event_type for fvg in fvgs], dtype=bool),
+            fvg_bearish=np.array(['BEARISH' in fvg.event_type for fvg in fvgs], dtype=bool))
+        self._zones_key = key
+        return self._zones
+
+    # --- Depth ladder ---
+    def order_book(self, candle: np.ndarray, zones: ZoneArrays) -> Dict[str, np.ndarray]:
+        """`candle` is one OHLCV row. Returns `{'bids': (n, 2), 'asks': (n, 2)}` price/size arrays, best level first."""
+        _, high, low, close, _ = candle
+        volatility = (high - low) or (close * 0.001)
+        bid_prices = close - volatility * self._level_steps; ask_prices = close + volatility * self._level_steps
+        bid_sizes = self.book_size_model.draw(self.rng, self.book_levels, *self.base_bid_strength)
+        ask_sizes = self.book_size_model.draw(self.rng, self.book_levels, *self.base_ask_strength)
+
+        # Order-block walls: demand below price joins the bids, supply above price joins the asks.
+        walls = (zones.ob_bullish & (zones.ob_high < close)) | (~zones.ob_bullish & zones.ob_bearish & (zones.ob_low > close))
+        if walls.any():
+            wall_prices = self.rng.uniform(zones.ob_low[walls], zones.ob_high[walls])
+            wall_sizes = self.rng.uniform(zones.ob_strength_low[walls], zones.ob_strength_high[walls])
+            on_bid = zones.ob_bullish[walls]
+            bid_prices = np.concatenate((bid_prices, wall_prices[on_bid])); bid_sizes = np.concatenate((bid_sizes, wall_sizes[on_bid]))
+            ask_prices = np.concatenate((ask_prices, wall_prices[~on_bid])); ask_sizes = np.concatenate((ask_sizes, wall_sizes[~on_bid]))
+
+        # Void vacuums: every void a level sits inside thins it once more.
+        bull_voids = zones.fvg_bullish & (zones.fvg_high < close)
+        bear_voids = ~zones.fvg_bullish & zones.fvg_bearish & (zones.fvg_low > close)
+        if bull_voids.any(): ask_sizes = ask_sizes * self.fvg_vacuum_factor ** self._inside_count(ask_prices, zones.fvg_low[bull_voids], zones.fvg_high[bull_voids])
+        if bear_voids.any(): bid_sizes = bid_sizes * self.fvg_vacuum_factor ** self._inside_count(bid_prices, zones.fvg_low[bear_voids], zones.fvg_high[bear_voids])
+
+        bid_order = np.argsort(-bid_prices, kind='stable'); ask_order = np.argsort(ask_prices, kind='stable')
+        return {'bids': np.column_stack((bid_prices[bid_order], bid_sizes[bid_order])),
+                'asks': np.column_stack((ask_prices[ask_order], ask_sizes[ask_order]))}
+
+    @staticmethod
+    def _inside_count(prices: np.ndarray, lows: np.ndarray, highs: np.ndarray) -> np.ndarray:
+        return ((prices[:, None] > lows[None, :]) & (prices[:, None] < highs[None, :])).sum(axis=1)
+
+    # --- Trade prints ---
+    def buy_probability(self, candle: np.ndarray, zones: ZoneArrays) -> float:
+        open_, high, low, close, _ = candle
+        probability = 0.60 if close > open_ else 0.40
+        proximity = ((high - low) or (close * 0.001)) * 0.5
+        near_demand = zones.ob_bullish & (low <= zones.ob_high + proximity)
+        near_supply = ~zones.ob_bullish & zones.ob_bearish & (high >= zones.ob_low - proximity)
+        inside_void = (zones.fvg_low <= close) & (close <= zones.fvg_high)
+        probability += 0.20 * (near_demand.sum() - near_supply.sum())
+        probability += 0.15 * ((inside_void & zones.fvg_bullish).sum() - (inside_void & ~zones.fvg_bullish & zones.fvg_bearish).sum())
+        return float(np.clip(probability, 0.05, 0.95))
+
+    def tape(self, candle: np.ndarray, zones: ZoneArrays) -> TapeArrays:
+        _, high, low, _, volume = candle
+        volume = int(volume) if volume > 0 else 0
+        num_trades = max(5, volume // 1000 if volume > 0 else 5)
+        is_buy = self.rng.random(num_trades) < self.buy_probability(candle, zones)
+        prices = self.rng.uniform(low, high, num_trades)
+        sizes = self.trade_size_model.draw(self.rng, num_trades, *self.trade_size_range)
+        return TapeArrays(prices=prices, sizes=sizes, is_buy=is_buy)
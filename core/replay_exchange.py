@@ -0,0 +1,163 @@
+# F:\ShadowVanguard_Legion_Godspeed\core\replay_exchange.py
+# Version 1.1 - Prometheus, The Echo Exchange
+
+import argparse
+import asyncio
+import json
+import logging
+import threading
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+import pandas as pd
+from aiohttp import web, WSMsgType
+
+logger = logging.getLogger("ReplayExchange")
+
+
+class ReplayExchange:
+    """
+    THE ECHO EXCHANGE: A local WebSocket stand-in for a live exchange. It replays a candle
+    history as the push streams the `StreamingDataProvider` consumes: for every candle a
+    partial-depth snapshot, a burst of aggregate trades walking the candle's open -> extreme
+    -> extreme -> close path, and finally the closed kline; when the history runs out it
+    closes the socket. The messages are Binance combined-stream messages, on the streams the
+    subscriber asked for. Its `fetch_ohlcv` is the REST side the subscriber warms up from:
+    the first `history_size` candles, then the bar in progress.
+    """
+    def __init__(self, candles: pd.DataFrame, host: str = "127.0.0.1", port: int = 8765, history_size: int = 600,
+                 candles_per_second: float = 0.0, trades_per_candle: int = 8, book_levels: int = 20, seed: int = 42):
+        self.candles = candles[['open', 'high', 'low', 'close', 'volume']]
+        self.host = host; self.port = port
+        self.history_size = int(history_size); self.candles_per_second = float(candles_per_second)
+        self.trades_per_candle = max(4, int(trades_per_candle)); self.book_levels = int(book_levels)
+        self.seed = seed
+        self._stamps_ms = (self.candles.index.asi8 // 1_000_000).astype(np.int64); self._values = self.candles.to_numpy(dtype=np.float64)
+        self._runner: Optional[web.AppRunner] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None; self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        return f"ws://{self.host}:{self.port}/stream"
+
+    def fetch_ohlcv(self, symbol: str, timeframe: str = '5m', since: Optional[int] = None, limit: Optional[int] = None) -> List[List[float]]:
+        """ccxt's `fetch_ohlcv`, as the exchange answers it before the replay starts: the history, then the bar in progress."""
+        end = min(self.history_size + 1, len(self._values)); start = max(0, end - limit) if limit else 0
+        return np.column_stack((self._stamps_ms[start:end], self._values[start:end])).tolist()
+
+    # --- Message forging (Binance combined streams; prices and sizes travel as strings) ---
+    @staticmethod
+    def _kline(stream: str, symbol: str, interval: str, stamp_ms: int, step_ms: int, row: np.ndarray) -> Dict[str, Any]:
+        o, h, l, c, v = (repr(float(x)) for x in row)
+        return {'stream': stream, 'data': {'e': 'kline', 'E': stamp_ms + step_ms, 's': symbol, 'k': {
+            't': stamp_ms, 'T': stamp_ms + step_ms - 1, 's': symbol, 'i': interval, 'f': 0, 'L': 0,
+            'o': o, 'c': c, 'h': h, 'l': l, 'v': v, 'n': 0, 'x': True, 'q': '0', 'V': '0', 'Q': '0', 'B': '0'}}}
+
+    def _depth(self, stream: str, symbol: str, levels: int, stamp_ms: int, row: np.ndarray, rng: np.random.Generator) -> Dict[str, Any]:
+        tick = max((row[1] - row[2]) * 0.05, row[0] * 1e-5)
+        offsets = np.arange(1, levels + 1) * tick
+        bids = [[repr(float(p)), repr(float(q))] for p, q in zip((row[0] - offsets).round(8), rng.uniform(0.1, 2.0, levels).round(8))]
+        asks = [[repr(float(p)), repr(float(q))] for p, q in zip((row[0] + offsets).round(8), rng.uniform(0.1, 2.0, levels).round(8))]
+        return {'stream': stream, 'data': {'e': 'depthUpdate', 'E': stamp_ms, 'T': stamp_ms, 's': symbol, 'U': 0, 'u': 0, 'pu': 0, 'b': bids, 'a': asks}}
+
+    def _trades(self, stream: str, symbol: str, stamp_ms: int, step_ms: int, row: np.ndarray, rng: np.random.Generator) -> List[Dict[str, Any]]:
+        # A bullish candle is walked open -> low -> high -> close, a bearish one open -> high -> low -> close.
+        o, h, l, c, v = row
+        path = [o, l, h, c] if c >= o else [o, h, l, c]
+        prices = np.interp(np.linspace(0, 3, self.trades_per_candle), [0, 1, 2, 3], path)
+        sizes = rng.dirichlet(np.ones(self.trades_per_candle)) * v
+        times = stamp_ms + np.linspace(0, step_ms - 1, self.trades_per_candle).astype(np.int64)
+        return [{'stream': stream, 'data': {'e': 'aggTrade', 'E': int(t), 's': symbol, 'a': i, 'p': repr(float(p)), 'q': repr(float(q)),
+                                            'f': i, 'l': i, 'T': int(t), 'm': bool(i > 0 and p < prices[i - 1])}}
+                for i, (t, p, q) in enumerate(zip(times, prices, sizes))]
+
+    # --- Serving ---
+    async def _handle(self, request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse(heartbeat=30.0); await ws.prepare(request)
+        subscription = await ws.receive()
+        if subscription.type != WSMsgType.TEXT: return ws
+        logger.info(f"[ReplayExchange] Subscriber joined: {subscription.data}")
+        request_id = None; streams: Dict[str, str] = {}
+        try:
+            message = json.loads(subscription.data); request_id = message.get('id')
+            for name in message.get('params', []):
+                kind = name.split('@', 1)[1] if '@' in name else name
+                streams['kline' if kind.startswith('kline_') else 'trade' if kind in ('aggTrade', 'trade') else 'depth' if kind.startswith('depth') else kind] = name
+        except (ValueError, AttributeError): pass
+        if 'kline' not in streams:
+            logger.error(f"[ReplayExchange] Not a Binance kline subscription: {subscription.data}"); await ws.close(); return ws
+        await ws.send_json({'result': None, 'id': request_id})
+        symbol = streams['kline'].split('@')[0].upper(); interval = streams['kline'].split('_', 1)[1]
+        levels = int(streams['depth'].split('@')[1][5:] or self.book_levels) if 'depth' in streams else 0
+
+        stamps_ms, values = self._stamps_ms, self._values
+        step_ms = int(np.median(np.diff(stamps_ms))) if len(stamps_ms) > 1 else 300_000
+        rng = np.random.default_rng(self.seed); pause = 1.0 / self.candles_per_second if self.candles_per_second > 0 else 0.0
+        try:
+            for i in range(min(self.history_size, len(values)), len(values)):
+                if ws.closed: break
+                stamp_ms = int(stamps_ms[i]); row = values[i]
+                if levels: await ws.send_json(self._depth(streams['depth'], symbol, levels, stamp_ms, row, rng))
+                if 'trade' in streams:
+                    for trade in self._trades(streams['trade'], symbol, stamp_ms, step_ms, row, rng): await ws.send_json(trade)
+                await ws.send_json(self._kline(streams['kline'], symbol, interval, stamp_ms, step_ms, row))
+                await asyncio.sleep(pause)
+        except ConnectionResetError:
+            logger.warning("[ReplayExchange] Subscriber vanished mid-replay.")
+        await ws.close()
+        return ws
+
+    async def start(self):
+        app = web.Application(); app.router.add_get('/stream', self._handle)
+        # A subscriber still attached at shutdown is cut off after a short grace, not the default minute.
+        self._runner = web.AppRunner(app, shutdown_timeout=2.0); await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port); await site.start()
+        if self.port == 0: self.port = site._server.sockets[0].getsockname()[1]
+        logger.info(f"[ReplayExchange] Echo Exchange v1.1 serving {len(self.candles)} candles at {self.url}.")
+
+    async def stop(self):
+        if self._runner: await self._runner.cleanup(); self._runner = None
+
+    # --- Thread hosting (tests and in-process replays) ---
+    def start_in_background(self) -> "ReplayExchange":
+        ready = threading.Event()
+        def _serve():
+            self._loop = asyncio.new_event_loop(); asyncio.set_event_loop(self._loop)
+            self._loop.run_until_complete(self.start()); ready.set()
+            self._loop.run_forever()
+        self._thread = threading.Thread(target=_serve, name="ReplayExchange", daemon=True); self._thread.start()
+        ready.wait(timeout=10)
+        return self
+
+    def shutdown(self):
+        if not self._loop: return
+        asyncio.run_coroutine_threadsafe(self.stop(), self._loop).result(timeout=10)
+        self._loop.call_soon_threadsafe(self._loop.stop); self._thread.join(timeout=10)
+        self._loop = None
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="ShadowVanguard - The Echo Exchange (offline WebSocket replay)")
+    parser.add_argument("--store", default="data/candle_store", help="Candle vault root.")
+    parser.add_argument("--symbol", default="BTCUSDT"); parser.add_argument("--timeframe", default="5m")
+    parser.add_argument("--start", default=None); parser.add_argument("--end", default=None)
+    parser.add_argument("--host", default="127.0.0.1"); parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--history", type=int, default=600, help="Candles served to the warmup fetch before the replay starts.")
+    parser.add_argument("--speed", type=float, default=1.0, help="Candles per second (0 = as fast as possible).")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+
+    from core.candle_store import CandleStore
+    candles = CandleStore(args.store).load(args.symbol, args.timeframe, args.start, args.end)
+    if candles.empty: logger.error(f"No candles for {args.symbol} {args.timeframe} in '{args.store}'. Import them first."); return 1
+    exchange = ReplayExchange(candles, args.host, args.port, history_size=args.history, candles_per_second=args.speed)
+    async def _serve_forever():
+        await exchange.start()
+        await asyncio.Event().wait()
+    try: asyncio.run(_serve_forever())
+    except KeyboardInterrupt: pass
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,111 @@
+# F:\ShadowVanguard_Legion_Godspeed\core\shared_candles.py
+# Version 1.0 - Prometheus, The Common Well
+
+import logging
+import secrets
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger("SharedCandles")
+
+SHARED_COLUMNS: Tuple[str, ...] = ("open", "high", "low", "close", "volume")
+
+# The segments this process has attached to, by name. They stay mapped for the life of the process,
+# since every frame served from them is a view that would dangle the moment its segment were closed.
+_ATTACHED: Dict[str, shared_memory.SharedMemory] = {}
+
+
+@dataclass(frozen=True, slots=True)
+class SharedCandlesHandle:
+    """What a worker needs to find a published history: the segments' names and the layout in them. Pickles in a few hundred bytes."""
+    values_segment: str
+    index_segment: str
+    rows: int
+    columns: Tuple[str, ...]
+    index_name: Optional[str] = None
+    tz: Optional[str] = None
+
+
+def _open_segment(name: str) -> shared_memory.SharedMemory:
+    # Only the publisher unlinks; from 3.13 an attaching process can keep the resource tracker out of it.
+    try: return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError: return shared_memory.SharedMemory(name=name)
+
+
+def _segment(name: str) -> shared_memory.SharedMemory:
+    if name not in _ATTACHED: _ATTACHED[name] = _open_segment(name)
+    return _ATTACHED[name]
+
+
+def attach_arrays(handle: SharedCandlesHandle) -> Tuple[np.ndarray, np.ndarray]:
+    """The published values (one read-only row per column) and int64 timestamps, as views straight into the segments."""
+    values = np.ndarray((len(handle.columns), handle.rows), dtype=np.float64, buffer=_segment(handle.values_segment).buf)
+    stamps = np.ndarray((handle.rows,), dtype=np.int64, buffer=_segment(handle.index_segment).buf)
+    values.flags.writeable = False; stamps.flags.writeable = False
+    return values, stamps
+
+
+def attach_frame(handle: SharedCandlesHandle) -> pd.DataFrame:
+    """The published history as a DataFrame whose columns are zero-copy views of the shared values."""
+    values, stamps = attach_arrays(handle)
+    index = pd.DatetimeIndex(stamps.view('datetime64[ns]'), name=handle.index_name)
+    if handle.tz: index = index.tz_localize('UTC').tz_convert(handle.tz)
+    # The values are laid out column by column, which is how pandas holds a float block: `.T` is adopted as is.
+    return pd.DataFrame(values.T, index=index, columns=list(handle.columns), copy=False)
+
+
+def detach(handle: SharedCandlesHandle):
+    """Unmaps a handle's segments from this process. Frames attached from it must no longer be used."""
+    for name in (handle.values_segment, handle.index_segment):
+        segment = _ATTACHED.pop(name, None)
+        if segment is None: continue
+        try: segment.close()
+        except BufferError: _ATTACHED[name] = segment; logger.warning(f"Segment '{name}' still has live views; it stays mapped.")
+
+
+class SharedCandles:
+    """
+    THE COMMON WELL: Publishes a candle history once into `multiprocessing.shared_memory`, so
+    any number of worker processes read the same pages instead of each receiving (or parsing)
+    its own copy. The float columns go into one segment, laid out column by column, and the
+    timestamps into another; `handle` is the small picklable ticket a worker attaches with
+    (`attach_frame`), and gets back views, not copies. The publisher owns the segments: `close`
+    unlinks them, and using it as a context manager does so when the work is done.
+    """
+    def __init__(self, frame: pd.DataFrame, columns: Optional[List[str]] = None, prefix: str = 'svc'):
+        columns = tuple(columns or [c for c in SHARED_COLUMNS if c in frame.columns])
+        if not isinstance(frame.index, pd.DatetimeIndex): raise TypeError("Shared candles need a DatetimeIndex.")
+        rows = len(frame); token = secrets.token_hex(4)
+        # A zero-byte segment is refused by the OS; an empty history still publishes one row's worth.
+        self.segments = [shared_memory.SharedMemory(name=f"{prefix}_{token}_v", create=True, size=max(8, rows * len(columns) * 8)),
+                         shared_memory.SharedMemory(name=f"{prefix}_{token}_i", create=True, size=max(8, rows * 8))]
+        values = np.ndarray((len(columns), rows), dtype=np.float64, buffer=self.segments[0].buf)
+        for i, column in enumerate(columns): values[i] = frame[column].to_numpy(dtype=np.float64)
+        stamps = np.ndarray((rows,), dtype=np.int64, buffer=self.segments[1].buf)
+        index = frame.index.tz_convert('UTC').tz_localize(None) if frame.index.tz is not None else frame.index
+        stamps[:] = index.as_unit('ns').asi8
+        del values, stamps  # No view of ours may outlive `close`.
+        self.handle = SharedCandlesHandle(self.segments[0].name, self.segments[1].name, rows, columns, frame.index.name,
+                                          str(frame.index.tz) if frame.index.tz is not None else None)
+        logger.info(f"[SharedCandles] The Common Well v1.0 holds {rows} candle(s) x {len(columns)} column(s) ({rows * (len(columns) + 1) * 8 / 1e6:.1f} MB) in shared memory.")
+
+    def __getstate__(self) -> Dict[str, Any]:
+        raise TypeError("SharedCandles owns its segments; hand workers its `handle` instead.")
+
+    def __enter__(self) -> 'SharedCandles':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Unlinks the segments. Workers still attached keep their mapping until they detach or exit."""
+        detach(self.handle)
+        for segment in self.segments:
+            try: segment.close(); segment.unlink()
+            except FileNotFoundError: pass
+        self.segments = []
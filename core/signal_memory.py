@@ -0,0 +1,31 @@
+# F:\ShadowVanguard_Legion_Godspeed\core\signal_memory.py
+# Version 1.0 - Prometheus, The Bounded Remembrance
+
+from collections import OrderedDict
+from typing import Hashable
+
+
+class SignalMemory(OrderedDict):
+    """
+    THE BOUNDED REMEMBRANCE: The signal IDs an analyst has already fired, each with the candle
+    index it fired on, oldest first. IDs only ever leave from the front: once they are older
+    than `lifespan` candles, or when more than `max_entries` are held (0 = no cap). Expiry
+    therefore visits only what expires instead of every signal a session has ever fired, and
+    a multi-day session holds at most `max_entries` of them.
+    It is still a dict: `signal_id in memory` is the analyst's de-duplication check.
+    """
+    def __init__(self, lifespan: int = 500, max_entries: int = 0):
+        super().__init__()
+        self.lifespan = lifespan; self.max_entries = max_entries
+        self.expired = 0; self.evicted = 0  # Lifetime tallies, for the Lifecycle Warden's telemetry
+
+    def remember(self, signal_id: Hashable, candle_index: int):
+        self[signal_id] = candle_index
+        if self.max_entries and len(self) > self.max_entries: self.popitem(last=False); self.evicted += 1
+
+    def expire(self, current_index: int) -> int:
+        """Forgets the signals older than the lifespan; indexes only grow, so they are all at the front."""
+        expired = 0
+        while self and current_index - next(iter(self.values())) > self.lifespan: self.popitem(last=False); expired += 1
+        self.expired += expired
+        return expired
@@ -0,0 +1,338 @@
+# F:\ShadowVanguard_Legion_Godspeed\core\stream_data_provider.py
+# Version 1.2 - Prometheus, The Stream Herald
+
+import asyncio
+import heapq
+import json
+import logging
+import queue
+import threading
+import time
+from typing import Dict, Any, List, Optional, Tuple
+
+import aiohttp
+import ccxt
+import numpy as np
+import pandas as pd
+
+from .data_models import MarketDataFrame
+from .interface_book import IDataProvider
+from .streaming_window import CandleRingBuffer, OHLCV_COLUMNS
+from .data_provider import MultiTimeframeAggregator
+from .indicator_cache import IndicatorCache
+from .swing_engine import SwingEngine
+
+logger = logging.getLogger("StreamDataProvider")
+
+MS_TO_NS = 1_000_000
+# Both exchanges only push their partial (top-N) books at these depths.
+BOOK_LEVELS = (5, 10, 20)
+
+
+def book_levels(depth: int) -> int:
+    return next((levels for levels in BOOK_LEVELS if levels >= depth), BOOK_LEVELS[-1])
+
+
+def _market_parts(symbol: str) -> Tuple[str, str]:
+    base, _, quote = symbol.split(':')[0].partition('/')
+    return base.upper(), quote.upper()
+
+
+class BinanceDialect:
+    """
+    The Binance combined-stream schema (spot and USD-M futures): `{"stream": "btcusdt@kline_5m",
+    "data": {...}}`. A kline carries its bar in the nested `k` object, closed when `k.x` is true;
+    trades come from `@aggTrade`; the book is the partial `@depth<N>@100ms` stream, a fresh
+    top-N snapshot on every push.
+    """
+    name = 'binance'
+    default_url = 'wss://fstream.binance.com/stream'
+    keepalive_seconds = 0.0  # The server pings; aiohttp answers.
+
+    def __init__(self, stream_symbol: str):
+        self.stream_symbol = stream_symbol
+
+    @staticmethod
+    def symbol_for(target_symbol: str) -> str:
+        return ''.join(_market_parts(target_symbol))
+
+    def subscriptions(self, timeframe: str, depth: int) -> List[Dict[str, Any]]:
+        s = self.stream_symbol.lower()
+        return [{'method': 'SUBSCRIBE', 'params': [f"{s}@kline_{timeframe}", f"{s}@aggTrade", f"{s}@depth{book_levels(depth)}@100ms"], 'id': 1}]
+
+    def keepalive(self) -> Optional[Dict[str, Any]]:
+        return None
+
+    def parse(self, message: Dict[str, Any]) -> List[Tuple[str, Any]]:
+        data = message.get('data', message)
+        if not isinstance(data, dict): return []
+        event = data.get('e')
+        if event == 'kline':
+            k = data['k']
+            return [('kline', (int(k['t']), [float(k['o']), float(k['h']), float(k['l']), float(k['c']), float(k['v'])], bool(k['x'])))]
+        if event in ('aggTrade', 'trade'):
+            return [('trade', {'side': 'sell' if data['m'] else 'buy', 'price': float(data['p']), 'size': float(data['q']), 'timestamp': int(data['T'])})]
+        # Futures partial depth arrives as a 'depthUpdate' with b/a; spot partial depth has no event type, only bids/asks.
+        if event == 'depthUpdate' or 'lastUpdateId' in data:
+            return [('book', (data.get('b', data.get('bids', [])), data.get('a', data.get('asks', []))))]
+        return []  # Subscription acknowledgements ({"result": null, "id": 1}) and anything else.
+
+
+class MexcDialect:
+    """
+    The MEXC contract (perpetual swap) push schema: `{"channel": "push.kline", "data": {...},
+    "symbol": "BTC_USDT"}`. A kline push has no closed flag: the bar in progress is pushed
+    until the next one opens, so a bar is taken as closed when its successor's first push
+    arrives. Its time `t` is in seconds. Trades are `push.deal` (T: 1 buy, 2 sell) and the book
+    is `push.depth.full`, a top-N snapshot. The server drops a client that has not pinged.
+    """
+    name = 'mexc'
+    default_url = 'wss://contract.mexc.com/edge'
+    keepalive_seconds = 15.0
+    INTERVALS = {'1m': 'Min1', '5m': 'Min5', '15m': 'Min15', '30m': 'Min30', '1h': 'Min60', '4h': 'Hour4', '8h': 'Hour8', '1d': 'Day1'}
+
+    def __init__(self, stream_symbol: str):
+        self.stream_symbol = stream_symbol
+        self._open_bar: Optional[Tuple[int, List[float]]] = None
+
+    @staticmethod
+    def symbol_for(target_symbol: str) -> str:
+        return '_'.join(_market_parts(target_symbol))
+
+    def subscriptions(self, timeframe: str, depth: int) -> List[Dict[str, Any]]:
+        self._open_bar = None  # A new connection starts a new bar; what a reconnect replays is dropped downstream.
+        return [{'method': 'sub.kline', 'param': {'symbol': self.stream_symbol, 'interval': self.INTERVALS.get(timeframe, timeframe)}},
+                {'method': 'sub.deal', 'param': {'symbol': self.stream_symbol}},
+                {'method': 'sub.depth.full', 'param': {'symbol': self.stream_symbol, 'limit': book_levels(depth)}}]
+
+    def keepalive(self) -> Optional[Dict[str, Any]]:
+        return {'method': 'ping'}
+
+    def parse(self, message: Dict[str, Any]) -> List[Tuple[str, Any]]:
+        channel = message.get('channel', ''); data = message.get('data')
+        if channel == 'push.kline':
+            stamp_ms = int(data['t']) * 1000; row = [float(data['o']), float(data['h']), float(data['l']), float(data['c']), float(data['q'])]
+            events = []
+            if self._open_bar is not None and stamp_ms > self._open_bar[0]: events.append(('kline', (*self._open_bar, True)))
+            if self._open_bar is None or stamp_ms >= self._open_bar[0]: self._open_bar = (stamp_ms, row)
+            return events
+        if channel == 'push.deal':
+            return [('trade', {'side': 'buy' if int(deal['T']) == 1 else 'sell', 'price': float(deal['p']), 'size': float(deal['v']), 'timestamp': int(deal['t'])})
+                    for deal in (data if isinstance(data, list) else [data])]
+        if channel == 'push.depth.full':
+            return [('book', ([level[:2] for level in data.get('bids', [])], [level[:2] for level in data.get('asks', [])]))]
+        return []  # 'pong' and the 'rs.sub.*' acknowledgements.
+
+
+DIALECTS = {dialect.name: dialect for dialect in (BinanceDialect, MexcDialect)}
+
+
+class StreamingDataProvider(IDataProvider):
+    """
+    THE STREAM HERALD: Replaces the REST poll-and-sleep loop with push streams. An asyncio
+    consumer runs on its own thread and folds every kline, trade and depth message into
+    incremental state: a candle ring, a live price->size book and the tape of the candle
+    in progress. `fetch_next_market_data` simply waits for the next closed candle, so a
+    decision is taken the moment the exchange closes the bar, without polling latency or
+    rate-limit cost.
+    v1.1: The wire format is the exchange's own, through a dialect (Binance combined streams,
+          MEXC contract pushes; by default the one of `live_engine.exchange`), and the window
+          is warmed up over REST with `fetch_ohlcv`: from the exchange through ccxt, or from
+          the `history_source` handed in (the local `ReplayExchange`).
+    v1.2: Each packet carries the higher-timeframe bars the shared aggregator folded for its window.
+    """
+    def __init__(self, main_config: Dict[str, Any], stream_config: Dict[str, Any], history_source: Optional[Any] = None):
+        self.main_config = main_config
+        self.stream_config = stream_config
+        self.live_config = self.main_config.get('live_engine', {}) or {}
+        self.symbol = self.main_config.get('target_symbol', 'BTC/USDT:USDT')
+        dialect_class = DIALECTS.get(self.stream_config.get('dialect') or self.live_config.get('exchange', 'binance'))
+        if dialect_class is None:
+            logger.error(f"No stream dialect for '{self.stream_config.get('dialect') or self.live_config.get('exchange')}'; speaking Binance's.")
+            dialect_class = BinanceDialect
+        self.stream_symbol = self.stream_config.get('stream_symbol') or dialect_class.symbol_for(self.symbol)
+        self.dialect = dialect_class(self.stream_symbol)
+        self.url = self.stream_config.get('url') or self.dialect.default_url
+
+        dp_config = self.main_config.get('data_provider', {})
+        self.base_timeframe_minutes = dp_config.get('timeframe_minutes', 5)
+        self.base_timeframe_str = f"{self.base_timeframe_minutes}m"
+        self.data_window_size = dp_config.get('data_window_size', 600)
+        self.book_depth = self.stream_config.get('book_depth', 20)
+        self.warmup_timeout_seconds = self.stream_config.get('warmup_timeout_seconds', 60)
+        self.candle_timeout_seconds = self.stream_config.get('candle_timeout_seconds') or None
+        self.reconnect = self.stream_config.get('reconnect', True)
+        self.reconnect_delay_seconds = self.stream_config.get('reconnect_delay_seconds', 1.0)
+        self.max_reconnect_delay_seconds = self.stream_config.get('max_reconnect_delay_seconds', 30.0)
+        self.skip_stale_candles = self.stream_config.get('skip_stale_candles', True)
+        self.max_retries = self.live_config.get('max_retries', 5)
+        # Anything with ccxt's `fetch_ohlcv(symbol, timeframe, since, limit)`. Candle history is public: no credentials.
+        self.history_source = history_source
+
+        # --- Incremental state: the book and the tape are written by the stream thread under the lock ---
+        self._lock = threading.Lock()
+        self.candles = CandleRingBuffer(self.data_window_size)
+        self.bids: Dict[float, float] = {}; self.asks: Dict[float, float] = {}
+        self._candle_tape: List[Dict[str, Any]] = []
+        # Closed candles travel to the engagement thread, which alone owns the candle ring.
+        self._events: "queue.Queue[Tuple[int, np.ndarray, Any]]" = queue.Queue()
+        self._last_closed_stamp: Optional[int] = None
+        self.time_aggregator = MultiTimeframeAggregator(self.base_timeframe_minutes, dp_config.get('strategic_timeframes', ['15m', '1h', '4h']), capacity=self.data_window_size)
+        self.indicator_cache = IndicatorCache(capacity=self.data_window_size)
+        self.swing_engine = SwingEngine(base_timeframe=self.base_timeframe_str)
+
+        self.is_warmed_up = False
+        self._stream_ended = False
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        logger.info(f"[StreamDataProvider] The Stream Herald v1.2 ready for {self.stream_symbol} at {self.url} ({self.dialect.name} dialect).")
+
+    # --- Lifecycle ---
+    def start(self):
+        if self._thread is not None: return
+        self._thread = threading.Thread(target=self._run_loop, name="StreamHerald", daemon=True)
+        self._thread.start()
+
+    def close(self):
+        self._stop.set()
+        # The consumer is cancelled, not its loop stopped, so the socket and the session are closed on the way out.
+        if self._loop is not None and self._task is not None and not self._loop.is_closed(): self._loop.call_soon_threadsafe(self._task.cancel)
+        if self._thread is not None: self._thread.join(timeout=10); self._thread = None
+
+    def _run_loop(self):
+        self._loop = asyncio.new_event_loop(); asyncio.set_event_loop(self._loop)
+        self._task = self._loop.create_task(self._consume())
+        try: self._loop.run_until_complete(self._task)
+        except asyncio.CancelledError: pass  # Cancelled by `close()`.
+        finally: self._loop.close()
+
+    async def _keep_alive(self, ws: aiohttp.ClientWebSocketResponse):
+        while not ws.closed:
+            await asyncio.sleep(self.dialect.keepalive_seconds)
+            if not ws.closed: await ws.send_json(self.dialect.keepalive())
+
+    async def _consume(self):
+        delay = self.reconnect_delay_seconds
+        async with aiohttp.ClientSession() as session:
+            while not self._stop.is_set() and not self._stream_ended:
+                try:
+                    async with session.ws_connect(self.url, heartbeat=30.0) as ws:
+                        for subscription in self.dialect.subscriptions(self.base_timeframe_str, self.book_depth): await ws.send_json(subscription)
+                        logger.info(f"[StreamDataProvider] Subscribed to the {self.stream_symbol} kline, trade and book streams.")
+                        delay = self.reconnect_delay_seconds
+                        pinger = asyncio.ensure_future(self._keep_alive(ws)) if self.dialect.keepalive_seconds else None
+                        try:
+                            async for message in ws:
+                                if message.type == aiohttp.WSMsgType.TEXT: self._dispatch(json.loads(message.data))
+                                elif message.type in (aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.ERROR): break
+                                if self._stop.is_set(): break
+                        finally:
+                            if pinger: pinger.cancel()
+                except (aiohttp.ClientError, OSError, asyncio.TimeoutError) as e:
+                    logger.warning(f"[StreamDataProvider] Stream connection lost: {e}.")
+                if self._stop.is_set(): break
+                if not self.reconnect:
+                    logger.info("[StreamDataProvider] The exchange closed the stream."); self._stream_ended = True; break
+                logger.warning(f"[StreamDataProvider] Reconnecting in {delay:.1f}s...")
+                await asyncio.sleep(delay); delay = min(delay * 2, self.max_reconnect_delay_seconds)
+
+    # --- Message handling (stream thread) ---
+    def _dispatch(self, message: Dict[str, Any]):
+        try:
+            for kind, payload in self.dialect.parse(message):
+                if kind == 'kline': self._on_kline(*payload)
+                elif kind == 'trade': self._on_trade(payload)
+                elif kind == 'book': self._on_book(*payload)
+        except (KeyError, TypeError, ValueError, IndexError) as e:
+            logger.error(f"[StreamDataProvider] Malformed {self.dialect.name} message skipped: {e}")
+
+    def _on_kline(self, stamp_ms: int, row: List[float], closed: bool):
+        if not closed: return  # Only closed bars drive decisions.
+        stamp = stamp_ms * MS_TO_NS
+        if self._last_closed_stamp is not None and stamp <= self._last_closed_stamp: return  # Replayed after a reconnect.
+        self._last_closed_stamp = stamp
+        with self._lock:
+            tape, self._candle_tape = self._candle_tape, []
+            # The book is frozen as it stood when the bar closed; the stream keeps moving after this.
+            book = {'bids': heapq.nlargest(self.book_depth, self.bids.items()), 'asks': heapq.nsmallest(self.book_depth, self.asks.items())}
+        self._events.put((stamp, np.array(row, dtype=np.float64), (book, tape)))
+
+    def _on_trade(self, trade: Dict[str, Any]):
+        with self._lock: self._candle_tape.append(trade)
+
+    def _on_book(self, bids: List[Any], asks: List[Any]):
+        # Both dialects push a top-N snapshot: it replaces the book rather than patching it.
+        with self._lock:
+            self.bids = {float(price): float(size) for price, size in bids if float(size) > 0.0}
+            self.asks = {float(price): float(size) for price, size in asks if float(size) > 0.0}
+
+    # --- IDataProvider (engagement thread) ---
+    def _history_source(self) -> Any:
+        if self.history_source is None:
+            exchange_id = self.live_config.get('exchange', self.dialect.name)
+            self.history_source = getattr(ccxt, exchange_id)({'options': {'defaultType': self.live_config.get('market_type', 'swap')},
+                                                              'timeout': self.live_config.get('request_timeout_ms', 30000)})
+        return self.history_source
+
+    def _fetch_history(self) -> Optional[list]:
+        delay = self.reconnect_delay_seconds; deadline = time.monotonic() + self.warmup_timeout_seconds
+        for attempt in range(1, self.max_retries + 1):
+            try: return self._history_source().fetch_ohlcv(self.symbol, self.base_timeframe_str, limit=self.data_window_size + 1)
+            except (ccxt.NetworkError, ccxt.ExchangeError, OSError) as e:
+                logger.warning(f"Warmup history fetch failed (attempt {attempt}/{self.max_retries}): {e}")
+            if time.monotonic() + delay > deadline: break
+            time.sleep(delay); delay = min(delay * 2, self.max_reconnect_delay_seconds)
+        return None
+
+    def _warmup_memory_buffer(self) -> bool:
+        # The stream is joined first, so no bar closes unseen between the REST snapshot and the first push.
+        self.start()
+        ohlcv = self._fetch_history()
+        if not ohlcv or len(ohlcv) < 2:
+            logger.error("Stream warmup failed: no candle history could be fetched."); return False
+        rows = np.asarray(ohlcv[:-1], dtype=np.float64)  # The last bar is still in progress; the stream will close it.
+        self.candles.load(rows[:, 0].astype(np.int64) * MS_TO_NS, rows[:, 1:1 + len(OHLCV_COLUMNS)])
+        self.is_warmed_up = True
+        logger.info(f"Memory buffer warmup complete. {self.candles.count} candles in the ring, last at {pd.Timestamp(self.candles.last_stamp())}.")
+        return True
+
+    def fetch_next_market_data(self) -> Optional[MarketDataFrame]:
+        if not self.is_warmed_up:
+            if not self._warmup_memory_buffer(): return None
+            return self._create_mdf({'bids': [], 'asks': []}, [])
+
+        while True:
+            try: event = self._events.get(timeout=self.candle_timeout_seconds or 1.0)
+            except queue.Empty:
+                if self._stream_ended or self._stop.is_set(): return None
+                if self.candle_timeout_seconds: logger.warning("No closed candle within the timeout. Waiting...")
+                continue
+            # Live, a slow consumer never decides on stale bars: every closed candle is folded into the
+            # ring, but only the newest one is judged. A replay sets `skip_stale_candles: false` to judge them all.
+            skipped = -1; fresh = None
+            while True:
+                stamp, row, snapshots = event
+                # Bars the REST warmup already holds were pushed while it was being fetched.
+                if self.candles.last_stamp() is None or stamp > self.candles.last_stamp():
+                    self.candles.push(stamp, row); fresh = (stamp, snapshots); skipped += 1
+                if not self.skip_stale_candles or self._events.empty(): break
+                event = self._events.get_nowait()
+            if fresh is None: continue
+            if skipped: logger.warning(f"Consumer lagged behind the stream; skipped {skipped} closed candle(s).")
+            logger.debug(f"New {self.base_timeframe_str} candle closed at {pd.Timestamp(fresh[0])}")
+            return self._create_mdf(*fresh[1])
+
+    def _create_mdf(self, order_book: Dict[str, Any], tape: List[Dict[str, Any]]) -> Optional[MarketDataFrame]:
+        if not self.candles.count: return None
+        # The ring is owned by this thread alone, so the window is handed out as a zero-copy view.
+        df = self.candles.as_frame(); stamps, values = self.candles.view()
+        ohlcv_multidim = {self.base_timeframe_str: df, **self.time_aggregator.window_frames(stamps, values)}
+        return MarketDataFrame(
+            timestamp=df.index[-1], symbol=self.symbol, ohlcv_multidim=ohlcv_multidim,
+            order_book_snapshot=order_book, tape_snapshot=tape, timeframe_aggregator=self.time_aggregator,
+            indicator_cache=self.indicator_cache, swing_engine=self.swing_engine)
+
+    def has_more_data(self) -> bool:
+        return not (self._stream_ended and self._events.empty())
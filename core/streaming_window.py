@@ -0,0 +1,135 @@
+# F:\ShadowVanguard_Legion_Godspeed\core\streaming_window.py
+# Version 1.3 - Prometheus, The Ring Warden
+
+import logging
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger("StreamingWindowEngine")
+
+OHLCV_COLUMNS: List[str] = ["open", "high", "low", "close", "volume"]
+
+
+class CandleRingBuffer:
+    """
+    THE RING WARDEN'S VAULT: A preallocated, mirrored ring of candles. Every row is
+    written twice (at `slot` and `slot + capacity`), so the most recent `count` rows
+    are ALWAYS one contiguous slice of the backing array. Pushing is O(1) and reading
+    the window is a zero-copy view, no matter how long the campaign has run.
+    """
+    __slots__ = ("capacity", "columns", "values", "stamps", "_write", "count")
+
+    def __init__(self, capacity: int, columns: List[str] = OHLCV_COLUMNS):
+        self.capacity = max(1, int(capacity))
+        self.columns = list(columns)
+        self.values = np.empty((2 * self.capacity, len(self.columns)), dtype=np.float64)
+        self.stamps = np.empty(2 * self.capacity, dtype=np.int64)
+        self._write = 0; self.count = 0
+
+    def reset(self):
+        self._write = 0; self.count = 0
+
+    # A snapshot keeps only the live window: the mirror and the unwritten slots are rebuilt on load.
+    def __getstate__(self) -> Tuple:
+        stamps, values = self.view()
+        return self.capacity, self.columns, np.array(stamps), np.array(values)
+
+    def __setstate__(self, state: Tuple):
+        capacity, columns, stamps, values = state
+        self.capacity = capacity; self.columns = columns
+        self.values = np.zeros((2 * capacity, len(columns)), dtype=np.float64); self.stamps = np.zeros(2 * capacity, dtype=np.int64)
+        self.load(stamps, values)
+
+    def push(self, stamp: int, row: np.ndarray):
+        slot = self._write
+        self.values[slot] = row; self.values[slot + self.capacity] = row
+        self.stamps[slot] = stamp; self.stamps[slot + self.capacity] = stamp
+        self._write = (slot + 1) % self.capacity
+        if self.count < self.capacity: self.count += 1
+
+    def pop(self):
+        """Forgets the newest row (its slot is simply rewritten by the next push)."""
+        if self.count: self._write = (self._write - 1) % self.capacity; self.count -= 1
+
+    def load(self, stamps: np.ndarray, rows: np.ndarray):
+        """Bulk-primes the ring with the tail of `rows`, discarding whatever it held."""
+        self.reset()
+        stamps = stamps[-self.capacity:]; rows = rows[-self.capacity:]; n = len(stamps)
+        if n == 0: return
+        self.values[:n] = rows; self.values[self.capacity:self.capacity + n] = rows
+        self.stamps[:n] = stamps; self.stamps[self.capacity:self.capacity + n] = stamps
+        self._write = n % self.capacity; self.count = n
+
+    def _bounds(self) -> Tuple[int, int]:
+        end = self._write + self.capacity
+        return end - self.count, end
+
+    def view(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns read-only (stamps, values) views over the current window, oldest first."""
+        start, end = self._bounds()
+        stamps_view = self.stamps[start:end]; values_view = self.values[start:end]
+        stamps_view.flags.writeable = False; values_view.flags.writeable = False
+        return stamps_view, values_view
+
+    def last_stamp(self) -> Optional[int]:
+        return int(self.stamps[self._write + self.capacity - 1]) if self.count else None
+
+    def as_frame(self, copy: bool = False) -> pd.DataFrame:
+        """
+        The current window as an OHLCV frame, oldest first. By default the frame is a LIVE VIEW:
+        its values and index are the ring's own slots, so once the ring moves on (the next push,
+        pop or load) a frame kept from before shows other candles. That suits the per-tick
+        readers; whoever keeps a frame past the tick asks for `copy=True`.
+        """
+        # [ZERO-COPY WRAPPER]: The frame's single float block is the ring view itself. Analyzers that
+        # add columns (e.g. 'atr') get new blocks; the vault beneath them is read-only and untouched.
+        stamps_view, values_view = self.view()
+        if copy: stamps_view, values_view = stamps_view.copy(), values_view.copy()
+        index = pd.DatetimeIndex(stamps_view.view("M8[ns]"))
+        return pd.DataFrame(values_view, index=index, columns=self.columns, copy=False)
+
+
+class StreamingWindowEngine:
+    """
+    THE RING WARDEN: Replaces the per-tick `iloc` slice of the base history with one ring
+    buffer and a monotonic cursor. A tick pushes exactly one base candle, so per-tick cost is
+    flat in the length of history. Higher timeframes are not the Warden's: they are folded
+    once per tick by the provider's `MultiTimeframeAggregator`.
+    """
+    def __init__(self, base_df: pd.DataFrame, window_size: int, base_label: str):
+        self.window_size = int(window_size)
+        self.base_label = base_label
+        self._base_stamps, self._base_values = self._to_arrays(base_df)
+        self._base_ring = CandleRingBuffer(self.window_size)
+        self.start_index: Optional[int] = None
+        logger.info(f"[StreamingWindowEngine] The Ring Warden v1.3 is online. Window: {self.window_size}, timeframe: {base_label}.")
+
+    @staticmethod
+    def _to_arrays(df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+        if df is None or df.empty: return np.empty(0, dtype=np.int64), np.empty((0, len(OHLCV_COLUMNS)), dtype=np.float64)
+        stamps = np.ascontiguousarray(pd.DatetimeIndex(df.index).asi8, dtype=np.int64)
+        values = np.ascontiguousarray(df[OHLCV_COLUMNS].to_numpy(dtype=np.float64))
+        return stamps, values
+
+    def __len__(self) -> int:
+        return len(self._base_stamps)
+
+    def seek(self, start_index: int):
+        """Re-primes the ring so the window covers [start_index, start_index + window_size)."""
+        end_index = start_index + self.window_size
+        self._base_ring.load(self._base_stamps[start_index:end_index], self._base_values[start_index:end_index])
+        self.start_index = start_index
+
+    def advance(self):
+        """Slides the window forward by exactly one base candle."""
+        new_index = self.start_index + self.window_size
+        self._base_ring.push(self._base_stamps[new_index], self._base_values[new_index])
+        self.start_index += 1
+
+    def window_at(self, start_index: int) -> Optional[Tuple[pd.Timestamp, Dict[str, pd.DataFrame]]]:
+        """Positions the engine at `start_index` (advancing when sequential, seeking otherwise) and returns the frames."""
+        if start_index < 0 or start_index + self.window_size > len(self): return None
+        if self.start_index is not None and start_index == self.start_index + 1: self.advance()
+        elif start_index != self.start_index: self.seek(start_index)
+        return pd.Timestamp(self._base_ring.last_stamp()), {self.base_label: self._base_ring.as_frame()}
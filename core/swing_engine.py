@@ -0,0 +1,148 @@
+# F:\ShadowVanguard_Legion_Godspeed\core\swing_engine.py
+# Version 1.1 - Prometheus, The Pivot Sentinel
+
+import logging
+from bisect import bisect_left
+from collections import deque
+from heapq import merge
+from typing import Dict, Any, List, Optional, Tuple, Deque
+
+import numpy as np
+import pandas as pd
+
+from .data_models import SwingPivot
+
+logger = logging.getLogger("SwingEngine")
+
+
+class PivotTracker:
+    """
+    One side (highs or lows) of one series. A monotonic stack holds the bars that no later
+    bar has broken yet, so every new bar learns in amortized O(1) how many bars on its left
+    it dominates, and every bar it breaks learns how many bars on its right it dominated.
+    A bar is confirmed as a pivot once `min_strength` bars have closed on each side of it.
+    """
+    __slots__ = ("kind", "sign", "min_strength", "max_strength", "pivots", "ordinal", "_stack", "_ordinals")
+
+    def __init__(self, kind: str, min_strength: int, max_strength: int, history: int):
+        self.kind = kind; self.sign = 1.0 if kind == 'high' else -1.0
+        self.min_strength = max(1, int(min_strength)); self.max_strength = max(self.min_strength, int(max_strength))
+        self.pivots: Deque[SwingPivot] = deque(maxlen=history)
+        self.ordinal = -1
+        self._stack: List[list] = []   # [ordinal, stamp, signed price, left, pivot or None], oldest first
+        self._ordinals: List[int] = []  # The stack's ordinals, for bisection
+
+    def push(self, stamp: int, price: float):
+        j = self.ordinal + 1; value = price * self.sign; stack = self._stack; ordinals = self._ordinals
+        while stack and stack[-1][2] < value:  # Every bar this one breaks has its right-hand span settled.
+            broken = stack.pop(); ordinals.pop()
+            if broken[4] is not None: broken[4].right = min(j - broken[0] - 1, self.max_strength)
+        k = len(stack) - 1
+        while k >= 0 and stack[k][2] == value: k -= 1  # Equal bars do not break each other.
+        left = min(j - stack[k][0] - 1 if k >= 0 else j, self.max_strength)
+        stack.append([j, stamp, value, left, None]); ordinals.append(j); self.ordinal = j
+
+        candidate = j - self.min_strength
+        slot = bisect_left(ordinals, candidate)
+        if candidate >= 0 and slot < len(ordinals) and ordinals[slot] == candidate:
+            entry = stack[slot]
+            if entry[3] >= self.min_strength:
+                entry[4] = SwingPivot(kind=self.kind, price=entry[2] * self.sign, stamp=entry[1], ordinal=candidate, left=entry[3])
+                self.pivots.append(entry[4])
+
+        # Bars older than the strength cap can no longer change anything: they leave the stack at full strength.
+        horizon = j - self.max_strength - 1; expired = bisect_left(ordinals, horizon)
+        if expired:
+            for entry in stack[:expired]:
+                if entry[4] is not None: entry[4].right = self.max_strength
+            del stack[:expired]; del ordinals[:expired]
+
+    def strength(self, pivot: SwingPivot) -> int:
+        right = pivot.right if pivot.right is not None else self.ordinal - pivot.ordinal
+        return min(pivot.left, right, self.max_strength)
+
+
+class SwingLedger:
+    """The pivot history of one timeframe: a highs tracker and a lows tracker fed from the same closed bars."""
+    __slots__ = ("highs", "lows", "last_stamp", "_args")
+
+    def __init__(self, min_strength: int = 2, max_strength: int = 100, history: int = 500):
+        self._args = (min_strength, max_strength, history)
+        self.reset()
+
+    def reset(self):
+        self.highs = PivotTracker('high', *self._args); self.lows = PivotTracker('low', *self._args); self.last_stamp: Optional[int] = None
+
+    def extend(self, stamps: np.ndarray, high: np.ndarray, low: np.ndarray):
+        """Folds in the bars it has not yet seen; a rewind or a gap in the stream starts a fresh ledger."""
+        if len(stamps) == 0: return
+        first = 0
+        if self.last_stamp is not None:
+            first = int(np.searchsorted(stamps, self.last_stamp, side='right'))
+            if first == 0 or int(stamps[first - 1]) != self.last_stamp: self.reset(); first = 0
+        for stamp, h, l in zip(stamps[first:].tolist(), high[first:].tolist(), low[first:].tolist()):
+            self.highs.push(stamp, h); self.lows.push(stamp, l)
+        self.last_stamp = int(stamps[-1])
+
+    def pivots(self, min_strength: int, kind: Optional[str] = None, since_stamp: Optional[int] = None, count: Optional[int] = None) -> List[SwingPivot]:
+        """Confirmed pivots of at least `min_strength`, oldest first (highs and lows interleaved unless `kind` is given).
+        `count` keeps only the most recent ones of each side, which stops the walk back early."""
+        sides = [t for t in (self.highs, self.lows) if kind is None or t.kind == kind]
+        selected = []
+        for tracker in sides:
+            picked = []
+            for pivot in reversed(tracker.pivots):
+                if since_stamp is not None and pivot.stamp < since_stamp: break
+                if tracker.strength(pivot) >= min_strength:
+                    picked.append(pivot)
+                    if count is not None and len(picked) >= count: break
+            selected.append(picked[::-1])
+        return list(merge(*selected, key=lambda p: p.ordinal)) if len(selected) > 1 else selected[0]
+
+
+class SwingEngine:
+    """
+    THE PIVOT SENTINEL: One streaming swing detector per data provider, serving fibonacci,
+    divergence and structure analysis from the same pivot set. Each timeframe keeps a
+    `SwingLedger`; pivots are confirmed as bars close and carry their strength (how many bars
+    they dominate on both sides), so an analyzer asking for `order=15` swings and one asking
+    for `order=10` read the same pivots, filtered by strength. A pivot of strength >= k is
+    exactly a point `argrelextrema(..., np.greater_equal, order=k)` reports inside the window.
+    """
+    def __init__(self, base_timeframe: str = '5m', min_strength: int = 2, max_strength: int = 100, history: int = 500):
+        self.base_timeframe = base_timeframe
+        self.min_strength = min_strength; self.max_strength = max_strength; self.history = history
+        self.ledgers: Dict[str, SwingLedger] = {}
+
+    def reset(self):
+        self.ledgers.clear()
+
+    def ledger(self, timeframe: str, df: pd.DataFrame) -> SwingLedger:
+        """Brings the timeframe's ledger up to the last closed bar of `df` (a higher-timeframe tail bar is still forming)."""
+        ledger = self.ledgers.get(timeframe)
+        if ledger is None: ledger = self.ledgers[timeframe] = SwingLedger(self.min_strength, self.max_strength, self.history)
+        settled = len(df) if timeframe == self.base_timeframe else len(df) - 1
+        if settled > 0:
+            stamps = df.index.asi8[:settled]
+            if ledger.last_stamp != int(stamps[-1]):
+                ledger.extend(stamps, df['high'].to_numpy(dtype=np.float64)[:settled], df['low'].to_numpy(dtype=np.float64)[:settled])
+        return ledger
+
+    def pivots(self, timeframe: str, df: pd.DataFrame, min_strength: int, kind: Optional[str] = None, count: Optional[int] = None) -> List[SwingPivot]:
+        """The confirmed pivots inside the window of `df`, oldest first (only the last `count` of each side, if given)."""
+        if df is None or df.empty: return []
+        return self.ledger(timeframe, df).pivots(max(min_strength, self.min_strength), kind, since_stamp=int(df.index.asi8[0]), count=count)
+
+    def swing_positions(self, timeframe: str, df: pd.DataFrame, order: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Window positions of the swing highs and swing lows of at least `order`: the drop-in for `argrelextrema` scans."""
+        stamps = df.index.asi8
+        def _positions(kind: str) -> np.ndarray:
+            return np.searchsorted(stamps, np.array([p.stamp for p in self.pivots(timeframe, df, order, kind)], dtype=np.int64))
+        return _positions('high'), _positions('low')
+
+
+def find_swing_points(high: np.ndarray, low: np.ndarray, order: int) -> Tuple[List[int], List[int]]:
+    """One-shot pivots of a bare array window (no stamps, no history): positions of the swing highs and lows of `order`."""
+    ledger = SwingLedger(min_strength=order, max_strength=order, history=len(high))
+    ledger.extend(np.arange(len(high), dtype=np.int64), np.asarray(high, dtype=np.float64), np.asarray(low, dtype=np.float64))
+    return [p.ordinal for p in ledger.pivots(order, 'high')], [p.ordinal for p in ledger.pivots(order, 'low')]
@@ -0,0 +1,137 @@
+# F:\ShadowVanguard_Legion_Godspeed\core\zone_index.py
+# Version 1.1 - Prometheus, The Zone Cartographer
+
+import logging
+from bisect import bisect_left, bisect_right, insort
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger("ZoneIndex")
+
+_AFTER = float('inf')   # Sorts after every insertion number at the same price
+_BEFORE = -1            # Sorts before every insertion number at the same price
+
+
+def zone_bounds(zone: Any) -> Tuple[float, float]:
+    if hasattr(zone, 'price_low'): return float(zone.price_low), float(zone.price_high)
+    low, high = zone.price_range; return float(low), float(high)  # Legacy `LiquidityVoid`, `FibonacciZone`
+
+
+class ZoneIndex:
+    """
+    THE ZONE CARTOGRAPHER: A price-interval index over zones (order blocks, voids, anything
+    with `price_low`/`price_high` or a `price_range`). Two bisect-sorted ladders, one of lows
+    and one of highs, answer "which zones does this candle touch", "which zones does this
+    close mitigate" and "which zone is the nearest floor or ceiling" in logarithmic time, so
+    a map holding hundreds of zones costs the same per tick as a map holding ten.
+    Ties are resolved to the zone added first, exactly as a scan over the insertion-ordered
+    list with `min()`/`max()` resolves them; query results come back in insertion order.
+    """
+    __slots__ = ("_zones", "_lows", "_highs", "_seq", "_next")
+
+    def __init__(self, zones: Iterable[Any] = ()):
+        self._zones: Dict[int, Tuple[Any, float, float]] = {}  # insertion number -> (zone, low, high)
+        self._seq: Dict[int, int] = {}                          # id(zone) -> insertion number
+        self._lows: List[Tuple[float, int]] = []; self._highs: List[Tuple[float, int]] = []
+        self._next = 0
+        for zone in zones: self.add(zone)
+
+    def __len__(self) -> int:
+        return len(self._zones)
+
+    def __iter__(self) -> Iterator[Any]:
+        return (entry[0] for entry in self._zones.values())
+
+    def __contains__(self, zone: Any) -> bool:
+        return id(zone) in self._seq
+
+    def zones(self) -> List[Any]:
+        return [entry[0] for entry in self._zones.values()]
+
+    # Zones are tracked by identity, and identities do not survive a pickle: the lookup is rebuilt on load.
+    def __getstate__(self) -> Tuple:
+        return self._zones, self._lows, self._highs, self._next
+
+    def __setstate__(self, state: Tuple):
+        self._zones, self._lows, self._highs, self._next = state
+        self._seq = {id(entry[0]): seq for seq, entry in self._zones.items()}
+
+    # --- Maintenance ---
+    def add(self, zone: Any):
+        if id(zone) in self._seq: return
+        low, high = zone_bounds(zone); seq = self._next; self._next += 1
+        self._zones[seq] = (zone, low, high); self._seq[id(zone)] = seq
+        insort(self._lows, (low, seq)); insort(self._highs, (high, seq))
+
+    def discard(self, zone: Any):
+        seq = self._seq.pop(id(zone), None)
+        if seq is None: return
+        _, low, high = self._zones.pop(seq)
+        del self._lows[bisect_left(self._lows, (low, seq))]; del self._highs[bisect_left(self._highs, (high, seq))]
+
+    def clear(self):
+        self._zones.clear(); self._seq.clear(); self._lows.clear(); self._highs.clear()
+
+    def _evict(self, entries: List[Tuple[float, int]]) -> List[Any]:
+        evicted = [self._zones[seq][0] for _, seq in sorted(entries, key=lambda e: e[1])]
+        for zone in evicted: self.discard(zone)
+        return evicted
+
+    def evict_lows_above(self, price: float) -> List[Any]:
+        """Removes and returns every zone lying entirely above `price` (a demand zone closed through)."""
+        return self._evict(self._lows[bisect_right(self._lows, (price, _AFTER)):])
+
+    def evict_highs_below(self, price: float) -> List[Any]:
+        """Removes and returns every zone lying entirely below `price` (a supply zone closed through)."""
+        return self._evict(self._highs[:bisect_left(self._highs, (price, _BEFORE))])
+
+    # --- Queries ---
+    def _ordered(self, entries: List[Tuple[float, int]]) -> List[Any]:
+        return [self._zones[seq][0] for seq in sorted(seq for _, seq in entries)]
+
+    def highs_at_or_above(self, price: float) -> List[Any]:
+        """Zones reaching up to `price` or beyond: the ones a candle whose low is `price` has touched from above."""
+        return self._ordered(self._highs[bisect_left(self._highs, (price, _BEFORE)):])
+
+    def lows_at_or_below(self, price: float) -> List[Any]:
+        """Zones reaching down to `price` or beyond: the ones a candle whose high is `price` has touched from below."""
+        return self._ordered(self._lows[:bisect_right(self._lows, (price, _AFTER))])
+
+    def containing(self, price: float) -> List[Any]:
+        """Zones with `low <= price <= high`, walking whichever ladder has fewer candidates."""
+        return self.overlapping(price, price)
+
+    def overlapping(self, low: float, high: float) -> List[Any]:
+        """Zones sharing at least one price with `[low, high]` (touching counts)."""
+        below = bisect_right(self._lows, (high, _AFTER)); above = bisect_left(self._highs, (low, _BEFORE))
+        if below <= len(self._highs) - above:
+            return self._ordered([e for e in self._lows[:below] if self._zones[e[1]][2] >= low])
+        return self._ordered([e for e in self._highs[above:] if self._zones[e[1]][1] <= high])
+
+    def _first_at(self, ladder: List[Tuple[float, int]], value: float) -> Any:
+        return self._zones[ladder[bisect_left(ladder, (value, _BEFORE))][1]][0]
+
+    def nearest_below(self, price: float) -> Optional[Any]:
+        """The zone whose high is the greatest one strictly below `price` (the nearest floor)."""
+        i = bisect_left(self._highs, (price, _BEFORE))
+        return self._first_at(self._highs, self._highs[i - 1][0]) if i else None
+
+    def nearest_above(self, price: float) -> Optional[Any]:
+        """The zone whose low is the smallest one strictly above `price` (the nearest ceiling)."""
+        i = bisect_right(self._lows, (price, _AFTER))
+        return self._zones[self._lows[i][1]][0] if i < len(self._lows) else None
+
+    def nearest_to(self, price: float, bound: str = 'high') -> Optional[Any]:
+        """The zone whose `bound` ('low' or 'high') is closest to `price`, on either side."""
+        ladder = self._highs if bound == 'high' else self._lows
+        if not ladder: return None
+        i = bisect_left(ladder, (price, _BEFORE)); candidates = []
+        if i: candidates.append(self._first_at(ladder, ladder[i - 1][0]))
+        if i < len(ladder): candidates.append(self._zones[ladder[i][1]][0])
+        pick = lambda zone: (abs(zone_bounds(zone)[bound == 'high'] - price), self._seq[id(zone)])
+        return min(candidates, key=pick)
+
+
+def side_index(indexes: Dict[str, Dict[str, ZoneIndex]], zones: Dict[str, Dict[str, List[Any]]], timeframe: str, side: str) -> ZoneIndex:
+    """The report's live index for one timeframe and side, or one built from its zone list when the report carries none."""
+    index = indexes.get(timeframe, {}).get(side)
+    return index if index is not None else ZoneIndex(zones.get(timeframe, {}).get(side, []))
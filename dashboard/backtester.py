@@ -32,7 +32,7 @@ class Backtester:
         
         # --- FINALIZED: Initialize components like in main.py ---
         self.data_provider = DataProvider(self.config.get('data_provider', {}))
-        self.memory = ExperienceMemory(self.config.get('memory', {}).get('max_size', 1000))
+        self.memory = ExperienceMemory(max_size=self.config.get('memory', {}).get('max_size', 1000))
         
         self.power_scanner = PowerScanner(self.config.get('power_scanner', {}))
         self.emotion_engine = SyntheticEmotionEngine(self.config.get('emotion_engine', {}))
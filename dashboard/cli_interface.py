@@ -1,8 +1,9 @@
 # F:\ShadowVanguard_Legion_Godspeed\dashboard\cli_interface.py
-# Version 7.0 - Prometheus, The Oracle's Herald
+# Version 8.0 - Prometheus, The Oracle's Herald
 
 import logging
-from typing import List, Dict, Any, Optional
+from dataclasses import dataclass
+from typing import List, Dict, Any, Optional, Tuple
 
 from rich.console import Console
 from rich.panel import Panel
@@ -22,6 +23,20 @@ from risk_manager.capital_allocator import CapitalAllocator
 
 logger = logging.getLogger("CliInterface")
 
+# The War Room's panels, in drawing order, and the Herald's method that paints each from its snapshot values.
+PANEL_PAINTERS = {
+    'header': '_create_header', 'market': '_create_market_overview_panel', 'power': '_create_power_panel',
+    'intel': '_create_intel_reports_panel', 'positions': '_create_positions_panel', 'decision': '_create_decision_panel',
+    'strategic_map': '_create_strategic_map_panel', 'profile': '_create_profile_panel'}
+PANELS = tuple(PANEL_PAINTERS)
+
+
+@dataclass(frozen=True, slots=True)
+class DashboardSnapshot:
+    tick: int
+    panels: Dict[str, Any]  # panel name -> plain values (numbers, names, tuples); equal values draw an equal panel
+
+
 class CliInterface:
     """
     THE ORACLE'S HERALD: The final, perfected version of the War Room. This Herald
@@ -29,11 +44,14 @@ class CliInterface:
     synthesized judgment ('TrueNetForce') and displays all critical counter-intelligence
     signals. The communication from the battlefield to the Commander is now pure,
     unambiguous, and complete. The final protocol mismatch is resolved.
+    v8.0: Every panel is painted from a DashboardSnapshot of plain values captured in the
+    trading thread, so the War Room relay (dashboard/war_room.py) can draw it elsewhere and
+    repaint only the panels whose values changed.
     """
-    def __init__(self):
-        # [PACT KEPT]: This method is PRESERVED exactly as submitted in v6.0.
-        self.console = Console()
-        logger.info("[CliInterface] The Oracle's Herald v7.0 is ready.")
+    def __init__(self, console: Optional[Console] = None):
+        # [PACT KEPT]: This method is PRESERVED as submitted in v6.0; a renderer may hand in its own console.
+        self.console = console or Console()
+        logger.info("[CliInterface] The Oracle's Herald v8.0 is ready.")
 
     def display_welcome_message(self):
         # [PACT KEPT]: This method is PRESERVED exactly as submitted in v6.0.
@@ -56,26 +74,72 @@ class CliInterface:
             liq_report: Optional[LiquidityReport], fib_report: Optional[FibonacciReport],
             div_report: Optional[DivergenceReport], final_decision: TacticalDecision,
             signal: Optional[TacticalSignal], active_positions: List[PositionV2],
-            capital_allocator: CapitalAllocator, strategic_map: Optional[Dict[str, Any]] = None):
-        # [PACT KEPT]: This entire method is PRESERVED exactly as submitted in v6.0.
-        # The change is ONLY in the sub-method it calls (_create_power_panel).
+            capital_allocator: CapitalAllocator, strategic_map: Optional[Dict[str, Any]] = None,
+            profile_summary: Optional[List[Dict[str, Any]]] = None):
+        # [PACT KEPT]: The one-shot War Room is PRESERVED; it now paints a snapshot like the War Room relay does.
+        snapshot = self.capture(mdf, structure_report, power_report, emotion_report, ob_report, liq_report, fib_report, div_report,
+                                final_decision, signal, active_positions, capital_allocator, strategic_map, profile_summary)
+        layout = self.build_layout()
+        for name in PANELS: self.paint(layout, name, snapshot.panels[name])
+        self.console.clear(); self.console.print(layout)
+
+    # --- Snapshots: what the War Room shows, as plain values ---
+    def capture(
+            self,
+            mdf: MarketDataFrame,
+            structure_report: Optional[StructureReport], power_report: Optional[PowerReport],
+            emotion_report: Optional[EmotionReport], ob_report: Optional[OrderBlockReport],
+            liq_report: Optional[LiquidityReport], fib_report: Optional[FibonacciReport],
+            div_report: Optional[DivergenceReport], final_decision: TacticalDecision,
+            signal: Optional[TacticalSignal], active_positions: List[PositionV2],
+            capital_allocator: CapitalAllocator, strategic_map: Optional[Dict[str, Any]] = None,
+            profile_summary: Optional[List[Dict[str, Any]]] = None, tick: int = 0) -> 'DashboardSnapshot':
+        """
+        Reduces the tick's reports to the few numbers and names each panel shows. It runs in the
+        trading thread and holds no reference to a live object, so the snapshot can be handed to
+        a renderer thread or process, compared with the previous one, or written out as JSON.
+        """
+        structure = structure_report or StructureReport(); power = power_report or PowerReport(); emo = emotion_report or EmotionReport()
+        price_data = mdf.ohlcv_multidim.get('5m'); price = float(price_data['close'].iloc[-1]) if price_data is not None and not price_data.empty else None
+        avg_pnl = sum(p.pnl_percentage for p in active_positions) / len(active_positions) if active_positions else None
+        signal_counts = tuple(sum(len(v) for v in signals.values()) if signals else 0 for signals in (
+            ob_report.interaction_signals if ob_report else None, liq_report.confirmation_signals if liq_report else None,
+            fib_report.confirmation_signals if fib_report else None, div_report.confirmation_signals if div_report else None))
+        trend = structure.primary_trend.get('1h', 'N/A')
+        panels = {
+            'header': (float(capital_allocator.current_capital), avg_pnl),
+            'market': (str(getattr(mdf, 'symbol', 'N/A')), price, getattr(trend, 'value', trend),
+                       getattr(structure.market_personality, 'name', 'UNCERTAIN'), float(structure.personality_certainty)),
+            'power': (float(power.true_net_force), float(power.book_imbalance), float(power.delta_joiners), power.absorption_signal),
+            'intel': (emo.dominant_mood, *signal_counts),
+            'positions': tuple((p.position_id[:8], p.side.name, float(p.size), float(p.entry_price), float(p.pnl_percentage),
+                                float(p.catastrophic_stop_loss) if p.catastrophic_stop_loss else None,
+                                bool(p.hedge_trap and p.hedge_trap.status == "ACTIVE")) for p in active_positions),
+            'decision': (final_decision.name, float(signal.confidence), signal.source) if signal else (final_decision.name, None, None),
+            'strategic_map': (sum(len(v) for v in strategic_map.get('order_blocks', {}).values()),
+                              sum(len(v) for v in strategic_map.get('fvgs', {}).values())) if strategic_map else None,
+            'profile': tuple(profile_summary) if profile_summary else None,
+        }
+        return DashboardSnapshot(tick=tick, panels=panels)
+
+    def build_layout(self) -> Layout:
+        """The War Room's frame, with one named slot per panel."""
         layout = Layout(name="root"); layout.split(Layout(name="header", size=3), Layout(ratio=1, name="main"))
         layout["main"].split_row(Layout(name="left_intel", ratio=4), Layout(name="operations", ratio=3))
-        operations_column = Layout(name="operations_column"); operations_column.split(
-            self._create_positions_panel(active_positions), self._create_decision_panel(final_decision, signal),
-            self._create_strategic_map_panel(strategic_map))
-        layout["operations"].update(operations_column)
-        if active_positions: avg_pnl_percent = sum(p.pnl_percentage for p in active_positions)/len(active_positions); pnl_text = f"Avg PnL: {avg_pnl_percent:+.2f}%"
-        else: pnl_text = "Avg PnL: N/A"
-        header_text=f"[bold]SHADOWVANGUARD LEGION - WAR ROOM[/bold]|Capital: ${capital_allocator.current_capital:,.2f}|{pnl_text}"
-        layout["header"].update(Align.center(header_text, vertical="middle"))
-        left_intel_column = Layout(name="left_intel_column"); left_intel_column.split(
-            self._create_market_overview_panel(mdf, structure_report),
-            self._create_power_panel(power_report), # This now calls the modernized version.
-            self._create_intel_reports_panel(ob_report, liq_report, fib_report, div_report, emotion_report))
-        layout["left_intel"].update(left_intel_column)
-        self.console.clear(); self.console.print(layout)
-    
+        layout["left_intel"].split(Layout(name="market"), Layout(name="power"), Layout(name="intel"))
+        layout["operations"].split(Layout(name="positions"), Layout(name="decision"), Layout(name="strategic_map"), Layout(name="profile"))
+        return layout
+
+    def paint(self, layout: Layout, name: str, data: Any):
+        """Redraws one panel of `layout` from its snapshot values."""
+        if name == 'profile': layout[name].visible = data is not None
+        layout[name].update(getattr(self, PANEL_PAINTERS[name])(data))
+
+    def _create_header(self, data: Tuple[float, Optional[float]]) -> Align:
+        capital, avg_pnl = data
+        pnl_text = f"Avg PnL: {avg_pnl:+.2f}%" if avg_pnl is not None else "Avg PnL: N/A"
+        return Align.center(f"[bold]SHADOWVANGUARD LEGION - WAR ROOM[/bold]|Capital: ${capital:,.2f}|{pnl_text}", vertical="middle")
+
     def display_final_report(self, capital_allocator: CapitalAllocator):
         # [PACT KEPT]: This method is PRESERVED exactly as submitted in v6.0.
         final_capital=capital_allocator.current_capital; initial_capital=capital_allocator.initial_capital
@@ -88,95 +152,102 @@ class CliInterface:
         report_table.add_row("Total PnL:",f"[{color}]${pnl:,.2f} ({pnl_percent:+.2f}%)[/{color}]")
         self.console.print(Panel(report_table, border_style="bold blue", title="--- FINAL CAMPAIGN REPORT ---"))
 
-    def _create_strategic_map_panel(self, strategic_map: Optional[Dict[str, Any]]) -> Panel:
-        # [PACT KEPT]: This method is PRESERVED exactly as submitted in v6.0.
-        if not strategic_map: return Panel(Align.center("[dim]Strategic Map Unavailable[/dim]"), title="[7] Alexandria Library", border_style="dim")
-        text=Text(); ob_map=strategic_map.get('order_blocks',{}); total_obs=sum(len(v) for v in ob_map.values())
-        liq_map=strategic_map.get('liquidity_voids',{}); total_liqs=sum(len(v) for v in liq_map.values())
+    def display_profile_report(self, profile_summary: List[Dict[str, Any]]):
+        # [SURGICAL UPGRADE]: The Chronometer's debriefing, printed once the campaign ends.
+        if profile_summary: self.console.print(self._create_profile_panel(profile_summary, full=True))
+
+    def _create_profile_panel(self, profile_summary: Optional[List[Dict[str, Any]]], full: bool = False) -> Panel:
+        table = Table(show_header=True, header_style="bold magenta", padding=(0,1))
+        columns = ["Stage", "p50 ms", "p95 ms", "p99 ms", "Max ms", "Share"] + (["Calls", "Mean ms", "Blocks/call"] if full else [])
+        for i, column in enumerate(columns): table.add_column(column, justify="left" if i == 0 else "right")
+        for row in profile_summary or ():
+            cells = [row['stage'], f"{row['p50_ms']:.3f}", f"{row['p95_ms']:.3f}", f"{row['p99_ms']:.3f}", f"{row['max_ms']:.2f}", f"{row['share_pct']:.1f}%"]
+            if full:
+                blocks = row.get('net_blocks_per_call')
+                cells += [str(row['count']), f"{row['mean_ms']:.3f}", f"{blocks:+.1f}" if blocks is not None else "-"]
+            table.add_row(*cells, style="bold" if row['stage'] == 'tick_total' else None)
+        return Panel(table, title="[8] Chronometer" if not full else "--- TICK LATENCY REPORT ---", border_style="magenta")
+
+    def _create_strategic_map_panel(self, data: Optional[Tuple[int, int]]) -> Panel:
+        # [PACT KEPT]: This method is PRESERVED as submitted in v6.0; it paints the map's two counts from the snapshot.
+        if not data: return Panel(Align.center("[dim]Strategic Map Unavailable[/dim]"), title="[7] Alexandria Library", border_style="dim")
+        text=Text(); total_obs, total_liqs = data
         text.append(f"Historical Fortresses (OBs): [bold yellow]{total_obs}[/bold yellow]\n", style="white")
         text.append(f"Historical Vacuums (Voids): [bold cyan]{total_liqs}[/bold cyan]", style="white")
         return Panel(text, title="[7] Alexandria Library", border_style="bold yellow")
 
-    def _create_market_overview_panel(self, mdf: MarketDataFrame, structure: Optional[StructureReport]) -> Panel:
-        # [PACT KEPT]: This method is PRESERVED exactly as submitted in v6.0.
-        structure=structure or StructureReport()
+    def _create_market_overview_panel(self, data: Tuple[str, Optional[float], str, str, float]) -> Panel:
+        # [PACT KEPT]: This method is PRESERVED as submitted in v6.0; it paints from the snapshot's values.
+        symbol, price, trend, personality, certainty = data
         grid=Table.grid(expand=True,padding=(0,1)); grid.add_column(justify="left",style="bold",ratio=1); grid.add_column(justify="right",ratio=1)
-        price_data = mdf.ohlcv_multidim.get('5m'); price = price_data['close'].iloc[-1] if price_data is not None and not price_data.empty else 'N/A'
-        price_text = f"{price:,.2f}" if isinstance(price, (int, float)) else price
-        trend_color="green" if structure.primary_trend.get('1h')=='LONG' else "red" if structure.primary_trend.get('1h')=='SHORT' else "yellow"
-        grid.add_row("Symbol:",f"[bold white]{getattr(mdf,'symbol','N/A')}[/bold white]")
+        price_text = f"{price:,.2f}" if price is not None else 'N/A'
+        trend_color="green" if trend=='LONG' else "red" if trend=='SHORT' else "yellow"
+        grid.add_row("Symbol:",f"[bold white]{symbol}[/bold white]")
         grid.add_row("Price:",f"[bold cyan]{price_text}[/bold cyan]")
-        grid.add_row("1h Trend:",f"[{trend_color}]{structure.primary_trend.get('1h','N/A')}[/{trend_color}]")
-        grid.add_row("Personality:",f"[yellow]{getattr(structure.market_personality,'name','UNCERTAIN')} ({structure.personality_certainty:.2f})[/yellow]")
+        grid.add_row("1h Trend:",f"[{trend_color}]{trend}[/{trend_color}]")
+        grid.add_row("Personality:",f"[yellow]{personality} ({certainty:.2f})[/yellow]")
         return Panel(grid, title="[1] Market Overview", border_style="cyan")
         
-    def _create_power_panel(self, power: Optional[PowerReport]) -> Panel:
+    def _create_power_panel(self, data: Tuple[float, float, float, str]) -> Panel:
         # --- [THE FINAL MODERNIZATION]: The Power Panel is rebuilt to speak the Oracle's true language. ---
-        power = power or PowerReport()
+        true_net_force, book_imbalance, delta_joiners, absorption = data
         grid = Table.grid(expand=True, padding=(0,1))
         grid.add_column(justify="left", style="bold", ratio=2)
         grid.add_column(justify="right", ratio=3)
         
         # 1. Display the final judgment: TrueNetForce
-        force_color = "green" if power.true_net_force > 0 else "red" if power.true_net_force < 0 else "dim"
-        grid.add_row("Oracle's Judgment:", f"[{force_color}]{power.true_net_force:,.2f}[/{force_color}]")
+        force_color = "green" if true_net_force > 0 else "red" if true_net_force < 0 else "dim"
+        grid.add_row("Oracle's Judgment:", f"[{force_color}]{true_net_force:,.2f}[/{force_color}]")
 
         # 2. Display the raw evidence for the Commander's review
-        imbalance_str = f"{power.book_imbalance:+.2f}"
-        tape_str = f"{power.delta_joiners:+.2f}"
+        imbalance_str = f"{book_imbalance:+.2f}"
+        tape_str = f"{delta_joiners:+.2f}"
         evidence_text = Text.assemble(("Book Intent: ", "dim"), (imbalance_str, "white"), (" | Tape Action: ", "dim"), (tape_str, "white"))
         grid.add_row("Evidence:", evidence_text)
         
         # 3. Display critical counter-intelligence alerts
-        absorption = power.absorption_signal
         if absorption != "NONE":
             absorb_color = "bold green" if "BULLISH" in absorption else "bold red"
             grid.add_row("Counter-Intel:", f"[{absorb_color}]{absorption} ABSORPTION DETECTED[/{absorb_color}]")
         
         return Panel(grid, title="[3] Oracle's Insight", border_style="magenta")
 
-    def _create_intel_reports_panel(
-        self, ob: Optional[OrderBlockReport], liq: Optional[LiquidityReport], 
-        fib: Optional[FibonacciReport], div: Optional[DivergenceReport], emo: Optional[EmotionReport]
-    ) -> Panel:
-        # [PACT KEPT]: This method is PRESERVED exactly as submitted in v6.0.
-        emo = emo or EmotionReport(); grid = Table.grid(expand=True,padding=(0,1))
+    def _create_intel_reports_panel(self, data: Tuple[str, int, int, int, int]) -> Panel:
+        # [PACT KEPT]: This method is PRESERVED as submitted in v6.0; the signal counts come from the snapshot.
+        mood, ob_signals, liq_signals, fib_signals, div_signals = data; grid = Table.grid(expand=True,padding=(0,1))
         grid.add_column(justify="left",style="bold",ratio=2); grid.add_column(justify="right",ratio=1)
-        ob_signals=sum(len(v) for v in ob.interaction_signals.values()) if ob else 0
-        liq_signals=sum(len(v) for v in liq.confirmation_signals.values()) if liq else 0
-        fib_signals=sum(len(v) for v in fib.confirmation_signals.values()) if fib else 0
-        div_signals=sum(len(v) for v in div.confirmation_signals.values()) if div else 0
-        grid.add_row("Emotion:",f"[bold magenta]{emo.dominant_mood}[/bold magenta]")
+        grid.add_row("Emotion:",f"[bold magenta]{mood}[/bold magenta]")
         grid.add_row("Sonar Pings (OB):",f"[bold yellow]{ob_signals}[/bold yellow]" if ob_signals else "[dim]None[/dim]")
         grid.add_row("Void Reactions (FVG):",f"[bold cyan]{liq_signals}[/bold cyan]" if liq_signals else "[dim]None[/dim]")
         grid.add_row("Sniper Shots (Fib):",f"[bold green]{fib_signals}[/bold green]" if fib_signals else "[dim]None[/dim]")
         grid.add_row("Confessions (Div):",f"[bold red]{div_signals}[/bold red]" if div_signals else "[dim]None[/dim]")
         return Panel(grid, title="[4] Intel Signals", border_style="yellow")
 
-    def _create_decision_panel(self, decision: TacticalDecision, signal: Optional[TacticalSignal]) -> Panel:
-        # [PACT KEPT]: This method is PRESERVED exactly as submitted in v6.0.
+    def _create_decision_panel(self, data: Tuple[str, Optional[float], Optional[str]]) -> Panel:
+        # [PACT KEPT]: This method is PRESERVED as submitted in v6.0; a snapshot carries a signal's confidence and source.
+        decision, confidence, source = data
         grid=Table.grid(expand=True,padding=(0,1)); grid.add_column(justify="center"); decision_color="bold yellow"
-        if signal:
-            if decision in [TacticalDecision.ADVANCE,TacticalDecision.SCALE_IN]: decision_color="bold green"
-            elif decision in [TacticalDecision.RETREAT,TacticalDecision.FLIP_POSITION]: decision_color="bold red"
-            grid.add_row(f"[{decision_color}]>>> {decision.name} <<<[/{decision_color}]", style="bold"); grid.add_row(f"Confidence: [bold]{signal.confidence:.2%}[/bold]", style="white"); grid.add_row(f"Source: [dim]{signal.source}[/dim]")
+        if confidence is not None:
+            if decision in (TacticalDecision.ADVANCE.name,TacticalDecision.SCALE_IN.name): decision_color="bold green"
+            elif decision in (TacticalDecision.RETREAT.name,TacticalDecision.FLIP_POSITION.name): decision_color="bold red"
+            grid.add_row(f"[{decision_color}]>>> {decision} <<<[/{decision_color}]", style="bold"); grid.add_row(f"Confidence: [bold]{confidence:.2%}[/bold]", style="white"); grid.add_row(f"Source: [dim]{source}[/dim]")
         else:
-            decision_text = decision.name; grid.add_row(f"[{decision_color}]{decision_text}[/{decision_color}]")
-            if decision == TacticalDecision.WAIT: grid.add_row("[dim]Awaiting tactical opportunity...[/dim]")
+            grid.add_row(f"[{decision_color}]{decision}[/{decision_color}]")
+            if decision == TacticalDecision.WAIT.name: grid.add_row("[dim]Awaiting tactical opportunity...[/dim]")
             else: grid.add_row("[dim]Holding position...[/dim]")
         return Panel(grid, title="[5] Tactical Command", border_style="green")
         
-    def _create_positions_panel(self, positions: List[PositionV2]) -> Panel:
-        # [PACT KEPT]: This method is PRESERVED exactly as submitted in v6.0.
+    def _create_positions_panel(self, positions: Tuple[Tuple[Any, ...], ...]) -> Panel:
+        # [PACT KEPT]: This method is PRESERVED as submitted in v6.0; each row is a position's snapshot.
         if not positions: return Panel(Align.center("[dim]No Active Positions[/dim]"), title="[6] Active Positions", border_style="blue")
         table = Table(show_header=True, header_style="bold blue", padding=(0,1))
         table.add_column("ID",justify="left",style="dim"); table.add_column("Side",justify="center"); table.add_column("Size",justify="right")
         table.add_column("Entry Price",justify="right"); table.add_column("PnL %",justify="right",style="bold");
         table.add_column("Cat. SL",justify="right",style="bold red"); table.add_column("Hedge Trap",justify="center",style="dim")
-        for pos in positions:
-            pnl_color="green" if pos.pnl_percentage >= 0 else "red"; side_color="green" if pos.side==PositionSide.LONG else "red"
-            trap_status="Armed" if pos.hedge_trap and pos.hedge_trap.status=="ACTIVE" else "---"
-            cat_sl_str=f"{pos.catastrophic_stop_loss:,.2f}" if pos.catastrophic_stop_loss else "N/A"
-            table.add_row(pos.position_id[:8],f"[{side_color}]{pos.side.name}[/{side_color}]", f"{pos.size:.4f}", f"{pos.entry_price:,.2f}", 
-                f"[{pnl_color}]{pos.pnl_percentage:+.2f}%[/{pnl_color}]", cat_sl_str, trap_status)
-        return Panel(table, title="[6] Active Positions", border_style="blue")
\ No newline at end of file
+        for position_id, side, size, entry_price, pnl_percentage, catastrophic_stop_loss, trap_armed in positions:
+            pnl_color="green" if pnl_percentage >= 0 else "red"; side_color="green" if side==PositionSide.LONG.name else "red"
+            trap_status="Armed" if trap_armed else "---"
+            cat_sl_str=f"{catastrophic_stop_loss:,.2f}" if catastrophic_stop_loss else "N/A"
+            table.add_row(position_id,f"[{side_color}]{side}[/{side_color}]", f"{size:.4f}", f"{entry_price:,.2f}", 
+                f"[{pnl_color}]{pnl_percentage:+.2f}%[/{pnl_color}]", cat_sl_str, trap_status)
+        return Panel(table, title="[6] Active Positions", border_style="blue")
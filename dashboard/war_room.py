@@ -0,0 +1,164 @@
+# F:\ShadowVanguard_Legion_Godspeed\dashboard\war_room.py
+# Version 1.0 - Prometheus, The War Room Relay
+
+import json
+import logging
+import multiprocessing
+import queue
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Dict, Any, Callable, Optional
+
+from rich.console import Console
+from rich.live import Live
+
+from dashboard.cli_interface import CliInterface, DashboardSnapshot, PANELS
+
+logger = logging.getLogger("WarRoom")
+
+MODES = ('live', 'headless')
+RUNNERS = ('thread', 'process')
+
+
+class Mailbox:
+    """
+    The latest snapshot, handed from the trading thread to the renderer thread. A one-slot
+    deque's append and pop are atomic, so neither side ever takes a lock or waits: a newer
+    snapshot simply replaces one the renderer has not drawn yet.
+    """
+    def __init__(self):
+        self._slot: deque = deque(maxlen=1)
+
+    def post(self, snapshot: DashboardSnapshot):
+        self._slot.append(snapshot)
+
+    def take(self, wait: float = 0.0) -> Optional[DashboardSnapshot]:
+        try: return self._slot.pop()
+        except IndexError: return None
+
+
+class ProcessMailbox:
+    """The same handoff to a renderer process: snapshots are posted without waiting and the renderer keeps the newest."""
+    def __init__(self, context: Any):
+        self._queue = context.Queue()
+
+    def post(self, snapshot: DashboardSnapshot):
+        self._queue.put_nowait(snapshot)
+
+    def take(self, wait: float = 0.0) -> Optional[DashboardSnapshot]:
+        latest = None
+        try: latest = self._queue.get(timeout=wait) if wait else self._queue.get_nowait()
+        except queue.Empty: return None
+        while True:  # Only the newest is drawn
+            try: latest = self._queue.get_nowait()
+            except queue.Empty: return latest
+
+
+class LiveScreen:
+    """Draws snapshots in place on the terminal, repainting only the panels whose values changed."""
+    def __init__(self, console: Optional[Console] = None):
+        self.herald = CliInterface(console); self.layout = self.herald.build_layout(); self.shown: Dict[str, Any] = {}
+        self.live = Live(self.layout, console=self.herald.console, auto_refresh=False, transient=False)
+        self.repaints = 0
+
+    def __enter__(self) -> 'LiveScreen':
+        self.live.start(); return self
+
+    def __exit__(self, *exc):
+        self.live.stop()
+
+    def draw(self, snapshot: DashboardSnapshot):
+        changed = [name for name in PANELS if name not in self.shown or snapshot.panels.get(name) != self.shown[name]]
+        for name in changed:
+            self.herald.paint(self.layout, name, snapshot.panels.get(name)); self.shown[name] = snapshot.panels.get(name)
+        if changed: self.repaints += len(changed); self.live.refresh()
+
+
+class SnapshotRecorder:
+    """The headless War Room: every changed frame becomes one JSON line in `path`, for runs nobody watches."""
+    def __init__(self, path: Path):
+        self.path = Path(path); self.last: Optional[Dict[str, Any]] = None; self.frames = 0; self._file = None
+
+    def __enter__(self) -> 'SnapshotRecorder':
+        self.path.parent.mkdir(parents=True, exist_ok=True); self._file = open(self.path, 'w', encoding='utf-8'); return self
+
+    def __exit__(self, *exc):
+        self._file.close()
+
+    def draw(self, snapshot: DashboardSnapshot):
+        if snapshot.panels == self.last: return
+        self.last = snapshot.panels; self.frames += 1
+        self._file.write(json.dumps({'tick': snapshot.tick, 'time': time.time(), 'panels': snapshot.panels}, default=str) + "\n"); self._file.flush()
+
+
+def run_renderer(mailbox: Any, stop: Any, mode: str, frame_interval: float, snapshot_file: str):
+    """The renderer's loop: one frame every `frame_interval` seconds with the newest snapshot, whatever the tick speed."""
+    with (SnapshotRecorder(Path(snapshot_file)) if mode == 'headless' else LiveScreen()) as screen:
+        while True:
+            started = time.monotonic(); snapshot = mailbox.take()
+            if snapshot is not None: screen.draw(snapshot)
+            elif stop.is_set():
+                # The last snapshot is posted before the stop is set; a process mailbox may still be delivering it.
+                snapshot = mailbox.take(wait=0.5)
+                if snapshot is not None: screen.draw(snapshot)
+                return
+            stop.wait(max(0.0, frame_interval - (time.monotonic() - started)))
+
+
+class WarRoom:
+    """
+    THE WAR ROOM RELAY: The dashboard, drawn off the trading loop. The loop only captures a
+    compact snapshot of plain values, at most once per frame, and drops it in a lock-free
+    mailbox; a renderer thread (or process) draws the newest one at a fixed frame rate and
+    repaints only the panels whose values changed. Headless, the frames go to a JSON-lines
+    file instead of the terminal. A slow terminal never holds up a tick: at worst it skips
+    frames.
+    """
+    def __init__(self, config: Dict[str, Any], root: Path):
+        self.config = config or {}
+        self.mode = self.config.get('mode', 'live')
+        if self.mode not in MODES: logger.error(f"Unknown dashboard mode '{self.mode}'. Using 'live'."); self.mode = 'live'
+        self.runner = self.config.get('runner', 'thread')
+        if self.runner not in RUNNERS: logger.error(f"Unknown dashboard runner '{self.runner}'. Using 'thread'."); self.runner = 'thread'
+        self.frame_interval = 1.0 / max(0.1, float(self.config.get('frame_rate', 4)))
+        snapshot_file = Path(self.config.get('snapshot_file', 'dashboard_snapshots.jsonl'))
+        self.snapshot_file = snapshot_file if snapshot_file.is_absolute() else Path(root) / snapshot_file
+        self._next_frame = 0.0; self._pending: Optional[Callable[[], DashboardSnapshot]] = None
+        self.mailbox = None; self._stop = None; self._worker = None
+        logger.info(f"[WarRoom] The War Room Relay v1.0 will draw {1.0 / self.frame_interval:g} frames per second ({self.mode}, {self.runner}).")
+
+    @property
+    def running(self) -> bool:
+        return self._worker is not None
+
+    def start(self) -> 'WarRoom':
+        if self.running: return self
+        args = (self.mode, self.frame_interval, str(self.snapshot_file))
+        if self.runner == 'process':
+            context = multiprocessing.get_context()
+            self.mailbox = ProcessMailbox(context); self._stop = context.Event()
+            self._worker = context.Process(target=run_renderer, args=(self.mailbox, self._stop, *args), name='war-room', daemon=True)
+        else:
+            self.mailbox = Mailbox(); self._stop = threading.Event()
+            self._worker = threading.Thread(target=run_renderer, args=(self.mailbox, self._stop, *args), name='war-room', daemon=True)
+        self._worker.start()
+        return self
+
+    def publish(self, capture: Callable[[], DashboardSnapshot]) -> bool:
+        """
+        Called by the trading loop every tick with a function that captures the snapshot. It is
+        only called once a frame is due, so most ticks pay for one clock read.
+        """
+        now = time.monotonic()
+        if now < self._next_frame: self._pending = capture; return False
+        self._next_frame = now + self.frame_interval; self._pending = None
+        self.mailbox.post(capture()); return True
+
+    def close(self, timeout: float = 5.0):
+        """Posts the last tick's snapshot, lets the renderer draw it and stops the renderer."""
+        if not self.running: return
+        if self._pending is not None: self.mailbox.post(self._pending()); self._pending = None
+        self._stop.set(); self._worker.join(timeout)
+        self._worker = None
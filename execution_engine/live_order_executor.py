@@ -1,5 +1,5 @@
 # F:\ShadowVanguard_Legion_Godspeed\execution_engine\live_order_executor.py
-# Version 2.8 - The MEXC Enforcer
+# Version 2.10 - The MEXC Enforcer
 
 import logging
 from typing import Dict, Any, Optional, List
@@ -85,7 +85,7 @@ class LiveOrderExecutor(IOrderExecutor):
             logger.critical(f"Failed to initialize exchange '{self.exchange_id}': {e}", exc_info=True)
             raise
             
-        logger.info(f"[LiveOrderExecutor] The MEXC Enforcer v2.8 online, connected to {self.exchange_id.upper()}.")
+        logger.info(f"[LiveOrderExecutor] The MEXC Enforcer v2.10 online, connected to {self.exchange_id.upper()}.")
 
     # [PACT KEPT]: All order execution logic from v2.7 is 100% PRESERVED.
     
@@ -140,7 +140,8 @@ class LiveOrderExecutor(IOrderExecutor):
             logger.error(f"Failed to cancel order {order_id}: {e}")
             return False
 
-    def close_order(self, order_id: str, size: float, symbol: str, price: float) -> Optional[Dict[str, Any]]:
+    def close_order(self, order_id: str, size: float, symbol: str, price: float, **kwargs) -> Optional[Dict[str, Any]]:
+        # The exchange knows the position's side; `position_side` and other simulator hints are not needed here.
         try:
             positions = self.exchange.fetch_positions([symbol])
             open_position = next((p for p in positions if float(p.get('contracts', 0)) > 0), None)
@@ -161,11 +162,12 @@ class LiveOrderExecutor(IOrderExecutor):
             logger.critical(f"CRITICAL: Failed to execute live close for {symbol}: {e}")
             return None
 
-    def check_triggered_stops(self, current_high: float, current_low: float, symbol: str) -> List[Dict[str, Any]]:
+    def check_triggered_stops(self, current_high: float, current_low: float, symbol: Optional[str] = None) -> List[Dict[str, Any]]:
+        # [PACT KEPT]: The interface's signature: without a symbol, the paper traps of every symbol are checked.
         if not self.is_paper: return []
         triggered = [];
         for order_id, stop_info in list(self.pending_stops.items()):
-            if stop_info['symbol'] != symbol: continue
+            if symbol is not None and stop_info['symbol'] != symbol: continue
             is_triggered = False
             if stop_info['side'] == PositionSide.SHORT and current_high >= stop_info['trigger']: is_triggered = True
             elif stop_info['side'] == PositionSide.LONG and current_low <= stop_info['trigger']: is_triggered = True
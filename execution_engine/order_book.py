@@ -0,0 +1,123 @@
+# F:\ShadowVanguard_Legion_Godspeed\execution_engine\order_book.py
+# Version 1.0 - Prometheus, The Quartermaster's Ledger
+
+import heapq
+import logging
+from collections.abc import MutableMapping
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+
+from core.data_models import PositionV2
+from core.market_enums import PositionSide
+
+logger = logging.getLogger("OrderBook")
+
+COMPACT_MIN_DEAD = 64  # Cancelled heap entries tolerated before a heap is rebuilt (and never more than the live ones).
+
+
+class StopBook:
+    """
+    THE TRIPWIRE LEDGER: Pending stop orders, kept per symbol in two price-sorted heaps. A buy
+    stop (LONG) fires once the high reaches its trigger, so buy stops sit in a min-heap and
+    the tick pops them from the cheapest trigger up; a sell stop (SHORT) fires once the low
+    reaches its trigger and sits in a max-heap. A tick touches only the stops it fires, not
+    every trap the book holds. Cancelled stops leave the order table at once and their heap
+    entries are skipped (and periodically swept) when they surface.
+    Fired stops come back in the order they were placed, as a scan of the order table gives them.
+    """
+    def __init__(self):
+        self.orders: Dict[str, Dict[str, Any]] = {}                             # order_id -> order, in placement order
+        self._heaps: Dict[str, Dict[str, List[Tuple[float, int, str]]]] = {}     # symbol -> side -> [(key, seq, order_id)]
+        self._seq: Dict[str, int] = {}                                          # order_id -> placement number
+        self._next = 0; self._dead = 0
+
+    def __len__(self) -> int:
+        return len(self.orders)
+
+    def __contains__(self, order_id: str) -> bool:
+        return order_id in self.orders
+
+    def add(self, order: Dict[str, Any]):
+        order_id = order['order_id']; self.discard(order_id)
+        seq = self._next; self._next += 1; self.orders[order_id] = order; self._seq[order_id] = seq
+        side = order['side']
+        if side not in (PositionSide.LONG.value, PositionSide.SHORT.value): return  # Never fires, as before
+        key = order['trigger_price'] if side == PositionSide.LONG.value else -order['trigger_price']
+        heapq.heappush(self._heaps.setdefault(order['symbol'], {}).setdefault(side, []), (key, seq, order_id))
+
+    def discard(self, order_id: str) -> Optional[Dict[str, Any]]:
+        order = self.orders.pop(order_id, None)
+        if order is None: return None
+        self._seq.pop(order_id, None); self._dead += 1
+        if self._dead >= COMPACT_MIN_DEAD and self._dead > len(self.orders): self._compact()
+        return order
+
+    def _compact(self):
+        for sides in self._heaps.values():
+            for side, heap in sides.items():
+                sides[side] = [entry for entry in heap if self._seq.get(entry[2]) == entry[1]]; heapq.heapify(sides[side])
+        self._dead = 0
+
+    def _fire(self, heap: List[Tuple[float, int, str]], limit: float, fired: List[Tuple[int, Dict[str, Any]]]):
+        while heap and heap[0][0] <= limit:
+            _, seq, order_id = heapq.heappop(heap)
+            if self._seq.get(order_id) != seq: self._dead = max(0, self._dead - 1); continue  # Cancelled after it was placed
+            del self._seq[order_id]; fired.append((seq, self.orders.pop(order_id)))
+
+    def pop_triggered(self, current_high: float, current_low: float, symbol: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Removes and returns the stops the candle `[current_low, current_high]` has run through, for one symbol or all."""
+        fired: List[Tuple[int, Dict[str, Any]]] = []
+        for sym in ([symbol] if symbol is not None else list(self._heaps)):
+            sides = self._heaps.get(sym)
+            if not sides: continue
+            if PositionSide.LONG.value in sides: self._fire(sides[PositionSide.LONG.value], current_high, fired)
+            if PositionSide.SHORT.value in sides: self._fire(sides[PositionSide.SHORT.value], -current_low, fired)
+        fired.sort(key=lambda entry: entry[0])
+        return [order for _, order in fired]
+
+
+class PositionBook(MutableMapping):
+    """
+    THE MUSTER ROLL: The open positions by ID, with a second index by symbol, so "the
+    position on BTC" is a dict lookup however many hedges, flips and other symbols are
+    open. It is a mapping of position ID to position, used exactly as the plain dict it
+    replaces; the first position of a symbol is the oldest one still open, as a scan finds it.
+    """
+    def __init__(self):
+        self._positions: Dict[str, PositionV2] = {}
+        self._by_symbol: Dict[str, Dict[str, PositionV2]] = {}
+
+    def __getitem__(self, position_id: str) -> PositionV2:
+        return self._positions[position_id]
+
+    def __setitem__(self, position_id: str, position: PositionV2):
+        previous = self._positions.get(position_id)
+        if previous is not None and previous.symbol != position.symbol: self._unlink(position_id, previous.symbol)
+        self._positions[position_id] = position; self._by_symbol.setdefault(position.symbol, {})[position_id] = position
+
+    def __delitem__(self, position_id: str):
+        position = self._positions.pop(position_id); self._unlink(position_id, position.symbol)
+
+    def _unlink(self, position_id: str, symbol: str):
+        bucket = self._by_symbol[symbol]; del bucket[position_id]
+        if not bucket: del self._by_symbol[symbol]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._positions)
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def __contains__(self, position_id: object) -> bool:
+        return position_id in self._positions
+
+    def get(self, position_id: str, default: Any = None) -> Any:
+        return self._positions.get(position_id, default)
+
+    def values(self):
+        return self._positions.values()
+
+    def for_symbol(self, symbol: str) -> List[PositionV2]:
+        return list(self._by_symbol.get(symbol, {}).values())
+
+    def first_for_symbol(self, symbol: str) -> Optional[PositionV2]:
+        return next(iter(self._by_symbol.get(symbol, {}).values()), None)
@@ -1,5 +1,5 @@
 # F:\ShadowVanguard_Legion\execution_engine\order_executor.py
-# Version 3.2 - Prometheus: The Loyal Lookout
+# Version 3.5 - Prometheus: The Loyal Lookout
 
 import logging
 import uuid
@@ -7,6 +7,8 @@ from typing import Dict, Optional, Protocol, List, Any
 
 from core.data_models import PositionV2 as Position
 from core.market_enums import PositionSide
+from .order_book import StopBook
+from .fill_simulator import FillSimulator
 
 logger = logging.getLogger("OrderExecutor")
 
@@ -16,9 +18,9 @@ class IOrderExecutor(Protocol):
     passing parent_position_id for conditional orders.
     """
     def place_order(self, symbol: str, side: PositionSide, size: float, order_type: str = 'MARKET', parent_position_id: Optional[str] = None, **kwargs) -> Optional[Dict]: ...
-    def close_order(self, position_id: str, size: float, symbol: str, current_price: float) -> Optional[Dict]: ... # Added price for realism
+    def close_order(self, position_id: str, size: float, symbol: str, current_price: float, **kwargs) -> Optional[Dict]: ... # Added price for realism
     def cancel_order(self, order_id: str) -> bool: ...
-    def check_triggered_stops(self, current_high: float, current_low: float) -> List[Dict]: ...
+    def check_triggered_stops(self, current_high: float, current_low: float, symbol: Optional[str] = None) -> List[Dict]: ...
 
 
 class SimulatedOrderExecutor(IOrderExecutor):
@@ -26,10 +28,20 @@ class SimulatedOrderExecutor(IOrderExecutor):
     A simulated implementation. Version 3.2, "The Loyal Lookout", now correctly
     stamps the parent position ID on trap orders, ensuring the chain of command
     remains unbroken during counter-attacks.
+    v3.3: The stop check takes the `symbol` the engagement loop passes and watches only that symbol's traps.
+    v3.4: Pending stops live in a price-sorted StopBook, so a tick only visits the traps it springs.
+    v3.5: With an engaged FillSimulator, fills pay latency, depth, impact and fees, may be
+    partial, and stops fill where the candle path takes them.
     """
-    def __init__(self):
-        self.pending_orders: Dict[str, Dict[str, Any]] = {}
-        logger.info("[SimulatedOrderExecutor] The Loyal Lookout v3.2 is active.")
+    def __init__(self, fill_simulator: Optional[FillSimulator] = None):
+        # [SURGICAL UPGRADE]: `pending_orders` is the book's own order table, kept under its old name.
+        self.stop_book = StopBook(); self.pending_orders: Dict[str, Dict[str, Any]] = self.stop_book.orders
+        self.fill_simulator = fill_simulator if fill_simulator is not None and fill_simulator.enabled else None
+        logger.info("[SimulatedOrderExecutor] The Loyal Lookout v3.5 is active.")
+
+    def observe_market(self, mdf: Any, base_timeframe: str):
+        """Shows the tick's candle, book and tape to the fill engine, before any order of the tick is sent."""
+        if self.fill_simulator: self.fill_simulator.observe(mdf, base_timeframe)
 
     def place_order(self, symbol: str, side: PositionSide, size: float, order_type: str = 'MARKET', parent_position_id: Optional[str] = None, **kwargs) -> Optional[Dict]:
         """
@@ -56,13 +68,18 @@ class SimulatedOrderExecutor(IOrderExecutor):
                 'status': 'PENDING',
                 'parent_position_id': parent_position_id # Stamp the ID
             }
-            self.pending_orders[order_id] = order_details
+            self.stop_book.add(order_details)
             logger.info(f"Placed PENDING {side.name} {order_type} for parent {parent_position_id} ({order_id}) | Size {size:.4f} @ Trigger {trigger_price:.2f}")
             return order_details
 
         elif order_type.upper() == 'MARKET':
             filled_price = kwargs.get('current_price', 60000.0) 
             logger.info(f"Placing IMMEDIATE {side.name} MARKET order of size {size:.8f}")
+            if self.fill_simulator:
+                filled_price, filled_size, fee = self.fill_simulator.market(side == PositionSide.LONG, size, filled_price)
+                if filled_size <= 0:
+                    logger.warning(f"MARKET order {order_id} found no liquidity. Order rejected."); return {"status": "REJECTED", "order_id": order_id}
+                return {"status": "FILLED", "order_id": order_id, "filled_price": filled_price, "filled_size": filled_size, "fee": fee}
             return {
                 "status": "FILLED", "order_id": order_id,
                 "filled_price": filled_price, "filled_size": size
@@ -71,10 +88,14 @@ class SimulatedOrderExecutor(IOrderExecutor):
             logger.error(f"Unsupported order type '{order_type}'. Order rejected.")
             return None
 
-    def close_order(self, position_id: str, size: float, symbol: str, current_price: float) -> Optional[Dict]:
+    def close_order(self, position_id: str, size: float, symbol: str, current_price: float, position_side: Optional[PositionSide] = None, **kwargs) -> Optional[Dict]:
         """Simulates closing an existing position. Now returns a fill receipt for accuracy."""
         logger.info(f"--- SIMULATING: Closing Order for position {position_id} ---")
         logger.info(f"Closing {size:.8f} of position {position_id} for {symbol}")
+        if self.fill_simulator and position_side is not None:
+            # A close is reduce-only and always completes: it sweeps as deep as it must.
+            filled_price, filled_size, fee = self.fill_simulator.market(position_side != PositionSide.LONG, size, current_price, partial=False)
+            return {"status": "FILLED", "order_id": f"close-{position_id}", "filled_price": filled_price, "filled_size": filled_size, "fee": fee}
         # Return a fill receipt similar to a market order
         return {
             "status": "FILLED", "order_id": f"close-{position_id}",
@@ -85,44 +106,37 @@ class SimulatedOrderExecutor(IOrderExecutor):
         """Simulates cancelling a pending order."""
         if order_id in self.pending_orders:
             logger.info(f"--- SIMULATING: Cancelling PENDING order {order_id} ---")
-            del self.pending_orders[order_id]
+            self.stop_book.discard(order_id)
             return True
         else:
             logger.warning(f"Attempted to cancel {order_id}, but not found in pending orders.")
             return False
 
-    def check_triggered_stops(self, current_high: float, current_low: float) -> List[Dict]:
+    def check_triggered_stops(self, current_high: float, current_low: float, symbol: Optional[str] = None) -> List[Dict]:
         """
-        Checks if the current price has activated any pending STOP orders.
-        The fill receipt now includes the parent position ID.
+        Checks if the current price has activated any pending STOP orders (of `symbol`, or of
+        every symbol). The fill receipt now includes the parent position ID.
         """
         triggered_orders = []
-        for order_id in list(self.pending_orders.keys()):
-            order = self.pending_orders.get(order_id)
-            if not order: continue
-
-            is_triggered = False
-            # Ensure side is compared correctly (it's now a string)
-            if order['side'] == PositionSide.LONG.value and current_high >= order['trigger_price']:
-                is_triggered = True
-            elif order['side'] == PositionSide.SHORT.value and current_low <= order['trigger_price']:
-                is_triggered = True
+        # [SURGICAL UPGRADE]: A range query on the book instead of a scan of every pending order.
+        sprung = self.stop_book.pop_triggered(current_high, current_low, symbol)
+        fills = self.fill_simulator.stops(sprung, symbol) if self.fill_simulator else [(order, order['trigger_price'], order['size'], None) for order in sprung]
+        for order, filled_price, filled_size, fee in fills:
+            order_id = order['order_id']
+            logger.warning(f"!!! TRAP TRIGGERED !!! PENDING order {order_id} (parent: {order['parent_position_id']}) activated at price {order['trigger_price']:.2f}")
             
-            if is_triggered:
-                logger.warning(f"!!! TRAP TRIGGERED !!! PENDING order {order_id} (parent: {order['parent_position_id']}) activated at price {order['trigger_price']:.2f}")
-                
-                # --- AI-UPGRADE: Perfect Reporting Protocol ---
-                filled_receipt = {
-                    "status": "FILLED", 
-                    "order_id": f"triggered-{order_id}",
-                    "filled_price": order['trigger_price'],
-                    "filled_size": order['size'],
-                    "side": order['side'], # Include side
-                    # CRUCIAL: Add the parent ID to the receipt for the PositionManager
-                    "original_parent_id": order['parent_position_id'], 
-                    "original_trap_id": order_id
-                }
-                triggered_orders.append(filled_receipt)
-                del self.pending_orders[order_id]
+            # --- AI-UPGRADE: Perfect Reporting Protocol ---
+            filled_receipt = {
+                "status": "FILLED", 
+                "order_id": f"triggered-{order_id}",
+                "filled_price": filled_price,
+                "filled_size": filled_size,
+                "side": order['side'], # Include side
+                # CRUCIAL: Add the parent ID to the receipt for the PositionManager
+                "original_parent_id": order['parent_position_id'], 
+                "original_trap_id": order_id
+            }
+            if fee is not None: filled_receipt["fee"] = fee
+            triggered_orders.append(filled_receipt)
 
         return triggered_orders
\ No newline at end of file
@@ -1,11 +1,11 @@
 # F:\ShadowVanguard_Legion_Godspeed\execution_engine\position_manager.py
-# Version 14.2 - Prometheus, The Synchronized Scribe
+# Version 14.8 - Prometheus, The Synchronized Scribe
 
 import logging
 from typing import Dict, Optional, List, Any, Callable
 from uuid import uuid4
 from datetime import datetime
-from dataclasses import asdict
+from dataclasses import replace
 
 # [PACT KEPT]: All imports are preserved exactly from your v14.1.
 from core.data_models import (PositionV2 as Position, TacticalSignal, MarketDataFrame, 
@@ -15,9 +15,15 @@ from risk_manager.capital_allocator import CapitalAllocator
 from risk_manager.perimeter_architect import PerimeterArchitect, BattlePerimeters 
 from memory.experience_memory import ExperienceMemory
 from .order_executor import IOrderExecutor 
+from .order_book import PositionBook
+from memory.trade_journal import TradeJournal, PositionEvent
 
 logger = logging.getLogger("PositionManager")
 
+
+def _opposite(side: PositionSide) -> PositionSide:
+    return PositionSide.SHORT if side == PositionSide.LONG else PositionSide.LONG
+
 class PositionManager:
     """
     THE SYNCHRONIZED SCRIBE: This version completes the final protocol synchronization for
@@ -26,6 +32,14 @@ class PositionManager:
     mismatch. With this fix, a strike command can be fully received, architected,
     and executed with a fully armed counter-attack plan. The entire command chain,
     from intel to execution, is now perfectly unified.
+    v14.3: The open positions are a PositionBook, indexed by ID and by symbol.
+    v14.4: Every fill's fee is charged to the Quartermaster; partial fills are sized by what filled.
+    v14.5: Allocations name their symbol, so a Quartermaster shared by a fleet can cap each one.
+    v14.6: Every fill and every position event is written to the Flight Recorder; a close no
+    longer deep-copies the intelligence reports or the position.
+    v14.7: A partially filled entry or scale-in confirms its ticket for what filled, not what was asked.
+    v14.8: The experience of a close keeps the closed position itself, the same copy the Auditor
+    receives; it is turned into a dict only by whoever reads it.
     """
     def __init__(self, 
                  order_executor: IOrderExecutor, 
@@ -33,24 +47,26 @@ class PositionManager:
                  perimeter_architect: PerimeterArchitect,
                  memory: ExperienceMemory,
                  config: Dict[str, Any],
-                 on_position_closed_callback: Optional[Callable[[PositionV2], None]] = None
+                 on_position_closed_callback: Optional[Callable[[PositionV2], None]] = None,
+                 journal: Optional[TradeJournal] = None
                  ):
         
         # [PACT KEPT]: This method is PRESERVED exactly as submitted in v14.1.
         self.ee_config = config.get('execution_engine', {})
         self.lasso_config = self.ee_config.get('alchemist_lasso', {})
         self.max_flips_allowed = self.lasso_config.get('max_flips_allowed', 1)
-        self.active_positions: Dict[str, PositionV2] = {} 
+        self.active_positions: PositionBook = PositionBook()  # [SURGICAL UPGRADE]: position_id -> position, also indexed by symbol
         self.order_executor = order_executor
         self.capital_allocator = capital_allocator
         self.perimeter_architect = perimeter_architect
         self.memory = memory
         self.leverage = self.ee_config.get('leverage', 1)
         self.on_position_closed_callback = on_position_closed_callback
+        self.journal = journal or TradeJournal({}, '.')  # [SURGICAL UPGRADE]: A disabled recorder when none is handed in
         # Correctly get the tactical timeframe from the main config structure
         self.tactical_tf = config.get('data_provider', {}).get('timeframe_minutes', 5)
         self.tactical_tf_str = f"{self.tactical_tf}m"
-        logger.info(f"[PositionManager] The Synchronized Scribe v14.2 is online. All communications are standard.")
+        logger.info(f"[PositionManager] The Synchronized Scribe v14.8 is online. All communications are standard.")
     
     def _calculate_intelligent_flip_size(self, original_size: float, mdf: MarketDataFrame) -> float:
         # [PROTOCOL SYNCHRONIZATION]: The Alchemist's brain is updated to read the modern Oracle's judgment.
@@ -68,6 +84,13 @@ class PositionManager:
             logger.warning(f"Conservative flip. TrueNetForce ({abs(true_net_force):.2f}) below threshold. Using multiplier {multiplier}.")
         return original_size * multiplier
 
+    def _settle_fee(self, receipt: Optional[Dict], symbol: str = '', side: Optional[PositionSide] = None) -> Optional[Dict]:
+        # [SURGICAL UPGRADE]: Fill receipts from the Friction Engine carry the taker fee paid.
+        if receipt and receipt.get("fee"): self.capital_allocator.charge_fee(receipt["fee"])
+        # [SURGICAL UPGRADE]: Every fill passes through here, so this is where the Flight Recorder logs them.
+        if receipt and receipt.get("status") == "FILLED": self.journal.fill(receipt, symbol, side)
+        return receipt
+
     def _execute_hedge_trap(self, position: PositionV2, mdf: MarketDataFrame):
         # [PACT KEPT]: This method is PRESERVED.
         if not position.catastrophic_stop_loss: return
@@ -95,14 +118,14 @@ class PositionManager:
         management_sl, catastrophic_sl, take_profit_levels = (
             battle_plan.management_sl, battle_plan.catastrophic_sl, battle_plan.take_profit_levels)
         
-        ticket = self.capital_allocator.request_allocation(signal, catastrophic_sl, current_price)
+        ticket = self.capital_allocator.request_allocation(signal, catastrophic_sl, current_price, symbol=symbol)
         if not ticket: logger.warning(f"Allocation denied for {symbol}."); return
 
         position_size = ticket.allocated_amount / current_price if current_price > 0 else 0
         order_result = self.order_executor.place_order(symbol, side, position_size, 'MARKET', current_price=current_price)
         
         if order_result and order_result.get("status") == "FILLED":
-            pos_id = order_result["order_id"]
+            self._settle_fee(order_result, symbol, side); pos_id = order_result["order_id"]
             initial_intent = mdf.structure_report.market_regime.get(self.tactical_tf_str) if mdf.structure_report and mdf.structure_report.market_regime else MarketRegime.UNCERTAIN
             
             new_position = PositionV2(
@@ -113,7 +136,8 @@ class PositionManager:
             
             self._execute_hedge_trap(new_position, mdf) 
             self.active_positions[pos_id] = new_position
-            self.capital_allocator.confirm_and_link_ticket(ticket.ticket_id, new_position)
+            self.capital_allocator.confirm_and_link_ticket(ticket.ticket_id, new_position, filled_cost=new_position.size * new_position.entry_price)
+            self.journal.position(PositionEvent.OPENED, new_position, new_position.entry_price)
             logger.info(f"ADVANCE EXECUTED: Pos {pos_id} born ({side.name}) with intent '{initial_intent.name if initial_intent else 'N/A'}' and a full battle plan.")
         else:
              self.capital_allocator.release_capital_by_ticket_id(ticket.ticket_id)
@@ -122,13 +146,13 @@ class PositionManager:
         # [PACT KEPT]: The protocol for onboarding a flipped soldier is PRESERVED.
         tactical_df = mdf.ohlcv_multidim.get(self.tactical_tf_str)
         if tactical_df is None or tactical_df.empty:
-            logger.error("Cannot onboard new position: Tactical OHLCV data is missing."); self.order_executor.close_order(pos_id, size, symbol, entry_price); return None
+            logger.error("Cannot onboard new position: Tactical OHLCV data is missing."); self._settle_fee(self.order_executor.close_order(pos_id, size, symbol, entry_price, position_side=side), symbol, _opposite(side)); return None
             
         final_intent = mdf.structure_report.market_regime.get(self.tactical_tf_str) if mdf.structure_report and mdf.structure_report.market_regime else MarketRegime.UNCERTAIN
         battle_plan = self.perimeter_architect.determine_battle_perimeters(side=side, entry_price=entry_price, mdf=mdf)
             
         if not battle_plan:
-            logger.error(f"FATAL: Could not architect plan for flipped pos {pos_id}. Closing immediately."); self.order_executor.close_order(pos_id, size, symbol, entry_price); return None
+            logger.error(f"FATAL: Could not architect plan for flipped pos {pos_id}. Closing immediately."); self._settle_fee(self.order_executor.close_order(pos_id, size, symbol, entry_price, position_side=side), symbol, _opposite(side)); return None
 
         new_mgmt_sl, new_cat_sl, new_tp_levels = (
             battle_plan.management_sl, battle_plan.catastrophic_sl, battle_plan.take_profit_levels)
@@ -141,13 +165,14 @@ class PositionManager:
             take_profit_levels=new_tp_levels, flip_count=new_flip_count)
             
         allocation_signal = TacticalSignal(source="FLIP_CREATION", confidence=1.0, suggestion=TacticalDecision.FLIP_POSITION)
-        ticket = self.capital_allocator.request_allocation(allocation_signal, new_cat_sl, entry_price)
+        ticket = self.capital_allocator.request_allocation(allocation_signal, new_cat_sl, entry_price, symbol=symbol)
         if not ticket:
-             logger.error(f"FATAL: Capital denied for flipped pos {pos_id}. Closing immediately."); self.order_executor.close_order(pos_id, size, symbol, entry_price); return None
+             logger.error(f"FATAL: Capital denied for flipped pos {pos_id}. Closing immediately."); self._settle_fee(self.order_executor.close_order(pos_id, size, symbol, entry_price, position_side=side), symbol, _opposite(side)); return None
              
         self.capital_allocator.confirm_and_link_ticket(ticket.ticket_id, new_position)
         self._execute_hedge_trap(new_position, mdf)
         self.active_positions[pos_id] = new_position
+        self.journal.position(PositionEvent.OPENED, new_position, entry_price)
         logger.info(f"AWARE ONBOARDING COMPLETE: Flipped pos {pos_id} ready with new battle plan and flip count {new_flip_count}.")
         return new_position
 
@@ -161,7 +186,7 @@ class PositionManager:
         flip_size=self._calculate_intelligent_flip_size(position_to_flip.size, mdf)
         flip_order_result = self.order_executor.place_order(position_to_flip.symbol, flip_side, flip_size, 'MARKET', current_price=current_price)
         if flip_order_result and flip_order_result.get("status") == "FILLED":
-            old_pos_id=position_to_flip.position_id; new_pos_id=flip_order_result["order_id"]; filled_price=flip_order_result["filled_price"]
+            self._settle_fee(flip_order_result, position_to_flip.symbol, flip_side); old_pos_id=position_to_flip.position_id; new_pos_id=flip_order_result["order_id"]; filled_price=flip_order_result["filled_price"]
             logger.info(f"FLIP successful: Pos {old_pos_id} -> {new_pos_id} at {filled_price:.2f}.")
             new_size = flip_order_result["filled_size"] - position_to_flip.size
             if new_size < 1e-8: self._execute_full_close(position_to_flip, mdf, is_part_of_flip=False, exit_price_override=filled_price); return
@@ -175,6 +200,7 @@ class PositionManager:
     def handle_triggered_traps(self, triggered_traps: List[Dict], mdf: MarketDataFrame):
         for fill_receipt in triggered_traps:
             parent_id = fill_receipt.get("original_parent_id"); original_position = self.active_positions.get(parent_id)
+            self._settle_fee(fill_receipt, original_position.symbol if original_position else '')
             if not original_position: logger.error(f"CRITICAL: Trap for {parent_id} triggered, but position not found!"); continue
             
             intent_at_birth = original_position.strategic_intent
@@ -217,18 +243,19 @@ class PositionManager:
         additional_size=position.size*scale_ratio; current_price=tactical_df['close'].iloc[-1]; self._cancel_hedge_trap(position)
         allocation_signal = TacticalSignal(source="SCALE_IN_REINFORCEMENT", confidence=signal.confidence, suggestion=TacticalDecision.SCALE_IN)
         if position.catastrophic_stop_loss is None: self._execute_hedge_trap(position, mdf); return
-        ticket=self.capital_allocator.request_allocation(allocation_signal,position.catastrophic_stop_loss,current_price)
+        ticket=self.capital_allocator.request_allocation(allocation_signal,position.catastrophic_stop_loss,current_price,symbol=position.symbol)
         if not ticket: self._execute_hedge_trap(position, mdf); return
         order_result=self.order_executor.place_order(position.symbol, position.side, additional_size, 'MARKET', current_price=current_price)
         if order_result and order_result.get("status") == "FILLED":
-            filled_size=order_result["filled_size"]; filled_price=order_result["filled_price"]; new_total_size=position.size+filled_size
+            self._settle_fee(order_result, position.symbol, position.side); filled_size=order_result["filled_size"]; filled_price=order_result["filled_price"]; new_total_size=position.size+filled_size
             new_avg_price=((position.size*position.entry_price)+(filled_size*filled_price))/new_total_size
             position.entry_price, position.size = new_avg_price, new_total_size
             battle_plan=self.perimeter_architect.determine_battle_perimeters(side=position.side, entry_price=new_avg_price, mdf=mdf)
             if battle_plan:
                 position.management_stop_loss, position.catastrophic_stop_loss, position.take_profit_levels = (
                     battle_plan.management_sl, battle_plan.catastrophic_sl, battle_plan.take_profit_levels)
-            self._execute_hedge_trap(position,mdf); self.capital_allocator.confirm_and_link_ticket(ticket.ticket_id, position)
+            self._execute_hedge_trap(position,mdf); self.capital_allocator.confirm_and_link_ticket(ticket.ticket_id, position, filled_cost=filled_size*filled_price)
+            self.journal.position(PositionEvent.SCALED_IN, position, filled_price, filled_size)
         else: self.capital_allocator.release_capital_by_ticket_id(ticket.ticket_id); self._execute_hedge_trap(position,mdf)
 
     def _execute_full_close(self, position_to_close: PositionV2, mdf: MarketDataFrame, is_part_of_flip: bool = False, exit_price_override: Optional[float] = None):
@@ -237,7 +264,8 @@ class PositionManager:
         if not is_part_of_flip: self._cancel_hedge_trap(position_to_close)
         order_success=True
         if not is_part_of_flip:
-            close_order_result=self.order_executor.close_order(position_to_close.position_id,position_to_close.size,position_to_close.symbol,exit_price)
+            close_order_result=self._settle_fee(self.order_executor.close_order(position_to_close.position_id,position_to_close.size,position_to_close.symbol,exit_price,position_side=position_to_close.side),
+                                                position_to_close.symbol, _opposite(position_to_close.side))
             order_success=close_order_result and close_order_result.get("status") == "FILLED"
             if order_success: exit_price=close_order_result.get("filled_price", exit_price)
         position_to_close.exit_price=exit_price; position_to_close.exit_timestamp = datetime.utcnow()
@@ -247,9 +275,13 @@ class PositionManager:
             closed_pos.status="CLOSED"; self.capital_allocator.release_capital(closed_pos)
             log_prefix="FLIP-TRANSITION" if is_part_of_flip else "RETREAT EXECUTED"
             logger.info(f"{log_prefix}: Pos {closed_pos.position_id} closed. PnL: ${closed_pos.pnl_in_dollars:.2f} ({closed_pos.pnl_percentage:+.2f}%) @ {closed_pos.exit_price:.2f}")
-            self.memory.remember(Experience(state={'power':asdict(mdf.power_report), 'emotion':asdict(mdf.emotion_report), 'structure':asdict(mdf.structure_report)}, action=TacticalDecision.FLIP_POSITION if is_part_of_flip else TacticalDecision.RETREAT, outcome=closed_pos.pnl_percentage/100.0, position_details=asdict(closed_pos)))
+            self.journal.position(PositionEvent.FLIPPED if is_part_of_flip else PositionEvent.CLOSED, closed_pos, exit_price)
+            # [SURGICAL UPGRADE]: The tick's reports and the closed position are objects nobody writes to again: the memory
+            # keeps them as they are (one shallow copy of the position, shared with the callback), not deep copies or dicts.
+            closed_copy = replace(closed_pos)
+            self.memory.remember(Experience(state={'power_report': mdf.power_report, 'emotion_report': mdf.emotion_report, 'structure_report': mdf.structure_report}, action=TacticalDecision.FLIP_POSITION if is_part_of_flip else TacticalDecision.RETREAT, outcome=closed_pos.pnl_percentage/100.0, position_details=closed_copy))
             if self.on_position_closed_callback:
-                try: self.on_position_closed_callback(PositionV2(**asdict(closed_pos)))
+                try: self.on_position_closed_callback(closed_copy)
                 except Exception as e: logger.error(f"Failed to submit performance report for Pos {closed_pos.position_id}: {e}")
 
     def _execute_partial_exit(self, position: PositionV2, signal: TacticalSignal, mdf: MarketDataFrame):
@@ -261,12 +293,13 @@ class PositionManager:
         exit_side=PositionSide.SHORT if position.side==PositionSide.LONG else PositionSide.LONG
         order_result=self.order_executor.place_order(position.symbol, exit_side, exit_size, 'MARKET', current_price=current_price)
         if order_result and order_result.get("status") == "FILLED":
+            self._settle_fee(order_result, position.symbol, exit_side); exit_size=order_result["filled_size"]  # A partial fill realizes only what filled
             filled_price=order_result["filled_price"]; realized_pnl=(filled_price-position.entry_price)*exit_size*(position.leverage or 1)
             cost_basis_of_exit=exit_size*position.entry_price; self.capital_allocator.release_partial_capital(position.position_id,cost_basis_of_exit,realized_pnl)
             remaining_size=position.size - order_result["filled_size"]
             MINIMUM_VIABLE_SIZE=1e-8
             if remaining_size < MINIMUM_VIABLE_SIZE: self._execute_full_close(position,mdf,is_part_of_flip=False,exit_price_override=filled_price); return
-            position.size=remaining_size; self._execute_hedge_trap(position, mdf)
+            position.size=remaining_size; self.journal.position(PositionEvent.PARTIAL_EXIT, position, filled_price, exit_size, realized_pnl); self._execute_hedge_trap(position, mdf)
         else: self._execute_hedge_trap(position,mdf)
         
     def update_all_positions_pnl(self, current_price: float):
@@ -277,4 +310,4 @@ class PositionManager:
         leverage=position.leverage or 1; pnl_ratio_leveraged=pnl_ratio_raw*leverage
         position.pnl_percentage=pnl_ratio_leveraged*100; position.pnl_in_dollars=(position.size*position.entry_price)*pnl_ratio_leveraged
     def get_all_positions(self) -> List[PositionV2]: return list(self.active_positions.values())
-    def get_active_position_for_symbol(self, symbol: str) -> Optional[PositionV2]: return next((pos for pos in self.active_positions.values() if pos.symbol == symbol), None)
\ No newline at end of file
+    def get_active_position_for_symbol(self, symbol: str) -> Optional[PositionV2]: return self.active_positions.first_for_symbol(symbol)
\ No newline at end of file
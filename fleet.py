@@ -0,0 +1,138 @@
+# F:\ShadowVanguard_Legion_Godspeed\fleet.py
+# Version 1.3 - Prometheus, The Fleet Admiralty
+
+import argparse
+import logging
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+from main import ShadowVanguardOracle, PROJECT_ROOT, DEFAULT_CONFIG_PATH, get_isolated_config_copy
+from dashboard.cli_interface import CliInterface
+from memory.performance_auditor import PerformanceAuditor
+from risk_manager.capital_allocator import CapitalAllocator
+from utils.logger_config import setup_logging
+from utils.validators import FrozenConfig, freeze, thaw
+
+logger = logging.getLogger("FleetAdmiralty")
+
+
+def symbol_slug(symbol: str) -> str:
+    return re.sub(r'[^A-Za-z0-9]+', '_', symbol).strip('_').lower()
+
+
+def front_config(base_config: Dict[str, Any], front: Dict[str, Any]) -> FrozenConfig:
+    """
+    One symbol's complete configuration: the fleet's doctrine, the front's `target_symbol` and its
+    `{dotted.path: value}` overrides (its candles, its stream). The fleet draws the dashboard and
+    the fronts never checkpoint; each front writes its own profile report and journals.
+    """
+    config = thaw(base_config)
+    for path, value in (front.get('overrides') or {}).items():
+        node = config; keys = path.split('.')
+        for key in keys[:-1]: node = node.setdefault(key, {})
+        node[keys[-1]] = value
+    config['target_symbol'] = front['target_symbol']; config['dashboard_enabled'] = False
+    config['checkpoint'] = dict(config.get('checkpoint') or {}, enabled=False, resume=False)
+    report = Path((config.get('profiler') or {}).get('report_file', 'tick_profile.json'))
+    config['profiler'] = dict(config.get('profiler') or {}, report_file=str(report.with_name(f"{report.stem}_{symbol_slug(front['target_symbol'])}{report.suffix}")))
+    for section, key in (('lifecycle', 'journal_file'), ('trade_journal', 'file')):
+        journal = (config.get(section) or {}).get(key)
+        if journal: config[section] = dict(config[section], **{key: str(Path(journal).with_name(f"{Path(journal).stem}_{symbol_slug(front['target_symbol'])}{Path(journal).suffix}"))})
+    return freeze(config)
+
+
+class FleetCommander:
+    """
+    THE FLEET ADMIRALTY: Trades several symbols at once. Every front is a complete Oracle for
+    one symbol (its own provider, analysts, memories, Knight and Scribe), and all of them draw
+    on one Quartermaster and answer to one Auditor: the exposure cap is the portfolio's, and a
+    losing streak on any front raises the alert on all of them.
+    A tick runs in two halves. The analysis, which touches only a front's own units, runs on
+    a thread pool. The engagement, which spends the shared capital, then runs front by front
+    in the order of the settings, so a campaign's decisions never depend on which thread
+    finished first.
+    v1.3: What the pool overlaps is only what releases the GIL: a live front's exchange
+    round-trips and the larger numpy and pandas calls. The analysts are mostly pure Python, so
+    a backtest tick still costs about the sum of its fronts (measured: 7.8 ms for one front,
+    15.8 ms for two, 30.5 ms for four, the same as with `max_workers: 1`). The pool pays off
+    for live fronts waiting on their exchanges, not for CPU-bound replays.
+    """
+    def __init__(self, config: Dict[str, Any], histories: Optional[Dict[str, Any]] = None):
+        self.config = freeze(config)
+        self.simulation_mode = self.config.get('simulation_mode', 'backtest')
+        fleet_config = get_isolated_config_copy(self.config, 'fleet')
+        fronts = fleet_config.get('fronts') or [{'target_symbol': self.config.get('target_symbol', 'BTC/USDT:USDT')}]
+        self.capital_allocator = CapitalAllocator(self.config.get('initial_capital', 10000.0), get_isolated_config_copy(self.config, 'capital_allocator'))
+        self.performance_auditor = PerformanceAuditor(get_isolated_config_copy(self.config, 'memory'))
+        self.oracles: Dict[str, ShadowVanguardOracle] = {}
+        for front in fronts:
+            symbol = front.get('target_symbol')
+            if not symbol or symbol in self.oracles:
+                logger.error(f"Front {front!r} has no target_symbol or repeats one. Ignored."); continue
+            logger.info(f"Commissioning the {symbol} front...")
+            self.oracles[symbol] = ShadowVanguardOracle(
+                front_config(self.config, front), history=(histories or {}).get(symbol),
+                capital_allocator=self.capital_allocator, performance_auditor=self.performance_auditor)
+        workers = min(len(self.oracles), fleet_config.get('max_workers') or len(self.oracles))
+        # One front, or one worker, needs no pool: the analysis then runs inline.
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='front') if workers > 1 else None
+        self.cli = CliInterface()
+        self.ticks = 0
+        logger.info(f"[FleetCommander] The Fleet Admiralty v1.3 commands {len(self.oracles)} front(s) on {max(1, workers)} analysis worker(s): {', '.join(self.oracles)}.")
+
+    def run_campaign(self):
+        self.cli.display_welcome_message()
+        if not self.config.get('auto_start', False):
+            if not self.cli.get_confirmation(f"Do you authorize the operation on {len(self.oracles)} front(s)?"):
+                logger.warning("Operation aborted by the Commander."); return
+        for symbol, oracle in self.oracles.items():
+            if self.simulation_mode == 'backtest': oracle.phase_zero_historical_wisdom()
+            elif not oracle.phase_zero_live_warmup():
+                logger.critical(f"The {symbol} front could not be warmed up. The fleet stands down."); self.stand_down(); return
+        self.phase_two_engagement()
+        self.stand_down()
+        self.cli.display_final_report(self.capital_allocator)
+
+    def phase_two_engagement(self):
+        logger.info("="*20 + " [ PHASE 2: FLEET ENGAGEMENT ] " + "="*20)
+        try:
+            while self._tick():
+                interval = self.config.get('tick_interval_seconds', 0.0) if self.simulation_mode != 'backtest' else 0.0
+                time.sleep(interval)
+        except KeyboardInterrupt:
+            logger.info("\nOperation manually halted by the Commander.")
+        except Exception as e:
+            logger.critical(f"CRITICAL FAILURE IN FLEET ENGAGEMENT LOOP: {e}", exc_info=True)
+
+    def _tick(self) -> bool:
+        """Analyses every front that still has data (in parallel), then engages them in order. False once all are exhausted."""
+        fronts: List[ShadowVanguardOracle] = [oracle for oracle in self.oracles.values() if oracle.data_provider.has_more_data()]
+        if not fronts: return False
+        frames = list(self.pool.map(ShadowVanguardOracle._analyze, fronts)) if self.pool else [oracle._analyze() for oracle in fronts]
+        for oracle, mdf in zip(fronts, frames):
+            if mdf is not None: oracle._engage(mdf)
+            oracle.lifecycle.tick_completed(oracle)
+        self.ticks += 1
+        return True
+
+    def stand_down(self):
+        for oracle in self.oracles.values(): oracle.stand_down()
+        if self.pool: self.pool.shutdown(wait=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="ShadowVanguard - The Fleet Admiralty (multi-symbol engine)")
+    parser.add_argument("--config", default=str(DEFAULT_CONFIG_PATH), help="Path to master configuration file.")
+    parser.add_argument("--workers", type=int, help="Override fleet.max_workers.")
+    args = parser.parse_args()
+    try:
+        master_config = ShadowVanguardOracle.load_config(args.config)
+        setup_logging(PROJECT_ROOT, log_file_name=os.environ.get('LEGION_LOG_FILE', 'legion_activity.log'), policy=master_config.get('logging', {}))
+        if args.workers is not None: master_config['fleet'] = dict(master_config.get('fleet') or {}, max_workers=args.workers)
+        FleetCommander(master_config).run_campaign()
+    except Exception as e:
+        logger.critical(f"The Fleet Admiralty could not take command: {e}", exc_info=True)
@@ -1,5 +1,5 @@
 # F:\ShadowVanguard_Legion\intelligence\battle_learner.py
-# Version 2.1 - Prometheus Project: The Connected War College
+# Version 2.2 - Prometheus Project: The Connected War College
 
 import logging
 from typing import Dict, Any, Tuple, List
@@ -81,4 +81,13 @@ class BattleLearner:
         """Returns a copy of the current Q-Table for analysis or persistence."""
         return dict(self.q_table)
 
+    # The nested defaultdict's factories are lambdas, which cannot be pickled: checkpoints carry plain dicts.
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy(); state['q_table'] = {s: dict(actions) for s, actions in self.q_table.items()}
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]):
+        q_table = state.pop('q_table'); self.__dict__.update(state)
+        self.q_table = defaultdict(lambda: defaultdict(float), {s: defaultdict(float, actions) for s, actions in q_table.items()})
+
 # --- END OF FILE ---
\ No newline at end of file
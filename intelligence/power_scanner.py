@@ -1,5 +1,5 @@
 # F:\ShadowVanguard_Legion_Godspeed\intelligence\power_scanner.py
-# Version 9.1 - Prometheus, The Adrenaline Protocol
+# Version 9.3 - Prometheus, The Adrenaline Protocol
 
 import logging
 from typing import Dict, Any, Tuple, Optional, List
@@ -7,6 +7,8 @@ import pandas as pd
 import numpy as np
 
 from core.data_models import MarketDataFrame, PowerReport
+from core.market_simulator import TapeArrays
+from core.indicator_cache import IndicatorCache
 
 logger = logging.getLogger("PowerScanner")
 
@@ -30,6 +32,7 @@ class PowerScanner:
         self.absorption_volume_threshold = self.ps_config.get('absorption_volume_threshold', 10.0)
         self.tape_confirmation_multiplier = self.ps_config.get('tape_confirmation_multiplier', 1.5)
         self.absorption_veto_strength = self.ps_config.get('absorption_veto_strength', 2.0)
+        self._depth_weights = self.book_weight_decay ** np.arange(self.depth, dtype=np.float64)
 
         self.last_book_net_force: float = 0.0
         self.volatility_window = 14
@@ -40,12 +43,15 @@ class PowerScanner:
         self.adr_volume_ma_period = self.adr_config.get('volume_ma_period', 20)
         self.adr_atr_period = self.adr_config.get('atr_period', 14)
         self.adr_force_multiplier = self.adr_config.get('force_multiplier', 100)
+        # [SURGICAL UPGRADE]: ATR and volume MA come from the provider's shared almanac (this one serves bare frames).
+        self.indicator_cache = IndicatorCache()
 
         logger.info(f"[PowerScanner] The Oracle of Truth v9.1 (Adrenaline Protocol) is online.")
 
     def scan(self, mdf: MarketDataFrame) -> PowerReport:
         # [SURGICAL UPGRADE]: A mode-switch is installed at the heart of the Oracle.
         tactical_ohlcv = mdf.ohlcv_multidim.get(self.tactical_tf)
+        cache = mdf.indicator_cache or self.indicator_cache
 
         try:
             if tactical_ohlcv is None or tactical_ohlcv.empty:
@@ -53,12 +59,12 @@ class PowerScanner:
                 return PowerReport()
             
             # --- MODE SWITCH ---
-            is_live_simulation = not mdf.order_book_snapshot and not mdf.tape_snapshot
+            is_live_simulation = not mdf.order_book_snapshot and (mdf.tape_snapshot is None or len(mdf.tape_snapshot) == 0)
             
             if is_live_simulation:
                 # --- Adrenaline Protocol Activated (Live/Paper Mode) ---
                 logger.debug("Live mode detected. Engaging Adrenaline Protocol (OHLCV-based force estimation).")
-                return self._estimate_force_from_ohlcv(tactical_ohlcv)
+                return self._estimate_force_from_ohlcv(tactical_ohlcv, cache)
             else:
                 # --- High-Fidelity Synthesis Activated (Backtest Mode) ---
                 book_support, book_resistance, book_imbalance = self._analyze_book_potential(mdf)
@@ -73,7 +79,7 @@ class PowerScanner:
             
             net_force_acceleration = true_net_force - self.last_book_net_force
             self.last_book_net_force = true_net_force
-            price_velocity = self._calculate_price_velocity(tactical_ohlcv)
+            price_velocity = self._calculate_price_velocity(tactical_ohlcv, cache)
             
             logger.info(log_message)
 
@@ -92,25 +98,20 @@ class PowerScanner:
             logger.error(f"[PowerScanner] Critical error in scan: {e}", exc_info=True)
             return PowerReport()
 
-    def _estimate_force_from_ohlcv(self, df_ohlcv: pd.DataFrame) -> PowerReport:
+    def _estimate_force_from_ohlcv(self, df_ohlcv: pd.DataFrame, cache: Optional[IndicatorCache] = None) -> PowerReport:
         """
         [ADRENALINE INJECTION]: Estimates TrueNetForce based on candle momentum and volume.
         This provides an actionable, albeit less precise, power reading for live testing.
         """
         if len(df_ohlcv) < self.adr_volume_ma_period + 1: return PowerReport()
         
-        df = df_ohlcv.copy()
+        cache = cache or self.indicator_cache
+        df = df_ohlcv
         last_candle = df.iloc[-1]
         
-        # Calculate ATR for volatility context
-        tr = pd.DataFrame(index=df.index)
-        tr['h-l'] = df['high'] - df['low']; tr['h-pc'] = abs(df['high'] - df['close'].shift(1)); tr['l-pc'] = abs(df['low'] - df['close'].shift(1))
-        atr = tr[['h-l', 'h-pc', 'l-pc']].max(axis=1).ewm(span=self.adr_atr_period, adjust=False).mean()
-        last_atr = atr.iloc[-1]
-        
-        # Calculate Volume MA for context
-        volume_ma = df['volume'].rolling(window=self.adr_volume_ma_period).mean()
-        last_volume_ma = volume_ma.iloc[-1]
+        # ATR (span-smoothed) for volatility context and the volume MA for conviction, read from the almanac
+        last_atr = cache.atr(self.tactical_tf, df, self.adr_atr_period, wilder=False)
+        last_volume_ma = cache.sma(self.tactical_tf, df, self.adr_volume_ma_period, column='volume')
 
         # Calculate force components
         body_size = last_candle['close'] - last_candle['open']
@@ -127,7 +128,7 @@ class PowerScanner:
         # Clean up extreme values
         estimated_force = np.clip(estimated_force, -100, 100)
 
-        price_velocity = self._calculate_price_velocity(df)
+        price_velocity = self._calculate_price_velocity(df, cache)
         
         logger.info(
             f"TruthSight Scan (Adrenaline Protocol): TrueNetForce={estimated_force:,.2f} "
@@ -155,16 +156,20 @@ class PowerScanner:
             base_force = min(base_force, 0) - self.absorption_veto_strength * 100
         return base_force
 
-    def _calculate_weighted_volume(self, orders: List[Tuple[float, float]]) -> float:
-        weighted_volume = 0.0
-        for i, (price, size) in enumerate(orders[:self.depth]):
-            weight = self.book_weight_decay ** i
-            weighted_volume += size * weight
-        return weighted_volume
+    @staticmethod
+    def _as_levels(orders: Any) -> np.ndarray:
+        """Order book sides arrive as (n, 2) price/size arrays from the simulator, or as lists of pairs from live feeds."""
+        if isinstance(orders, np.ndarray): return orders
+        return np.asarray(orders, dtype=np.float64).reshape(-1, 2)
+
+    def _calculate_weighted_volume(self, orders: Any) -> float:
+        # [SURGICAL UPGRADE]: One dot product against precomputed decay weights replaces the per-level loop.
+        sizes = self._as_levels(orders)[:self.depth, 1]
+        return float(sizes @ self._depth_weights[:len(sizes)])
 
     def _analyze_book_potential(self, mdf: MarketDataFrame) -> Tuple[float, float, float]:
         order_book = mdf.order_book_snapshot or {}; book_bids = order_book.get("bids",[]); book_asks=order_book.get("asks",[])
-        if not book_bids or not book_asks: return 0.0, 0.0, 0.0
+        if len(book_bids) == 0 or len(book_asks) == 0: return 0.0, 0.0, 0.0
         weighted_bid_volume = self._calculate_weighted_volume(book_bids)
         weighted_ask_volume = self._calculate_weighted_volume(book_asks)
         total_volume = weighted_bid_volume + weighted_ask_volume
@@ -173,16 +178,18 @@ class PowerScanner:
         return weighted_bid_volume, weighted_ask_volume, imbalance
 
     def _analyze_tape_action(self, mdf: MarketDataFrame) -> Tuple[float, float]:
-        tape = mdf.tape_snapshot or [];
-        if not tape: return 0.0, 0.0
+        tape = mdf.tape_snapshot
+        if tape is None or len(tape) == 0: return 0.0, 0.0
+        if isinstance(tape, TapeArrays): return tape.buy_volume(), tape.sell_volume()
         buy_volume=sum(t.get('size', 0) for t in tape if t.get('side')=='buy')
         sell_volume=sum(t.get('size', 0) for t in tape if t.get('side')=='sell')
         return buy_volume, sell_volume
 
     def _detect_absorption(self, mdf: MarketDataFrame, tape_buying: float, tape_selling: float) -> str:
-        current_book=mdf.order_book_snapshot
-        if not self.last_order_book_snapshot or not current_book or not current_book.get("bids") or not current_book.get("asks"): return "NONE"
-        last_top_bid=self.last_order_book_snapshot.get("bids",[[0]])[0][0]; last_top_ask=self.last_order_book_snapshot.get("asks",[[0]])[0][0]
+        current_book=mdf.order_book_snapshot; last_book=self.last_order_book_snapshot
+        if not last_book or not current_book: return "NONE"
+        if any(len(book.get(side, [])) == 0 for book in (last_book, current_book) for side in ("bids", "asks")): return "NONE"
+        last_top_bid=last_book["bids"][0][0]; last_top_ask=last_book["asks"][0][0]
         current_top_bid=current_book["bids"][0][0]; current_top_ask=current_book["asks"][0][0]
         if tape_selling >= self.absorption_volume_threshold and current_top_bid >= last_top_bid:
             logger.warning("COUNTER-INTEL: Bullish Absorption detected! Heavy selling pressure is being absorbed.")
@@ -192,11 +199,9 @@ class PowerScanner:
             return "BEARISH"
         return "NONE"
     
-    def _calculate_price_velocity(self, ohlcv: pd.DataFrame) -> float:
+    def _calculate_price_velocity(self, ohlcv: pd.DataFrame, cache: Optional[IndicatorCache] = None) -> float:
         if len(ohlcv)<self.volatility_window+1: return 0.0
         try:
-            df = ohlcv.copy(); high,low,close=df['high'],df['low'],df['close']; df['tr1']=abs(high-low); df['tr2']=abs(high-close.shift(1)); df['tr3']=abs(low-close.shift(1))
-            tr=df[['tr1','tr2','tr3']].max(axis=1); atr=tr.ewm(alpha=1/self.volatility_window, adjust=False).mean()
-            last_atr=atr.iloc[-1]; current_price=ohlcv['close'].iloc[-1]
+            last_atr=(cache or self.indicator_cache).atr(self.tactical_tf, ohlcv, self.volatility_window); current_price=ohlcv['close'].iloc[-1]
             return (last_atr/current_price) if current_price>0 else 0.0
         except Exception: return 0.0
\ No newline at end of file
@@ -1,12 +1,12 @@
 # F:\ShadowVanguard_Legion_Godspeed\main.py
-# Version 26.0 - Prometheus, The Final Command Protocol
+# Version 26.10 - Prometheus, The Final Command Protocol
 
 import logging
 import time
 import yaml 
 import argparse
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 import sys
 import os
 from dotenv import load_dotenv
@@ -21,25 +21,32 @@ try:
 except Exception as e:
     logging.warning(f"Could not automatically add venv path: {e}")
 from utils.logger_config import setup_logging
-setup_logging(PROJECT_ROOT)
+# Sweep workers set LEGION_LOG_FILE='' so re-importing this module never truncates the commander's log.
+setup_logging(PROJECT_ROOT, log_file_name=os.environ.get('LEGION_LOG_FILE', 'legion_activity.log'))
 
 # [PACT KEPT]: All necessary imports are PRESERVED.
 from core.interface_book import IDataProvider, IOrderExecutor
 from core.data_provider import DataProvider
 from execution_engine.order_executor import SimulatedOrderExecutor
+from execution_engine.fill_simulator import FillSimulator
 from core.live_data_provider import LiveDataProvider
+from core.stream_data_provider import StreamingDataProvider
+from core.replay_exchange import ReplayExchange
 from execution_engine.live_order_executor import LiveOrderExecutor
 from core.data_models import MarketDataFrame 
 from risk_manager.capital_allocator import CapitalAllocator
 from risk_manager.perimeter_architect import PerimeterArchitect
 from memory.strategic_memory import StrategicMemory
+from memory.strategic_map_store import StrategicMapStore, map_doctrine
 from memory.experience_memory import ExperienceMemory
 from memory.performance_auditor import PerformanceAuditor
+from memory.trade_journal import TradeJournal
 from execution_engine.position_manager import PositionManager
 from analyst_ai.structure_analyzer import StructureAnalyzer
 from intelligence.power_scanner import PowerScanner
 from intelligence.synthetic_emotion import SyntheticEmotionEngine
 from dashboard.cli_interface import CliInterface
+from dashboard.war_room import WarRoom
 from analyst_ai.order_block_analyzer import OrderBlockAnalyzer
 from analyst_ai.liquidity_analyzer import LiquidityAnalyzer
 from analyst_ai.fibonacci_helper import FibonacciHelper
@@ -47,15 +54,18 @@ from analyst_ai.divergence_detector import DivergenceDetector
 from tactical_ai.tactical_controller import TacticalController
 from core.market_enums import TacticalDecision
 from analyst_ai.multi_timeframe_synthesizer import MultiTimeframeSynthesizer
+from utils.tick_profiler import TickProfiler
+from utils.checkpoint import CheckpointManager, config_fingerprint
+from utils.lifecycle import LifecycleWarden
+from utils.validators import FrozenConfig, freeze, validate_config, report_issues
 
 logger = logging.getLogger("ShadowVanguardOracle")
 
-def get_isolated_config_copy(full_config: Dict, key: str) -> Dict:
+def get_isolated_config_copy(full_config: Dict, key: str) -> FrozenConfig:
     # [PACT KEPT]: This utility is PRESERVED.
-    if full_config is None: return {}
-    config_slice = full_config.get(key, {})
-    if config_slice is None: return {}
-    return yaml.safe_load(yaml.dump(config_slice))
+    # [SURGICAL UPGRADE]: The doctrine is frozen, so every unit is handed the sealed section itself instead of a YAML round-trip copy.
+    if full_config is None: return FrozenConfig()
+    return freeze(full_config.get(key) or {})
 
 class ShadowVanguardOracle:
     """
@@ -63,21 +73,50 @@ class ShadowVanguardOracle:
     command center. Its universal protocol is now fully robust, intelligently handling
     optional credentials like passphrases. It is prepared for deployment on any
     battlefield defined in its constitution, starting with the MEXC campaign.
+    v26.3: The constitution is validated and frozen once; every unit reads the same sealed
+    doctrine, and a changed tactical doctrine is rearmed without a restart.
+    v26.5: A tick is an analysis half and an engagement half, and the Quartermaster and the
+    Auditor can be handed in, so a fleet can run one Oracle per symbol on shared capital.
+    v26.6: The dashboard is drawn by the War Room relay, off the trading loop.
+    v26.7: The Lifecycle Warden archives closed positions and samples the memory of a long session.
+    v26.8: The Flight Recorder journals every signal, decision, fill and position event.
+    v26.9: A replay's stream is warmed up from the Echo Exchange's own candle history.
+    v26.10: A settings file with fatal issues is refused at startup, as it is on a doctrine reload.
     """
-    def __init__(self, config: Dict):
+    def __init__(self, config: Dict, history: Optional[Any] = None, config_path: Optional[str] = None,
+                 capital_allocator: Optional[CapitalAllocator] = None, performance_auditor: Optional[PerformanceAuditor] = None):
         # [PACT KEPT]: The overall structure is PRESERVED.
-        self.config = config
+        # [SURGICAL UPGRADE]: `history` lets a sweep hand every run the same, already-loaded base candles.
+        self.config = freeze(config)
+        self.config_path = self.resolve_config_path(config_path) if config_path else None; self._config_mtime = self._doctrine_mtime()
         self.simulation_mode = self.config.get('simulation_mode', 'backtest')
         logger.info(f"--- OPERATION MODE: {self.simulation_mode.upper()} ---")
 
         self.data_provider: IDataProvider
         self.order_executor: IOrderExecutor
+        self.replay_exchange: Optional[ReplayExchange] = None
 
         if self.simulation_mode == 'backtest':
             logger.info("Assembling Backtest Simulation Corps...")
             dp_config = get_isolated_config_copy(self.config, 'data_provider')
-            self.data_provider = DataProvider(dp_config)
-            self.order_executor = SimulatedOrderExecutor()
+            # The provider stamps its frames with the Oracle's own symbol, the one positions and stops are filed under.
+            dp_config = freeze({'simulation_engine': get_isolated_config_copy(self.config, 'simulation_engine'),
+                                'target_symbol': self.config.get('target_symbol', 'BTC/USDT:USDT'), **dp_config})
+            self.data_provider = DataProvider(dp_config, strategic_memory=None, history=history)
+            self.order_executor = SimulatedOrderExecutor(self._fill_simulator())
+        elif self.simulation_mode == 'replay':
+            # [SURGICAL UPGRADE]: The campaign history is pushed through a local Echo Exchange and consumed
+            # exactly as a live stream would be, with simulated execution and no credentials.
+            logger.info("Assembling Replay Corps (local Echo Exchange)...")
+            stream_config = get_isolated_config_copy(self.config, 'live_engine').get('stream', {})
+            campaign = DataProvider(get_isolated_config_copy(self.config, 'data_provider'), strategic_memory=None, history=history).full_df_5m
+            self.replay_exchange = ReplayExchange(campaign, port=0, history_size=stream_config.get('replay_history_size', 600),
+                                                  candles_per_second=stream_config.get('replay_candles_per_second', 0)).start_in_background()
+            # It speaks Binance's combined streams, serves the warmup history itself and ends the replay by closing the socket.
+            stream_config = freeze({**stream_config, 'url': self.replay_exchange.url, 'dialect': 'binance', 'stream_symbol': '',
+                                    'skip_stale_candles': False, 'reconnect': False})
+            self.data_provider = StreamingDataProvider(self.config, stream_config, history_source=self.replay_exchange)
+            self.order_executor = SimulatedOrderExecutor(self._fill_simulator())
         else: # paper or live
             live_config = get_isolated_config_copy(self.config, 'live_engine')
             exchange_name = live_config.get('exchange', 'unknown')
@@ -104,7 +143,10 @@ class ShadowVanguardOracle:
 
             is_paper_trading = (self.simulation_mode == 'paper')
             
-            self.data_provider = LiveDataProvider(self.config, live_config, api_key, secret_key, passphrase, is_paper_trading)
+            if live_config.get('data_feed', 'rest') == 'stream':
+                self.data_provider = StreamingDataProvider(self.config, live_config.get('stream', {}))
+            else:
+                self.data_provider = LiveDataProvider(self.config, live_config, api_key, secret_key, passphrase, is_paper_trading)
             self.order_executor = LiveOrderExecutor(self.config, live_config, api_key, secret_key, passphrase, is_paper_trading)
         
         logger.info("Ambassadors for the designated world have been commissioned.")
@@ -114,16 +156,24 @@ class ShadowVanguardOracle:
         self.strategic_memory = StrategicMemory(get_isolated_config_copy(self.config, 'memory'))
         if isinstance(self.data_provider, DataProvider):
             self.data_provider.strategic_memory = self.strategic_memory
+        # [SURGICAL UPGRADE]: The Great Library keeps Phase 0's map between runs and sweep workers.
+        self.map_store = StrategicMapStore(
+            get_isolated_config_copy(self.config, 'memory').get('strategic_map_store', {}), map_doctrine(self.config),
+            f"{self.config.get('data_provider', {}).get('timeframe_minutes', 5)}m", PROJECT_ROOT)
 
         self.experience_memory = ExperienceMemory(get_isolated_config_copy(self.config, 'memory'))
-        self.performance_auditor = PerformanceAuditor(get_isolated_config_copy(self.config, 'memory'))
+        # [SURGICAL UPGRADE]: A fleet hands every Oracle the same Auditor and Quartermaster.
+        self.performance_auditor = performance_auditor or PerformanceAuditor(get_isolated_config_copy(self.config, 'memory'))
         initial_capital = self.config.get('initial_capital', 10000.0)
-        self.capital_allocator = CapitalAllocator(initial_capital, get_isolated_config_copy(self.config, 'capital_allocator'))
+        self.capital_allocator = capital_allocator or CapitalAllocator(initial_capital, get_isolated_config_copy(self.config, 'capital_allocator'))
         self.perimeter_architect = PerimeterArchitect(get_isolated_config_copy(self.config, 'risk_manager'))
+        # [SURGICAL UPGRADE]: A closed position is journaled by the Lifecycle Warden on its way to the Auditor.
+        self.lifecycle = LifecycleWarden(get_isolated_config_copy(self.config, 'lifecycle'), PROJECT_ROOT)
         self.position_manager = PositionManager(
             self.order_executor, self.capital_allocator, self.perimeter_architect, self.experience_memory,
-            config=yaml.safe_load(yaml.dump(self.config)),
-            on_position_closed_callback=self.performance_auditor.record_closed_position
+            config=self.config,
+            on_position_closed_callback=self.lifecycle.relay(self.performance_auditor.record_closed_position),
+            journal=TradeJournal(get_isolated_config_copy(self.config, 'trade_journal'), PROJECT_ROOT)
         )
         logger.info("Recruiting the Intelligence Wing...")
         self.time_oracle = MultiTimeframeSynthesizer(get_isolated_config_copy(self.config, 'analyst_ai'))
@@ -135,13 +185,28 @@ class ShadowVanguardOracle:
         self.fib_sniper = FibonacciHelper(get_isolated_config_copy(self.config, 'analyst_ai'))
         self.interrogator = DivergenceDetector(get_isolated_config_copy(self.config, 'analyst_ai'))
         self.supreme_commander = TacticalController(
-            self.position_manager, self.experience_memory, self.strategic_memory,
-            yaml.safe_load(yaml.dump(self.config))
+            self.position_manager, self.experience_memory, self.strategic_memory, self.config
         )
         self.cli = CliInterface()
+        self.profiler = TickProfiler(get_isolated_config_copy(self.config, 'profiler'))
+        # [SURGICAL UPGRADE]: The Chronicle Keeper snapshots backtests; live and replay providers hold sockets and threads.
+        self.checkpoints = CheckpointManager(get_isolated_config_copy(self.config, 'checkpoint'), self.config, PROJECT_ROOT)
+        self.reload_config = get_isolated_config_copy(self.config, 'doctrine_reload')
+        if self.simulation_mode != 'backtest' and self.checkpoints.enabled:
+            logger.warning("Checkpoints are only supported in backtest mode. Disabled."); self.checkpoints.enabled = False
+        self.dashboard_enabled = self.config.get('dashboard_enabled', True)
+        # [SURGICAL UPGRADE]: The War Room relay draws the dashboard in its own thread; the loop only hands it snapshots.
+        self.war_room = WarRoom(get_isolated_config_copy(self.config, 'dashboard'), PROJECT_ROOT) if self.dashboard_enabled else None
         self.symbol = self.config.get('target_symbol', 'BTC/USDT:USDT')
+        # [SURGICAL UPGRADE]: Resolved once per run instead of a YAML round-trip on every tick.
+        self.base_tf_name = f"{self.config.get('data_provider', {}).get('timeframe_minutes', 5)}m"
         logger.info(f"All units initialized. Final Command Protocol synchronized for {self.config.get('live_engine', {}).get('exchange', 'backtest')}.")
         
+    def _fill_simulator(self) -> FillSimulator:
+        # [SURGICAL UPGRADE]: The Friction Engine prices simulated fills; disabled, the Lookout fills at the touch as before.
+        return FillSimulator(get_isolated_config_copy(self.config, 'execution_engine').get('fill_simulator', {}),
+                             self.config.get('data_provider', {}).get('timeframe_minutes', 5))
+
     # [PACT KEPT]: The remainder of the file is PRESERVED.
     def run_simulation(self):
         self.cli.display_welcome_message()
@@ -150,25 +215,37 @@ class ShadowVanguardOracle:
                 logger.warning("Operation aborted by the Commander."); return
         
         if self.simulation_mode == 'backtest':
-            self.phase_zero_historical_wisdom()
-        else:
-            logger.info("="*20 + " [ PHASE 0: LIVE WARMUP ] " + "="*20)
-            if isinstance(self.data_provider, LiveDataProvider):
-                initial_mdf = self.data_provider.fetch_next_market_data()
-                if initial_mdf:
-                    enriched_mdf = self.time_oracle.synthesize(initial_mdf)
-                    self.strategic_memory.build_from_history(enriched_mdf, ob_analyzer=self.ob_analyzer, liq_analyzer=self.liq_analyzer)
-                    logger.info("Live mode warmup and strategic map built successfully.")
-                else:
-                    logger.critical("Live warmup FAILED. Cannot proceed with engagement."); return
-            else:
-                 logger.critical("Configuration Mismatch: Live mode selected but LiveDataProvider is not active."); return
+            if not (self.checkpoints.enabled and self.checkpoints.resume and self.checkpoints.restore(self)):
+                self.phase_zero_historical_wisdom()
+        elif not self.phase_zero_live_warmup(): return
 
         self.phase_one_knowledge_acquisition()
         self.phase_two_engagement()
-        logger.info("="*25 + " [ CAMPAIGN FINISHED ] " + "="*25)
+        self.stand_down()
         self.cli.display_final_report(self.capital_allocator)
 
+    def phase_zero_live_warmup(self) -> bool:
+        logger.info("="*20 + " [ PHASE 0: LIVE WARMUP ] " + "="*20)
+        if isinstance(self.data_provider, (LiveDataProvider, StreamingDataProvider)):
+            initial_mdf = self.data_provider.fetch_next_market_data()
+            if initial_mdf:
+                enriched_mdf = self.time_oracle.synthesize(initial_mdf)
+                self.strategic_memory.build_from_history(enriched_mdf, ob_analyzer=self.ob_analyzer, liq_analyzer=self.liq_analyzer)
+                logger.info("Live mode warmup and strategic map built successfully."); return True
+            logger.critical("Live warmup FAILED. Cannot proceed with engagement."); return False
+        logger.critical("Configuration Mismatch: Live mode selected but LiveDataProvider is not active."); return False
+
+    def stand_down(self):
+        """Draws the last frame, exports the profile and closes the streams once the engagement is over."""
+        if self.war_room: self.war_room.close()
+        self.lifecycle.close(self); self.position_manager.journal.close()
+        if self.profiler.enabled:
+            self.profiler.export(PROJECT_ROOT / self.config.get('profiler', {}).get('report_file', 'tick_profile.json'))
+            self.cli.display_profile_report(self.profiler.summary())
+        if isinstance(self.data_provider, StreamingDataProvider): self.data_provider.close()
+        if self.replay_exchange: self.replay_exchange.shutdown()
+        logger.info("="*25 + " [ CAMPAIGN FINISHED ] " + "="*25)
+
     def phase_zero_historical_wisdom(self):
         if not isinstance(self.data_provider, DataProvider):
             logger.warning("Skipping Phase 0 as it is intended for backtest mode only."); return
@@ -180,10 +257,14 @@ class ShadowVanguardOracle:
         base_tf_df = historical_dict.get(base_tf_str)
         if not historical_dict or base_tf_df is None or base_tf_df.empty:
              logger.error("Cannot build historical wisdom."); return
+        history = dict(historical_dict)  # The synthesis below adds its timeframes to the dict it is handed.
+        if self.map_store.recall(self, history) == 'exact':
+            logger.info("The timeless strategic map has been recalled."); return
         last_timestamp = historical_dict[base_tf_str].index[-1]
         historical_mdf = MarketDataFrame(timestamp=last_timestamp, symbol=self.symbol, ohlcv_multidim=historical_dict)
         enriched_mdf = self.time_oracle.synthesize(historical_mdf)
         self.strategic_memory.build_from_history(enriched_mdf, ob_analyzer=self.ob_analyzer, liq_analyzer=self.liq_analyzer)
+        self.map_store.archive(self, history)
         logger.info("The timeless strategic map has been built.")
         
     def phase_one_knowledge_acquisition(self):
@@ -191,9 +272,14 @@ class ShadowVanguardOracle:
         
     def phase_two_engagement(self):
         logger.info("="*20 + " [ PHASE 2: GODSPEED ENGAGEMENT ] " + "="*20)
+        if self.war_room: self.war_room.start()
         try:
             while self.data_provider.has_more_data():
                 self._tick()
+                self.checkpoints.tick_completed(self)
+                self.lifecycle.tick_completed(self)
+                if self.reload_config.get('watch', False) and self.checkpoints.ticks % max(1, int(self.reload_config.get('check_every_ticks', 100))) == 0:
+                    self.watch_doctrine()
                 interval = self.config.get('tick_interval_seconds', 0.0) if self.simulation_mode != 'backtest' else 0.0
                 time.sleep(interval)
         except KeyboardInterrupt:
@@ -202,54 +288,105 @@ class ShadowVanguardOracle:
             logger.critical(f"CRITICAL FAILURE IN ENGAGEMENT LOOP: {e}", exc_info=True)
 
     def _tick(self):
-        mdf = self.data_provider.fetch_next_market_data()
-        if mdf is None: return
-        mdf = self.time_oracle.synthesize(mdf)
+        mdf = self._analyze()
+        if mdf is not None: self._engage(mdf)
+
+    def _analyze(self) -> Optional[MarketDataFrame]:
+        """The tick's first half: the next frame and every analyst's report on it. It reads and writes this Oracle's units only."""
+        profiler = self.profiler; profiler.begin_tick()
+        mdf = self.data_provider.fetch_next_market_data(); profiler.lap('fetch')
+        if mdf is None: return None
+        mdf = self.time_oracle.synthesize(mdf); profiler.lap('synthesize')
+        if isinstance(self.order_executor, SimulatedOrderExecutor): self.order_executor.observe_market(mdf, self.base_tf_name)
         log_tick_info = False
         if self.simulation_mode == 'backtest' and isinstance(self.data_provider, DataProvider) and hasattr(self.data_provider, 'current_index') and self.data_provider.current_index % 10 == 0:
             log_tick_info = True
         if log_tick_info:
              logger.debug("-" * 25 + f" [ BATTLE TICK #{self.data_provider.current_index} ] " + "-" * 25)
         
-        mdf.ob_report = self.ob_analyzer.analyze(mdf)
-        mdf.liq_report = self.liq_analyzer.analyze(mdf)
-        mdf.fib_report = self.fib_sniper.analyze(mdf)
-        mdf.div_report = self.interrogator.analyze(mdf)
-        mdf.structure_report = self.structure_analyzer.analyze(mdf)
-        mdf.power_scanner = self.power_scanner.scan(mdf)
-        mdf.emotion_report = self.emotion_engine.analyze(mdf)
+        mdf.ob_report = self.ob_analyzer.analyze(mdf); profiler.lap('order_blocks')
+        mdf.liq_report = self.liq_analyzer.analyze(mdf); profiler.lap('liquidity')
+        mdf.fib_report = self.fib_sniper.analyze(mdf); profiler.lap('fibonacci')
+        mdf.div_report = self.interrogator.analyze(mdf); profiler.lap('divergence')
+        mdf.structure_report = self.structure_analyzer.analyze(mdf); profiler.lap('structure')
+        mdf.power_scanner = self.power_scanner.scan(mdf); profiler.lap('power_scan')
+        mdf.emotion_report = self.emotion_engine.analyze(mdf); profiler.lap('emotion')
+        return mdf
+
+    def _engage(self, mdf: MarketDataFrame):
+        """The tick's second half: the decision, its execution, the PnL update and the stop check, against the shared capital."""
+        profiler = self.profiler
         active_position = self.position_manager.get_active_position_for_symbol(self.symbol)
         strategic_alert_status = self.performance_auditor.get_strategic_alert_status()
         final_decision, signal = self.supreme_commander.decide_and_signal(
-            mdf=mdf, strategic_alert_status=strategic_alert_status, active_pos=active_position)
+            mdf=mdf, strategic_alert_status=strategic_alert_status, active_pos=active_position); profiler.lap('decide')
+        tactical_df = mdf.ohlcv_multidim.get(self.base_tf_name)
+        last_candle = tactical_df.iloc[-1] if tactical_df is not None and not tactical_df.empty else None
+        # [SURGICAL UPGRADE]: The Scribe's Flight Recorder (a resumed snapshot's, too) opens the tick before anything can fill.
+        journal = self.position_manager.journal; journal.stamp(mdf.timestamp)
+        if journal.enabled:
+            close = last_candle['close'] if last_candle is not None else float('nan')
+            if signal: journal.signal(signal, self.symbol, close)
+            journal.decision(final_decision, signal, self.symbol, close)
         if signal and final_decision not in [TacticalDecision.WAIT, TacticalDecision.HOLD]:
-             self.position_manager.execute_tactical_decision(final_decision, signal, mdf)
-        dp_config = get_isolated_config_copy(self.config, 'data_provider')
-        base_tf_minutes = dp_config.get('timeframe_minutes', 5)
-        base_tf_name = f"{base_tf_minutes}m"
-        tactical_df = mdf.ohlcv_multidim.get(base_tf_name)
-        if tactical_df is not None and not tactical_df.empty:
-            last_candle = tactical_df.iloc[-1]
+             self.position_manager.execute_tactical_decision(final_decision, signal, mdf); profiler.lap('execute')
+        if last_candle is not None:
             current_price, current_high, current_low = last_candle['close'], last_candle['high'], last_candle['low']
-            self.position_manager.update_all_positions_pnl(current_price)
+            self.position_manager.update_all_positions_pnl(current_price); profiler.lap('pnl_update')
             triggered_traps = self.order_executor.check_triggered_stops(current_high=current_high, current_low=current_low, symbol=self.symbol)
             if triggered_traps: self.position_manager.handle_triggered_traps(triggered_traps, mdf)
-        log_dashboard_info = False
-        if self.simulation_mode == 'backtest' and isinstance(self.data_provider, DataProvider) and hasattr(self.data_provider, 'current_index') and self.data_provider.current_index % 50 == 0:
-            log_dashboard_info = True
-        if log_dashboard_info:
-            self.cli.display_full_dashboard(
+            profiler.lap('stop_check')
+        profiler.end_tick()
+        # [SURGICAL UPGRADE]: No more clearing and reprinting the console from the loop: the snapshot is captured only when a frame is due.
+        if self.war_room and self.war_room.running:
+            self.war_room.publish(lambda: self.cli.capture(
                 mdf=mdf, structure_report=mdf.structure_report, power_report=mdf.power_report,
                 emotion_report=mdf.emotion_report, ob_report=mdf.ob_report, fib_report=mdf.fib_report,
                 div_report=mdf.div_report, liq_report=mdf.liq_report, final_decision=final_decision,
                 signal=signal, active_positions=self.position_manager.get_all_positions(),
-                capital_allocator=self.capital_allocator, strategic_map=self.strategic_memory.get_strategic_map()
-            )
+                capital_allocator=self.capital_allocator, strategic_map=self.strategic_memory.get_strategic_map(),
+                profile_summary=self.profiler.summary() if self.profiler.enabled else None, tick=self.checkpoints.ticks + 1))
+
+    # --- Doctrine hot-reload ---
+    def _doctrine_mtime(self) -> Optional[float]:
+        try: return os.stat(self.config_path).st_mtime if self.config_path else None
+        except OSError: return None
+
+    def watch_doctrine(self) -> bool:
+        """Re-reads the settings file when it has changed on disk since it was last read."""
+        mtime = self._doctrine_mtime()
+        if mtime is None or mtime == self._config_mtime: return False
+        self._config_mtime = mtime
+        return self.reload_doctrine()
+
+    def reload_doctrine(self, config_path: Optional[str] = None) -> bool:
+        """
+        Validates the settings file again and rearms the TacticalController with its doctrine in
+        one swap. A file that fails validation is refused whole; changes outside the tactical
+        doctrine are reported and take effect on the next start.
+        """
+        path = config_path or self.config_path
+        if not path: logger.warning("No settings file to reload the doctrine from."); return False
+        fresh = self.load_config(path, validate=False); issues = validate_config(fresh); report_issues(issues, str(path))
+        if any(issue.fatal for issue in issues):
+            logger.error("The reloaded doctrine was refused; the Legion keeps its current orders."); return False
+        fresh = freeze(fresh)
+        changed = sorted(key for key in set(fresh) | set(self.config) if fresh.get(key) != self.config.get(key))
+        deferred = [key for key in changed if key not in ('tactical_controller', 'doctrine_reload')]
+        if deferred: logger.warning(f"Doctrine changes to {', '.join(deferred)} take effect on the next start.")
+        if 'tactical_controller' not in changed: return False
+        self.config = freeze({**self.config, 'tactical_controller': fresh['tactical_controller']})
+        self.supreme_commander.rearm(self.config); self.checkpoints.fingerprint = config_fingerprint(self.config)
+        logger.info("The TacticalController has been rearmed with the reloaded doctrine.")
+        return True
+
+    @staticmethod
+    def resolve_config_path(config_path_str: str) -> Path:
+        path = Path(config_path_str); return path if path.is_absolute() else PROJECT_ROOT / path
 
     @staticmethod
-    def load_config(config_path_str: str = 'config/settings.yaml') -> Dict[str, Any]:
-        path = Path(config_path_str);
-        if not path.is_absolute(): path = PROJECT_ROOT / path
+    def load_config(config_path_str: str = 'config/settings.yaml', validate: bool = True) -> Dict[str, Any]:
+        path = ShadowVanguardOracle.resolve_config_path(config_path_str)
         if not path.is_file():
             path.parent.mkdir(parents=True, exist_ok=True); default_config={'initial_capital':10000.0}
             with open(path, 'w', encoding='utf-8') as f: yaml.dump(default_config, f, sort_keys=False, indent=2)
@@ -258,7 +395,15 @@ class ShadowVanguardOracle:
         with open(path, 'r', encoding='utf-8') as f: config = yaml.safe_load(f)
         if 'data_provider' in config and 'csv_files' in config['data_provider']:
             config['data_provider']['csv_files']=[str(PROJECT_ROOT/p) for p in config['data_provider']['csv_files']]
+        if 'data_provider' in config and 'candle_store_path' in config['data_provider']:
+            config['data_provider']['candle_store_path']=str(PROJECT_ROOT/config['data_provider']['candle_store_path'])
         logger.info(f"Configuration loaded from '{path}'.")
+        # [SURGICAL UPGRADE]: Checked once, before any unit reads it: a mistyped key is caught here, not silently defaulted.
+        # A value of the wrong type would break the unit reading it, so the Legion refuses to start on it at all.
+        if validate:
+            issues = validate_config(config); report_issues(issues, path.name)
+            fatal = [issue for issue in issues if issue.fatal]
+            if fatal: raise ValueError(f"'{path.name}' has {len(fatal)} fatal issue(s); the Legion refuses to start on it.")
         return config
 
 if __name__ == "__main__":
@@ -267,7 +412,9 @@ if __name__ == "__main__":
     args = parser.parse_args()
     try:
         master_config = ShadowVanguardOracle.load_config(args.config)
-        oracle_bot = ShadowVanguardOracle(config=master_config)
+        # The boot logger only covers the import phase; the campaign runs under settings.yaml's logging policy.
+        setup_logging(PROJECT_ROOT, log_file_name=os.environ.get('LEGION_LOG_FILE', 'legion_activity.log'), policy=master_config.get('logging', {}))
+        oracle_bot = ShadowVanguardOracle(config=master_config, config_path=args.config)
         oracle_bot.run_simulation()
     except Exception as e:
         logger.critical(f"Bot failed to initialize or run. Aborting. Reason: {e}", exc_info=True)
\ No newline at end of file
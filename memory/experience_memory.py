@@ -1,5 +1,5 @@
 # F:\ShadowVanguard_Legion\memory\experience_memory.py
-# Version 4.4 - Prometheus: Unified with the central data constitution.
+# Version 5.0 - Prometheus, The Recollection Lattice
 
 import logging
 from typing import Dict, Any, List, Optional
@@ -7,70 +7,92 @@ from collections import deque
 import numpy as np
 import pandas as pd
 from sklearn.preprocessing import StandardScaler
-from sklearn.exceptions import NotFittedError
 
 # AI-UPGRADE: وارد کردن مدل‌ها از یک منبع واحد و مرکزی
 from core.data_models import TacticalSignal, PositionV2 as Position, PowerReport, EmotionReport, Experience
 from core.market_enums import TacticalDecision, MarketRegime
+from memory.similarity_index import SimilarityIndex
 
 logger = logging.getLogger("ExperienceMemory")
 
 # AI-FIX: تعریف تکراری Experience حذف شد. اکنون از نسخه مرکزی استفاده می‌شود.
 
+POWER_FEATURES = ('true_net_force', 'net_force_acceleration', 'book_imbalance', 'delta_joiners', 'price_velocity')
+EMOTION_FEATURES = ('aggression', 'caution', 'fear', 'greed', 'doubt', 'hysteria', 'exhaustion')
+ALL_REGIMES = list(MarketRegime)
+FEATURE_DIMENSION = len(POWER_FEATURES) + len(EMOTION_FEATURES) + len(ALL_REGIMES)
+_CALM_EMOTION = EmotionReport()
+
+
+def _read_field(source: Any, name: str, default: float) -> float:
+    """Reads a feature from either a live report object or its `asdict` snapshot."""
+    if source is None: return default
+    value = source.get(name, default) if isinstance(source, dict) else getattr(source, name, default)
+    return float(value) if value is not None else default
+
 class ExperienceMemory:
     """
     The Legion's archives. It stores battle experiences, learns from them,
-    and provides wisdom from past encounters. Now fully aligned with the core constitution.
+    and provides wisdom from past encounters. Recall is served by a `SimilarityIndex`
+    that mirrors the archive as one pre-normalized matrix, so a query costs a single
+    matrix product instead of a Python walk over every memory.
     """
-    def __init__(self, config: Dict[str, Any]):
-        self.config = config
-        self.max_size = self.config.get('max_size', 2000)
+    def __init__(self, config: Optional[Dict[str, Any]] = None, max_size: Optional[int] = None):
+        self.config = config or {}
+        self.max_size = max_size or self.config.get('max_size', 2000)
         self.scaler_refit_interval = self.config.get('refit_interval', 100)
+        self.min_similarity_threshold = self.config.get('min_similarity_threshold', 0.7)
         
         self.memory = deque(maxlen=self.max_size)
         self.scaler = StandardScaler()
+        self.index = SimilarityIndex(self.max_size, FEATURE_DIMENSION)
         self.operations_since_refit = 0
         
-        logger.info(f"[ExperienceMemory] Unified Archives v4.4 ready. Capacity: {self.max_size}.")
+        logger.info(f"[ExperienceMemory] Recollection Lattice v5.0 ready. Capacity: {self.max_size}.")
 
     def remember(self, experience: Experience):
         self.memory.append(experience)
+        # [SURGICAL UPGRADE]: The index is updated in place; only this one vector is scaled and normalized.
+        self.index.add(self._state_to_vector(experience.state), experience.outcome, self._is_recallable(experience), experience)
         self.operations_since_refit += 1
         if self.operations_since_refit >= self.scaler_refit_interval:
             self.refit_scaler()
     
-    def prime_with_history(self, history_df: pd.DataFrame, structure_analyzer, power_scanner):
+    def prime_with_history(self, history_df: pd.DataFrame, structure_analyzer=None, power_scanner=None):
         """
         Primes the memory with simplified experiences from historical data.
+        The feature matrix is built column-wise and loaded into the index in one shot.
         """
         logger.info(f"Priming memory with {len(history_df)} historical records...")
-        if history_df.empty: return
+        if history_df.empty or len(history_df) < 2: return
         
-        for i in range(1, len(history_df)):
-            outcome = (history_df['close'].iloc[i] / history_df['close'].iloc[i-1]) - 1
-            
-            # This is a very simplified state for priming purposes.
-            simple_state = {
-                'power_report': PowerReport(net_force=(history_df['volume'].iloc[i] * np.sign(outcome))),
-                'emotion_report': EmotionReport(),
-                'market_regime': MarketRegime.UNCERTAIN
-            }
-            exp = Experience(state=simple_state, action=TacticalDecision.HOLD, outcome=outcome)
-            self.memory.append(exp)
+        closes = history_df['close'].to_numpy(dtype=float); volumes = history_df['volume'].to_numpy(dtype=float)
+        outcomes = closes[1:] / closes[:-1] - 1
+        net_forces = volumes[1:] * np.sign(outcomes)
+
+        # This is a very simplified state for priming purposes: only the net force varies.
+        template = self._state_to_vector({'market_regime': MarketRegime.UNCERTAIN})
+        vectors = np.tile(template, (len(outcomes), 1)); vectors[:, POWER_FEATURES.index('true_net_force')] = net_forces
+        experiences = [Experience(state={'power_report': PowerReport(true_net_force=float(force)), 'emotion_report': EmotionReport(),
+                                         'market_regime': MarketRegime.UNCERTAIN}, action=TacticalDecision.HOLD, outcome=float(outcome))
+                       for force, outcome in zip(net_forces, outcomes)]
+        self.memory.extend(experiences)
+        self.index.add_many(vectors, outcomes, np.ones(len(outcomes), dtype=bool), experiences)
         
         logger.info("Memory priming complete. Initial scaler fitting...")
         self.refit_scaler()
 
     def refit_scaler(self):
-        """Trains the feature scaler on all current experiences in memory."""
+        """Trains the feature scaler on all current experiences and re-normalizes the index in bulk."""
         if len(self.memory) < 20: 
             logger.debug("Not enough experiences to refit the scaler yet.")
             return
 
         try:
-            all_vectors = [vec for exp in self.memory if (vec := self._state_to_vector(exp.state)) is not None]
-            if all_vectors:
+            all_vectors = self.index.raw_vectors()
+            if len(all_vectors):
                 self.scaler.fit(all_vectors)
+                self.index.calibrate(self.scaler.mean_, self.scaler.scale_)
                 self.operations_since_refit = 0
                 logger.info(f"Adaptive feature scaler has been successfully refitted on {len(all_vectors)} experiences.")
         except Exception as e:
@@ -78,68 +100,64 @@ class ExperienceMemory:
             
     def find_similar_pattern(self, current_state: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Finds the most successful similar past experience."""
-        try:
-            current_vector = self._get_scaled_vector(current_state)
-            if current_vector is None: return None
-        except (NotFittedError, ValueError):
-             logger.warning("Memory scaler not ready or invalid data. Historical analysis skipped.")
-             return None
+        return self.find_similar_patterns([current_state])[0]
 
-        best_match_info = None
-        best_similarity_score = -float('inf') 
+    def find_similar_patterns(self, states: List[Dict[str, Any]], k: int = 1) -> List[Optional[Dict[str, Any]]]:
+        """
+        Batched recall: one matrix product answers every state at once. With `k == 1` each entry is
+        the best match (or None); with `k > 1` each entry also carries the runners-up under 'neighbours'.
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(states)
+        if not self.index.is_calibrated:
+            logger.warning("Memory scaler not ready or invalid data. Historical analysis skipped.")
+            return results
 
-        for exp in self.memory:
-            if exp.action == TacticalDecision.WAIT or not exp.state: continue
-            
-            exp_vector = self._get_scaled_vector(exp.state)
-            if exp_vector is None: continue
-                
-            similarity = self._calculate_cosine_similarity(current_vector, exp_vector)
-            
-            weighted_score = similarity * (1 + exp.outcome)
-            
-            if weighted_score > best_similarity_score:
-                best_similarity_score = weighted_score
-                best_match_info = {
-                    "decision": exp.action,
-                    "confidence": round(min(1.0, similarity), 2),
-                    "reason": f"Historical match (sim: {similarity:.2f}, outcome: {exp.outcome:.2%})"
-                }
-        
-        min_similarity_threshold = self.config.get('min_similarity_threshold', 0.7)
-        if best_match_info and best_match_info['confidence'] > min_similarity_threshold:
-            logger.info(f"Memory Recall: Suggesting '{best_match_info['decision'].name}' with confidence {best_match_info['confidence']:.2f}")
-            return best_match_info
-        
-        return None
+        vectors = [self._state_to_vector(state) for state in states]
+        valid = [i for i, vec in enumerate(vectors) if vec is not None]
+        if not valid: return results
+        slots, _, similarities = self.index.query(np.vstack([vectors[i] for i in valid]), k=k)
+
+        for row, i in enumerate(valid):
+            matches = [self._describe_match(slot, sim) for slot, sim in zip(slots[row], similarities[row]) if slot >= 0]
+            best_match_info = matches[0] if matches else None
+            if best_match_info and best_match_info['confidence'] > self.min_similarity_threshold:
+                logger.info(f"Memory Recall: Suggesting '{best_match_info['decision'].name}' with confidence {best_match_info['confidence']:.2f}")
+                if k > 1: best_match_info['neighbours'] = matches[1:]
+                results[i] = best_match_info
+        return results
+
+    def _describe_match(self, slot: int, similarity: float) -> Dict[str, Any]:
+        exp = self.index.payload(slot); outcome = self.index.outcome(slot)
+        return {
+            "decision": exp.action,
+            "confidence": round(min(1.0, float(similarity)), 2),
+            "reason": f"Historical match (sim: {similarity:.2f}, outcome: {outcome:.2%})"
+        }
+
+    @staticmethod
+    def _is_recallable(experience: Experience) -> bool:
+        return experience.action != TacticalDecision.WAIT and bool(experience.state)
 
     def _state_to_vector(self, state: Dict[str, Any]) -> Optional[np.ndarray]:
+        """
+        Accepts both live states ('power_report'/'emotion_report' objects) and the archived
+        `asdict` snapshots written by the PositionManager ('power'/'emotion'/'structure').
+        """
         try:
-            power = state.get('power_report') or PowerReport()
-            emotion = state.get('emotion_report') or EmotionReport()
-            regime = state.get('market_regime') or MarketRegime.UNCERTAIN
-            
-            all_regimes = list(MarketRegime)
-            regime_vector = [1.0 if regime == r else 0.0 for r in all_regimes]
-
-            feature_vector = [
-                power.net_force, power.confidence, power.price_velocity,
-                emotion.aggression, emotion.caution, emotion.fear, emotion.greed, emotion.doubt,
-                emotion.hysteria, emotion.exhaustion
-            ] + regime_vector
+            power = state.get('power_report') or state.get('power') or PowerReport()
+            emotion = state.get('emotion_report') or state.get('emotion') or EmotionReport()
+            regime = state.get('market_regime')
+            if regime is None:
+                structure = state.get('structure_report') or state.get('structure') or {}
+                regimes = structure.get('market_regime', {}) if isinstance(structure, dict) else getattr(structure, 'market_regime', {})
+                regime = next(iter(regimes.values()), None) if regimes else None
+            regime = regime or MarketRegime.UNCERTAIN
+
+            regime_vector = [1.0 if regime == r else 0.0 for r in ALL_REGIMES]
+            feature_vector = [_read_field(power, name, 0.0) for name in POWER_FEATURES] + \
+                             [_read_field(emotion, name, getattr(_CALM_EMOTION, name)) for name in EMOTION_FEATURES] + regime_vector
             
             return np.array(feature_vector, dtype=float)
         except Exception as e:
             logger.warning(f"Could not convert state to vector: {e}")
             return None
-
-    def _get_scaled_vector(self, state: Dict[str, Any]) -> Optional[np.ndarray]:
-        vector = self._state_to_vector(state)
-        if vector is None: return None
-        return self.scaler.transform(vector.reshape(1, -1))[0]
-
-    def _calculate_cosine_similarity(self, vec_a: np.ndarray, vec_b: np.ndarray) -> float:
-        if vec_a is None or vec_b is None: return 0.0
-        norm_a = np.linalg.norm(vec_a); norm_b = np.linalg.norm(vec_b)
-        if norm_a == 0 or norm_b == 0: return 0.0
-        return max(0.0, float(np.dot(vec_a, vec_b) / (norm_a * norm_b)))
\ No newline at end of file
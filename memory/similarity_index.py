@@ -0,0 +1,122 @@
+# F:\ShadowVanguard_Legion_Godspeed\memory\similarity_index.py
+# Version 1.0 - Prometheus, The Recollection Lattice
+
+import logging
+from typing import Any, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger("SimilarityIndex")
+
+
+class SimilarityIndex:
+    """
+    THE RECOLLECTION LATTICE: A contiguous, pre-normalized feature matrix mirroring the
+    Legion's experience archive slot for slot. Raw vectors are kept beside their scaled,
+    unit-length twins, so a scaler refit re-normalizes the whole lattice in one bulk
+    operation and every recall is a single matrix product followed by an argpartition.
+    Slots behave as a ring: once full, the oldest memory is overwritten, exactly as the
+    archive's bounded deque forgets it.
+    """
+    def __init__(self, capacity: int, dimension: int):
+        self.capacity = max(1, int(capacity)); self.dimension = int(dimension)
+        self._raw = np.zeros((self.capacity, self.dimension), dtype=np.float64)
+        self._unit = np.zeros((self.capacity, self.dimension), dtype=np.float64)
+        self._outcomes = np.zeros(self.capacity, dtype=np.float64)
+        self._eligible = np.zeros(self.capacity, dtype=bool); self._has_vector = np.zeros(self.capacity, dtype=bool)
+        self._payloads: List[Any] = [None] * self.capacity
+        self._mean: Optional[np.ndarray] = None; self._scale: Optional[np.ndarray] = None
+        self._next_slot = 0; self.size = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    # --- Normalization ---
+    @property
+    def is_calibrated(self) -> bool:
+        return self._mean is not None
+
+    def _normalize(self, raw: np.ndarray) -> np.ndarray:
+        scaled = (raw - self._mean) / self._scale
+        norms = np.linalg.norm(scaled, axis=-1, keepdims=True)
+        return np.divide(scaled, norms, out=np.zeros_like(scaled), where=norms > 0)
+
+    def calibrate(self, mean: np.ndarray, scale: np.ndarray):
+        """Adopts a freshly fitted scaler and re-normalizes every stored vector in one pass."""
+        self._mean = np.asarray(mean, dtype=np.float64); self._scale = np.asarray(scale, dtype=np.float64)
+        if self.size: self._unit[:self.size] = self._normalize(self._raw[:self.size])
+
+    # --- Storage ---
+    def _slots_in_age_order(self) -> np.ndarray:
+        if self.size < self.capacity: return np.arange(self.size)
+        return (np.arange(self.capacity) + self._next_slot) % self.capacity
+
+    def add(self, vector: Optional[np.ndarray], outcome: float, eligible: bool, payload: Any = None):
+        """Writes one memory into the next ring slot. A missing vector occupies its slot but never matches."""
+        slot = self._next_slot
+        if vector is None:
+            self._raw[slot] = 0.0; self._unit[slot] = 0.0; eligible = False
+        else:
+            self._raw[slot] = vector
+            self._unit[slot] = self._normalize(self._raw[slot]) if self.is_calibrated else 0.0
+        self._outcomes[slot] = outcome; self._eligible[slot] = eligible; self._has_vector[slot] = vector is not None; self._payloads[slot] = payload
+        self._next_slot = (slot + 1) % self.capacity; self.size = min(self.size + 1, self.capacity)
+
+    def add_many(self, vectors: np.ndarray, outcomes: np.ndarray, eligible: np.ndarray, payloads: Optional[List[Any]] = None):
+        """Bulk-loads a block of memories; only the newest `capacity` rows survive, as with repeated `add` calls."""
+        vectors = np.asarray(vectors, dtype=np.float64).reshape(-1, self.dimension)
+        outcomes = np.asarray(outcomes, dtype=np.float64); eligible = np.asarray(eligible, dtype=bool)
+        count = len(vectors)
+        if count == 0: return
+        payloads = list(payloads) if payloads is not None else [None] * count
+        if count > self.capacity:
+            vectors, outcomes, eligible, payloads = vectors[-self.capacity:], outcomes[-self.capacity:], eligible[-self.capacity:], payloads[-self.capacity:]
+            self._next_slot = (self._next_slot + count - self.capacity) % self.capacity; count = self.capacity
+        slots = (self._next_slot + np.arange(count)) % self.capacity
+        self._raw[slots] = vectors
+        self._unit[slots] = self._normalize(vectors) if self.is_calibrated else 0.0
+        self._outcomes[slots] = outcomes; self._eligible[slots] = eligible; self._has_vector[slots] = True
+        for slot, payload in zip(slots.tolist(), payloads): self._payloads[slot] = payload
+        self._next_slot = int((slots[-1] + 1) % self.capacity); self.size = min(self.size + count, self.capacity)
+
+    def raw_vectors(self) -> np.ndarray:
+        """Every stored raw vector (oldest first); the training set for the archive's scaler."""
+        slots = self._slots_in_age_order()
+        return self._raw[slots[self._has_vector[slots]]]
+
+    def clear(self):
+        self._eligible[:] = False; self._has_vector[:] = False; self._payloads = [None] * self.capacity
+        self._next_slot = 0; self.size = 0
+
+    # --- Recall ---
+    def query(self, vectors: np.ndarray, k: int = 1) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Answers a batch of queries at once. Returns `(slots, scores, similarities)`, each shaped
+        `(n_queries, k)` and ordered best first, where score = max(0, cosine) * (1 + outcome).
+        Slots holding no eligible memory come back as -1 with a score of -inf.
+        """
+        queries = np.atleast_2d(np.asarray(vectors, dtype=np.float64))
+        k = max(1, min(int(k), self.capacity))
+        empty = (np.full((len(queries), k), -1), np.full((len(queries), k), -np.inf), np.zeros((len(queries), k)))
+        if not self.is_calibrated or self.size == 0: return empty
+
+        slots = self._slots_in_age_order()
+        similarities = np.maximum(self._normalize(queries) @ self._unit[slots].T, 0.0)
+        scores = np.where(self._eligible[slots], similarities * (1.0 + self._outcomes[slots]), -np.inf)
+
+        k = min(k, len(slots))
+        if k == 1: candidates = np.argmax(scores, axis=1)[:, None]
+        elif k < len(slots): candidates = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        else: candidates = np.broadcast_to(np.arange(len(slots)), scores.shape).copy()
+        # Best first; equal scores keep the oldest memory first, as the archive's linear scan did.
+        order = np.lexsort((candidates, -np.take_along_axis(scores, candidates, axis=1)), axis=1)
+        best = np.take_along_axis(candidates, order, axis=1)
+        best_scores = np.take_along_axis(scores, best, axis=1); best_sims = np.take_along_axis(similarities, best, axis=1)
+        best_slots = np.where(np.isfinite(best_scores), slots[best], -1)
+        return best_slots, best_scores, best_sims
+
+    def payload(self, slot: int) -> Any:
+        return self._payloads[slot] if slot >= 0 else None
+
+    def outcome(self, slot: int) -> float:
+        return float(self._outcomes[slot])
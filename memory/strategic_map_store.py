@@ -0,0 +1,138 @@
+# F:\ShadowVanguard_Legion_Godspeed\memory\strategic_map_store.py
+# Version 1.1 - Prometheus, The Great Library
+
+import hashlib
+import json
+import logging
+import os
+import pickle
+import time
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+
+import pandas as pd
+
+logger = logging.getLogger("StrategicMapStore")
+
+STORE_VERSION = 2  # 2: the analyzers' fired signals are a SignalMemory
+# The units Phase 0 writes to: the archive itself, and the analyzers (and the clockwork) whose registries it is read from.
+MAP_COMPONENTS = ('strategic_memory', 'ob_analyzer', 'liq_analyzer', 'time_oracle')
+# What an archive of a shorter history lends to a longer one: the void harvest, which is the part that
+# grows with the history. Order blocks are judged on the last candles only and are simply judged again.
+EXTEND_COMPONENTS = ('liq_analyzer',)
+
+
+def map_doctrine(config: Dict[str, Any]) -> Dict[str, Any]:
+    """The settings a strategic map depends on: the candles' timeframes, the analyzers that read them and the archive protocol."""
+    analysts = config.get('analyst_ai', {}) or {}; data = config.get('data_provider', {}) or {}
+    protocol = dict((config.get('memory', {}) or {}).get('strategic_memory_protocol', {}) or {})
+    return {'timeframes': (data.get('timeframe_minutes', 5), data.get('strategic_timeframes')), 'protocol': protocol,
+            **{section: analysts.get(section) for section in ('multi_timeframe_synthesizer', 'order_block_analyzer', 'liquidity_analyzer')}}
+
+
+def _frame_digest(df: pd.DataFrame) -> str:
+    digest = hashlib.sha256(df.index.asi8.tobytes())
+    digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return digest.hexdigest()[:16]
+
+
+class StrategicMapStore:
+    """
+    THE GREAT LIBRARY: Keeps Phase 0's strategic map on disk, keyed by the history it was
+    built from and by a hash of the analyzer doctrine that built it (order blocks, voids,
+    time synthesis and the archive protocol, nothing else), so every run and every sweep
+    worker over the same data recalls one archive instead of rebuilding it.
+    When the history has grown since an archive was written (the same candles, plus new ones),
+    its void harvest is recalled and only the new candles are scanned; the map that comes out
+    is the one a build over the whole history would have produced.
+    Entries are pickles: only recall from a library this engine wrote.
+    """
+    def __init__(self, config: Dict[str, Any], doctrine: Dict[str, Any], base_timeframe: str, root: Path):
+        self.config = config or {}
+        self.enabled = self.config.get('enabled', False)
+        self.keep = max(1, int(self.config.get('keep', 8)))
+        directory = Path(self.config.get('directory', 'strategic_maps'))
+        self.directory = directory if directory.is_absolute() else Path(root) / directory
+        self.base_timeframe = base_timeframe
+        self.doctrine_hash = hashlib.sha256(json.dumps(doctrine, sort_keys=True, default=str).encode('utf-8')).hexdigest()[:16]
+        if self.enabled: logger.info(f"[StrategicMapStore] The Great Library v1.1 keeps strategic maps in '{self.directory}'.")
+
+    # --- History spans ---
+    def spans(self, history: Dict[str, pd.DataFrame]) -> Dict[str, Tuple[int, str]]:
+        """Per timeframe, the settled candle count and their digest (a higher-timeframe tail bar is still forming)."""
+        spans = {}
+        for tf in sorted(history):
+            df = history[tf]; settled = len(df) if tf == self.base_timeframe else max(len(df) - 1, 0)
+            spans[tf] = (settled, _frame_digest(df.iloc[:settled]))
+        return spans
+
+    def _extends(self, spans: Dict[str, Tuple[int, str]], history: Dict[str, pd.DataFrame]) -> bool:
+        if set(spans) != set(history): return False
+        for tf, (settled, digest) in spans.items():
+            current = len(history[tf]) if tf == self.base_timeframe else len(history[tf]) - 1
+            if current < settled or _frame_digest(history[tf].iloc[:settled]) != digest: return False
+        return True
+
+    def _name(self, spans: Dict[str, Tuple[int, str]]) -> Path:
+        data_hash = hashlib.sha256(json.dumps(spans, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+        return self.directory / f"map_{self.doctrine_hash}_{data_hash}.pkl"
+
+    # --- Files: a small header, then the units, so candidates are judged without loading their archives ---
+    def _entries(self) -> List[Path]:
+        return sorted(self.directory.glob(f"map_{self.doctrine_hash}_*.pkl"), key=lambda p: p.stat().st_mtime) if self.directory.is_dir() else []
+
+    @staticmethod
+    def _header(path: Path) -> Optional[Dict[str, Any]]:
+        try:
+            with open(path, 'rb') as f: header = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError) as e:
+            logger.error(f"[StrategicMapStore] Could not read '{path.name}': {e}"); return None
+        return header if isinstance(header, dict) and header.get('version') == STORE_VERSION else None
+
+    @staticmethod
+    def _components(path: Path) -> Optional[Dict[str, Any]]:
+        try:
+            with open(path, 'rb') as f: pickle.load(f); return pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError) as e:
+            logger.error(f"[StrategicMapStore] Could not read '{path.name}': {e}"); return None
+
+    # --- Recall and archive ---
+    def recall(self, engine: Any, history: Dict[str, pd.DataFrame]) -> Optional[str]:
+        """
+        Loads the best archive for `history` into the engine's live units. Returns 'exact' when
+        it was built from this very history (Phase 0 is done), 'extend' when it covers a prefix
+        of it (the archival must still run, over the new candles only), or None.
+        """
+        if not self.enabled: return None
+        spans = self.spans(history); path = self._name(spans); mode = 'exact'
+        if not path.is_file():
+            best = None
+            for candidate in self._entries():
+                header = self._header(candidate)
+                if header is None or not self._extends(header['spans'], history): continue
+                covered = header['spans'].get(self.base_timeframe, (0, ''))[0]
+                if best is None or covered > best[0]: best = (covered, candidate)
+            if best is None: return None
+            path, mode = best[1], 'extend'
+        components = self._components(path)
+        if components is None: return None
+        # Loaded into the live units, so everything already holding them (the provider, the Knight) sees the archive.
+        for name, component in components.items():
+            if mode == 'exact' or name in EXTEND_COMPONENTS: vars(getattr(engine, name)).update(vars(component))
+        logger.info(f"[StrategicMapStore] The strategic map was recalled from '{path.name}' ({mode}).")
+        return mode
+
+    def archive(self, engine: Any, history: Dict[str, pd.DataFrame]) -> Optional[Path]:
+        if not self.enabled: return None
+        spans = self.spans(history); path = self._name(spans)
+        # Sweep workers may archive the same map at once: each writes its own partial file and renames it over the target.
+        self.directory.mkdir(parents=True, exist_ok=True); partial = path.with_suffix(f".{os.getpid()}.partial")
+        try:
+            with open(partial, 'wb') as f:
+                pickle.dump({'version': STORE_VERSION, 'spans': spans, 'saved_at': time.time()}, f, protocol=pickle.HIGHEST_PROTOCOL)
+                pickle.dump({name: getattr(engine, name) for name in MAP_COMPONENTS}, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(partial, path)
+        except (OSError, pickle.PicklingError, TypeError, AttributeError) as e:
+            logger.error(f"[StrategicMapStore] The strategic map could not be archived: {e}"); partial.unlink(missing_ok=True); return None
+        for stale in self._entries()[:-self.keep]: stale.unlink(missing_ok=True)
+        return path
@@ -1,13 +1,14 @@
 # F:\ShadowVanguard_Legion_Godspeed\memory\strategic_memory.py
-# Version 2.2 - Prometheus, The Enlightened Historian
+# Version 3.0 - Prometheus, The Enlightened Historian
 
 import logging
 import pandas as pd
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Iterable
 
 # [PACT KEPT]: The new, correct alliances are preserved.
 # [SURGICAL UPGRADE]: Import the official blueprints for perfect type hinting and understanding.
 from core.data_models import MarketDataFrame, OrderBlock, FairValueGap
+from core.zone_index import ZoneIndex
 from analyst_ai.order_block_analyzer import OrderBlockAnalyzer
 from analyst_ai.liquidity_analyzer import LiquidityAnalyzer
 
@@ -21,6 +22,10 @@ class StrategicMemory:
     protocol of the Legion. It correctly reads the `all_blocks` and `unfilled_fvgs` fields
     from modern reports, ensuring the foundational strategic map is built upon a unified
     and consistent truth. The last echo of the old language is gone.
+    v3.0: Every archived zone is also indexed by price, so the map answers range and
+    nearest-zone questions in logarithmic time. The voids are harvested from the Ghost
+    Hunter's registry, which folds only the candles it has not yet seen: archiving a longer
+    history with a Hunter that already holds the shorter one extends the map incrementally.
     """
 
     def __init__(self, config: Dict[str, Any]):
@@ -30,12 +35,15 @@ class StrategicMemory:
         # [SURGICAL UPGRADE]: Archives are now correctly typed with official blueprints.
         self.historical_order_blocks: Dict[str, List[OrderBlock]] = {tf: [] for tf in self.timeframes_to_archive}
         self.historical_liquidity_voids: Dict[str, List[FairValueGap]] = {tf: [] for tf in self.timeframes_to_archive}
+        # [SURGICAL UPGRADE]: The same archives, sorted by price: {'1h': ZoneIndex}.
+        self.order_block_index: Dict[str, ZoneIndex] = {tf: ZoneIndex() for tf in self.timeframes_to_archive}
+        self.void_index: Dict[str, ZoneIndex] = {tf: ZoneIndex() for tf in self.timeframes_to_archive}
 
-        logger.info("[StrategicMemory] The Enlightened Historian v2.2 is founded. The past is now perfectly clear.")
+        logger.info("[StrategicMemory] The Enlightened Historian v3.0 is founded. The past is now perfectly clear.")
 
     def build_from_history(
         self,
-        full_historical_mdf: MarketDataFrame, 
+        full_historical_mdf: MarketDataFrame,
         ob_analyzer: OrderBlockAnalyzer,
         liq_analyzer: LiquidityAnalyzer
     ):
@@ -51,7 +59,8 @@ class StrategicMemory:
 
         # --- Generate comprehensive reports ONCE on the entire historical dataset for efficiency ---
         ob_report = ob_analyzer.analyze(full_historical_mdf)
-        liq_report = liq_analyzer.analyze(full_historical_mdf)
+        # [SURGICAL UPGRADE]: The voids are harvested, so an archive extended with new candles equals one built over them all.
+        liq_report = liq_analyzer.analyze(full_historical_mdf, harvest=True)
 
         # --- Archive Order Blocks using the new, universal protocol ---
         if ob_report and ob_report.all_blocks:
@@ -75,13 +84,48 @@ class StrategicMemory:
                     self.historical_liquidity_voids[tf] = sorted(all_tf_fvgs, key=lambda v: v.created_at_index)
                     logger.info(f"Archived {len(all_tf_fvgs)} significant Liquidity Voids for {tf} timeframe.")
 
+        self._reindex()
         logger.info("The Great Archival is complete. The strategic map is now timeless and consistent.")
-        
+
+    def _reindex(self):
+        self.order_block_index = {tf: ZoneIndex(blocks) for tf, blocks in self.historical_order_blocks.items()}
+        self.void_index = {tf: ZoneIndex(voids) for tf, voids in self.historical_liquidity_voids.items()}
+
     def get_strategic_map(self) -> Dict[str, Any]:
         """
         [PACT KEPT]: This method is PRESERVED, with a minor rename for clarity.
+        'fvgs' is the one name every reader of the map uses.
         """
         return {
             'order_blocks': self.historical_order_blocks,
             'fvgs': self.historical_liquidity_voids  # Renamed from 'liquidity_voids' for consistency
-        }
\ No newline at end of file
+        }
+
+    # --- The Query Protocol ---
+    @staticmethod
+    def _collect(indexes: Dict[str, ZoneIndex], timeframes: Optional[Iterable[str]], query) -> List[Any]:
+        selected = indexes if timeframes is None else {tf: indexes[tf] for tf in timeframes if tf in indexes}
+        return [zone for index in selected.values() for zone in query(index)]
+
+    def order_blocks_between(self, low: float, high: float, timeframes: Optional[Iterable[str]] = None) -> List[OrderBlock]:
+        """Archived order blocks sharing a price with `[low, high]`, timeframe by timeframe, oldest first within each."""
+        return self._collect(self.order_block_index, timeframes, lambda index: index.overlapping(low, high))
+
+    def voids_between(self, low: float, high: float, timeframes: Optional[Iterable[str]] = None) -> List[FairValueGap]:
+        """Archived liquidity voids sharing a price with `[low, high]`, timeframe by timeframe, oldest first within each."""
+        return self._collect(self.void_index, timeframes, lambda index: index.overlapping(low, high))
+
+    def nearest_order_block(self, price: float, direction: str = 'below', timeframes: Optional[Iterable[str]] = None) -> Optional[OrderBlock]:
+        """The archived block closest to `price` lying entirely below it (a floor) or entirely above it (a ceiling)."""
+        return self._nearest(self.order_block_index, price, direction, timeframes)
+
+    def nearest_void(self, price: float, direction: str = 'below', timeframes: Optional[Iterable[str]] = None) -> Optional[FairValueGap]:
+        """The archived void closest to `price` lying entirely below it (a floor) or entirely above it (a ceiling)."""
+        return self._nearest(self.void_index, price, direction, timeframes)
+
+    def _nearest(self, indexes: Dict[str, ZoneIndex], price: float, direction: str, timeframes: Optional[Iterable[str]]) -> Optional[Any]:
+        if direction == 'below':
+            candidates = self._collect(indexes, timeframes, lambda index: [z for z in [index.nearest_below(price)] if z is not None])
+            return max(candidates, key=lambda z: z.price_high, default=None)
+        candidates = self._collect(indexes, timeframes, lambda index: [z for z in [index.nearest_above(price)] if z is not None])
+        return min(candidates, key=lambda z: z.price_low, default=None)
@@ -0,0 +1,186 @@
+# F:\ShadowVanguard_Legion_Godspeed\memory\trade_journal.py
+# Version 1.1 - Prometheus, The Flight Recorder
+
+import json
+import logging
+import struct
+from dataclasses import dataclass, field
+from enum import IntEnum
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from core.market_enums import TacticalDecision, PositionSide
+
+logger = logging.getLogger("FlightRecorder")
+
+SCHEMA_VERSION = 1
+MAGIC = b'SVJ\x01'
+_HEADER = struct.Struct('<4sHI')  # magic, schema version, length of the JSON code tables that follow
+_BLOCK = struct.Struct('<III')  # records, strings, bytes of strings
+# One event. Its meaning per kind:
+#   SIGNAL    code=suggestion, ref=source, value=confidence, price=close
+#   DECISION  code=decision, ref=signal source ('' without one), value=signal confidence (NaN without one), price=close
+#   FILL      side=order side, ref=order ID, price/size=filled, value=fee
+#   POSITION  code=event, side=position side, ref=position ID, price=entry (opened, scaled in) or exit, size,
+#             value=PnL %, extra=PnL $ (realized PnL $ for a partial exit)
+RECORD_DTYPE = np.dtype([('tick', '<u4'), ('time', '<i8'), ('kind', 'u1'), ('code', 'u1'), ('side', 'u1'), ('symbol', '<u4'),
+                         ('ref', '<u4'), ('price', '<f8'), ('size', '<f8'), ('value', '<f8'), ('extra', '<f8')])
+TEXT_COLUMNS = ('symbol', 'ref')
+
+
+class JournalKind(IntEnum):
+    SIGNAL = 1
+    DECISION = 2
+    FILL = 3
+    POSITION = 4
+
+
+class PositionEvent(IntEnum):
+    OPENED = 1
+    SCALED_IN = 2
+    PARTIAL_EXIT = 3
+    CLOSED = 4
+    FLIPPED = 5  # Closed by a flip into the opposite side
+
+
+DECISION_CODES = {decision: i for i, decision in enumerate(TacticalDecision)}
+SIDE_CODES = {None: 0, **{side: i for i, side in enumerate(PositionSide, start=1)}, **{side.value: i for i, side in enumerate(PositionSide, start=1)}}
+# The code tables are written into every journal's header, so a journal is read with the tables it was written with.
+CODE_TABLES = {'kinds': {k.value: k.name for k in JournalKind}, 'decisions': [d.name for d in TacticalDecision],
+               'events': {e.value: e.name for e in PositionEvent}, 'sides': ['NONE'] + [s.name for s in PositionSide]}
+
+
+def _nanos(timestamp: Any) -> int:
+    if timestamp is None: return 0
+    try: return int(pd.Timestamp(timestamp).value)
+    except (TypeError, ValueError): return 0
+
+
+class TradeJournal:
+    """
+    THE FLIGHT RECORDER: An append-only binary journal of every signal, decision, fill and
+    position event of a run. Recording one is a tuple appended to a list; the encoding is
+    deferred to `flush` (every `flush_every_records` events, and when the run stands down),
+    which writes one block: the block's own string table, then its records as fixed-width
+    rows. A journal is a header with the schema version and the code tables, then blocks, so
+    `read_journal` loads it straight into columnar arrays and a torn last block is dropped.
+    v1.1: A journal is one run. A fresh recorder starts its file over on its first write; only
+    a recorder restored from a checkpoint (it has written before) appends to what is there.
+    """
+    def __init__(self, config: Dict[str, Any], root: Path):
+        self.config = config or {}
+        self.enabled = bool(self.config.get('enabled', False))
+        path = Path(self.config.get('file', 'trade_journal.svj')); self.path = path if path.is_absolute() else Path(root) / path
+        self.flush_every = max(1, int(self.config.get('flush_every_records', 4096)))
+        self.idle_decisions = bool(self.config.get('idle_decisions', True))
+        self.pending: List[Tuple] = []
+        self.tick = 0; self.time: Any = None; self.written = 0
+        self.fresh = True  # Until the first block is written: that write replaces whatever an earlier run left at the path
+        if self.enabled: logger.info(f"[FlightRecorder] The Flight Recorder v1.1 journals the run to '{self.path}' (schema v{SCHEMA_VERSION}).")
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # A checkpoint carries the recorder, not the events the running session has yet to write.
+        return {**self.__dict__, 'pending': []}
+
+    # --- Recording (the trading loop) ---
+    def stamp(self, timestamp: Any):
+        """Opens a tick: the events that follow carry its number and its candle's time."""
+        self.tick += 1; self.time = timestamp
+
+    def record(self, kind: JournalKind, code: int = 0, side: int = 0, symbol: str = '', ref: str = '',
+               price: float = np.nan, size: float = np.nan, value: float = np.nan, extra: float = np.nan):
+        if not self.enabled: return
+        self.pending.append((self.tick, self.time, kind, code, side, symbol, ref, price, size, value, extra))
+        if len(self.pending) >= self.flush_every: self.flush()
+
+    def signal(self, signal: Any, symbol: str, price: float):
+        if self.enabled: self.record(JournalKind.SIGNAL, DECISION_CODES.get(signal.suggestion, 0), 0, symbol, signal.source, price, value=signal.confidence)
+
+    def decision(self, decision: TacticalDecision, signal: Any, symbol: str, price: float):
+        if not self.enabled or (not self.idle_decisions and signal is None and decision in (TacticalDecision.WAIT, TacticalDecision.HOLD)): return
+        self.record(JournalKind.DECISION, DECISION_CODES.get(decision, 0), 0, symbol, signal.source if signal else '', price,
+                    value=signal.confidence if signal else np.nan)
+
+    def fill(self, receipt: Dict[str, Any], symbol: str, side: Any):
+        if self.enabled: self.record(JournalKind.FILL, 0, SIDE_CODES.get(receipt.get('side', side), 0), symbol, str(receipt.get('order_id', '')),
+                                     receipt.get('filled_price', np.nan), receipt.get('filled_size', np.nan), receipt.get('fee') or 0.0)
+
+    def position(self, event: PositionEvent, position: Any, price: float, size: Optional[float] = None, extra: Optional[float] = None):
+        if self.enabled: self.record(JournalKind.POSITION, event, SIDE_CODES.get(position.side, 0), position.symbol, position.position_id, price,
+                                     position.size if size is None else size, position.pnl_percentage,
+                                     (position.pnl_in_dollars if position.pnl_in_dollars is not None else np.nan) if extra is None else extra)
+
+    # --- Encoding (deferred) ---
+    def flush(self):
+        if not self.pending: return
+        rows, self.pending = self.pending, []
+        strings: Dict[str, int] = {}
+        encoded = [(tick, _nanos(time), kind, code, side, strings.setdefault(symbol, len(strings)), strings.setdefault(ref, len(strings)),
+                    price, size, value, extra) for tick, time, kind, code, side, symbol, ref, price, size, value, extra in rows]
+        text = '\0'.join(strings).encode('utf-8')
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, 'wb' if self.fresh else 'ab') as f:
+                if f.tell() == 0:
+                    tables = json.dumps(CODE_TABLES).encode('utf-8'); f.write(_HEADER.pack(MAGIC, SCHEMA_VERSION, len(tables)) + tables)
+                f.write(_BLOCK.pack(len(encoded), len(strings), len(text)) + text + np.array(encoded, dtype=RECORD_DTYPE).tobytes())
+            self.written += len(encoded); self.fresh = False
+        except OSError as e: logger.error(f"Could not write {len(encoded)} journal event(s) to '{self.path}': {e}")
+
+    def close(self):
+        self.flush()
+        if self.enabled and self.written: logger.info(f"[FlightRecorder] {self.written} event(s) journaled to '{self.path}'.")
+
+
+@dataclass(slots=True)
+class JournalColumns:
+    """A journal loaded as columns: the raw records (RECORD_DTYPE) and the strings their text columns point into."""
+    schema: int
+    tables: Dict[str, Any]
+    records: np.ndarray
+    strings: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=object))
+
+    def __len__(self) -> int: return len(self.records)
+
+    def column(self, name: str) -> np.ndarray:
+        return self.strings[self.records[name]] if name in TEXT_COLUMNS else self.records[name]
+
+    def of(self, kind: JournalKind) -> 'JournalColumns':
+        return JournalColumns(self.schema, self.tables, self.records[self.records['kind'] == kind], self.strings)
+
+    def to_frame(self) -> pd.DataFrame:
+        """One row per event, with the codes spelled out (a decision's or signal's name, a position event's name)."""
+        frame = pd.DataFrame({name: self.column(name) for name in RECORD_DTYPE.names})
+        frame['time'] = pd.to_datetime(frame['time'])
+        kinds = {int(k): v for k, v in self.tables.get('kinds', {}).items()}; events = {int(k): v for k, v in self.tables.get('events', {}).items()}
+        decisions = self.tables.get('decisions', []); sides = self.tables.get('sides', [])
+        frame['kind'] = frame['kind'].map(kinds)
+        frame['side'] = frame['side'].map(lambda code: sides[code] if code < len(sides) else str(code))
+        frame['code'] = [events.get(code, str(code)) if kind == 'POSITION' else (decisions[code] if kind in ('SIGNAL', 'DECISION') and code < len(decisions) else '')
+                         for kind, code in zip(frame['kind'], frame['code'])]
+        return frame.rename(columns={'code': 'label'})
+
+
+def read_journal(path: Path) -> JournalColumns:
+    """Loads a journal into columns. A block cut short (a run that died mid-write) ends the read."""
+    data = Path(path).read_bytes()
+    if len(data) < _HEADER.size: return JournalColumns(SCHEMA_VERSION, CODE_TABLES, np.empty(0, dtype=RECORD_DTYPE))
+    magic, schema, tables_size = _HEADER.unpack_from(data, 0)
+    if magic != MAGIC: raise ValueError(f"'{path}' is not a trade journal.")
+    if schema != SCHEMA_VERSION: raise ValueError(f"'{path}' is a schema v{schema} journal; this reader speaks v{SCHEMA_VERSION}.")
+    offset = _HEADER.size + tables_size; tables = json.loads(data[_HEADER.size:offset])
+    blocks: List[np.ndarray] = []; strings: List[str] = []
+    while offset + _BLOCK.size <= len(data):
+        count, string_count, text_size = _BLOCK.unpack_from(data, offset); start = offset + _BLOCK.size
+        end = start + text_size + count * RECORD_DTYPE.itemsize
+        if end > len(data): logger.warning(f"'{path}' ends in a torn block of {count} event(s); it is ignored."); break
+        block = np.frombuffer(data, dtype=RECORD_DTYPE, count=count, offset=start + text_size).copy()
+        block_strings = data[start:start + text_size].decode('utf-8').split('\0') if string_count else []
+        # A block's string IDs are its own; they are shifted into the journal-wide table.
+        for name in TEXT_COLUMNS: block[name] += len(strings)
+        strings.extend(block_strings); blocks.append(block); offset = end
+    records = np.concatenate(blocks) if blocks else np.empty(0, dtype=RECORD_DTYPE)
+    return JournalColumns(schema, tables, records, np.array(strings, dtype=object))
@@ -0,0 +1,159 @@
+# F:\ShadowVanguard_Legion_Godspeed\research.py
+# Version 1.0 - Prometheus, The Proving Ground
+
+import argparse
+import logging
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from rich.console import Console
+from rich.table import Table
+
+logger = logging.getLogger("ProvingGround")
+
+PROJECT_ROOT = Path(__file__).resolve().parent
+
+
+@dataclass(slots=True)
+class ResearchRule:
+    name: str
+    # Analyst ('liq'), or analyst and timeframe ('liq_15m'), to the weight of its bullish minus bearish signals.
+    weights: Dict[str, float]
+    min_score: float = 1.0
+    hold_bars: int = 12
+    allow_short: bool = True
+
+
+@dataclass(slots=True)
+class ResearchResult:
+    rule: str
+    bars: int = 0
+    total_pnl_pct: float = 0.0
+    closed_trades: int = 0
+    win_rate: float = 0.0
+    max_drawdown_pct: float = 0.0
+    exposure_pct: float = 0.0
+    weights: Dict[str, float] = field(default_factory=dict)
+
+
+def parse_rules(raw_rules: Optional[List[Dict[str, Any]]]) -> List[ResearchRule]:
+    rules = []
+    for i, raw in enumerate(raw_rules or []):
+        try: rules.append(ResearchRule(name=str(raw.get('name', f"rule-{i:02d}")), weights=dict(raw.get('weights', {})),
+                                       min_score=float(raw.get('min_score', 1.0)), hold_bars=int(raw.get('hold_bars', 12)),
+                                       allow_short=bool(raw.get('allow_short', True))))
+        except (TypeError, ValueError, AttributeError) as e: logger.error(f"Research rule #{i} is malformed ({e}). Ignored.")
+    return rules
+
+
+# --- The vectorized PnL engine ---
+def signal_score(matrix: pd.DataFrame, weights: Dict[str, float]) -> np.ndarray:
+    """Per bar: the weighted bullish signal count minus the weighted bearish one."""
+    score = np.zeros(len(matrix))
+    for key, weight in weights.items():
+        columns = [c for c in matrix.columns if c.startswith(key + '_')]
+        if not columns: logger.warning(f"No signal column matches '{key}'."); continue
+        for column in columns: score += (weight if column.endswith('_bull') else -weight) * matrix[column].to_numpy()
+    return score
+
+
+def rule_positions(score: np.ndarray, rule: ResearchRule) -> np.ndarray:
+    """
+    +1 / -1 / 0 per bar, held from that bar's close to the next. A score of `min_score` opens
+    (or flips) a position, which is held for `hold_bars` bars after the last signal in its
+    direction; without shorts, a bearish signal only closes a long.
+    """
+    direction = np.where(score >= rule.min_score, 1.0, np.where(score <= -rule.min_score, -1.0 if rule.allow_short else 0.0, np.nan))
+    return pd.Series(direction).ffill(limit=max(0, rule.hold_bars - 1)).fillna(0.0).to_numpy()
+
+
+def evaluate_positions(rule: ResearchRule, positions: np.ndarray, closes: np.ndarray, fee_bps: float = 0.0) -> ResearchResult:
+    """Marks `positions` to the closes: each bar earns the previous bar's position, each change of position pays `fee_bps` per unit."""
+    fee = fee_bps / 10000.0
+    moves = np.r_[0.0, closes[1:] / closes[:-1] - 1.0]; held = np.r_[0.0, positions[:-1]]
+    turnover = np.abs(np.diff(positions, prepend=0.0))
+    equity = np.cumprod(1.0 + held * moves - turnover * fee)
+    peak = np.maximum.accumulate(np.r_[1.0, equity])[1:]
+    result = ResearchResult(rule=rule.name, bars=len(positions), weights=dict(rule.weights))
+    if not len(positions): return result
+    result.total_pnl_pct = (equity[-1] - 1.0) * 100.0
+    result.max_drawdown_pct = float(((peak - equity) / peak).max() * 100.0)
+    result.exposure_pct = float((positions != 0).mean() * 100.0)
+    # A trade is a run of one non-zero position; it earns the moves of the bars after each of its bars, less both legs' fees.
+    starts = np.flatnonzero(np.diff(positions, prepend=0.0) != 0)
+    starts = starts[positions[starts] != 0]
+    if len(starts):
+        ends = np.r_[np.flatnonzero(np.diff(positions) != 0), len(positions) - 1]
+        ends = ends[np.searchsorted(ends, starts)]
+        growth = np.r_[0.0, np.cumsum(np.log1p(positions * np.r_[moves[1:], 0.0]))]
+        trade_pnl = np.expm1(growth[ends + 1] - growth[starts]) - 2 * fee
+        result.closed_trades = len(starts); result.win_rate = float((trade_pnl > 0).mean() * 100.0)
+    return result
+
+
+def run_research(config: Dict[str, Any], history: Optional[pd.DataFrame] = None,
+                 research_config: Optional[Dict[str, Any]] = None) -> Tuple[pd.DataFrame, List[ResearchResult]]:
+    from analyst_ai.signal_matrix import build_signal_matrix
+    from core.data_provider import DataProvider
+    research_config = dict(research_config if research_config is not None else config.get('research', {}) or {})
+    if history is None: history = DataProvider(dict(config.get('data_provider', {}) or {}), strategic_memory=None).full_df_5m
+    started = time.perf_counter()
+    matrix = build_signal_matrix(config, history, research_config.get('max_ticks', 0))
+    logger.info(f"The Proving Ground read {len(matrix)} bar(s) of signals in {time.perf_counter() - started:.2f}s.")
+    closes = history['close'].reindex(matrix.index).to_numpy(dtype=np.float64)
+    fee_bps = research_config.get('fee_bps', 0.0); results = []
+    for rule in parse_rules(research_config.get('rules', [])):
+        results.append(evaluate_positions(rule, rule_positions(signal_score(matrix, rule.weights), rule), closes, fee_bps))
+    return matrix, sorted(results, key=lambda r: r.total_pnl_pct, reverse=True)
+
+
+def verify_matrix(config: Dict[str, Any], matrix: pd.DataFrame, history: pd.DataFrame) -> int:
+    """Replays the same bars tick by tick and counts the bars where the two matrices disagree."""
+    from analyst_ai.signal_matrix import replay_signal_matrix
+    replayed = replay_signal_matrix(config, history, len(matrix))
+    columns = list(dict.fromkeys(list(matrix.columns) + list(replayed.columns)))
+    differs = (matrix.reindex(columns=columns, fill_value=0) != replayed.reindex(index=matrix.index, columns=columns, fill_value=0)).any(axis=1)
+    return int(differs.sum())
+
+
+def display_results(matrix: pd.DataFrame, results: List[ResearchResult]):
+    console = Console()
+    signals = Table(title="[bold]The Proving Ground - Signals per Analyst[/bold]")
+    for column in ("Column", "Signals"): signals.add_column(column, justify="left" if column == "Column" else "right")
+    for column, total in matrix.sum().items(): signals.add_row(column, str(int(total)))
+    console.print(signals)
+    table = Table(title="[bold]The Proving Ground - Ranked Rules[/bold]")
+    for column, justify in (("#", "right"), ("Rule", "left"), ("PnL %", "right"), ("Trades", "right"), ("Win %", "right"),
+                            ("Max DD %", "right"), ("Exposure %", "right"), ("Weights", "left")):
+        table.add_column(column, justify=justify)
+    for rank, r in enumerate(results, start=1):
+        weights = ", ".join(f"{k}={v:g}" for k, v in r.weights.items())
+        table.add_row(str(rank), r.rule, f"{r.total_pnl_pct:+.2f}", str(r.closed_trades), f"{r.win_rate:.1f}", f"{r.max_drawdown_pct:.2f}",
+                      f"{r.exposure_pct:.1f}", weights)
+    console.print(table)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="ShadowVanguard - The Proving Ground (vectorized signal research)")
+    parser.add_argument("--config", default=str(PROJECT_ROOT / 'config' / 'settings.yaml'), help="Path to master configuration file.")
+    parser.add_argument("--max-ticks", type=int, help="Override research.max_ticks (0 = full campaign).")
+    parser.add_argument("--verify", action="store_true", help="Replay the analysts tick by tick and check the signal matrix against it.")
+    parser.add_argument("--output", help="CSV file for the signal matrix.")
+    args = parser.parse_args()
+
+    from main import ShadowVanguardOracle
+    from core.data_provider import DataProvider
+    master_config = ShadowVanguardOracle.load_config(args.config)
+    research_settings = dict(master_config.get('research', {}) or {})
+    if args.max_ticks is not None: research_settings['max_ticks'] = args.max_ticks
+    campaign = DataProvider(dict(master_config.get('data_provider', {})), strategic_memory=None).full_df_5m
+    signal_matrix, ranked = run_research(master_config, campaign, research_settings)
+    display_results(signal_matrix, ranked)
+    if args.output: signal_matrix.to_csv(PROJECT_ROOT / args.output, index_label='timestamp'); logger.info(f"Signal matrix written to '{args.output}'.")
+    if args.verify:
+        mismatches = verify_matrix(master_config, signal_matrix, campaign)
+        (logger.info if not mismatches else logger.error)(f"Tick-by-tick replay: {mismatches} bar(s) disagree with the signal matrix.")
@@ -1,5 +1,5 @@
 # F:\ShadowVanguard_Legion_Godspeed\risk_manager\capital_allocator.py
-# Version 6.0 - Prometheus, The Scaled Quartermaster
+# Version 6.4 - Prometheus, The Scaled Quartermaster
 
 import logging
 from typing import Dict, Any, List, Optional
@@ -21,6 +21,7 @@ class AllocationTicket:
     allocated_amount: float = field(init=False)
     position_id: Optional[str] = None
     is_active: bool = True
+    symbol: Optional[str] = None
     
     def __post_init__(self):
         self.allocated_amount = self.original_allocated_amount
@@ -36,6 +37,13 @@ class CapitalAllocator:
     - It can now fund everything from a full-scale assault to a low-cost scout mission.
     - All other advanced features, like the "Conquest Engine" for compounding,
       are perfectly preserved and integrated with this new dynamic risk system.
+    - v6.1: Linked tickets are also indexed by position, so releasing a position's capital
+      visits its own tickets instead of every ticket the Quartermaster holds.
+    - v6.2: Trading fees are charged to the capital as they are paid, and tallied.
+    - v6.3: One Quartermaster can fund a whole fleet: the exposure cap is portfolio-wide, and
+      `max_symbol_exposure_percent` caps what any single symbol may hold of it.
+    - v6.4: A ticket confirmed for an order that filled only in part shrinks to what filled,
+      and the rest of its reservation goes back to the pool.
     """
     def __init__(self, initial_capital: float, config: Dict[str, Any]):
         # The constructor logic is perfectly preserved from v5.0.
@@ -44,9 +52,14 @@ class CapitalAllocator:
         self.current_capital = initial_capital
         self.total_allocated_cost = 0.0
         self.active_tickets: Dict[str, AllocationTicket] = {}
+        self.position_tickets: Dict[str, Dict[str, AllocationTicket]] = {}  # position_id -> linked tickets, in linking order
+        self.total_fees_paid = 0.0
+        self.symbol_allocated_cost: Dict[str, float] = {}  # symbol -> capital its tickets hold
 
         self.risk_per_trade_base = self.config.get('risk_per_trade_percent', 1.0) / 100.0
         self.max_exposure_percent = self.config.get('max_exposure_percent', 10.0) / 100.0
+        symbol_cap = self.config.get('max_symbol_exposure_percent')
+        self.max_symbol_exposure_percent = symbol_cap / 100.0 if symbol_cap else None
         
         self.reinvestment_aggressiveness = self.config.get('reinvestment_aggressiveness', 0.0)
         
@@ -57,10 +70,10 @@ class CapitalAllocator:
             'SCOUT': 0.25
         })
         
-        logger.info(f"[CapitalAllocator] The Scaled Quartermaster v6.0 deployed. Compounding: {self.reinvestment_aggressiveness:.2%}")
+        logger.info(f"[CapitalAllocator] The Scaled Quartermaster v6.4 deployed. Compounding: {self.reinvestment_aggressiveness:.2%}")
 
     # --- THE "SCALES OF JUSTICE" REVOLUTION ---
-    def request_allocation(self, signal: TacticalSignal, stop_loss_price: Optional[float], entry_price: float) -> Optional[AllocationTicket]:
+    def request_allocation(self, signal: TacticalSignal, stop_loss_price: Optional[float], entry_price: float, symbol: Optional[str] = None) -> Optional[AllocationTicket]:
         """
         REVOLUTIONIZED. This method is now context-aware. It reads the `risk_level`
         from the signal and adjusts the capital at risk accordingly, making our
@@ -74,6 +87,12 @@ class CapitalAllocator:
         if max_allowed_allocation <= 0:
             logger.warning("Max exposure reached. Allocation denied.")
             return None
+        # [SURGICAL UPGRADE]: A fleet's symbols share the cap above; no single symbol may take more than its own share of it.
+        if symbol is not None and self.max_symbol_exposure_percent is not None:
+            max_allowed_allocation = min(max_allowed_allocation, self.current_capital * self.max_symbol_exposure_percent - self.symbol_allocated_cost.get(symbol, 0.0))
+            if max_allowed_allocation <= 0:
+                logger.warning(f"Max exposure for {symbol} reached. Allocation denied.")
+                return None
             
         # --- Section 2: The New Dynamic Risk Calculation ---
         risk_base_capital = self._get_risk_base_capital()
@@ -113,10 +132,11 @@ class CapitalAllocator:
         ticket = AllocationTicket(
             ticket_id=f"tkt-{uuid4().hex[:8]}",
             decision=signal.suggestion,
-            original_allocated_amount=allocated_amount
+            original_allocated_amount=allocated_amount,
+            symbol=symbol
         )
         self.active_tickets[ticket.ticket_id] = ticket
-        self.total_allocated_cost += allocated_amount
+        self.total_allocated_cost += allocated_amount; self._expose(ticket, allocated_amount)
         logger.info(f"Allocation Ticket {ticket.ticket_id} ISSUED for {signal.suggestion.name} ({risk_level}) with amount ${allocated_amount:.2f}.")
         return ticket
 
@@ -137,26 +157,42 @@ class CapitalAllocator:
         logger.debug(f"Risk Base Capital: Initial ${self.initial_capital:.2f} + Reinvestable ${reinvestable_profit:.2f} (from {self.reinvestment_aggressiveness:.2%} of profit) = ${risk_base_capital:.2f}")
         return risk_base_capital
 
-    def confirm_and_link_ticket(self, ticket_id: str, position: Position):
-        # Perfectly preserved.
+    def confirm_and_link_ticket(self, ticket_id: str, position: Position, filled_cost: Optional[float] = None):
+        # [SURGICAL UPGRADE]: `filled_cost` is what the order actually bought (size x price); a reservation above it is released.
         if ticket_id in self.active_tickets:
-            self.active_tickets[ticket_id].position_id = position.position_id
+            ticket = self.active_tickets[ticket_id]; self._unlink(ticket)
+            if filled_cost is not None and 0 <= filled_cost < ticket.allocated_amount:
+                unfilled = ticket.allocated_amount - filled_cost; ticket.allocated_amount = filled_cost
+                self.total_allocated_cost -= unfilled; self._expose(ticket, -unfilled)
+                logger.info(f"Ticket {ticket_id} shrunk to its fill: ${unfilled:.2f} of its reservation released.")
+            ticket.position_id = position.position_id; self.position_tickets.setdefault(position.position_id, {})[ticket_id] = ticket
             logger.info(f"Ticket {ticket_id} linked to Position {position.position_id}.")
 
     def release_capital_by_ticket_id(self, ticket_id: str):
         # Perfectly preserved.
         if ticket_id in self.active_tickets and self.active_tickets[ticket_id].is_active:
-            ticket = self.active_tickets.pop(ticket_id)
-            self.total_allocated_cost -= ticket.allocated_amount
+            ticket = self.active_tickets.pop(ticket_id); self._unlink(ticket)
+            self.total_allocated_cost -= ticket.allocated_amount; self._expose(ticket, -ticket.allocated_amount)
             logger.info(f"Capital for ticket {ticket_id} (${ticket.allocated_amount:.2f}) released due to order failure.")
 
+    def _unlink(self, ticket: AllocationTicket):
+        linked = self.position_tickets.get(ticket.position_id)
+        if linked is None: return
+        linked.pop(ticket.ticket_id, None)
+        if not linked: del self.position_tickets[ticket.position_id]
+
+    def _expose(self, ticket: AllocationTicket, amount: float):
+        if ticket.symbol is None: return
+        held = self.symbol_allocated_cost.get(ticket.symbol, 0.0) + amount
+        if held > 1e-9: self.symbol_allocated_cost[ticket.symbol] = held
+        else: self.symbol_allocated_cost.pop(ticket.symbol, None)
+
     def release_capital(self, position: Position):
-        # Perfectly preserved.
+        # [SURGICAL UPGRADE]: The position's own tickets, from the index instead of a scan of them all.
         cost_to_release = 0; tickets_to_remove = []
-        for ticket_id, ticket in self.active_tickets.items():
-            if ticket.position_id == position.position_id:
-                cost_to_release += ticket.allocated_amount
-                tickets_to_remove.append(ticket_id)
+        for ticket_id, ticket in self.position_tickets.pop(position.position_id, {}).items():
+            cost_to_release += ticket.allocated_amount; self._expose(ticket, -ticket.allocated_amount)
+            tickets_to_remove.append(ticket_id)
         if not tickets_to_remove and not getattr(position, 'is_untracked', False):
             logger.warning(f"Request to release capital for pos {position.position_id}, but no tickets found.")
         for ticket_id in tickets_to_remove:
@@ -170,17 +206,21 @@ class CapitalAllocator:
         else:
              logger.warning(f"Position {position.position_id} closed without a PnL in dollars. Capital may be inaccurate.")
     
+    def charge_fee(self, fee: float):
+        self.current_capital -= fee; self.total_fees_paid += fee
+        logger.debug(f"Fee of ${fee:.2f} paid. Total fees: ${self.total_fees_paid:.2f}")
+
     def release_partial_capital(self, position_id: str, cost_basis_of_exit: float, realized_pnl: float):
         # Perfectly preserved.
         logger.info(f"Processing partial release for {position_id} | Cost Basis: ${cost_basis_of_exit:.2f}, PnL: ${realized_pnl:.2f}")
-        pos_tickets = [t for t in self.active_tickets.values() if t.position_id == position_id and t.is_active]
+        pos_tickets = [t for t in self.position_tickets.get(position_id, {}).values() if t.is_active]
         if not pos_tickets: logger.error(f"FATAL ACCOUNTING: No active ticket for {position_id}. Partial exit failed."); return
         remaining_cost_to_release = cost_basis_of_exit
         for ticket in sorted(pos_tickets, key=lambda t: t.ticket_id):
             if remaining_cost_to_release <= 0: break
             release_amount = min(ticket.allocated_amount, remaining_cost_to_release)
             ticket.allocated_amount -= release_amount
-            self.total_allocated_cost -= release_amount
+            self.total_allocated_cost -= release_amount; self._expose(ticket, -release_amount)
             remaining_cost_to_release -= release_amount
             logger.debug(f"Reduced ticket {ticket.ticket_id} by ${release_amount:.2f}. Rem: ${ticket.allocated_amount:.2f}")
         if remaining_cost_to_release > 1e-6: logger.warning(f"Cost basis (${cost_basis_of_exit:.2f}) exceeded total capital for pos {position_id}. Releasing what was possible.")
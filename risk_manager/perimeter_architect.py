@@ -1,5 +1,5 @@
 # F:\ShadowVanguard_Legion_Godspeed\risk_manager\perimeter_architect.py
-# Version 8.1 - Prometheus, The Unified Strategist
+# Version 8.3 - Prometheus, The Unified Strategist
 
 import logging
 from typing import Dict, Any, Optional, Tuple, List
@@ -11,6 +11,7 @@ from dataclasses import dataclass, field
 from core.data_models import (MarketDataFrame, PositionV2, StructureReport, PowerReport, 
                               OrderBlockReport, FibonacciReport, LiquidityReport, StructuralEvent)
 from core.market_enums import PositionSide, MarketRegime
+from core.indicator_cache import IndicatorCache
 
 logger = logging.getLogger("PerimeterArchitect")
 
@@ -41,7 +42,9 @@ class PerimeterArchitect:
         self.catastrophic_atr_extension = self.pa_config.get('catastrophic_atr_extension', 1.0)
         self.strategic_timeframes = self.pa_config.get('strategic_timeframes', ['4h', '1h'])
         self.tactical_timeframe = self.pa_config.get('tactical_timeframe', '5m')
-        logger.info("[PerimeterArchitect] The Unified Strategist v8.1 deployed. All blueprints are synchronized.")
+        # [SURGICAL UPGRADE]: The ATR is read from the provider's shared almanac (this one serves bare frames).
+        self.indicator_cache = IndicatorCache()
+        logger.info("[PerimeterArchitect] The Unified Strategist v8.3 deployed. All blueprints are synchronized.")
 
     def _get_all_structural_points(
         self, side: PositionSide, structure: Optional[StructureReport], 
@@ -87,11 +90,11 @@ class PerimeterArchitect:
     def _find_optimal_sl_point(
         self, side: PositionSide, entry_price: float, ohlcv_df: pd.DataFrame,
         structure: Optional[StructureReport], ob_report: Optional[OrderBlockReport],
-        liq_report: Optional[LiquidityReport]
+        liq_report: Optional[LiquidityReport], cache: Optional[IndicatorCache] = None
     ) -> float:
         # [PACT KEPT]: This battle-hardened logic is PRESERVED.
         is_long = side == PositionSide.LONG
-        atr = self._calculate_atr(ohlcv_df)
+        atr = self._calculate_atr(ohlcv_df, cache)
         if atr < 1e-9: atr = entry_price * 0.005 
 
         htf_points = self._get_all_structural_points(side, structure, ob_report, liq_report, self.strategic_timeframes)
@@ -123,7 +126,7 @@ class PerimeterArchitect:
         is_long = side == PositionSide.LONG
         opposing_side = PositionSide.SHORT if is_long else PositionSide.LONG
         
-        all_timeframes = self.strategic_timeframes + [self.tactical_timeframe]
+        all_timeframes = [*self.strategic_timeframes, self.tactical_timeframe]  # The doctrine's lists are frozen tuples
         opposing_points = self._get_all_structural_points(opposing_side, structure, ob_report, liq_report, all_timeframes)
         
         valid_targets = [p for p in opposing_points if p > entry_price] if is_long else [p for p in opposing_points if p < entry_price]
@@ -165,10 +168,10 @@ class PerimeterArchitect:
             
         optimal_sl_point = self._find_optimal_sl_point(
             side, entry_price, ohlcv_df, 
-            mdf.structure_report, mdf.ob_report, mdf.liq_report
+            mdf.structure_report, mdf.ob_report, mdf.liq_report, cache=mdf.indicator_cache
         )
         
-        atr = self._calculate_atr(ohlcv_df)
+        atr = self._calculate_atr(ohlcv_df, mdf.indicator_cache)
         if atr < 1e-9:
              logger.warning("ATR is zero. Cannot architect perimeters. Systems offline.")
              return None
@@ -188,12 +191,11 @@ class PerimeterArchitect:
             take_profit_levels=take_profit_levels
         )
 
-    def _calculate_atr(self, ohlcv_df: pd.DataFrame) -> float:
-        # [PACT KEPT]: This utility is PRESERVED.
+    def _calculate_atr(self, ohlcv_df: pd.DataFrame, cache: Optional[IndicatorCache] = None) -> float:
+        # [PACT KEPT]: The short-window fallback is PRESERVED; the Wilder ATR itself now comes from the almanac.
         if len(ohlcv_df) < self.atr_period + 1: return np.mean(ohlcv_df['high'] - ohlcv_df['low']) if not ohlcv_df.empty else 0.0
-        df = ohlcv_df.copy(); df['h-l'] = df['high'] - df['low']; df['h-pc'] = abs(df['high'] - df['close'].shift(1)); df['l-pc'] = abs(df['low'] - df['close'].shift(1))
-        tr = df[['h-l', 'h-pc', 'l-pc']].max(axis=1); atr = tr.ewm(alpha=1/self.atr_period, adjust=False).mean()
-        return atr.iloc[-1] if pd.notna(atr.iloc[-1]) else 0.0
+        atr = (cache or self.indicator_cache).atr(self.tactical_timeframe, ohlcv_df, self.atr_period)
+        return atr if pd.notna(atr) else 0.0
     
     def update_trailing_stop_loss(self, position: PositionV2, current_price: float) -> Optional[float]:
         # [PACT KEPT]: This method is PRESERVED.
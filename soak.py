@@ -0,0 +1,91 @@
+# F:\ShadowVanguard_Legion_Godspeed\soak.py
+# Version 1.0 - Prometheus, The Endurance Trial
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+import pandas as pd
+from rich.console import Console
+from rich.table import Table
+
+from utils.lifecycle import MemorySample
+
+logger = logging.getLogger("EnduranceTrial")
+
+PROJECT_ROOT = Path(__file__).resolve().parent
+
+
+def looped_history(history: pd.DataFrame, laps: int) -> pd.DataFrame:
+    """The campaign's candles `laps` times back to back, on one unbroken clock, so the Oracle sees a session `laps` times as long."""
+    step = history.index[1] - history.index[0] if len(history) > 1 else pd.Timedelta(minutes=5)
+    values = np.tile(history.to_numpy(), (max(1, laps), 1))
+    index = pd.date_range(history.index[0], periods=len(values), freq=step, name=history.index.name)
+    return pd.DataFrame(values, index=index, columns=history.columns).astype(history.dtypes.to_dict())
+
+
+def run_soak(config: Dict[str, Any], laps: int = 4, history: Optional[pd.DataFrame] = None) -> List[MemorySample]:
+    """Replays the campaign `laps` times in one Oracle and samples its memory at the end of every lap."""
+    from main import ShadowVanguardOracle  # Imported lazily: `main` configures logging on import.
+    from core.data_provider import DataProvider
+    if history is None: history = DataProvider(dict(config.get('data_provider', {}) or {}), strategic_memory=None).full_df_5m
+    oracle = ShadowVanguardOracle(config, history=looped_history(history, laps))
+    oracle.phase_zero_historical_wisdom()
+    samples: List[MemorySample] = []; lap = len(history)
+    try:
+        while oracle.data_provider.has_more_data():
+            oracle._tick(); oracle.lifecycle.tick_completed(oracle)
+            if oracle.lifecycle.ticks % lap == 0: samples.append(oracle.lifecycle.sample(oracle))
+        if not samples or samples[-1].tick != oracle.lifecycle.ticks: samples.append(oracle.lifecycle.sample(oracle))
+    finally: oracle.stand_down()
+    return samples
+
+
+def check_flat(samples: List[MemorySample], rss_tolerance_mb: float = 16.0, growth_tolerance: float = 0.1, slack: int = 16) -> List[str]:
+    """
+    The ways the session grew after its first lap (which is allowed to fill the caches): RSS by
+    more than `rss_tolerance_mb`, or an unbounded container by more than `growth_tolerance` of
+    its size plus `slack` items. A capped container may keep filling up to its cap. Empty when
+    the session held flat.
+    """
+    if len(samples) < 2: return ["Too few samples to judge: the soak needs at least two laps."]
+    baseline, final = samples[0], samples[-1]; failures = []
+    if final.rss_mb - baseline.rss_mb > rss_tolerance_mb:
+        failures.append(f"RSS grew {final.rss_mb - baseline.rss_mb:.1f} MB ({baseline.rss_mb:.1f} -> {final.rss_mb:.1f}) between ticks {baseline.tick} and {final.tick}.")
+    for name, held in final.containers.items():
+        before = baseline.containers.get(name, 0)
+        if name in final.bounds:
+            if held > final.bounds[name]: failures.append(f"{name} holds {held} items, over its cap of {final.bounds[name]}.")
+        elif held > before * (1 + growth_tolerance) + slack: failures.append(f"{name} grew from {before} to {held} items.")
+    return failures
+
+
+def display_samples(samples: List[MemorySample]):
+    table = Table(title="[bold]The Endurance Trial - Memory per Lap[/bold]")
+    names = sorted({name for sample in samples for name in sample.containers})
+    for column in ["Tick", "RSS MB"] + names: table.add_column(column.replace('.', '\n'), justify="right")
+    for sample in samples: table.add_row(str(sample.tick), f"{sample.rss_mb:.1f}", *(str(sample.containers.get(name, '-')) for name in names))
+    Console().print(table)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="ShadowVanguard - The Endurance Trial (soak test)")
+    parser.add_argument("--config", default=str(PROJECT_ROOT / 'config' / 'settings.yaml'), help="Path to master configuration file.")
+    parser.add_argument("--laps", type=int, help="Override lifecycle.soak_laps.")
+    parser.add_argument("--rss-tolerance-mb", type=float, help="Override lifecycle.soak_rss_tolerance_mb.")
+    args = parser.parse_args()
+
+    from main import ShadowVanguardOracle
+    master_config = ShadowVanguardOracle.load_config(args.config)
+    lifecycle_settings = master_config.get('lifecycle', {}) or {}
+    soak_config = {**master_config, 'simulation_mode': 'backtest', 'dashboard_enabled': False,
+                   'checkpoint': dict(master_config.get('checkpoint', {}) or {}, enabled=False, resume=False)}
+    lap_samples = run_soak(soak_config, args.laps if args.laps is not None else lifecycle_settings.get('soak_laps', 4))
+    display_samples(lap_samples)
+    problems = check_flat(lap_samples, args.rss_tolerance_mb if args.rss_tolerance_mb is not None else lifecycle_settings.get('soak_rss_tolerance_mb', 16.0))
+    for problem in problems: logger.error(problem)
+    if problems: sys.exit(1)
+    logger.info(f"The session held flat over {len(lap_samples)} lap(s).")
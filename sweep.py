@@ -0,0 +1,215 @@
+# F:\ShadowVanguard_Legion_Godspeed\sweep.py
+# Version 1.3 - Prometheus, The War Games Council
+
+import argparse
+import copy
+import csv
+import hashlib
+import itertools
+import logging
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+import yaml
+from rich.console import Console
+from rich.table import Table
+
+from core.shared_candles import SharedCandles
+
+logger = logging.getLogger("WarGamesCouncil")
+
+PROJECT_ROOT = Path(__file__).resolve().parent
+SWEEPABLE_SECTIONS = ('tactical_controller.scoring_weights', 'tactical_controller.management_rules', 'risk_manager', 'capital_allocator')
+
+# The campaign history, loaded once by the parent and inherited (fork) or received once (spawn) by each worker;
+# with `shared_memory`, only a handle to the parent's published copy, which every worker attaches to.
+_SHARED_HISTORY = None
+
+
+@dataclass(slots=True)
+class SweepResult:
+    run_id: str
+    overrides: Dict[str, Any]
+    ticks: int = 0
+    final_capital: float = 0.0
+    total_pnl_pct: float = 0.0
+    closed_trades: int = 0
+    win_rate: float = 0.0
+    max_drawdown_pct: float = 0.0
+    elapsed_seconds: float = 0.0
+    error: Optional[str] = None
+    config_hash: str = field(default="")
+
+
+# --- Planning ---
+def build_sweep_plan(space: Dict[str, Any], mode: str = 'grid', samples: int = 10, seed: int = 42) -> List[Dict[str, Any]]:
+    """
+    Turns a `{dotted.path: candidates}` space into a list of override dicts. Grid mode takes the
+    cartesian product of candidate lists; random mode draws `samples` points, picking from lists
+    and drawing uniformly from `{min, max}` ranges (integers when both bounds are integers).
+    """
+    valid_space = {}
+    for path, candidates in (space or {}).items():
+        if not any(path == section or path.startswith(section + '.') for section in SWEEPABLE_SECTIONS):
+            logger.error(f"Parameter '{path}' is outside the sweepable sections {SWEEPABLE_SECTIONS}. Ignored."); continue
+        valid_space[path] = candidates
+    if not valid_space: return [{}]
+    paths = sorted(valid_space)
+    if mode == 'grid':
+        axes = [valid_space[p] if isinstance(valid_space[p], list) else [valid_space[p]] for p in paths]
+        return [dict(zip(paths, combo)) for combo in itertools.product(*axes)]
+    rng = random.Random(seed); plan = []
+    for _ in range(max(1, samples)):
+        point = {}
+        for path in paths:
+            candidates = valid_space[path]
+            if isinstance(candidates, list): point[path] = rng.choice(candidates)
+            elif isinstance(candidates, dict):
+                low, high = candidates['min'], candidates['max']
+                point[path] = rng.randint(low, high) if isinstance(low, int) and isinstance(high, int) else round(rng.uniform(low, high), 6)
+            else: point[path] = candidates
+        plan.append(point)
+    return plan
+
+
+def freeze_run_config(base_config: Dict[str, Any], overrides: Dict[str, Any]) -> Dict[str, Any]:
+    """Builds a run's complete, self-contained configuration exactly once: base + overrides + headless backtest flags."""
+    config = yaml.safe_load(yaml.safe_dump(base_config))
+    for path, value in overrides.items():
+        node = config; keys = path.split('.')
+        for key in keys[:-1]: node = node.setdefault(key, {})
+        node[keys[-1]] = value
+    config.update({'simulation_mode': 'backtest', 'auto_start': True, 'dashboard_enabled': False, 'tick_interval_seconds': 0.0})
+    # Runs share one checkpoint directory; none of them may write or resume engine snapshots there.
+    config['checkpoint'] = dict(config.get('checkpoint') or {}, enabled=False, resume=False)
+    # Nor may they interleave their events in one journal file.
+    config['trade_journal'] = dict(config.get('trade_journal') or {}, enabled=False)
+    config['lifecycle'] = dict(config.get('lifecycle') or {}, journal_file='')
+    return config
+
+
+def config_fingerprint(config: Dict[str, Any]) -> str:
+    return hashlib.sha1(yaml.safe_dump(config, sort_keys=True).encode('utf-8')).hexdigest()[:12]
+
+
+# --- Execution (runs inside the worker processes) ---
+def _init_worker(history: Any, log_level: int):
+    global _SHARED_HISTORY
+    _SHARED_HISTORY = history
+    # A forked worker inherits the commander's queue but not its writer thread; it builds its own, console only.
+    from utils.logger_config import setup_logging
+    setup_logging(PROJECT_ROOT, log_level=log_level, log_file_name='')
+
+
+def run_backtest(run_id: str, config: Dict[str, Any], overrides: Dict[str, Any], max_ticks: int = 0) -> SweepResult:
+    """Runs one complete (or tick-capped) backtest of the Oracle and distills it into a `SweepResult`."""
+    from main import ShadowVanguardOracle  # Imported lazily: `main` configures logging on import.
+    result = SweepResult(run_id=run_id, overrides=overrides, config_hash=config_fingerprint(config))
+    started = time.perf_counter()
+    try:
+        oracle = ShadowVanguardOracle(config, history=_SHARED_HISTORY)
+        closed_pnls: List[float] = []; auditor_callback = oracle.position_manager.on_position_closed_callback
+        def _record_close(position):
+            closed_pnls.append(position.pnl_percentage)
+            if auditor_callback: auditor_callback(position)
+        oracle.position_manager.on_position_closed_callback = _record_close
+
+        oracle.phase_zero_historical_wisdom()
+        allocator = oracle.capital_allocator; peak = allocator.current_capital; worst_drawdown = 0.0
+        while oracle.data_provider.has_more_data() and (max_ticks <= 0 or result.ticks < max_ticks):
+            oracle._tick(); result.ticks += 1
+            peak = max(peak, allocator.current_capital)
+            if peak > 0: worst_drawdown = max(worst_drawdown, (peak - allocator.current_capital) / peak * 100)
+
+        result.final_capital = allocator.current_capital
+        result.total_pnl_pct = (allocator.current_capital / allocator.initial_capital - 1) * 100 if allocator.initial_capital else 0.0
+        result.closed_trades = len(closed_pnls)
+        result.win_rate = sum(1 for pnl in closed_pnls if pnl > 0) / len(closed_pnls) * 100 if closed_pnls else 0.0
+        result.max_drawdown_pct = worst_drawdown
+    except Exception as e:
+        result.error = f"{type(e).__name__}: {e}"
+        logger.error(f"[{run_id}] War game aborted after {result.ticks} ticks: {result.error}")
+    result.elapsed_seconds = time.perf_counter() - started
+    return result
+
+
+# --- Orchestration (parent process) ---
+def rank_results(results: List[SweepResult], rank_by: str = 'total_pnl_pct') -> List[SweepResult]:
+    """Failed runs sink to the bottom; the rest are ordered by `rank_by`, best first (drawdown: lowest first)."""
+    ascending = rank_by == 'max_drawdown_pct'
+    healthy = sorted((r for r in results if r.error is None), key=lambda r: getattr(r, rank_by), reverse=not ascending)
+    return healthy + [r for r in results if r.error is not None]
+
+
+def run_sweep(base_config: Dict[str, Any], sweep_config: Dict[str, Any]) -> List[SweepResult]:
+    from core.data_provider import DataProvider
+    plan = build_sweep_plan(sweep_config.get('space', {}), sweep_config.get('mode', 'grid'),
+                            sweep_config.get('random_samples', 10), sweep_config.get('seed', 42))
+    max_workers = sweep_config.get('max_workers') or os.cpu_count() or 1
+    max_ticks = sweep_config.get('max_ticks', 0)
+    logger.info(f"The War Games Council convenes: {len(plan)} run(s) across {max_workers} worker(s).")
+
+    # The candles are forged once here and shared read-only; no worker parses the campaign again.
+    history = DataProvider(copy.deepcopy(base_config.get('data_provider', {})), strategic_memory=None).full_df_5m
+    well = SharedCandles(history) if sweep_config.get('shared_memory', True) and not history.empty else None
+    worker_log_level = logging.getLevelName(sweep_config.get('worker_log_level', 'WARNING'))
+    runs = [(f"run-{i:03d}", freeze_run_config(base_config, overrides), overrides) for i, overrides in enumerate(plan)]
+
+    # Workers must never reopen (and truncate) the commander's log file when they import `main`.
+    os.environ['LEGION_LOG_FILE'] = ''
+    results: List[SweepResult] = []
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=(well.handle if well else history, worker_log_level)) as pool:
+            futures = {pool.submit(run_backtest, run_id, config, overrides, max_ticks): run_id for run_id, config, overrides in runs}
+            for future in as_completed(futures):
+                result = future.result(); results.append(result)
+                logger.info(f"[{result.run_id}] finished in {result.elapsed_seconds:.1f}s: PnL {result.total_pnl_pct:+.2f}% over {result.closed_trades} trade(s).")
+    finally:
+        if well: well.close()
+    return rank_results(results, sweep_config.get('rank_by', 'total_pnl_pct'))
+
+
+def display_results(results: List[SweepResult], top_n: int = 20):
+    table = Table(title="[bold]War Games Council - Ranked Results[/bold]")
+    for column, justify in (("#", "right"), ("Run", "left"), ("PnL %", "right"), ("Trades", "right"), ("Win %", "right"),
+                            ("Max DD %", "right"), ("Ticks", "right"), ("Overrides", "left")):
+        table.add_column(column, justify=justify)
+    for rank, r in enumerate(results[:top_n], start=1):
+        overrides = ", ".join(f"{k.split('.')[-1]}={v}" for k, v in r.overrides.items()) or "(baseline)"
+        pnl = "[red]FAILED[/red]" if r.error else f"{r.total_pnl_pct:+.2f}"
+        table.add_row(str(rank), r.run_id, pnl, str(r.closed_trades), f"{r.win_rate:.1f}", f"{r.max_drawdown_pct:.2f}", str(r.ticks), overrides)
+    Console().print(table)
+
+
+def write_results_csv(results: List[SweepResult], path: Path):
+    if not results: return
+    rows = [asdict(r) for r in results]
+    for row in rows: row['overrides'] = yaml.safe_dump(row['overrides'], default_flow_style=True).strip()
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0].keys())); writer.writeheader(); writer.writerows(rows)
+    logger.info(f"Ranked results written to '{path}'.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="ShadowVanguard - The War Games Council (parameter sweep)")
+    parser.add_argument("--config", default=str(PROJECT_ROOT / 'config' / 'settings.yaml'), help="Path to master configuration file.")
+    parser.add_argument("--mode", choices=["grid", "random"], help="Override parameter_sweep.mode.")
+    parser.add_argument("--samples", type=int, help="Override parameter_sweep.random_samples.")
+    parser.add_argument("--workers", type=int, help="Override parameter_sweep.max_workers.")
+    parser.add_argument("--max-ticks", type=int, help="Override parameter_sweep.max_ticks (0 = full campaign).")
+    parser.add_argument("--output", default="sweep_results.csv", help="CSV file for the ranked results.")
+    args = parser.parse_args()
+
+    from main import ShadowVanguardOracle
+    master_config = ShadowVanguardOracle.load_config(args.config)
+    sweep_settings = dict(master_config.get('parameter_sweep', {}))
+    for key, value in (('mode', args.mode), ('random_samples', args.samples), ('max_workers', args.workers), ('max_ticks', args.max_ticks)):
+        if value is not None: sweep_settings[key] = value
+    ranked = run_sweep(master_config, sweep_settings)
+    display_results(ranked, sweep_settings.get('top_n', 20))
+    write_results_csv(ranked, PROJECT_ROOT / args.output)
@@ -1,5 +1,5 @@
 # F:\ShadowVanguard_Legion_Godspeed\tactical_ai\tactical_controller.py
-# Version 42.0 - Prometheus, The True-Sight Eagle
+# Version 42.2 - Prometheus, The True-Sight Eagle
 
 import logging
 from typing import Dict, Any, Tuple, Optional, List
@@ -14,6 +14,8 @@ from execution_engine.position_manager import PositionManager
 from memory.experience_memory import ExperienceMemory
 from memory.strategic_memory import StrategicMemory
 from memory.performance_auditor import StrategicAlertLevel
+from core.zone_index import side_index
+from utils.validators import FrozenConfig, freeze
 
 logger = logging.getLogger("TacticalController")
 
@@ -35,6 +37,12 @@ class ProximityDebugInfo:
     nearest_resistance: Optional[Tuple[str, float]] = None # (Type, Price)
     dist_to_resistance_pct: float = float('inf')
 
+@dataclass(frozen=True)
+class ControllerDoctrine:
+    """Everything the Eagle reads from the constitution, sealed together so a rearm replaces it in one assignment."""
+    config: Dict[str, Any]; controller_config: Dict[str, Any]; strategic_protocol: Dict[str, Any]
+    management_rules: Dict[str, Any]; scoring_weights: Dict[str, Any]
+
 class TacticalController:
     """
     THE TRUE-SIGHT EAGLE: This is the definitive hunter. A critical scaling bug in
@@ -42,17 +50,29 @@ class TacticalController:
     battlefield with its intended range. Furthermore, its mind is now transparent;
     if it chooses not to strike, it will report precisely WHY the location was not
     deemed a valid ambush point, eliminating all guesswork. The hunt begins now.
+    v42.2: The doctrine is one sealed bundle. `rearm` builds the new bundle aside and swaps it
+    in with a single assignment, so a hot-reload never shows a decision half of each doctrine.
     """
     def __init__(self, position_manager: PositionManager, memory: ExperienceMemory, strategic_memory: StrategicMemory, config: Dict[str, Any]):
         # [PACT KEPT]: This method is PRESERVED.
-        self.position_manager = position_manager; self.memory = memory; self.strategic_memory = strategic_memory; self.config = config
+        self.position_manager = position_manager; self.memory = memory; self.strategic_memory = strategic_memory
         self.rearm(config)
-        self.last_sent_roe: Dict[str, Any] = {}; logger.info(f"[TacticalController] The True-Sight Eagle v42.0 is in command. Vision corrected and amplified.")
+        self.last_sent_roe: Dict[str, Any] = {}; logger.info(f"[TacticalController] The True-Sight Eagle v42.2 is in command. Vision corrected and amplified.")
 
     def rearm(self, config: Dict[str, Any]):
-        # [PACT KEPT]: This method is PRESERVED.
-        self.controller_config = config.get('tactical_controller', {}); self.strategic_protocol = self.controller_config.get('strategic_protocol', {})
-        self.management_rules = self.controller_config.get('management_rules', {}); self.scoring_weights = self.controller_config.get('scoring_weights', {})
+        # [PACT KEPT]: The doctrine sections read are PRESERVED.
+        # [SURGICAL UPGRADE]: Sealed first, then swapped in with one assignment (atomic for a reader on another thread).
+        config = freeze(config); controller_config = config.get('tactical_controller') or FrozenConfig()
+        self.doctrine = ControllerDoctrine(
+            config=config, controller_config=controller_config, strategic_protocol=controller_config.get('strategic_protocol', FrozenConfig()),
+            management_rules=controller_config.get('management_rules', FrozenConfig()), scoring_weights=controller_config.get('scoring_weights', FrozenConfig()))
+
+    # The doctrine's sections, read through the current bundle.
+    config = property(lambda self: self.doctrine.config)
+    controller_config = property(lambda self: self.doctrine.controller_config)
+    strategic_protocol = property(lambda self: self.doctrine.strategic_protocol)
+    management_rules = property(lambda self: self.doctrine.management_rules)
+    scoring_weights = property(lambda self: self.doctrine.scoring_weights)
 
     def decide_and_signal(self,
                           mdf: MarketDataFrame,
@@ -129,16 +149,18 @@ class TacticalController:
         # [NEW DEBUG UNIT]: Initialize our new transparent thought process reporter.
         debug_info = ProximityDebugInfo()
 
-        # Gather all potential support and resistance zones
+        # Gather the nearest support and resistance of every zone family
+        # [SURGICAL UPGRADE]: Each family answers with its single nearest floor and ceiling from its price index.
         supports = [] # List of (type, price_high)
         resistances = [] # List of (type, price_low)
+        families = [('OB', mdf.ob_report.block_index, mdf.ob_report.all_blocks), ('FVG', mdf.liq_report.fvg_index, mdf.liq_report.unfilled_fvgs)]
         for tf in ['1h', '15m', '5m']:
-            if tf in mdf.ob_report.all_blocks:
-                supports.extend([(f"{tf}_OB", ob.price_high) for ob in mdf.ob_report.all_blocks.get(tf, {}).get('bullish', []) if ob.price_high < current_price])
-                resistances.extend([(f"{tf}_OB", ob.price_low) for ob in mdf.ob_report.all_blocks.get(tf, {}).get('bearish', []) if ob.price_low > current_price])
-            if tf in mdf.liq_report.unfilled_fvgs:
-                supports.extend([(f"{tf}_FVG", fvg.price_high) for fvg in mdf.liq_report.unfilled_fvgs.get(tf, {}).get('bullish', []) if fvg.price_high < current_price])
-                resistances.extend([(f"{tf}_FVG", fvg.price_low) for fvg in mdf.liq_report.unfilled_fvgs.get(tf, {}).get('bearish', []) if fvg.price_low > current_price])
+            for family, indexes, zones in families:
+                if tf not in zones: continue
+                support = side_index(indexes, zones, tf, 'bullish').nearest_below(current_price)
+                resistance = side_index(indexes, zones, tf, 'bearish').nearest_above(current_price)
+                if support: supports.append((f"{tf}_{family}", support.price_high))
+                if resistance: resistances.append((f"{tf}_{family}", resistance.price_low))
 
         # Find closest support and resistance for debugging
         if supports:
@@ -0,0 +1,68 @@
+# F:\ShadowVanguard_Legion_Godspeed\tests\test_candle_store.py
+# Version 1.1 - The Candle Vault's Seal
+
+import pytest
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+from core.candle_store import CandleStore
+from core.data_provider import DataProvider
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture(scope="module")
+def csv_files():
+    files = sorted(str(p) for p in (PROJECT_ROOT / "data").glob("BTCUSDT-5m-*.csv"))[:5]
+    if not files: pytest.skip("Bundled BTCUSDT CSVs are not available.")
+    return files
+
+
+def _provider(files, **overrides):
+    config = {'csv_files': files, 'campaign_start_date': '2025-06-01', 'data_window_size': 100, **overrides}
+    return DataProvider(config, strategic_memory=None)
+
+
+def test_store_backed_provider_matches_csv_ingestion(csv_files, tmp_path):
+    from_csv = _provider(csv_files).full_df_5m
+    from_store = _provider(csv_files, source='store', candle_store_path=str(tmp_path)).full_df_5m  # first run imports
+    again = _provider([], source='store', candle_store_path=str(tmp_path)).full_df_5m  # later runs only map
+    pd.testing.assert_frame_equal(from_store, from_csv, check_freq=False)
+    pd.testing.assert_frame_equal(again, from_csv, check_freq=False)
+    assert len(CandleStore(tmp_path).partitions('BTCUSDT', '5m')) == len(csv_files)
+
+
+def test_changed_or_added_sources_are_imported_again(csv_files, tmp_path, monkeypatch):
+    vault = tmp_path / "vault"; sources = []
+    for csv_file in csv_files[:3]: sources.append(str(tmp_path / Path(csv_file).name)); Path(sources[-1]).write_bytes(Path(csv_file).read_bytes())
+    _provider(sources[:2], source='store', candle_store_path=str(vault))
+    assert CandleStore(vault).stale_sources('BTCUSDT', '5m', sources) == [sources[2]]
+
+    # A third file joins csv_files and the first is rewritten with a different close: both reach the store.
+    lines = Path(sources[0]).read_text().splitlines(); fields = lines[-1].split(','); fields[4] = '1.5'
+    Path(sources[0]).write_text('\n'.join(lines[:-1] + [','.join(fields)]) + '\n')
+    df = _provider(sources, source='store', candle_store_path=str(vault)).full_df_5m
+    pd.testing.assert_frame_equal(df, _provider(sources).full_df_5m, check_freq=False)
+    assert CandleStore(vault).stale_sources('BTCUSDT', '5m', sources) == []
+
+    # A file dropped from csv_files keeps its candles in the store, and says so.
+    warnings = []; monkeypatch.setattr('core.data_provider.logger.warning', warnings.append)
+    _provider(sources[1:], source='store', candle_store_path=str(vault))
+    assert len(warnings) == 1 and Path(sources[0]).name in warnings[0]
+
+
+def test_verify_and_gap_detection(csv_files, tmp_path):
+    store = CandleStore(tmp_path)
+    store.import_csv_files('BTCUSDT', '5m', csv_files)
+    assert store.verify('BTCUSDT', '5m') == [] and store.find_gaps('BTCUSDT', '5m') == []
+
+    # Carve a hole of three candles out of the second day and corrupt the third day's closes.
+    day_two, day_three = store.partitions('BTCUSDT', '5m')[1:3]
+    kept = np.delete(np.load(day_two / "timestamp.npy"), [10, 11, 12])
+    np.save(day_two / "timestamp.npy", kept)
+    closes = np.load(day_three / "close.npy"); closes[0] += 1.0; np.save(day_three / "close.npy", closes)
+
+    assert store.verify('BTCUSDT', '5m') == [day_two.name, day_three.name]
+    gaps = store.find_gaps('BTCUSDT', '5m')
+    assert len(gaps) == 1 and gaps[0].missing_candles == 3
@@ -0,0 +1,101 @@
+# F:\ShadowVanguard_Legion_Godspeed\tests\test_checkpoint.py
+# Version 1.2 - The Chronicle Keeper's Trial
+
+import io
+import json
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.data_models import PositionV2
+from core.market_enums import PositionSide, TacticalDecision
+from main import ShadowVanguardOracle
+from memory.trade_journal import read_journal
+from utils.logger_config import shutdown_logging
+
+
+@pytest.fixture(autouse=True, scope="module")
+def _logging_stands_down():
+    yield
+    shutdown_logging()  # The boot logger's console handler must not outlive the runner's captured stdout
+
+
+SNAPSHOT_STATE = ('data_provider', 'capital_allocator', 'position_manager', 'experience_memory', 'emotion_engine',
+                  'ob_analyzer', 'liq_analyzer', 'fib_sniper', 'interrogator', 'power_scanner')
+
+
+def _history(n=1400, seed=11):
+    rng = np.random.default_rng(seed)
+    close = 30000 + rng.normal(0, 40, n).cumsum(); high = close + rng.uniform(1, 30, n); low = close - rng.uniform(1, 30, n)
+    return pd.DataFrame({'open': np.r_[close[0], close[:-1]], 'high': high, 'low': low, 'close': close, 'volume': rng.uniform(500, 5000, n)},
+                        index=pd.date_range('2024-01-01', periods=n, freq='5min'))
+
+
+def _oracle(directory, history, journals=None, **checkpoint):
+    config = ShadowVanguardOracle.load_config()
+    config.update({'simulation_mode': 'backtest', 'auto_start': True, 'dashboard_enabled': False})
+    config['data_provider'].update({'data_window_size': 300, 'training_days': 1, 'campaign_start_date': '2024-01-01'})
+    config['checkpoint'] = dict({'enabled': True, 'directory': str(directory), 'every_ticks': 15, 'keep': 2}, **checkpoint)
+    config['trade_journal'] = dict(config['trade_journal'], file=str((journals or directory) / 'run.svj'))
+    config['lifecycle'] = dict(config['lifecycle'], journal_file=str((journals or directory) / 'journal.jsonl'), telemetry_every_ticks=0)
+    return ShadowVanguardOracle(config, history=history)
+
+
+def _advance(oracle, ticks):
+    for _ in range(ticks):
+        oracle._tick()
+        oracle.checkpoints.tick_completed(oracle)
+
+
+def _dumps(component):
+    # Without the memo every shared object (an interned string, a reused float) is written out in full,
+    # so two equal states give equal bytes however their objects happen to be shared.
+    buffer = io.BytesIO(); pickler = pickle.Pickler(buffer, protocol=pickle.HIGHEST_PROTOCOL); pickler.fast = True
+    pickler.dump(component); return buffer.getvalue()
+
+
+def _state(oracle):
+    return {name: _dumps(getattr(oracle, name)) for name in SNAPSHOT_STATE}
+
+
+def test_resumed_campaign_continues_byte_for_byte(tmp_path):
+    history = _history()
+    straight = _oracle(tmp_path / 'straight', history, tmp_path); straight.phase_zero_historical_wisdom(); _advance(straight, 45)
+
+    first_leg = _oracle(tmp_path / 'resumed', history, tmp_path); first_leg.phase_zero_historical_wisdom(); _advance(first_leg, 37)
+    snapshots = first_leg.checkpoints.snapshots()
+    assert [p.name for p in snapshots] == ['snapshot_0000000015.pkl', 'snapshot_0000000030.pkl']  # Only the newest `keep` survive
+
+    second_leg = _oracle(tmp_path / 'resumed', history, tmp_path)
+    assert second_leg.checkpoints.restore(second_leg) and second_leg.checkpoints.ticks == 30
+    _advance(second_leg, 15)
+    assert _state(second_leg) == _state(straight)
+
+
+def test_snapshots_from_another_doctrine_are_refused(tmp_path):
+    history = _history(n=700)
+    oracle = _oracle(tmp_path, history); oracle.phase_zero_historical_wisdom(); oracle.checkpoints.save(oracle)
+    other = _oracle(tmp_path, history)
+    other.checkpoints = type(other.checkpoints)(other.config['checkpoint'], {**other.config, 'initial_capital': 1.0}, tmp_path)
+    assert not other.checkpoints.restore(other)
+
+
+
+def test_journals_stay_whole_across_a_resume(tmp_path):
+    history = _history(n=700)
+    def _close(oracle, position_id):
+        oracle.position_manager.on_position_closed_callback(PositionV2(position_id=position_id, symbol='BTC', side=PositionSide.LONG,
+                                                                       entry_price=100.0, size=1.0, status='CLOSED'))
+    first_leg = _oracle(tmp_path, history); first_leg.phase_zero_historical_wisdom()
+    first_leg.position_manager.journal.decision(TacticalDecision.WAIT, None, 'BTC', 100.0); _close(first_leg, 'P0')
+    first_leg.checkpoints.save(first_leg)  # The run then dies without standing down
+
+    second_leg = _oracle(tmp_path, history)
+    assert second_leg.checkpoints.restore(second_leg)
+    assert second_leg.position_manager.on_position_closed_callback.journal is second_leg.lifecycle.journal
+    _close(second_leg, 'P1'); second_leg.stand_down()
+    archived = [line for line in (tmp_path / 'journal.jsonl').read_text().splitlines()]
+    assert [json.loads(line)['position_id'] for line in archived] == ['P0', 'P1']
+    assert len(read_journal(tmp_path / 'run.svj')) == 1  # The decision queued before the snapshot
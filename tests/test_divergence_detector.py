@@ -0,0 +1,67 @@
+# F:\ShadowVanguard_Legion_Godspeed\tests\test_divergence_detector.py
+# Version 1.0 - The Streaming Interrogator's Trial
+
+import numpy as np
+import pandas as pd
+from scipy.signal import argrelextrema
+
+from analyst_ai.divergence_detector import DivergenceDetector
+from core.data_models import MarketDataFrame
+
+ORDER, WINDOW = 4, 300
+CONFIG = {'divergence_detector': {'analysis_timeframes': ['15m'], 'tactical_timeframe': '15m', 'rsi_period': 14, 'swing_order': ORDER,
+                                  'overbought_threshold': 60, 'oversold_threshold': 40, 'max_active_patterns': 10_000}}
+
+
+def _candles(n=1500, seed=21):
+    rng = np.random.default_rng(seed)
+    close = 100 + rng.normal(0, 1, n).cumsum(); high = close + rng.uniform(0, 1, n); low = close - rng.uniform(0, 1, n)
+    return pd.DataFrame({'open': close, 'high': high, 'low': low, 'close': close, 'volume': 1.0}, index=pd.date_range('2024-01-01', periods=n, freq='15min'))
+
+
+def _brute_force_patterns(candles):
+    """Re-pairs every extremum from scratch on every tick, the way the legacy detector did."""
+    delta = candles['close'].diff()
+    gain = delta.where(delta > 0, 0).ewm(alpha=1 / 14, adjust=False).mean(); loss = (-delta.where(delta < 0, 0)).ewm(alpha=1 / 14, adjust=False).mean()
+    rsi = (100 - 100 / (1 + gain / (loss + 1e-9))).to_numpy()
+    high, low = candles['high'].to_numpy(), candles['low'].to_numpy(); found = {}
+    for end in range(WINDOW, len(candles) + 1):
+        start = end - WINDOW
+        def last_two(values, comparator, first):
+            idx = [i for i in argrelextrema(values[:end], comparator, order=ORDER)[0] if max(ORDER, first) <= i < end - ORDER]
+            return idx[-2:] if len(idx) >= 2 else None
+        for side, prices, comparator in (('high', high, np.greater_equal), ('low', low, np.less_equal)):
+            p, r = last_two(prices, comparator, start), last_two(rsi, comparator, start + ORDER)
+            if p is None or r is None: continue
+            (p1, p2), (r1, r2) = p, r
+            if side == 'high':
+                rules = [('CL_BEAR', high[p2] > high[p1] and rsi[r2] < rsi[r1] and rsi[r2] > 60, low[p1:p2].min()),
+                         ('HD_BEAR', high[p2] < high[p1] and rsi[r2] > rsi[r1] and rsi[r2] > 60, low[r2:end].min())]
+            else:
+                rules = [('CL_BULL', low[p2] < low[p1] and rsi[r2] > rsi[r1] and rsi[r2] < 40, high[p1:p2].max()),
+                         ('HD_BULL', low[p2] > low[p1] and rsi[r2] < rsi[r1] and rsi[r2] < 40, high[r2:end].max())]
+            for tag, holds, level in rules:
+                pattern_id = f"{tag}_15m_{candles.index[p2]:%Y%m%d%H%M}"
+                if holds and pattern_id not in found: found[pattern_id] = (candles.index[p1].value, candles.index[p2].value, candles.index[r1].value, candles.index[r2].value, level)
+    return found
+
+
+def test_streaming_patterns_match_a_full_rescan_every_tick():
+    candles = _candles(); detector = DivergenceDetector(CONFIG)
+    for end in range(WINDOW, len(candles) + 1):
+        window = candles.iloc[end - WINDOW:end]
+        detector.analyze(MarketDataFrame(timestamp=window.index[-1], symbol='BTC/USDT', ohlcv_multidim={'15m': window}, order_book_snapshot={}, tape_snapshot=[]))
+    streamed = {p.pattern_id: (p.p1_idx, p.p2_idx, p.m1_idx, p.m2_idx, p.confirmation_level) for p in detector.active_patterns['15m']}
+    assert len(streamed) == len(detector.active_patterns['15m'])  # Never the same case twice
+    expected = _brute_force_patterns(candles)
+    assert len(expected) > 5 and streamed.keys() == expected.keys()
+    for pattern_id, (p1, p2, r1, r2, level) in expected.items():
+        assert streamed[pattern_id][:4] == (p1, p2, r1, r2) and np.isclose(streamed[pattern_id][4], level)
+
+
+def test_active_patterns_stay_bounded():
+    candles = _candles(seed=4); detector = DivergenceDetector({'divergence_detector': dict(CONFIG['divergence_detector'], max_active_patterns=3)})
+    for end in range(WINDOW, len(candles) + 1, 2):
+        window = candles.iloc[end - WINDOW:end]
+        detector.analyze(MarketDataFrame(timestamp=window.index[-1], symbol='BTC/USDT', ohlcv_multidim={'15m': window}, order_book_snapshot={}, tape_snapshot=[]))
+        assert len(detector.active_patterns['15m']) <= 3
@@ -0,0 +1,61 @@
+# F:\ShadowVanguard_Legion_Godspeed\tests\test_experience_memory.py
+# Version 1.0 - The Recollection Lattice's Trial
+
+import pytest
+import numpy as np
+import pandas as pd
+
+from core.data_models import PowerReport, EmotionReport, Experience
+from core.market_enums import TacticalDecision, MarketRegime
+from memory.experience_memory import ExperienceMemory
+
+ACTIONS = [TacticalDecision.HOLD, TacticalDecision.RETREAT, TacticalDecision.WAIT, TacticalDecision.FLIP_POSITION]
+
+
+def _random_state(rng, archived=False):
+    power = PowerReport(true_net_force=rng.normal(0, 30), net_force_acceleration=rng.normal(), book_imbalance=rng.uniform(-1, 1),
+                        delta_joiners=rng.normal(), price_velocity=rng.normal())
+    emotion = EmotionReport(aggression=rng.uniform(), caution=rng.uniform(), fear=rng.uniform(), greed=rng.uniform())
+    regime = list(MarketRegime)[rng.integers(len(MarketRegime))]
+    if archived:
+        from dataclasses import asdict
+        return {'power': asdict(power), 'emotion': asdict(emotion), 'structure': {'market_regime': {'5m': regime}}}
+    return {'power_report': power, 'emotion_report': emotion, 'market_regime': regime}
+
+
+def _brute_force(memory, state):
+    """The v4.4 linear scan: rescale every experience, one cosine at a time."""
+    scale = lambda s: memory.scaler.transform(memory._state_to_vector(s).reshape(1, -1))[0]
+    query = scale(state); best, best_score = None, -np.inf
+    for exp in memory.memory:
+        if exp.action == TacticalDecision.WAIT or not exp.state: continue
+        vec = scale(exp.state); denom = np.linalg.norm(query) * np.linalg.norm(vec)
+        similarity = max(0.0, float(query @ vec / denom)) if denom else 0.0
+        if similarity * (1 + exp.outcome) > best_score: best_score, best = similarity * (1 + exp.outcome), (exp, similarity)
+    return best
+
+
+def test_index_recall_matches_linear_scan_through_ring_wraparound():
+    rng = np.random.default_rng(3)
+    memory = ExperienceMemory({'max_size': 150, 'refit_interval': 40, 'min_similarity_threshold': -1.0})
+    for i in range(400):
+        memory.remember(Experience(state=_random_state(rng, archived=i % 2 == 0), action=ACTIONS[i % len(ACTIONS)], outcome=rng.normal(0, 0.05)))
+    assert len(memory.index) == len(memory.memory) == 150
+
+    queries = [_random_state(rng) for _ in range(25)]
+    batched = memory.find_similar_patterns(queries)
+    for query, match in zip(queries, batched):
+        exp, similarity = _brute_force(memory, query)
+        assert match['decision'] == exp.action and match['confidence'] == round(min(1.0, similarity), 2)
+        assert match == memory.find_similar_pattern(query)
+
+
+def test_prime_with_history_bulk_loads_and_recalls():
+    rng = np.random.default_rng(5)
+    close = 100 + np.cumsum(rng.normal(0, 0.5, 3000))
+    history = pd.DataFrame({'close': close, 'volume': rng.uniform(10, 100, 3000)})
+    memory = ExperienceMemory({'max_size': 2000})
+    memory.prime_with_history(history)
+    assert len(memory.memory) == len(memory.index) == 2000 and memory.index.is_calibrated
+    match = memory.find_similar_pattern({'power_report': PowerReport(true_net_force=80.0), 'emotion_report': EmotionReport()})
+    assert match is not None and match['decision'] == TacticalDecision.HOLD
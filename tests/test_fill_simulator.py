@@ -0,0 +1,65 @@
+# F:\ShadowVanguard_Legion_Godspeed\tests\test_fill_simulator.py
+# Version 1.0 - The Friction Engine's Trial
+
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+
+from core.market_enums import PositionSide
+from core.market_simulator import TapeArrays
+from execution_engine.fill_simulator import FillSimulator
+from execution_engine.order_executor import SimulatedOrderExecutor
+
+FRICTIONLESS = {'enabled': True, 'latency_ms': 0, 'taker_fee_bps': 0.0, 'slippage_bps': 0.0, 'impact_bps': 0.0, 'max_participation': 1.0}
+
+
+def _tick(open_, high, low, close, volume=100.0, buys=1.0, sells=1.0):
+    candle = pd.DataFrame({'open': [open_], 'high': [high], 'low': [low], 'close': [close], 'volume': [volume]})
+    steps = np.arange(1, 6, dtype=np.float64)
+    book = {'bids': np.column_stack((close - steps, np.full(5, 1.0))), 'asks': np.column_stack((close + steps, np.full(5, 1.0)))}
+    tape = TapeArrays(prices=np.array([close, close]), sizes=np.array([buys, sells]), is_buy=np.array([True, False]))
+    return SimpleNamespace(ohlcv_multidim={'5m': candle}, order_book_snapshot=book, tape_snapshot=tape)
+
+
+def _executor(**config):
+    return SimulatedOrderExecutor(FillSimulator(dict(FRICTIONLESS, **config), bar_minutes=5))
+
+
+def test_a_disabled_engine_fills_at_the_touch():
+    executor = SimulatedOrderExecutor(FillSimulator({'enabled': False})); executor.observe_market(_tick(100, 101, 99, 100), '5m')
+    receipt = executor.place_order('BTC', PositionSide.LONG, 2.0, 'MARKET', current_price=100.0)
+    assert executor.fill_simulator is None and (receipt['filled_price'], receipt['filled_size'], 'fee' in receipt) == (100.0, 2.0, False)
+
+
+def test_market_orders_walk_the_book_pay_fees_and_respect_participation():
+    executor = _executor(taker_fee_bps=10.0); executor.observe_market(_tick(100, 101, 99, 100), '5m')
+    receipt = executor.place_order('BTC', PositionSide.LONG, 2.5, 'MARKET', current_price=100.0)
+    assert receipt['filled_size'] == 2.5 and np.isclose(receipt['filled_price'], 100.0 + (1 * 1 + 1 * 2 + 0.5 * 3) / 2.5)  # 101, 102 and half of 103
+    assert np.isclose(receipt['fee'], receipt['filled_price'] * 2.5 * 0.001)
+    sell = executor.place_order('BTC', PositionSide.SHORT, 1.0, 'MARKET', current_price=100.0); assert np.isclose(sell['filled_price'], 99.0)
+
+    capped = _executor(max_participation=0.01); capped.observe_market(_tick(100, 101, 99, 100, volume=100.0, buys=3.0, sells=1.0), '5m')
+    assert np.isclose(capped.place_order('BTC', PositionSide.LONG, 5.0, 'MARKET', current_price=100.0)['filled_size'], 0.75)  # 1% of 75 bought
+    assert np.isclose(capped.close_order('p', 5.0, 'BTC', 100.0, position_side=PositionSide.SHORT)['filled_size'], 5.0)  # Closes always complete
+    thin = _executor(); thin.observe_market(_tick(100, 101, 99, 100), '5m')
+    assert thin.place_order('BTC', PositionSide.LONG, 8.0, 'MARKET', current_price=100.0)['filled_size'] == 5.0  # The whole ladder, no more
+
+
+def test_stops_fill_in_the_order_the_candle_path_reaches_them():
+    executor = _executor()
+    for side, trigger in [(PositionSide.LONG, 105.0), (PositionSide.SHORT, 97.0), (PositionSide.LONG, 99.0)]:
+        executor.place_order('BTC', side, 0.5, 'STOP_MARKET', trigger_price=trigger, parent_position_id='p')
+    executor.observe_market(_tick(100, 110, 95, 108), '5m')  # A rising bar: down to 95 first, then up to 110
+    fills = executor.check_triggered_stops(current_high=110, current_low=95, symbol='BTC')
+    # The buy stop at 99 is already through at the open and fills there; then the low is visited, then the high.
+    assert [(r['side'], r['filled_price']) for r in fills] == [('LONG', 101.0), ('SHORT', 96.0), ('LONG', 106.0)]
+    assert not executor.pending_orders
+
+
+def test_delayed_stops_fill_on_a_later_candle():
+    executor = _executor(stop_latency_ticks=1)
+    executor.place_order('BTC', PositionSide.SHORT, 0.5, 'STOP_MARKET', trigger_price=97.0, parent_position_id='p')
+    executor.observe_market(_tick(100, 101, 95, 96), '5m'); assert executor.check_triggered_stops(101, 95, symbol='BTC') == []
+    executor.observe_market(_tick(94, 95, 90, 91), '5m')
+    assert [r['filled_price'] for r in executor.check_triggered_stops(95, 90, symbol='BTC')] == [93.0]  # The next open, 94, less one level
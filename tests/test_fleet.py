@@ -0,0 +1,66 @@
+# F:\ShadowVanguard_Legion_Godspeed\tests\test_fleet.py
+# Version 1.1 - The Fleet Admiralty's Trial
+
+import io
+import pickle
+from types import SimpleNamespace
+
+import pytest
+
+from core.data_provider import DataProvider
+from core.market_enums import TacticalDecision
+from fleet import FleetCommander
+from main import ShadowVanguardOracle
+from risk_manager.capital_allocator import CapitalAllocator
+from utils.logger_config import shutdown_logging
+
+
+@pytest.fixture(autouse=True, scope="module")
+def _logging_stands_down():
+    yield
+    shutdown_logging()  # The boot logger's console handler must not outlive the runner's captured stdout
+
+
+ANALYSTS = ('ob_analyzer', 'liq_analyzer', 'fib_sniper', 'interrogator', 'structure_analyzer', 'power_scanner', 'emotion_engine', 'time_oracle')
+TICKERS = ('AAA/USDT:USDT', 'BBB/USDT:USDT')
+
+
+def _config():
+    config = ShadowVanguardOracle.load_config(validate=False)
+    config.update({'simulation_mode': 'backtest', 'auto_start': True, 'dashboard_enabled': False})
+    config['data_provider'].update({'source': 'csv', 'csv_files': config['data_provider']['csv_files'][:4],
+                                    'data_window_size': 300, 'training_days': 1, 'campaign_start_date': '2025-06-01'})
+    config['memory']['strategic_map_store']['enabled'] = False
+    config['trade_journal'] = dict(config['trade_journal'], enabled=False)
+    return config
+
+
+def _dumps(component):
+    buffer = io.BytesIO(); pickler = pickle.Pickler(buffer, protocol=pickle.HIGHEST_PROTOCOL); pickler.fast = True
+    pickler.dump(component); return buffer.getvalue()
+
+
+def test_every_front_analyses_its_own_candles_as_a_lone_oracle_would():
+    # The bundled BTCUSDT campaign, enlisted twice under synthetic tickers.
+    config = _config(); history = DataProvider(config['data_provider'], strategic_memory=None).full_df_5m
+    lone = ShadowVanguardOracle(config, history=history); lone.phase_zero_historical_wisdom()
+    config['fleet'] = {'max_workers': 2, 'fronts': [{'target_symbol': ticker} for ticker in TICKERS]}
+    fleet = FleetCommander(config, histories={ticker: history for ticker in TICKERS})
+    for oracle in fleet.oracles.values(): oracle.phase_zero_historical_wisdom()
+    for _ in range(30): lone._tick(); assert fleet._tick()
+    for ticker, front in fleet.oracles.items():
+        assert front.data_provider.symbol == ticker and front.capital_allocator is fleet.capital_allocator
+        assert all(_dumps(getattr(front, name)) == _dumps(getattr(lone, name)) for name in ANALYSTS)
+    fleet.stand_down()
+
+
+def test_the_shared_quartermaster_caps_the_portfolio_and_each_symbol():
+    allocator = CapitalAllocator(10000.0, {'risk_per_trade_percent': 10.0, 'max_exposure_percent': 50.0, 'max_symbol_exposure_percent': 30.0})
+    signal = SimpleNamespace(details={}, suggestion=TacticalDecision.ADVANCE)
+    first = allocator.request_allocation(signal, 99.0, 100.0, symbol=TICKERS[0])
+    assert first.allocated_amount == 3000.0 and allocator.request_allocation(signal, 99.0, 100.0, symbol=TICKERS[0]) is None
+    second = allocator.request_allocation(signal, 99.0, 100.0, symbol=TICKERS[1])
+    assert second.allocated_amount == 2000.0 and allocator.symbol_allocated_cost == {TICKERS[0]: 3000.0, TICKERS[1]: 2000.0}
+    assert allocator.request_allocation(signal, 99.0, 100.0, symbol='CCC/USDT:USDT') is None  # The portfolio is full
+    allocator.release_capital_by_ticket_id(first.ticket_id)
+    assert allocator.symbol_allocated_cost == {TICKERS[1]: 2000.0} and allocator.request_allocation(signal, 99.0, 100.0, symbol=TICKERS[0]) is not None
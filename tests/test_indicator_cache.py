@@ -0,0 +1,48 @@
+# F:\ShadowVanguard_Legion_Godspeed\tests\test_indicator_cache.py
+# Version 1.1 - The Shared Almanac's Audit
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.indicator_cache import IndicatorCache
+
+
+@pytest.fixture
+def candles():
+    rng = np.random.default_rng(11); n = 700
+    close = 100 + rng.normal(0, 1, n).cumsum()
+    return pd.DataFrame({'open': close + rng.normal(0, 0.3, n), 'high': close + rng.uniform(0, 1, n), 'low': close - rng.uniform(0, 1, n),
+                         'close': close, 'volume': rng.uniform(1, 10, n)}, index=pd.date_range('2024-01-01', periods=n, freq='5min'))
+
+
+def _legacy_atr(df, alpha):
+    # The per-tick full-frame computation the analyzers used to run.
+    tr = pd.concat([df['high'] - df['low'], (df['high'] - df['close'].shift(1)).abs(), (df['low'] - df['close'].shift(1)).abs()], axis=1).max(axis=1)
+    return tr.ewm(alpha=alpha, adjust=False).mean()
+
+
+def test_sliding_window_matches_full_recomputation(candles):
+    cache = IndicatorCache(capacity=300)
+    for start in range(0, 400, 7):  # Gaps of several candles are folded in together
+        window = candles.iloc[start:start + 300]
+        assert cache.atr('5m', window, 14) == pytest.approx(_legacy_atr(window, 1 / 14).iloc[-1])
+        assert cache.atr('5m', window, 14, wilder=False) == pytest.approx(_legacy_atr(window, 2 / 15).iloc[-1])
+        assert cache.sma('5m', window, 20) == pytest.approx(window['volume'].rolling(20).mean().iloc[-1])
+        delta = window['close'].diff()
+        gain = delta.where(delta > 0, 0).ewm(alpha=1 / 14, adjust=False).mean(); loss = (-delta.where(delta < 0, 0)).ewm(alpha=1 / 14, adjust=False).mean()
+        np.testing.assert_allclose(cache.rsi_series('5m', window, 14)[-50:], (100 - 100 / (1 + gain / (loss + 1e-9))).to_numpy()[-50:])
+    assert len(cache.streams) == 4  # One stream per (timeframe, indicator, parameters)
+
+
+def test_forming_bar_is_revised_and_rewinds_restart(candles):
+    cache = IndicatorCache(capacity=100)
+    window = candles.iloc[:80].copy()
+    cache.atr('1h', window, 14)
+    window.iloc[-1, window.columns.get_loc('high')] += 5.0  # The open bar keeps its stamp but moves
+    assert cache.atr('1h', window, 14) == pytest.approx(_legacy_atr(window, 1 / 14).iloc[-1])
+    grown = pd.concat([window, candles.iloc[80:81]])
+    assert cache.atr('1h', grown, 14) == pytest.approx(_legacy_atr(grown, 1 / 14).iloc[-1])
+
+    rewound = candles.iloc[10:60]  # Older than everything seen: a fresh fold
+    np.testing.assert_allclose(cache.atr_series('1h', rewound, 14), _legacy_atr(rewound, 1 / 14).to_numpy())
@@ -0,0 +1,63 @@
+# F:\ShadowVanguard_Legion_Godspeed\tests\test_lifecycle.py
+# Version 1.1 - The Lifecycle Warden's Trial
+
+import json
+import pickle
+
+import pytest
+
+from core.data_models import PositionV2
+from core.market_enums import PositionSide
+from core.signal_memory import SignalMemory
+from main import ShadowVanguardOracle
+from memory.trade_journal import JournalKind, read_journal
+from soak import check_flat, run_soak
+from utils.lifecycle import LifecycleWarden
+from utils.logger_config import shutdown_logging
+
+
+@pytest.fixture(autouse=True, scope="module")
+def _logging_stands_down():
+    yield
+    shutdown_logging()  # The boot logger's console handler must not outlive the runner's captured stdout
+
+
+ANALYST_SECTIONS = ('order_block_analyzer', 'liquidity_analyzer', 'fibonacci_helper', 'divergence_detector')
+
+
+def test_the_signal_memory_forgets_from_the_front_by_age_and_by_cap():
+    memory = SignalMemory(lifespan=10, max_entries=3)
+    for i, signal_id in enumerate('abcd'): memory.remember(signal_id, i * 4)
+    assert list(memory) == ['b', 'c', 'd'] and memory.evicted == 1 and 'a' not in memory
+    assert memory.expire(16) == 1 and list(memory) == ['c', 'd'] and memory.expired == 1
+    restored = pickle.loads(pickle.dumps(memory))
+    assert restored == memory and (restored.lifespan, restored.max_entries, restored.evicted) == (10, 3, 1)
+
+
+def test_closed_positions_are_archived_on_their_way_to_the_auditor(tmp_path):
+    warden = LifecycleWarden({'journal_file': 'journal.jsonl'}, tmp_path); judged = []
+    relay = warden.relay(judged.append)
+    assert pickle.loads(pickle.dumps(warden.relay())).journal.path == warden.journal.path  # Checkpoints carry the chain
+    for i in range(2):
+        relay(PositionV2(position_id=f"P{i}", symbol='BTC/USDT:USDT', side=PositionSide.SHORT, entry_price=100.0, size=1.0, status='CLOSED'))
+    assert not (tmp_path / 'journal.jsonl').exists()  # Serialized later, off the close path
+    warden.close(engine=None)
+    records = [json.loads(line) for line in (tmp_path / 'journal.jsonl').read_text().splitlines()]
+    assert [r['position_id'] for r in records] == ['P0', 'P1'] and records[0]['kind'] == 'position' and records[0]['side'] == 'SHORT'
+    assert [p.position_id for p in judged] == ['P0', 'P1']
+
+
+def test_a_looped_session_holds_its_memory_flat(tmp_path):
+    config = ShadowVanguardOracle.load_config(validate=False)
+    config.update({'simulation_mode': 'backtest', 'auto_start': True, 'dashboard_enabled': False})
+    config['data_provider'].update({'source': 'csv', 'csv_files': config['data_provider']['csv_files'][:1],
+                                    'data_window_size': 200, 'training_days': 1, 'campaign_start_date': '2025-06-01'})
+    config['memory']['strategic_map_store']['enabled'] = False
+    config['lifecycle'] = {'journal_file': str(tmp_path / 'journal.jsonl'), 'telemetry_every_ticks': 0}
+    config['trade_journal'] = {'enabled': True, 'file': str(tmp_path / 'run.svj')}
+    for section in ANALYST_SECTIONS: config['analyst_ai'][section]['signal_memory_max_entries'] = 8
+    samples = run_soak(config, laps=4)
+    assert len(samples) == 4 and check_flat(samples, rss_tolerance_mb=32.0) == []
+    assert all(samples[-1].containers[f"{unit}.triggered_signals"] <= 8 for unit in ('ob_analyzer', 'liq_analyzer', 'fib_sniper', 'interrogator'))
+    assert samples[-1].containers['liq_analyzer.triggered_signals'] == 8  # Full, and forgetting its oldest reactions
+    assert len(read_journal(tmp_path / 'run.svj').of(JournalKind.DECISION)) == samples[-1].tick  # One decision a tick, flushed at stand-down
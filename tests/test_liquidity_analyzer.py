@@ -0,0 +1,74 @@
+# F:\ShadowVanguard_Legion_Godspeed\tests\test_liquidity_analyzer.py
+# Version 1.0 - The Ghost Hunter's Trial
+
+import pytest
+import pandas as pd
+from pathlib import Path
+
+from core.data_provider import DataProvider
+from core.data_models import MarketDataFrame
+from analyst_ai.liquidity_analyzer import LiquidityAnalyzer, scan_fair_value_gaps
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+MIN_SIZE, MIN_VOLUME, VOLUME_MA = 0.3, 1.5, 20
+
+# --- Test Fixtures: The bundled BTCUSDT campaign, exactly as the DataProvider forges it ---
+
+@pytest.fixture(scope="module")
+def campaign():
+    csv_files = sorted(str(p) for p in (PROJECT_ROOT / "data").glob("BTCUSDT-5m-*.csv"))
+    if not csv_files: pytest.skip("Bundled BTCUSDT CSVs are not available.")
+    provider = DataProvider({'csv_files': csv_files, 'campaign_start_date': '2025-06-01', 'data_window_size': 600}, strategic_memory=None)
+    return provider.get_all_historical_data()
+
+
+def _legacy_fvg_loop(df):
+    """The v15.0 `_update_fvgs_for_timeframe` loop (frame indicators + iloc walk), kept as the reference truth."""
+    df = df.copy()
+    tr = pd.concat([df['high'] - df['low'], (df['high'] - df['close'].shift(1)).abs(), (df['low'] - df['close'].shift(1)).abs()], axis=1).max(axis=1)
+    df['atr'] = tr.ewm(alpha=1/14, adjust=False).mean(); df['volume_ma'] = df['volume'].rolling(window=VOLUME_MA).mean()
+    found = []
+    for i in range(len(df) - 2):
+        a, b, c = df.iloc[i], df.iloc[i+1], df.iloc[i+2]
+        is_bull = c['low'] > a['high']; is_bear = a['low'] > c['high']
+        if not (is_bull or is_bear): continue
+        high = c['low'] if is_bull else a['low']; low = a['high'] if is_bull else c['high']
+        if b['atr'] == 0 or (high - low) < b['atr'] * MIN_SIZE: continue
+        if b['volume_ma'] == 0 or c['volume'] < b['volume_ma'] * MIN_VOLUME: continue
+        found.append((i + 1, bool(is_bull), low, high))
+    return found, df
+
+
+@pytest.mark.parametrize("timeframe", ['5m', '15m', '1h', '4h'])
+def test_vectorized_scan_matches_legacy_loop(campaign, timeframe):
+    expected, enriched = _legacy_fvg_loop(campaign[timeframe])
+    positions, is_bullish, lows, highs = scan_fair_value_gaps(
+        enriched['high'].to_numpy(), enriched['low'].to_numpy(), enriched['volume'].to_numpy(),
+        enriched['atr'].to_numpy(), enriched['volume_ma'].to_numpy(), MIN_SIZE, MIN_VOLUME)
+    assert len(expected) > 0
+    assert [(int(p), bool(b), lo, hi) for p, b, lo, hi in zip(positions, is_bullish, lows, highs)] == expected
+
+
+def test_streaming_registry_matches_one_shot_scan_and_legacy_loop(campaign):
+    config = {'liquidity_analyzer': {'analysis_timeframes': ['5m'], 'tactical_timeframe': '5m', 'filled_fvg_memory': 10000}}
+    history = campaign['5m'].iloc[:3000]
+    detected = lambda analyzer: {(f.void_id, f.created_at_index, f.price_low, f.price_high) for f in analyzer.active_fvgs_by_tf['5m'] + list(analyzer.filled_fvgs_by_tf['5m'])}
+
+    one_shot = LiquidityAnalyzer(config); one_shot._update_fvgs_for_timeframe(history, '5m')
+    streaming = LiquidityAnalyzer(config)
+    for end in range(600, len(history) + 1): streaming._update_fvgs_for_timeframe(history.iloc[end - 600:end], '5m')
+
+    legacy, _ = _legacy_fvg_loop(history)
+    assert detected(streaming) == detected(one_shot)
+    assert sorted((index, low, high) for _, index, low, high in detected(one_shot)) == [(index, low, high) for index, _, low, high in legacy]
+    # Every void is born exactly once; windows that slide over it never clone it.
+    assert len(streaming.active_fvgs_by_tf['5m']) + len(streaming.filled_fvgs_by_tf['5m']) == len(legacy)
+
+
+def test_analyze_leaves_market_frames_untouched(campaign):
+    analyzer = LiquidityAnalyzer({'liquidity_analyzer': {'analysis_timeframes': ['5m', '1h'], 'tactical_timeframe': '5m'}})
+    frames = {'5m': campaign['5m'].iloc[:600].copy(), '1h': campaign['1h'].iloc[:100].copy()}
+    report = analyzer.analyze(MarketDataFrame(timestamp=frames['5m'].index[-1], symbol="BTCUSDT", ohlcv_multidim=frames))
+    assert list(frames['5m'].columns) == ['open', 'high', 'low', 'close', 'volume']
+    assert list(frames['1h'].columns) == ['open', 'high', 'low', 'close', 'volume']
+    assert report.unfilled_fvgs
@@ -0,0 +1,53 @@
+# F:\ShadowVanguard_Legion_Godspeed\tests\test_logger_config.py
+# Version 1.1 - The Scribes' Oath
+
+import json
+import logging
+
+from utils.logger_config import TickRateLimiter, setup_logging, shutdown_logging
+
+
+def _record(name, level=logging.INFO, msg="tick"):
+    return logging.LogRecord(name, level, __file__, 1, msg, None, None)
+
+
+def test_rate_limiter_samples_throttles_and_exempts_errors():
+    limiter = TickRateLimiter({'Sampled': {'sample_every': 5}, 'Throttled': {'max_per_second': 3}})
+    assert sum(limiter.filter(_record('Sampled')) for _ in range(50)) == 10
+    assert sum(limiter.filter(_record('Throttled')) for _ in range(50)) == 3
+    assert all(limiter.filter(_record('Throttled', logging.ERROR)) for _ in range(20))
+    assert all(limiter.filter(_record('Unruled')) for _ in range(20))
+
+    limiter._state['Throttled'][0] = 1.0  # Refill one token: the next survivor reports what was swallowed.
+    survivor = _record('Throttled'); assert limiter.filter(survivor)
+    assert survivor.getMessage() == "tick [+47 suppressed]"
+
+
+def test_queue_pipeline_writes_json_lines_off_thread(tmp_path):
+    root = logging.getLogger(); saved_handlers, saved_level = list(root.handlers), root.level
+    try:
+        setup_logging(tmp_path, log_file_name="scribe.log", policy={'console': False, 'json': True, 'rate_limits': {'Chatty': {'sample_every': 4}}})
+        for i in range(8): logging.getLogger("Chatty").info(f"tick {i}")
+        logging.getLogger("Chatty").error("breach")
+        shutdown_logging()
+        entries = [json.loads(line) for line in (tmp_path / "scribe.log").read_text(encoding='utf-8').splitlines()]
+        assert [e['message'] for e in entries if e['logger'] == 'Chatty'] == ["tick 0", "tick 4 [+3 suppressed]", "breach"]
+        assert entries[-1]['level'] == 'ERROR'
+    finally:
+        shutdown_logging(); root.handlers[:] = saved_handlers; root.setLevel(saved_level)
+
+
+def test_a_traceback_survives_the_queue_in_both_formats(tmp_path):
+    root = logging.getLogger(); saved_handlers, saved_level = list(root.handlers), root.level
+    try:
+        for name, json_lines in (("scribe.jsonl", True), ("scribe.log", False)):
+            setup_logging(tmp_path, log_file_name=name, policy={'console': False, 'json': json_lines})
+            try: {}['missing']
+            except KeyError: logging.getLogger("Breach").error("lookup failed for %s", 'missing', exc_info=True)
+            shutdown_logging()
+        entry = json.loads((tmp_path / "scribe.jsonl").read_text(encoding='utf-8').splitlines()[-1])
+        assert entry['message'] == "lookup failed for missing" and entry['exception'].startswith("Traceback") and "KeyError: 'missing'" in entry['exception']
+        text = (tmp_path / "scribe.log").read_text(encoding='utf-8')
+        assert "lookup failed for missing\nTraceback" in text and text.count("KeyError: 'missing'") == 1
+    finally:
+        shutdown_logging(); root.handlers[:] = saved_handlers; root.setLevel(saved_level)
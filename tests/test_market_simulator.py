@@ -0,0 +1,70 @@
+# F:\ShadowVanguard_Legion_Godspeed\tests\test_market_simulator.py
+# Version 1.0 - The Microstructure Forge's Trial
+
+import numpy as np
+import pytest
+
+from core.data_models import OrderBlock, FairValueGap, MarketDataFrame
+from core.market_simulator import MicrostructureSimulator, SizeModel, TapeArrays
+from intelligence.power_scanner import PowerScanner
+
+CANDLE = np.array([100.0, 102.0, 99.0, 101.0, 7_500.0])  # open, high, low, close, volume
+
+
+class UnitSizes(SizeModel):
+    def draw(self, rng, n, low, high): return np.ones(n)
+
+
+@pytest.fixture
+def strategic_map():
+    return {
+        'order_blocks': {'4h': [OrderBlock('ob1', 'BULLISH_OB', 95.0, 96.0, '4h', 1), OrderBlock('ob2', 'BEARISH_OB', 104.0, 105.0, '4h', 2)],
+                         '1h': [OrderBlock('ob3', 'BULLISH_OB', 101.5, 102.5, '1h', 3)]},  # Above price: no bid wall
+        'fvgs': {'1h': [FairValueGap('f1', 'BEARISH_FVG', 103.0, 104.5, '1h', 4), FairValueGap('f2', 'BEARISH_FVG', 103.5, 106.0, '1h', 5),
+                        FairValueGap('f3', 'BULLISH_FVG', 100.5, 101.5, '1h', 6)]}}
+
+
+def _legacy_shaping(simulator, book, strategic_map):
+    """The v9.3 per-zone loops (vacuum pass only), applied to an already forged ladder."""
+    close = CANDLE[3]; bids = [tuple(level) for level in book['bids']]
+    for fvg in strategic_map['fvgs']['1h']:
+        if 'BEARISH' in fvg.event_type and fvg.price_low > close:
+            bids = [(p, s * simulator.fvg_vacuum_factor) if fvg.price_low < p < fvg.price_high else (p, s) for p, s in bids]
+    return bids
+
+
+def test_same_seed_same_market_and_shaping_by_masks(strategic_map):
+    forge = lambda: MicrostructureSimulator({'fvg_vacuum_factor': 0.5}, seed=7)
+    a, b = forge(), forge()
+    zones = a.zones(strategic_map); assert a.zones(strategic_map) is zones  # Flattened once per map version
+    for _ in range(3):
+        book_a, book_b = a.order_book(CANDLE, zones), b.order_book(CANDLE, b.zones(strategic_map))
+        np.testing.assert_array_equal(book_a['bids'], book_b['bids']); np.testing.assert_array_equal(book_a['asks'], book_b['asks'])
+        tape_a, tape_b = a.tape(CANDLE, zones), b.tape(CANDLE, zones)
+        np.testing.assert_array_equal(tape_a.sizes, tape_b.sizes); np.testing.assert_array_equal(tape_a.is_buy, tape_b.is_buy)
+
+    shaped = MicrostructureSimulator({'fvg_vacuum_factor': 0.5, 'book_size_model': UnitSizes()}, seed=1)
+    book = shaped.order_book(CANDLE, shaped.zones(strategic_map))
+    # One bullish wall joins the bids (below price) and one bearish wall joins the asks (above price).
+    assert len(book['bids']) == len(book['asks']) == 51
+    assert np.all(np.diff(book['bids'][:, 0]) <= 0) and np.all(np.diff(book['asks'][:, 0]) >= 0)
+    # Void vacuums keep the v9.3 geometry: a level is thinned once per void on its side of the book that contains it.
+    np.testing.assert_allclose(book['bids'], np.array(_legacy_shaping(shaped, book, strategic_map)))
+    prices = np.linspace(100.0, 107.0, 71)
+    legacy_counts = [sum(low < p < high for low, high in ((103.0, 104.5), (103.5, 106.0))) for p in prices]
+    np.testing.assert_array_equal(shaped._inside_count(prices, np.array([103.0, 103.5]), np.array([104.5, 106.0])), legacy_counts)
+    assert shaped.buy_probability(CANDLE, shaped.zones(strategic_map)) == pytest.approx(0.60 + 0.20 + 0.20 - 0.20 + 0.15)
+
+
+def test_power_scanner_reads_arrays_like_lists():
+    scanner = PowerScanner({'power_scanner': {'order_book_depth': 10}})
+    rng = np.random.default_rng(3)
+    levels = np.column_stack((np.linspace(100, 90, 30), rng.uniform(0.1, 2.0, 30)))
+    legacy = sum(size * 0.85 ** i for i, (_, size) in enumerate(levels.tolist()[:10]))
+    assert scanner._calculate_weighted_volume(levels) == pytest.approx(legacy)
+    assert scanner._calculate_weighted_volume(levels.tolist()) == pytest.approx(legacy)
+
+    tape = TapeArrays(prices=np.array([1.0, 2.0, 3.0]), sizes=np.array([0.5, 1.5, 2.0]), is_buy=np.array([True, False, True]))
+    from_arrays = scanner._analyze_tape_action(MarketDataFrame(timestamp=None, symbol="T", tape_snapshot=tape))
+    from_dicts = scanner._analyze_tape_action(MarketDataFrame(timestamp=None, symbol="T", tape_snapshot=tape.to_trades()))
+    assert from_arrays == from_dicts == (2.5, 1.5)
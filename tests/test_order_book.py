@@ -0,0 +1,75 @@
+# F:\ShadowVanguard_Legion_Godspeed\tests\test_order_book.py
+# Version 1.1 - The Quartermaster's Ledger Audit
+
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from core.data_models import PositionV2
+from core.market_enums import PositionSide, TacticalDecision
+from execution_engine.order_book import PositionBook
+from execution_engine.order_executor import SimulatedOrderExecutor
+from risk_manager.capital_allocator import CapitalAllocator
+
+
+def _scan(pending, high, low, symbol):
+    # The Lookout's original protocol: every pending order, in placement order.
+    fired = [o for o in pending.values() if (symbol is None or o['symbol'] == symbol) and
+             ((o['side'] == 'LONG' and high >= o['trigger_price']) or (o['side'] == 'SHORT' and low <= o['trigger_price']))]
+    for order in fired: del pending[order['order_id']]
+    return [order['order_id'] for order in fired]
+
+
+def test_the_stop_book_springs_the_traps_a_scan_would():
+    rng = random.Random(3); executor = SimulatedOrderExecutor(); reference = {}
+    for _ in range(4000):
+        action = rng.random()
+        if action < 0.5:
+            side = rng.choice([PositionSide.LONG, PositionSide.SHORT]); symbol = rng.choice(['BTC', 'ETH'])
+            order = executor.place_order(symbol, side, 1.0, 'STOP_MARKET', trigger_price=round(rng.uniform(90, 110), 1), parent_position_id='p')
+            reference[order['order_id']] = dict(order)
+        elif action < 0.75 and reference:
+            order_id = rng.choice(list(reference)); assert executor.cancel_order(order_id); del reference[order_id]
+        else:
+            mid = rng.uniform(90, 110); high, low = mid + rng.uniform(0, 3), mid - rng.uniform(0, 3); symbol = rng.choice(['BTC', 'ETH', None])
+            fired = executor.check_triggered_stops(current_high=high, current_low=low, symbol=symbol)
+            assert [receipt['original_trap_id'] for receipt in fired] == _scan(reference, high, low, symbol)
+        assert list(executor.pending_orders) == list(reference)
+
+
+def _position(position_id, symbol):
+    return PositionV2(position_id=position_id, symbol=symbol, side=PositionSide.LONG, entry_price=100.0, size=1.0)
+
+
+def test_the_position_book_finds_the_oldest_open_position_of_a_symbol():
+    book = PositionBook()
+    for position_id, symbol in [('a', 'BTC'), ('b', 'ETH'), ('c', 'BTC')]: book[position_id] = _position(position_id, symbol)
+    assert book.first_for_symbol('BTC').position_id == 'a' and [p.position_id for p in book.for_symbol('BTC')] == ['a', 'c']
+    book.pop('a'); assert book.first_for_symbol('BTC').position_id == 'c' and 'a' not in book and len(book) == 2
+    book['c'] = _position('c', 'ETH'); assert book.first_for_symbol('BTC') is None and book.first_for_symbol('ETH').position_id == 'b'
+    assert list(book) == ['b', 'c'] and book.get('zz') is None
+
+
+def test_the_quartermaster_releases_a_position_through_its_own_tickets():
+    allocator = CapitalAllocator(10000.0, {'risk_per_trade_percent': 1.0, 'max_exposure_percent': 90.0})
+    signal = SimpleNamespace(details={}, suggestion=TacticalDecision.ADVANCE)
+    first, second, third = (allocator.request_allocation(signal, 95.0, 100.0) for _ in range(3))
+    allocator.confirm_and_link_ticket(first.ticket_id, _position('a', 'BTC')); allocator.confirm_and_link_ticket(second.ticket_id, _position('a', 'BTC'))
+    allocator.confirm_and_link_ticket(third.ticket_id, _position('b', 'BTC'))
+    allocator.release_partial_capital('a', 100.0, 0.0)
+    released = _position('a', 'BTC'); released.pnl_in_dollars = 5.0; allocator.release_capital(released)
+    assert list(allocator.active_tickets) == [third.ticket_id] and list(allocator.position_tickets) == ['b']
+    assert abs(allocator.total_allocated_cost - third.allocated_amount) < 1e-9 and allocator.current_capital == 10005.0
+
+
+def test_a_partial_fill_shrinks_its_ticket_to_what_filled():
+    allocator = CapitalAllocator(10000.0, {'risk_per_trade_percent': 1.0, 'max_exposure_percent': 90.0})
+    signal = SimpleNamespace(details={}, suggestion=TacticalDecision.ADVANCE)
+    ticket = allocator.request_allocation(signal, 95.0, 100.0, symbol='BTC'); reserved = ticket.allocated_amount
+    position = _position('a', 'BTC'); position.size = reserved / 100.0 * 0.4
+    allocator.confirm_and_link_ticket(ticket.ticket_id, position, filled_cost=position.size * position.entry_price)
+    assert ticket.allocated_amount == pytest.approx(0.4 * reserved) and allocator.total_allocated_cost == pytest.approx(0.4 * reserved)
+    assert allocator.symbol_allocated_cost['BTC'] == pytest.approx(0.4 * reserved) and ticket.original_allocated_amount == reserved
+    position.pnl_in_dollars = 0.0; allocator.release_capital(position)
+    assert allocator.total_allocated_cost == 0 and allocator.symbol_allocated_cost == {}
@@ -0,0 +1,44 @@
+# F:\ShadowVanguard_Legion_Godspeed\tests\test_research.py
+# Version 1.1 - The Proving Ground's Trial
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from analyst_ai.signal_matrix import build_signal_matrix, replay_signal_matrix
+from core.data_provider import DataProvider
+from main import ShadowVanguardOracle
+from research import ResearchRule, evaluate_positions, rule_positions, signal_score
+from utils.logger_config import shutdown_logging
+
+
+@pytest.fixture(autouse=True, scope="module")
+def _logging_stands_down():
+    yield
+    shutdown_logging()  # The boot logger's console handler must not outlive the runner's captured stdout
+
+
+def test_the_signal_matrix_matches_a_tick_by_tick_replay():
+    config = ShadowVanguardOracle.load_config(validate=False)
+    config['data_provider'].update({'source': 'csv', 'csv_files': config['data_provider']['csv_files'][:7],
+                                    'data_window_size': 450, 'campaign_start_date': '2025-06-01'})
+    config['analyst_ai']['order_block_analyzer']['sensitivity'] = 0.003  # Lets every analyst speak on a week of candles
+    history = DataProvider(config['data_provider'], strategic_memory=None).full_df_5m
+    matrix = build_signal_matrix(config, history)
+    replayed = replay_signal_matrix(config, history)
+    pd.testing.assert_frame_equal(matrix, replayed)
+    totals = matrix.sum()
+    assert all(totals[[c for c in matrix.columns if c.startswith(analyst + '_')]].sum() > 0 for analyst in ('ob', 'liq', 'fib', 'div'))
+    assert len(build_signal_matrix(config, history, max_ticks=100)) == 100
+
+
+def test_rules_are_marked_to_the_closes_by_the_vectorized_engine():
+    matrix = pd.DataFrame({'liq_5m_bull': [0, 1, 0, 0, 0, 0, 0], 'liq_5m_bear': [0, 0, 0, 0, 1, 0, 0], 'fib_15m_bull': [0, 0, 0, 0, 0, 0, 1]})
+    rule = ResearchRule('voids', {'liq': 1.0}, min_score=1.0, hold_bars=2)
+    positions = rule_positions(signal_score(matrix, rule.weights), rule)
+    assert positions.tolist() == [0, 1, 1, 0, -1, -1, 0]
+    closes = np.array([100.0, 100.0, 110.0, 121.0, 121.0, 108.9, 108.9])
+    result = evaluate_positions(rule, positions, closes)
+    assert result.closed_trades == 2 and result.win_rate == 100.0 and result.exposure_pct == 4 / 7 * 100
+    assert abs(result.total_pnl_pct - (1.21 * 1.1 - 1) * 100) < 1e-9 and result.max_drawdown_pct == 0.0
+    assert evaluate_positions(rule, positions, closes, fee_bps=10.0).total_pnl_pct < result.total_pnl_pct
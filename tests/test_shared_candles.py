@@ -0,0 +1,46 @@
+# F:\ShadowVanguard_Legion_Godspeed\tests\test_shared_candles.py
+# Version 1.0 - The Common Well's Trial
+
+import multiprocessing
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.data_provider import DataProvider
+from core.shared_candles import SharedCandles, attach_arrays, attach_frame
+
+
+def _history(rows: int = 600, tz=None) -> pd.DataFrame:
+    close = 100 + np.cumsum(np.random.default_rng(7).normal(0, 0.5, rows))
+    index = pd.date_range('2025-06-01', periods=rows, freq='5min', tz=tz)
+    return pd.DataFrame({'open': close - 0.1, 'high': close + 0.5, 'low': close - 0.5, 'close': close, 'volume': np.arange(rows, dtype=float)}, index=index)
+
+
+def _worker_view(handle):
+    frame = attach_frame(handle); values, _ = attach_arrays(handle)
+    return float(frame['close'].sum()), np.shares_memory(frame['close'].to_numpy(), values), frame['close'].to_numpy().flags.writeable
+
+
+def test_workers_attach_to_one_published_copy():
+    history = _history(tz='UTC')
+    with SharedCandles(history) as well:
+        assert len(pickle.dumps(well.handle)) < 1024
+        with pytest.raises(TypeError): pickle.dumps(well)  # Only the handle travels
+        with multiprocessing.get_context('fork').Pool(2) as pool: seen = pool.map(_worker_view, [well.handle] * 2)
+        assert seen == [(pytest.approx(history['close'].sum()), True, False)] * 2
+        frame = attach_frame(well.handle)
+        pd.testing.assert_frame_equal(frame, history, check_freq=False)
+        assert np.shares_memory(frame['open'].to_numpy(), attach_frame(well.handle)['open'].to_numpy())  # Two frames, one set of pages
+
+
+def test_the_data_provider_adopts_a_handle_as_its_history():
+    history = _history()
+    with SharedCandles(history) as well:
+        provider = DataProvider({'campaign_start_date': '2025-06-01', 'training_days': 1, 'data_window_size': 50}, strategic_memory=None, history=well.handle)
+        assert len(provider.full_df_5m) == len(history) and provider.live_phase_start_index == 288
+        assert np.shares_memory(provider.full_df_5m['close'].to_numpy(), attach_arrays(well.handle)[0])
+        assert provider.full_strategic_dfs['1h']['close'].equals(history['close'].resample('1h', label='right', closed='right').last().dropna())
+        restored = pickle.loads(pickle.dumps(provider))  # A checkpoint carries its own copy of the candles
+    assert restored.full_df_5m['close'].tolist() == history['close'].tolist()
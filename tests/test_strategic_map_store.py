@@ -0,0 +1,77 @@
+# F:\ShadowVanguard_Legion_Godspeed\tests\test_strategic_map_store.py
+# Version 1.1 - The Great Library's Audit
+
+import io
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from main import ShadowVanguardOracle
+from memory.strategic_map_store import MAP_COMPONENTS
+from utils.logger_config import shutdown_logging
+
+
+@pytest.fixture(autouse=True, scope="module")
+def _logging_stands_down():
+    yield
+    shutdown_logging()  # The boot logger's console handler must not outlive the runner's captured stdout
+
+
+def _history(n, seed=5):
+    rng = np.random.default_rng(seed)
+    close = 30000 + rng.normal(0, 40, n).cumsum(); high = close + rng.uniform(1, 30, n); low = close - rng.uniform(1, 30, n)
+    return pd.DataFrame({'open': np.r_[close[0], close[:-1]], 'high': high, 'low': low, 'close': close, 'volume': rng.uniform(500, 5000, n)},
+                        index=pd.date_range('2024-01-01', periods=n, freq='5min'))
+
+
+def _oracle(directory, history):
+    config = ShadowVanguardOracle.load_config()
+    config.update({'simulation_mode': 'backtest', 'auto_start': True, 'dashboard_enabled': False})
+    config['data_provider'].update({'data_window_size': 300, 'training_days': 1, 'campaign_start_date': '2024-01-01'})
+    config['memory']['strategic_map_store'] = {'enabled': True, 'directory': str(directory), 'keep': 4}
+    return ShadowVanguardOracle(config, history=history)
+
+
+def _dumps(component):
+    # Without the memo, equal states give equal bytes however their objects happen to be shared.
+    buffer = io.BytesIO(); pickler = pickle.Pickler(buffer, protocol=pickle.HIGHEST_PROTOCOL); pickler.fast = True
+    pickler.dump(component); return buffer.getvalue()
+
+
+def test_the_same_history_recalls_the_archive(tmp_path):
+    history = _history(700)
+    built = _oracle(tmp_path, history); built.phase_zero_historical_wisdom()
+    recalled = _oracle(tmp_path, history)
+    assert recalled.map_store.recall(recalled, recalled.data_provider.get_all_historical_data()) == 'exact'
+    assert recalled.data_provider.strategic_memory is recalled.strategic_memory  # Recalled into the live unit
+    for name in MAP_COMPONENTS:
+        assert _dumps(getattr(recalled, name)) == _dumps(getattr(built, name))
+
+
+def test_a_longer_history_extends_the_archive_into_the_same_map(tmp_path):
+    full = _history(1400)
+    _oracle(tmp_path, full.iloc[:1000]).phase_zero_historical_wisdom()
+    probe = _oracle(tmp_path, full)
+    assert probe.map_store.recall(probe, probe.data_provider.get_all_historical_data()) == 'extend'
+    extended = _oracle(tmp_path, full); extended.phase_zero_historical_wisdom()
+    built = _oracle(tmp_path / 'fresh', full); built.phase_zero_historical_wisdom()
+    assert sum(len(v) for v in built.strategic_memory.get_strategic_map()['fvgs'].values()) > 0
+    for name in MAP_COMPONENTS:
+        assert _dumps(getattr(extended, name)) == _dumps(getattr(built, name))
+    assert len(extended.map_store._entries()) == 2
+
+
+def test_price_queries_match_a_scan_of_the_map(tmp_path):
+    oracle = _oracle(tmp_path, _history(1400, seed=9)); oracle.phase_zero_historical_wisdom()
+    memory = oracle.strategic_memory; voids = memory.get_strategic_map()['fvgs']
+    assert sum(len(v) for v in voids.values()) > 0
+    for price in np.linspace(29500, 30500, 41):
+        scan = [v for tf in voids for v in voids[tf] if v.price_low <= price + 25 and v.price_high >= price - 25]
+        assert memory.voids_between(price - 25, price + 25) == scan
+        below = [v for tf in voids for v in voids[tf] if v.price_high < price]
+        assert memory.nearest_void(price, 'below') is max(below, key=lambda v: v.price_high, default=None)
+        above = [v for tf in voids for v in voids[tf] if v.price_low > price]
+        assert memory.nearest_void(price, 'above') is min(above, key=lambda v: v.price_low, default=None)
+    assert memory.order_blocks_between(0.0, 1e9, timeframes=['4h']) == memory.get_strategic_map()['order_blocks']['4h']
@@ -0,0 +1,88 @@
+# F:\ShadowVanguard_Legion_Godspeed\tests\test_stream_data_provider.py
+# Version 1.1 - The Stream Herald's Trial
+
+import json
+
+import pytest
+import numpy as np
+import pandas as pd
+
+from core.replay_exchange import ReplayExchange
+from core.stream_data_provider import StreamingDataProvider
+
+HISTORY, LIVE = 300, 120
+
+
+@pytest.fixture(scope="module")
+def candles():
+    rng = np.random.default_rng(21)
+    n = HISTORY + LIVE
+    close = 100 + np.cumsum(rng.normal(0, 0.5, n)); open_ = close + rng.normal(0, 0.2, n)
+    return pd.DataFrame({'open': open_, 'high': np.maximum(open_, close) + rng.uniform(0, 1, n), 'low': np.minimum(open_, close) - rng.uniform(0, 1, n),
+                         'close': close, 'volume': rng.uniform(10, 100, n)}, index=pd.date_range("2025-06-01", periods=n, freq="5min"))
+
+
+def test_replayed_stream_rebuilds_every_candle_book_and_tape(candles):
+    exchange = ReplayExchange(candles, port=0, history_size=HISTORY).start_in_background()
+    provider = StreamingDataProvider({'data_provider': {'timeframe_minutes': 5, 'data_window_size': 200}},
+                                     {'url': exchange.url, 'dialect': 'binance', 'skip_stale_candles': False, 'book_depth': 10, 'reconnect': False},
+                                     history_source=exchange)
+    try:
+        warmup = provider.fetch_next_market_data()
+        pd.testing.assert_frame_equal(warmup.ohlcv_multidim['5m'], candles.iloc[HISTORY - 200:HISTORY], check_freq=False)
+
+        ticks = 0; book = None
+        while provider.has_more_data():
+            mdf = provider.fetch_next_market_data()
+            if mdf is None: continue
+            # The window is a zero-copy view of the ring, so it is checked before the next tick moves it.
+            end = HISTORY + ticks + 1; ticks += 1; book = mdf.order_book_snapshot
+            pd.testing.assert_frame_equal(mdf.ohlcv_multidim['5m'], candles.iloc[end - 200:end], check_freq=False)
+            assert sum(t['size'] for t in mdf.tape_snapshot) == pytest.approx(candles['volume'].iloc[end - 1])
+        assert ticks == LIVE
+
+        assert len(book['bids']) == len(book['asks']) == 10
+        assert book['bids'][0][0] < candles['open'].iloc[-1] < book['asks'][0][0]
+        assert [p for p, _ in book['bids']] == sorted((p for p, _ in book['bids']), reverse=True)
+    finally:
+        provider.close(); exchange.shutdown()
+
+
+# Messages in the exchanges' documented wire formats (Binance USD-M combined streams, MEXC contract pushes).
+BINANCE_MESSAGES = [
+    '{"result":null,"id":1}',
+    '{"stream":"btcusdt@depth10@100ms","data":{"e":"depthUpdate","E":1717228799301,"T":1717228799297,"s":"BTCUSDT","U":4711915513,"u":4711915560,'
+    '"pu":4711915505,"b":[["67530.00","3.120"],["67529.90","0.004"]],"a":[["67530.10","1.911"],["67530.20","0.050"]]}}',
+    '{"stream":"btcusdt@aggTrade","data":{"e":"aggTrade","E":1717228799123,"a":2186740041,"s":"BTCUSDT","p":"67530.10","q":"0.015",'
+    '"f":5024374100,"l":5024374108,"T":1717228799120,"m":true}}',
+    '{"stream":"btcusdt@kline_5m","data":{"e":"kline","E":1717228790000,"s":"BTCUSDT","k":{"t":1717228500000,"T":1717228799999,"s":"BTCUSDT",'
+    '"i":"5m","f":5024371261,"L":5024374000,"o":"67512.40","c":"67529.00","h":"67544.00","l":"67498.20","v":"150.100","n":2800,"x":false,'
+    '"q":"10133470.71930","V":"80.018","Q":"5402123.33800","B":"0"}}}',
+    '{"stream":"btcusdt@kline_5m","data":{"e":"kline","E":1717228800012,"s":"BTCUSDT","k":{"t":1717228500000,"T":1717228799999,"s":"BTCUSDT",'
+    '"i":"5m","f":5024371261,"L":5024374108,"o":"67512.40","c":"67530.10","h":"67544.00","l":"67498.20","v":"152.337","n":2848,"x":true,'
+    '"q":"10284470.71930","V":"81.018","Q":"5470123.33800","B":"0"}}}',
+]
+MEXC_MESSAGES = [
+    '{"channel":"rs.sub.kline","data":"success","ts":1717228500120}',
+    '{"channel":"push.kline","data":{"a":10284470.7193,"c":67530.1,"h":67544.0,"interval":"Min5","l":67498.2,"o":67512.4,"q":152337,'
+    '"symbol":"BTC_USDT","t":1717228500},"symbol":"BTC_USDT","ts":1717228799950}',
+    '{"channel":"push.deal","data":{"M":1,"O":3,"T":2,"p":67530.1,"t":1717228799120,"v":15},"symbol":"BTC_USDT","ts":1717228799121}',
+    '{"channel":"push.depth.full","data":{"asks":[[67530.1,1911,3],[67530.2,50,1]],"bids":[[67530.0,3120,4],[67529.9,4,1]],'
+    '"version":16723871260},"symbol":"BTC_USDT","ts":1717228799301}',
+    '{"channel":"pong","data":1717228800001}',
+    '{"channel":"push.kline","data":{"a":33770.1,"c":67531.0,"h":67531.0,"interval":"Min5","l":67530.1,"o":67530.1,"q":500,'
+    '"symbol":"BTC_USDT","t":1717228800},"symbol":"BTC_USDT","ts":1717228800050}',
+]
+
+
+@pytest.mark.parametrize("dialect, messages, volume, seller", [('binance', BINANCE_MESSAGES, 152.337, 'sell'), ('mexc', MEXC_MESSAGES, 152337.0, 'sell')])
+def test_exchange_messages_close_one_bar_with_its_book_and_tape(dialect, messages, volume, seller):
+    provider = StreamingDataProvider({'target_symbol': 'BTC/USDT:USDT', 'data_provider': {'timeframe_minutes': 5, 'data_window_size': 50}},
+                                     {'dialect': dialect, 'book_depth': 10})
+    assert provider.stream_symbol == ('BTCUSDT' if dialect == 'binance' else 'BTC_USDT')
+    for message in messages: provider._dispatch(json.loads(message))
+    assert provider._events.qsize() == 1  # The bar in progress never reaches the Oracle; MEXC closes it when the next one opens
+    stamp, row, (book, tape) = provider._events.get_nowait()
+    assert pd.Timestamp(stamp) == pd.Timestamp('2024-06-01 07:55') and row.tolist() == [67512.4, 67544.0, 67498.2, 67530.1, volume]
+    assert book['bids'][0][0] == 67530.0 and book['asks'][0][0] == 67530.1 and len(book['bids']) == 2
+    assert tape == [{'side': seller, 'price': 67530.1, 'size': tape[0]['size'], 'timestamp': 1717228799120}]
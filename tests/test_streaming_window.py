@@ -0,0 +1,58 @@
+# F:\ShadowVanguard_Legion_Godspeed\tests\test_streaming_window.py
+# Version 1.2 - The Ring Warden's Oath
+
+import pytest
+import numpy as np
+import pandas as pd
+
+from core.streaming_window import StreamingWindowEngine, CandleRingBuffer
+
+# --- Test Fixtures: A synthetic 5m campaign ---
+
+@pytest.fixture(scope="module")
+def campaign():
+    rng = np.random.default_rng(7)
+    n = 3000
+    index = pd.date_range("2025-06-01", periods=n, freq="5min")
+    close = 100 + np.cumsum(rng.normal(0, 0.5, n))
+    df = pd.DataFrame({
+        "open": close + rng.normal(0, 0.1, n), "high": close + 1.0, "low": close - 1.0,
+        "close": close, "volume": rng.uniform(10, 100, n)}, index=index)
+    return df
+
+
+def test_ring_buffer_keeps_latest_rows_in_order():
+    ring = CandleRingBuffer(capacity=4, columns=["v"])
+    for i in range(10): ring.push(i, np.array([float(i)]))
+    stamps, values = ring.view()
+    assert stamps.tolist() == [6, 7, 8, 9]
+    assert values[:, 0].tolist() == [6.0, 7.0, 8.0, 9.0]
+    assert not values.flags.writeable
+
+
+def test_a_kept_frame_is_live_unless_copied():
+    ring = CandleRingBuffer(capacity=3, columns=["v"])
+    for i in range(3): ring.push(i, np.array([float(i)]))
+    live, kept = ring.as_frame(), ring.as_frame(copy=True)
+    ring.push(3, np.array([3.0]))
+    assert kept["v"].tolist() == [0.0, 1.0, 2.0] and kept.index.asi8.tolist() == [0, 1, 2]
+    assert live["v"].tolist() != [0.0, 1.0, 2.0]  # The view now reads slots the ring has moved past
+    assert kept["v"].to_numpy().flags.writeable and not np.shares_memory(kept["v"].to_numpy(), ring.values)
+
+
+@pytest.mark.parametrize("window_size", [50, 600])
+def test_sequential_ticks_match_legacy_slicing(campaign, window_size):
+    df = campaign
+    engine = StreamingWindowEngine(df, window_size, "5m")
+    for start in list(range(0, 400)) + [1200, 1201, 1202, 5]:
+        ts, frames = engine.window_at(start)
+        reference = df.iloc[start:start + window_size]  # The original per-tick slice, kept here as the reference truth
+        assert ts == reference.index[-1] and list(frames) == ["5m"]
+        pd.testing.assert_frame_equal(frames["5m"], reference, check_freq=False)
+
+
+def test_window_past_end_is_refused(campaign):
+    df = campaign
+    engine = StreamingWindowEngine(df, 600, "5m")
+    assert engine.window_at(len(df) - 600) is not None
+    assert engine.window_at(len(df) - 599) is None
@@ -0,0 +1,36 @@
+# F:\ShadowVanguard_Legion_Godspeed\tests\test_sweep.py
+# Version 1.0 - The War Games Council's Rules of Engagement
+
+from sweep import build_sweep_plan, freeze_run_config, rank_results, SweepResult
+
+
+def test_grid_plan_is_cartesian_and_rejects_foreign_sections():
+    space = {
+        'tactical_controller.scoring_weights.bos_bullish': [1.0, 1.5],
+        'capital_allocator.risk_per_trade_percent': [1.5, 2.5, 3.5],
+        'data_provider.data_window_size': [100, 200],  # not sweepable
+    }
+    plan = build_sweep_plan(space, mode='grid')
+    assert len(plan) == 6
+    assert all('data_provider.data_window_size' not in point for point in plan)
+
+
+def test_random_plan_is_seeded_and_respects_ranges():
+    space = {'risk_manager.perimeter_architect.atr_multiplier': {'min': 1.5, 'max': 3.0},
+             'tactical_controller.management_rules.regime_confirmation_ticks': {'min': 1, 'max': 5}}
+    plan = build_sweep_plan(space, mode='random', samples=8, seed=3)
+    assert plan == build_sweep_plan(space, mode='random', samples=8, seed=3)
+    assert all(1.5 <= p['risk_manager.perimeter_architect.atr_multiplier'] <= 3.0 for p in plan)
+    assert all(isinstance(p['tactical_controller.management_rules.regime_confirmation_ticks'], int) for p in plan)
+
+
+def test_frozen_run_config_applies_overrides_without_touching_the_base():
+    base = {'simulation_mode': 'paper', 'capital_allocator': {'risk_per_trade_percent': 2.5}}
+    frozen = freeze_run_config(base, {'capital_allocator.risk_per_trade_percent': 1.0})
+    assert frozen['capital_allocator']['risk_per_trade_percent'] == 1.0 and frozen['simulation_mode'] == 'backtest'
+    assert base['capital_allocator']['risk_per_trade_percent'] == 2.5
+
+
+def test_ranking_puts_failed_runs_last():
+    results = [SweepResult('a', {}, total_pnl_pct=1.0), SweepResult('b', {}, error='boom'), SweepResult('c', {}, total_pnl_pct=4.0)]
+    assert [r.run_id for r in rank_results(results)] == ['c', 'a', 'b']
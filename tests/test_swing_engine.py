@@ -0,0 +1,43 @@
+# F:\ShadowVanguard_Legion_Godspeed\tests\test_swing_engine.py
+# Version 1.0 - The Pivot Sentinel's Watch
+
+import numpy as np
+import pandas as pd
+from scipy.signal import argrelextrema
+
+from core.swing_engine import SwingEngine, find_swing_points
+
+
+def _interior_extrema(values, comparator, order, start=0):
+    """The legacy argrelextrema scan, restricted to points with `order` closed bars on both sides."""
+    return [i - start for i in argrelextrema(values, comparator, order=order)[0] if max(order, start) <= i < len(values) - order]
+
+
+def test_one_shot_pivots_match_argrelextrema_including_ties():
+    rng = np.random.default_rng(5)
+    for order in (1, 3, 7, 15):
+        close = 100 + rng.normal(0, 1, 500).cumsum()
+        high = np.round(close + rng.uniform(0, 1, 500), 1); low = np.round(close - rng.uniform(0, 1, 500), 1)  # Rounding forces ties
+        highs, lows = find_swing_points(high, low, order)
+        assert highs == _interior_extrema(high, np.greater_equal, order) and lows == _interior_extrema(low, np.less_equal, order)
+
+
+def test_streaming_ledger_serves_every_order_from_one_pivot_set():
+    rng = np.random.default_rng(8); n = 1200
+    close = 100 + rng.normal(0, 1, n).cumsum(); high = close + rng.uniform(0, 1, n); low = close - rng.uniform(0, 1, n)
+    candles = pd.DataFrame({'open': close, 'high': high, 'low': low, 'close': close, 'volume': 1.0}, index=pd.date_range('2024-01-01', periods=n, freq='5min'))
+    engine = SwingEngine(base_timeframe='5m')
+    for start in range(0, 600, 4):
+        window = candles.iloc[start:start + 500]; end = start + 500
+        for order in (5, 10, 15):
+            highs, lows = engine.swing_positions('5m', window, order)
+            assert list(highs) == _interior_extrema(high[:end], np.greater_equal, order, start)
+            assert list(lows) == _interior_extrema(low[:end], np.less_equal, order, start)
+    assert list(engine.ledgers) == ['5m']
+    strengths = [engine.ledgers['5m'].highs.strength(p) for p in engine.pivots('5m', window, 10, 'high')]
+    assert strengths and min(strengths) >= 10
+
+    # On a higher timeframe the tail bar is still forming and never confirms anything.
+    forming = candles.iloc[:300].copy(); forming.iloc[-1, forming.columns.get_loc('high')] = 1e6
+    highs, _ = engine.swing_positions('1h', forming, 5)
+    assert list(highs) == _interior_extrema(high[:299], np.greater_equal, 5)
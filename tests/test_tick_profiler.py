@@ -0,0 +1,42 @@
+# F:\ShadowVanguard_Legion_Godspeed\tests\test_tick_profiler.py
+# Version 1.0 - The Chronometer's Calibration
+
+import json
+import pytest
+import numpy as np
+
+from utils.tick_profiler import LatencyHistogram, TickProfiler
+
+
+def test_histogram_percentiles_track_exact_quantiles():
+    samples = np.random.default_rng(9).lognormal(mean=13, sigma=1.2, size=50_000).astype(np.int64)  # ~0.4ms median
+    histogram = LatencyHistogram()
+    for value in samples.tolist(): histogram.record(value)
+    sorted_samples = np.sort(samples)
+    for pct in (50, 95, 99, 99.9):
+        exact = sorted_samples[int(np.ceil(pct / 100 * len(samples))) - 1]
+        assert exact <= histogram.percentile(pct) <= exact * 1.016
+    assert histogram.percentile(100) == histogram.max_ns == samples.max()
+    assert histogram.mean() == pytest.approx(samples.mean())
+
+
+def test_bucket_ceilings_bound_every_value():
+    for value in [0, 1, 127, 128, 129, 255, 256, 1_000, 65_537, 10**9, 2**40 + 12345]:
+        index = LatencyHistogram.bucket_index(value)
+        assert value <= LatencyHistogram.bucket_ceiling(index)
+        assert index == 0 or LatencyHistogram.bucket_ceiling(index - 1) < value
+
+
+def test_profiler_laps_and_report(tmp_path):
+    disabled = TickProfiler(); disabled.begin_tick(); disabled.lap('fetch'); disabled.end_tick()
+    assert disabled.histograms == {} and disabled.export(tmp_path / "none.json") is None
+
+    profiler = TickProfiler({'enabled': True})
+    for _ in range(20):
+        profiler.begin_tick()
+        profiler.lap('fetch'); hoard = [object() for _ in range(500)]; profiler.lap('analyze'); profiler.end_tick()
+    summary = {row['stage']: row for row in profiler.summary()}
+    assert list(summary) == ['fetch', 'analyze', 'tick_total'] and summary['analyze']['count'] == 20
+    assert summary['analyze']['net_blocks_per_call'] > 0 and summary['analyze']['p99_ms'] >= summary['analyze']['p50_ms']
+    report = json.loads(profiler.export(tmp_path / "profile.json").read_text())
+    assert [row['stage'] for row in report['stages']] == ['fetch', 'analyze', 'tick_total']
@@ -0,0 +1,58 @@
+# F:\ShadowVanguard_Legion_Godspeed\tests\test_time_synthesis.py
+# Version 1.1 - The Clockwork's Oath
+
+import pytest
+import numpy as np
+import pandas as pd
+
+from core.data_models import MarketDataFrame
+from core.data_provider import DataProvider, MultiTimeframeAggregator
+from analyst_ai.multi_timeframe_synthesizer import MultiTimeframeSynthesizer
+
+RULES = {'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last', 'volume': 'sum'}
+TIMEFRAMES = ['15m', '1h', '4h']
+
+
+@pytest.fixture(scope="module")
+def base_df():
+    rng = np.random.default_rng(11)
+    n = 2000
+    close = 100 + np.cumsum(rng.normal(0, 0.5, n))
+    return pd.DataFrame({
+        'open': close + rng.normal(0, 0.1, n), 'high': close + rng.uniform(0, 1, n), 'low': close - rng.uniform(0, 1, n),
+        'close': close, 'volume': rng.uniform(10, 100, n)}, index=pd.date_range("2025-06-01 00:35", periods=n, freq="5min"))
+
+
+def _resampled(window, tf):
+    return window.resample(tf.replace('m', 'min')).agg(RULES).dropna()
+
+
+def test_synthesizer_matches_full_resample_on_sliding_windows(base_df):
+    synthesizer = MultiTimeframeSynthesizer({'multi_timeframe_synthesizer': {'base_timeframe': '5m', 'target_timeframes': TIMEFRAMES}})
+    starts = list(range(0, 150)) + [900, 901, 40]  # sequential ticks, a jump forward and a rewind
+    for start in starts:
+        window = base_df.iloc[start:start + 300]
+        mdf = synthesizer.synthesize(MarketDataFrame(timestamp=window.index[-1], symbol="TEST", ohlcv_multidim={'5m': window}))
+        for tf in TIMEFRAMES:
+            pd.testing.assert_frame_equal(mdf.ohlcv_multidim[tf], _resampled(window, tf), check_freq=False)
+
+
+def test_aggregator_closes_bars_incrementally(base_df):
+    aggregator = MultiTimeframeAggregator(5, ['1h'])
+    for _, candle in base_df.iloc[:30].iterrows(): aggregator.update_with_new_candle(candle)
+    expected = _resampled(base_df.iloc[:30], '1h')
+    pd.testing.assert_frame_equal(aggregator.timeframe_dfs['1h'], expected.iloc[:-1], check_freq=False)
+    assert aggregator.incomplete_candles['1h']['timestamp'] == expected.index[-1]
+    assert aggregator.incomplete_candles['1h']['volume'] == pytest.approx(expected['volume'].iloc[-1])
+
+
+def test_provider_folds_once_and_the_synthesizer_takes_its_bars(base_df):
+    provider = DataProvider({'campaign_start_date': '2025-06-01', 'data_window_size': 300, 'strategic_timeframes': TIMEFRAMES}, strategic_memory=None, history=base_df)
+    synthesizer = MultiTimeframeSynthesizer({'multi_timeframe_synthesizer': {'base_timeframe': '5m', 'target_timeframes': TIMEFRAMES}})
+    for _ in range(60):
+        mdf = provider.fetch_next_market_data(); folded = {tf: mdf.ohlcv_multidim[tf] for tf in TIMEFRAMES}
+        synthesizer.synthesize(mdf)
+        for tf in TIMEFRAMES:
+            assert mdf.ohlcv_multidim[tf] is folded[tf]
+            pd.testing.assert_frame_equal(folded[tf], _resampled(mdf.ohlcv_multidim['5m'], tf), check_freq=False)
+    assert synthesizer.own_aggregator.last_stamp is None  # Nothing was folded a second time
@@ -0,0 +1,78 @@
+# F:\ShadowVanguard_Legion_Godspeed\tests\test_trade_journal.py
+# Version 1.1 - The Flight Recorder's Trial
+
+import pickle
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.data_models import PositionV2, TacticalSignal, PowerReport, EmotionReport, StructureReport
+from core.market_enums import PositionSide, TacticalDecision
+from execution_engine.order_executor import SimulatedOrderExecutor
+from execution_engine.position_manager import PositionManager
+from memory.experience_memory import ExperienceMemory
+from memory.trade_journal import JournalKind, PositionEvent, TradeJournal, read_journal
+from risk_manager.capital_allocator import CapitalAllocator
+
+
+def test_events_are_read_back_as_columns_across_blocks(tmp_path):
+    journal = TradeJournal({'enabled': True, 'file': 'run.svj', 'flush_every_records': 3}, tmp_path)
+    signal = TacticalSignal(source='Cowboy', confidence=0.8, suggestion=TacticalDecision.ADVANCE)
+    for minute in range(4):
+        journal.stamp(pd.Timestamp('2025-06-01') + pd.Timedelta(minutes=5 * minute))
+        journal.decision(TacticalDecision.WAIT, None, 'BTC', 100.0 + minute)
+    journal.signal(signal, 'ETH', 50.0); journal.decision(TacticalDecision.ADVANCE, signal, 'ETH', 50.0)
+    journal.fill({'status': 'FILLED', 'order_id': 'o-1', 'filled_price': 50.1, 'filled_size': 2.0, 'fee': 0.05}, 'ETH', PositionSide.LONG)
+    assert journal.written == 6 and len(journal.pending) == 1  # Two blocks on disk, one event still buffered
+    journal.close()
+    with open(tmp_path / 'run.svj', 'ab') as f: f.write(b'\x05\x00\x00\x00torn')  # A run that died mid-write
+
+    columns = read_journal(tmp_path / 'run.svj')
+    assert len(columns) == 7 and columns.column('tick').tolist() == [1, 2, 3, 4, 4, 4, 4]
+    assert columns.column('symbol').tolist() == ['BTC'] * 4 + ['ETH'] * 3 and columns.column('ref').tolist()[4:] == ['Cowboy', 'Cowboy', 'o-1']
+    fills = columns.of(JournalKind.FILL)
+    assert fills.column('price').tolist() == [50.1] and fills.column('value').tolist() == [0.05]
+    frame = columns.to_frame()
+    assert frame['label'].tolist()[3:6] == ['WAIT', 'ADVANCE', 'ADVANCE'] and frame['kind'].tolist()[4:] == ['SIGNAL', 'DECISION', 'FILL']
+    assert frame['time'].iloc[3] == pd.Timestamp('2025-06-01 00:15') and frame['side'].iloc[-1] == 'LONG'
+
+
+def test_a_fresh_run_starts_its_own_journal_and_a_resumed_one_appends(tmp_path):
+    for run in ('run0', 'run1'):
+        journal = TradeJournal({'enabled': True, 'file': 'run.svj'}, tmp_path); journal.stamp(pd.Timestamp('2025-06-01'))
+        journal.fill({'status': 'FILLED', 'order_id': run, 'filled_price': 1.0, 'filled_size': 1.0}, 'BTC', PositionSide.LONG); journal.flush()
+    resumed = pickle.loads(pickle.dumps(journal)); resumed.stamp(pd.Timestamp('2025-06-01 00:05'))
+    resumed.fill({'status': 'FILLED', 'order_id': 'run1-resumed', 'filled_price': 1.0, 'filled_size': 1.0}, 'BTC', PositionSide.LONG); resumed.close()
+    columns = read_journal(tmp_path / 'run.svj')
+    assert columns.column('ref').tolist() == ['run1', 'run1-resumed'] and columns.column('tick').tolist() == [1, 2]
+
+
+def test_a_journal_of_another_schema_is_refused(tmp_path):
+    (tmp_path / 'old.svj').write_bytes(b'SVJ\x01\x07\x00\x02\x00\x00\x00{}')
+    with pytest.raises(ValueError): read_journal(tmp_path / 'old.svj')
+
+
+def test_the_scribe_journals_its_fills_and_position_events(tmp_path):
+    journal = TradeJournal({'enabled': True, 'file': 'scribe.svj'}, tmp_path)
+    allocator = CapitalAllocator(10000.0, {'risk_per_trade_percent': 1.0, 'max_exposure_percent': 90.0}); closed = []
+    scribe = PositionManager(SimulatedOrderExecutor(), allocator, None, ExperienceMemory(), {}, on_position_closed_callback=closed.append, journal=journal)
+    position = PositionV2(position_id='p-1', symbol='BTC', side=PositionSide.LONG, entry_price=100.0, size=2.0)
+    ticket = allocator.request_allocation(SimpleNamespace(details={}, suggestion=TacticalDecision.ADVANCE), 95.0, 100.0, symbol='BTC')
+    allocator.confirm_and_link_ticket(ticket.ticket_id, position); scribe.active_positions['p-1'] = position
+    candles = pd.DataFrame({'open': [100.0], 'high': [111.0], 'low': [99.0], 'close': [110.0], 'volume': [1.0]})
+    mdf = SimpleNamespace(ohlcv_multidim={'5m': candles}, power_report=PowerReport(), emotion_report=EmotionReport(), structure_report=StructureReport())
+    journal.stamp(pd.Timestamp('2025-06-01'))
+    scribe._execute_partial_exit(position, TacticalSignal('Knight', 1.0, TacticalDecision.PARTIAL_EXIT, {'exit_ratio': 0.5}), mdf)
+    scribe._execute_full_close(position, mdf)
+    assert closed[0] is not position and closed[0].status == 'CLOSED' and scribe.memory.memory[-1].state['power_report'] is mdf.power_report
+    experience = scribe.memory.memory[-1]
+    assert experience.position_details is closed[0] and experience.details()['position_id'] == 'p-1'  # Serialized only when read
+    journal.close()
+
+    frame = read_journal(tmp_path / 'scribe.svj').to_frame()
+    assert frame['kind'].tolist() == ['FILL', 'POSITION', 'FILL', 'POSITION'] and frame['side'].tolist() == ['SHORT', 'LONG', 'SHORT', 'LONG']
+    events = frame[frame['kind'] == 'POSITION']
+    assert events['label'].tolist() == [PositionEvent.PARTIAL_EXIT.name, PositionEvent.CLOSED.name] and events['size'].tolist() == [1.0, 1.0]
+    assert np.allclose(events['extra'], [10.0, 10.0]) and events['value'].iloc[-1] == pytest.approx(10.0)  # $10 on each half, +10% on the close
@@ -0,0 +1,72 @@
+# F:\ShadowVanguard_Legion_Godspeed\tests\test_validators.py
+# Version 1.2 - The Constitution Warden's Trial
+
+import copy
+import json
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+import yaml
+
+from main import ShadowVanguardOracle
+from utils.logger_config import shutdown_logging
+from utils.validators import FrozenConfig, freeze, validate_config
+
+
+@pytest.fixture(autouse=True, scope="module")
+def _logging_stands_down():
+    yield
+    shutdown_logging()  # The boot logger's console handler must not outlive the runner's captured stdout
+
+
+def test_a_frozen_doctrine_cannot_be_changed_and_reads_like_the_original():
+    raw = ShadowVanguardOracle.load_config(); frozen = freeze(raw)
+    assert frozen == freeze(copy.deepcopy(raw)) and json.dumps(frozen, sort_keys=True) == json.dumps(raw, sort_keys=True)
+    assert frozen.data_provider.timeframe_minutes == raw['data_provider']['timeframe_minutes']
+    assert isinstance(frozen.data_provider.strategic_timeframes, tuple)
+    for mutate in (lambda: frozen.__setitem__('initial_capital', 1.0), lambda: frozen['memory'].update({}),
+                   lambda: frozen.data_provider.setdefault('source', 'csv'), lambda: setattr(frozen, 'auto_start', False)):
+        with pytest.raises(TypeError): mutate()
+    with pytest.raises(AttributeError): frozen.no_such_section
+    assert copy.deepcopy(frozen) is frozen
+    restored = pickle.loads(pickle.dumps(frozen)); assert restored == frozen and isinstance(restored.memory, FrozenConfig)
+    thawed = frozen.thaw(); thawed['memory']['max_size'] = 1; assert thawed['data_provider']['strategic_timeframes'] == list(raw['data_provider']['strategic_timeframes'])
+
+
+def test_the_shipped_settings_conform_and_typos_are_caught():
+    assert validate_config(ShadowVanguardOracle.load_config()) == []
+    issues = validate_config({'initial_capital': 'lots', 'analyst_ai': {'order_block_analyzer': {'sensitivty': 0.3}}})
+    assert [(str(i), i.fatal) for i in issues] == [
+        ("initial_capital: expected a number, got str 'lots'", True),
+        ("analyst_ai.order_block_analyzer.sensitivty: unknown key (did you mean 'sensitivity'?)", False)]
+
+
+def test_a_fatal_issue_refuses_the_start_and_a_typo_does_not(tmp_path):
+    path = tmp_path / 'settings.yaml'
+    path.write_text(yaml.safe_dump({'initial_capital': 5000.0, 'analyst_ai': {'order_block_analyzer': {'sensitivty': 0.3}}}), encoding='utf-8')
+    assert ShadowVanguardOracle.load_config(str(path))['initial_capital'] == 5000.0
+    path.write_text(yaml.safe_dump({'initial_capital': 'lots'}), encoding='utf-8')
+    with pytest.raises(ValueError, match='1 fatal issue'): ShadowVanguardOracle.load_config(str(path))
+    assert ShadowVanguardOracle.load_config(str(path), validate=False)['initial_capital'] == 'lots'
+
+
+def test_a_reloaded_doctrine_rearms_the_controller(tmp_path):
+    settings = ShadowVanguardOracle.load_config(validate=False); settings.update({'simulation_mode': 'backtest'})
+    settings['data_provider'].update({'data_window_size': 300, 'training_days': 1, 'campaign_start_date': '2024-01-01'})
+    path = tmp_path / 'settings.yaml'; path.write_text(yaml.safe_dump(settings), encoding='utf-8')
+    history = pd.DataFrame({column: np.full(700, 30000.0) for column in ('open', 'high', 'low', 'close', 'volume')},
+                           index=pd.date_range('2024-01-01', periods=700, freq='5min'))
+    oracle = ShadowVanguardOracle(ShadowVanguardOracle.load_config(str(path)), history=history, config_path=str(path))
+    commander = oracle.supreme_commander; before = commander.doctrine
+    assert not oracle.reload_doctrine()  # Nothing changed
+
+    settings['tactical_controller']['scoring_weights']['bos_bullish'] = 9.0; settings['initial_capital'] = 1.0
+    path.write_text(yaml.safe_dump(settings), encoding='utf-8')
+    assert oracle.reload_doctrine()
+    assert commander.scoring_weights['bos_bullish'] == 9.0 and before.scoring_weights['bos_bullish'] == 1.5
+    assert oracle.config['initial_capital'] != 1.0  # Outside the tactical doctrine: only on the next start
+
+    settings['tactical_controller']['aov_proximity_percent'] = 'near'; path.write_text(yaml.safe_dump(settings), encoding='utf-8')
+    assert not oracle.reload_doctrine() and commander.controller_config['aov_proximity_percent'] == 1.2
@@ -0,0 +1,40 @@
+# F:\ShadowVanguard_Legion_Godspeed\tests\test_war_room.py
+# Version 1.0 - The War Room Relay's Trial
+
+import io
+import json
+
+from rich.console import Console
+
+from dashboard.cli_interface import DashboardSnapshot
+from dashboard.war_room import LiveScreen, WarRoom
+
+
+def _snapshot(tick, capital=10000.0, decision=('WAIT', None, None)):
+    return DashboardSnapshot(tick=tick, panels={
+        'header': (capital, None), 'market': ('BTC/USDT:USDT', 30000.0, 'LONG', 'TRENDING', 0.8),
+        'power': (1.5, 0.2, -0.1, 'NONE'), 'intel': ('NEUTRAL', 0, 1, 0, 0),
+        'positions': (('sim-0001', 'LONG', 0.1, 29950.0, 0.17, 29000.0, True),), 'decision': decision,
+        'strategic_map': (12, 7), 'profile': None})
+
+
+def test_only_the_panels_that_changed_are_repainted():
+    console = Console(file=io.StringIO(), force_terminal=True, width=140)
+    with LiveScreen(console) as screen:
+        screen.draw(_snapshot(1)); assert screen.repaints == 8
+        screen.draw(_snapshot(2)); assert screen.repaints == 8
+        screen.draw(_snapshot(3, decision=('ADVANCE', 0.9, 'UnifiedEntry'))); assert screen.repaints == 9
+    assert 'ADVANCE' in console.file.getvalue() and 'Alexandria Library' in console.file.getvalue()
+
+
+def test_headless_frames_are_paced_and_the_last_tick_is_always_written(tmp_path):
+    room = WarRoom({'mode': 'headless', 'frame_rate': 0.5, 'snapshot_file': 'frames.jsonl'}, tmp_path).start()
+    captured = []
+    def capture(tick):
+        def _capture(): captured.append(tick); return _snapshot(tick, capital=10000.0 + tick)
+        return _capture
+    for tick in range(1, 201): room.publish(capture(tick))
+    room.close()
+    assert captured == [1, 200]  # One frame was due while the loop ran; the last tick is drawn on close
+    frames = [json.loads(line) for line in (tmp_path / 'frames.jsonl').read_text(encoding='utf-8').splitlines()]
+    assert frames[-1]['tick'] == 200 and frames[-1]['panels']['header'][0] == 10200.0 and len(frames) <= 2
@@ -0,0 +1,40 @@
+# F:\ShadowVanguard_Legion_Godspeed\tests\test_zone_index.py
+# Version 1.0 - The Zone Cartographer's Audit
+
+import numpy as np
+
+from core.data_models import OrderBlock
+from core.zone_index import ZoneIndex, side_index
+
+
+def _zones(rng, n, start=0):
+    lows = np.round(rng.uniform(90, 110, n), 0)  # Whole prices force ties
+    return [OrderBlock(f"ob{start + i}", 'BULLISH_OB', float(low), float(low + rng.integers(0, 4)), '5m', start + i) for i, low in enumerate(lows)]
+
+
+def test_queries_match_a_linear_scan_including_ties():
+    rng = np.random.default_rng(3); live = _zones(rng, 300); index = ZoneIndex(live)
+    for step in range(200):
+        price = float(np.round(rng.uniform(88, 116), 0 if step % 2 else 2))
+        assert index.highs_at_or_above(price) == [z for z in live if z.price_high >= price]
+        assert index.lows_at_or_below(price) == [z for z in live if z.price_low <= price]
+        assert index.containing(price) == [z for z in live if z.price_low <= price <= z.price_high]
+        assert index.overlapping(price - 2, price + 1) == [z for z in live if z.price_low <= price + 1 and z.price_high >= price - 2]
+        below = [z for z in live if z.price_high < price]; above = [z for z in live if z.price_low > price]
+        assert index.nearest_below(price) is (min(below, key=lambda z: price - z.price_high) if below else None)
+        assert index.nearest_above(price) is (min(above, key=lambda z: z.price_low - price) if above else None)
+        assert index.nearest_to(price, 'high') is min(live, key=lambda z: abs(z.price_high - price))
+        assert index.nearest_to(price, 'low') is min(live, key=lambda z: abs(z.price_low - price))
+        if step % 3 == 0:  # Churn: mitigate from both sides, then new zones arrive
+            assert index.evict_lows_above(price + 8) == [z for z in live if z.price_low > price + 8]
+            assert index.evict_highs_below(price - 8) == [z for z in live if z.price_high < price - 8]
+            live = [z for z in live if price - 8 <= z.price_high and z.price_low <= price + 8]
+            fresh = _zones(rng, 5, start=1000 + step * 5); live += fresh
+            for zone in fresh: index.add(zone)
+        assert len(index) == len(live) and index.zones() == live
+
+
+def test_reports_without_an_index_fall_back_to_their_lists():
+    zones = {'1h': {'bullish': [OrderBlock('a', 'BULLISH_OB', 95.0, 96.0, '1h', 0), OrderBlock('b', 'BULLISH_OB', 97.0, 98.0, '1h', 1)]}}
+    assert side_index({}, zones, '1h', 'bullish').nearest_below(100.0).block_id == 'b'
+    assert len(side_index({}, zones, '4h', 'bearish')) == 0
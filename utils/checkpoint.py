@@ -0,0 +1,121 @@
+# F:\ShadowVanguard_Legion_Godspeed\utils\checkpoint.py
+# Version 1.8 - Prometheus, The Chronicle Keeper
+
+import hashlib
+import json
+import logging
+import os
+import pickle
+import random
+import time
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger("Checkpoint")
+
+SNAPSHOT_VERSION = 5  # 2: the executor's StopBook, the PositionBook and the allocator's ticket index; 3: the analysts' SignalMemory; 4: the Scribe's Flight Recorder; 5: the Lifecycle Warden
+SNAPSHOT_GLOB = "snapshot_*.pkl"
+
+# Every stateful unit of a backtest. They are pickled together, so the references they hold to
+# each other (the Knight's position manager, the manager's allocator and executor...) survive as one graph.
+ENGINE_COMPONENTS = (
+    'data_provider', 'order_executor', 'strategic_memory', 'experience_memory', 'performance_auditor',
+    'capital_allocator', 'perimeter_architect', 'position_manager', 'time_oracle', 'structure_analyzer',
+    'power_scanner', 'emotion_engine', 'ob_analyzer', 'liq_analyzer', 'fib_sniper', 'interrogator',
+    'supreme_commander', 'profiler', 'lifecycle')
+# The journals that defer their writes, as (unit, attribute). A snapshot carries none of their queued
+# events, so they are flushed before it is written, or a resumed run's files would have a hole.
+DEFERRED_JOURNALS = (('position_manager', 'journal'), ('lifecycle', 'journal'))
+# Sections that change how a run is shown or saved, never what it decides.
+COSMETIC_SECTIONS = ('checkpoint', 'dashboard_enabled', 'dashboard', 'auto_start', 'profiler', 'logging', 'parameter_sweep', 'doctrine_reload', 'fleet', 'research', 'lifecycle', 'trade_journal')
+
+
+def config_fingerprint(config: Dict[str, Any]) -> str:
+    doctrine = {key: value for key, value in config.items() if key not in COSMETIC_SECTIONS}
+    return hashlib.sha256(json.dumps(doctrine, sort_keys=True, default=str).encode('utf-8')).hexdigest()[:16]
+
+
+class CheckpointManager:
+    """
+    THE CHRONICLE KEEPER: Periodically writes the whole backtest engine (every analyzer
+    registry, the allocator's tickets, open positions, the experience memory, the emotion
+    deque, the simulator's Generator and the process-wide `random`/`numpy` RNG states) to a
+    local snapshot, and brings a fresh engine back to the exact tick it was taken at, so an
+    interrupted campaign continues as if it had never stopped. (The Phase 0 strategic map
+    has its own library: `memory.strategic_map_store`.)
+    Snapshots are pickles: only resume from files this engine wrote.
+    """
+    def __init__(self, config: Dict[str, Any], full_config: Dict[str, Any], root: Path):
+        self.config = config or {}
+        self.enabled = self.config.get('enabled', False)
+        self.every_ticks = max(1, int(self.config.get('every_ticks', 5000)))
+        self.keep = max(1, int(self.config.get('keep', 3)))
+        self.resume = self.config.get('resume', True)
+        directory = Path(self.config.get('directory', 'checkpoints'))
+        self.directory = directory if directory.is_absolute() else Path(root) / directory
+        self.fingerprint = config_fingerprint(full_config)
+        self.ticks = 0
+        if self.enabled: logger.info(f"[Checkpoint] The Chronicle Keeper v1.8 will write a snapshot every {self.every_ticks} ticks to '{self.directory}'.")
+
+    # --- Files ---
+    def _write(self, path: Path, payload: Dict[str, Any]):
+        # Written beside the target and renamed over it, so a crash mid-write never leaves a torn snapshot.
+        self.directory.mkdir(parents=True, exist_ok=True)
+        partial = path.with_suffix('.partial')
+        with open(partial, 'wb') as f: pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(partial, path)
+
+    @staticmethod
+    def _read(path: Path) -> Optional[Dict[str, Any]]:
+        try:
+            with open(path, 'rb') as f: payload = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError) as e:
+            logger.error(f"[Checkpoint] Could not read '{path}': {e}"); return None
+        if payload.get('version') != SNAPSHOT_VERSION:
+            logger.warning(f"[Checkpoint] '{path}' was written by snapshot format {payload.get('version')}; ignored."); return None
+        return payload
+
+    def snapshots(self) -> List[Path]:
+        return sorted(self.directory.glob(SNAPSHOT_GLOB)) if self.directory.is_dir() else []
+
+    def latest(self) -> Optional[Path]:
+        snapshots = self.snapshots(); return snapshots[-1] if snapshots else None
+
+    # --- Engine snapshots ---
+    def tick_completed(self, engine: Any) -> Optional[Path]:
+        """Counts a finished tick and writes a snapshot on every `every_ticks`-th one."""
+        self.ticks += 1
+        if self.enabled and self.ticks % self.every_ticks == 0: return self.save(engine)
+        return None
+
+    def save(self, engine: Any) -> Optional[Path]:
+        started = time.perf_counter()
+        for unit, attribute in DEFERRED_JOURNALS:
+            journal = getattr(getattr(engine, unit, None), attribute, None)
+            if journal is not None: journal.flush()
+        payload = {'version': SNAPSHOT_VERSION, 'fingerprint': self.fingerprint, 'ticks': self.ticks, 'saved_at': time.time(),
+                   'components': {name: getattr(engine, name) for name in ENGINE_COMPONENTS if hasattr(engine, name)},
+                   'rng': {'random': random.getstate(), 'numpy': np.random.get_state()}}
+        path = self.directory / f"snapshot_{self.ticks:010d}.pkl"
+        try: self._write(path, payload)
+        except (OSError, pickle.PicklingError, TypeError, AttributeError) as e:
+            logger.error(f"[Checkpoint] Snapshot at tick {self.ticks} failed: {e}"); return None
+        for stale in self.snapshots()[:-self.keep]: stale.unlink(missing_ok=True)
+        logger.info(f"[Checkpoint] Snapshot of tick {self.ticks} written to '{path.name}' in {time.perf_counter() - started:.2f}s.")
+        return path
+
+    def restore(self, engine: Any, path: Optional[Path] = None) -> bool:
+        """Loads the latest (or the given) snapshot into `engine`. Returns False, leaving it untouched, when there is none to trust."""
+        path = path or self.latest()
+        if path is None: return False
+        payload = self._read(path)
+        if payload is None: return False
+        if payload.get('fingerprint') != self.fingerprint:
+            logger.warning(f"[Checkpoint] '{path.name}' was taken under a different doctrine; starting afresh."); return False
+        for name, component in payload['components'].items(): setattr(engine, name, component)
+        random.setstate(payload['rng']['random']); np.random.set_state(payload['rng']['numpy'])
+        self.ticks = payload['ticks']
+        logger.info(f"[Checkpoint] Campaign resumed from '{path.name}' at tick {self.ticks}.")
+        return True
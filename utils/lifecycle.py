@@ -0,0 +1,167 @@
+# F:\ShadowVanguard_Legion_Godspeed\utils\lifecycle.py
+# Version 1.1 - Prometheus, The Lifecycle Warden
+
+import json
+import logging
+import os
+import pickle
+import time
+from collections import deque
+from collections.abc import Mapping
+from dataclasses import dataclass, field, asdict, is_dataclass
+from datetime import datetime
+from enum import Enum
+from pathlib import Path
+from typing import Dict, Any, Callable, List, Optional, Tuple
+
+logger = logging.getLogger("LifecycleWarden")
+
+# The Oracle's long-lived containers, as (unit, attribute). A dict of per-timeframe lists counts their items.
+TRACKED_CONTAINERS = (
+    ('ob_analyzer', 'triggered_signals'), ('ob_analyzer', 'active_blocks_by_tf'),
+    ('liq_analyzer', 'triggered_signals'), ('liq_analyzer', 'active_fvgs_by_tf'), ('liq_analyzer', 'filled_fvgs_by_tf'),
+    ('fib_sniper', 'triggered_signals'), ('fib_sniper', 'active_zones'),
+    ('interrogator', 'triggered_signals'), ('interrogator', 'active_patterns'),
+    ('order_executor', 'pending_orders'), ('capital_allocator', 'active_tickets'), ('position_manager', 'active_positions'),
+    ('experience_memory', 'memory'), ('performance_auditor', 'trade_history'))
+# The units weighed (pickled) by `measure_components`; the provider's candle history is left out, it is fixed.
+MEASURED_COMPONENTS = (
+    'order_executor', 'strategic_memory', 'experience_memory', 'performance_auditor', 'capital_allocator', 'position_manager',
+    'time_oracle', 'structure_analyzer', 'power_scanner', 'emotion_engine', 'ob_analyzer', 'liq_analyzer', 'fib_sniper',
+    'interrogator', 'supreme_commander')
+
+
+def resident_memory_mb() -> float:
+    """The process's resident set size now; its peak where /proc is missing; 0 where neither can be read."""
+    try:
+        with open('/proc/self/statm', 'rb') as f: return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2**20
+    except (OSError, ValueError, IndexError, AttributeError): pass
+    try:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+    except ImportError: return 0.0
+
+
+def count_items(container: Any) -> int:
+    if isinstance(container, Mapping) and container and all(isinstance(v, (list, deque, dict, set, tuple)) for v in container.values()):
+        return sum(len(v) for v in container.values())
+    try: return len(container)
+    except TypeError: return 0
+
+
+def container_bound(container: Any) -> Optional[int]:
+    """The most items a container can hold by construction (a deque's maxlen, a capped SignalMemory), or None if unbounded."""
+    if isinstance(container, Mapping) and container and all(isinstance(v, (list, deque, dict, set, tuple)) for v in container.values()):
+        bounds = [container_bound(v) for v in container.values()]
+        return None if None in bounds else sum(bounds)
+    return getattr(container, 'maxlen', None) or getattr(container, 'max_entries', None) or None
+
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, Enum): return value.name
+    if isinstance(value, datetime): return value.isoformat()
+    if is_dataclass(value): return asdict(value)
+    return str(value)
+
+
+class ArchiveJournal:
+    """
+    An append-only JSON-lines file of closed objects. Archiving only queues the object; it is
+    serialized when `flush_every` have queued up or the session closes, and the file is opened
+    for each flush, so the journal is only a path and a queue: it travels through checkpoints
+    and process boundaries like any other value (without the queue).
+    """
+    def __init__(self, path: Path, flush_every: int = 32):
+        self.path = Path(path); self.flush_every = max(1, flush_every); self.records = 0
+        self.pending: List[Tuple[str, float, Any]] = []
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {**self.__dict__, 'pending': []}
+
+    def append(self, kind: str, obj: Any):
+        self.pending.append((kind, time.time(), obj))
+        if len(self.pending) >= self.flush_every: self.flush()
+
+    def flush(self):
+        if not self.pending: return
+        queued, self.pending = self.pending, []
+        try:
+            lines = [json.dumps({'kind': kind, 'archived_at': archived_at, **(asdict(obj) if is_dataclass(obj) else dict(obj))}, default=_plain)
+                     for kind, archived_at, obj in queued]
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, 'a', encoding='utf-8') as f: f.write("\n".join(lines) + "\n")
+            self.records += len(lines)
+        except (OSError, TypeError, ValueError) as e: logger.error(f"Could not archive {len(queued)} object(s) to '{self.path}': {e}")
+
+
+class ClosedPositionRelay:
+    """The Scribe's close callback: archives the closed position, then hands it on (to the Auditor)."""
+    def __init__(self, journal: Optional[ArchiveJournal], then: Optional[Callable[[Any], None]] = None):
+        self.journal = journal; self.then = then
+
+    def __call__(self, position: Any):
+        if self.journal is not None: self.journal.append('position', position)
+        if self.then is not None: self.then(position)
+
+
+@dataclass(slots=True)
+class MemorySample:
+    tick: int
+    rss_mb: float
+    containers: Dict[str, int] = field(default_factory=dict)  # 'unit.attribute' -> items held
+    bounds: Dict[str, int] = field(default_factory=dict)  # 'unit.attribute' -> most items it can hold, for the bounded ones
+    component_kb: Dict[str, float] = field(default_factory=dict)  # unit -> pickled size, when measured
+
+
+class LifecycleWarden:
+    """
+    THE LIFECYCLE WARDEN: Keeps a long session's memory in view. Closed positions leave the
+    engine for an append-only journal, and every `telemetry_every_ticks` ticks the Warden
+    samples the process RSS and the size of every long-lived container (optionally the
+    pickled weight of every unit too), so a session that drifts shows which unit is growing.
+    The retention itself belongs to the containers (the analysts' SignalMemory, the bounded
+    ledgers and deques); the Warden only watches and archives.
+    """
+    def __init__(self, config: Dict[str, Any], root: Path):
+        self.config = config or {}
+        self.telemetry_every = max(0, int(self.config.get('telemetry_every_ticks', 0) or 0))
+        self.measure_components = bool(self.config.get('measure_components', False))
+        self.samples: deque = deque(maxlen=max(2, int(self.config.get('telemetry_history', 256))))
+        journal_file = self.config.get('journal_file')
+        if journal_file:
+            journal_path = Path(journal_file)
+            self.journal = ArchiveJournal(journal_path if journal_path.is_absolute() else Path(root) / journal_path, int(self.config.get('journal_flush_every', 32)))
+        else: self.journal = None
+        self.ticks = 0
+        logger.info(f"[LifecycleWarden] The Lifecycle Warden v1.1 is on watch: telemetry every {self.telemetry_every or 'no'} tick(s), "
+                    f"journal {'at ' + repr(str(self.journal.path)) if self.journal else 'disabled'}.")
+
+    def relay(self, then: Optional[Callable[[Any], None]] = None) -> ClosedPositionRelay:
+        return ClosedPositionRelay(self.journal, then)
+
+    def tick_completed(self, engine: Any):
+        self.ticks += 1
+        if self.telemetry_every and self.ticks % self.telemetry_every == 0: self.sample(engine)
+
+    def sample(self, engine: Any) -> MemorySample:
+        sample = MemorySample(tick=self.ticks, rss_mb=resident_memory_mb())
+        for unit, attribute in TRACKED_CONTAINERS:
+            container = getattr(getattr(engine, unit, None), attribute, None)
+            if container is None: continue
+            sample.containers[f"{unit}.{attribute}"] = count_items(container)
+            if (bound := container_bound(container)) is not None: sample.bounds[f"{unit}.{attribute}"] = bound
+        if self.measure_components:
+            for unit in MEASURED_COMPONENTS:
+                try: sample.component_kb[unit] = len(pickle.dumps(getattr(engine, unit), protocol=pickle.HIGHEST_PROTOCOL)) / 1024.0
+                except Exception as e: logger.debug(f"Could not weigh {unit}: {e}")
+        self.samples.append(sample)
+        largest = sorted(sample.containers.items(), key=lambda item: item[1], reverse=True)[:4]
+        logger.info(f"[LifecycleWarden] Tick {sample.tick}: RSS {sample.rss_mb:.1f} MB | " + ", ".join(f"{name}={count}" for name, count in largest))
+        return sample
+
+    def close(self, engine: Any):
+        """Writes what is left of the archive, then takes a last sample and reports the drift since the first one."""
+        if self.journal is not None: self.journal.flush()
+        if not self.telemetry_every: return
+        last = self.sample(engine); first = self.samples[0]
+        if first is not last: logger.info(f"[LifecycleWarden] RSS {first.rss_mb:.1f} MB -> {last.rss_mb:.1f} MB over ticks {first.tick}..{last.tick}.")
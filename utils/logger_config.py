@@ -1,30 +1,164 @@
-# utils/logger_config.py (نسخه 2.0)
+# utils/logger_config.py (نسخه 3.2)
+import atexit
+import copy
+import json
 import logging
+import logging.handlers
+import queue
 import sys
+import threading
+import time
 from pathlib import Path
+from typing import Dict, Any, Optional
 
-def setup_logging(project_root: Path, log_level=logging.INFO):
-    """Sets up the central logging system."""
-    log_format = logging.Formatter(
-        fmt="%(asctime)s - [%(levelname)-8s] - (%(name)-22s) - %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S"
-    )
+LOG_FORMAT = "%(asctime)s - [%(levelname)-8s] - (%(name)-22s) - %(message)s"
+LOG_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# The single background writer of this process, and the file it owns (reconfiguring appends instead of truncating).
+_ACTIVE_LISTENER: Optional[logging.handlers.QueueListener] = None
+_ACTIVE_LOG_FILE: Optional[Path] = None
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """Structured output: one JSON object per record, ready for grep, jq or a log shipper."""
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {'ts': self.formatTime(record, LOG_DATE_FORMAT), 'level': record.levelname, 'logger': record.name, 'message': record.getMessage()}
+        # A record that crossed the queue carries its traceback already rendered, in `exc_text`.
+        exception = record.exc_text or (self.formatException(record.exc_info) if record.exc_info else None)
+        if exception: entry['exception'] = exception
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class TickRateLimiter(logging.Filter):
+    """
+    THE CENSOR: Per-logger sampling and token-bucket rate limiting for the repetitive
+    per-tick chatter. Records at or above `exempt_level` always pass. When a record gets
+    through after others were suppressed, it reports how many were swallowed.
+    """
+    def __init__(self, rules: Dict[str, Dict[str, Any]], exempt_level: int = logging.ERROR):
+        super().__init__()
+        self.default_rule = rules.get('default', {})
+        self.rules = {name: rule for name, rule in rules.items() if name != 'default'}
+        self.exempt_level = exempt_level
+        self._state: Dict[str, list] = {}  # logger -> [tokens, last_refill, seen, suppressed]
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= self.exempt_level: return True
+        rule = self.rules.get(record.name, self.default_rule)
+        if not rule: return True
+        max_per_second = rule.get('max_per_second', 0); sample_every = max(1, int(rule.get('sample_every', 1)))
+        with self._lock:
+            now = time.monotonic()
+            state = self._state.setdefault(record.name, [float(max_per_second), now, 0, 0])
+            state[2] += 1
+            allowed = (state[2] - 1) % sample_every == 0
+            if allowed and max_per_second > 0:
+                state[0] = min(float(max_per_second), state[0] + (now - state[1]) * max_per_second); state[1] = now
+                if state[0] >= 1.0: state[0] -= 1.0
+                else: allowed = False
+            if not allowed: state[3] += 1; return False
+            suppressed, state[3] = state[3], 0
+        if suppressed:
+            record.msg = f"{record.getMessage()} [+{suppressed} suppressed]"; record.args = None
+        return True
+
+
+class DrainingQueueListener(logging.handlers.QueueListener):
+    """Waits for room in a saturated queue so the stop sentinel is never lost and every queued record is written."""
+    def enqueue_sentinel(self):
+        self.queue.put(self._sentinel)
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """Never lets a slow terminal or disk stall the caller: when the queue is full, the record is dropped and counted."""
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The inherited `prepare` folds the traceback into the message and clears it. Here the message is merged
+        # with its args and the traceback is rendered on the calling thread (its frames are gone by the time the
+        # listener runs), but it stays apart in `exc_text`, so each output's formatter still places it itself.
+        record = copy.copy(record)
+        record.message = record.getMessage(); record.msg = record.message; record.args = None
+        if record.exc_info:
+            if not record.exc_text: record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try: self.queue.put_nowait(record)
+        except queue.Full: self.dropped += 1
+
+
+def _build_file_handler(log_file_path: Path, policy: Dict[str, Any], append: bool) -> logging.Handler:
+    max_bytes = int(policy.get('max_bytes', 0))
+    if max_bytes <= 0: return logging.FileHandler(log_file_path, mode='a' if append else 'w', encoding='utf-8')
+    handler = logging.handlers.RotatingFileHandler(log_file_path, maxBytes=max_bytes, backupCount=int(policy.get('backup_count', 3)), encoding='utf-8')
+    # Rotating handlers always append; a fresh campaign rolls the previous log aside instead of truncating it.
+    if not append and log_file_path.is_file() and log_file_path.stat().st_size > 0: handler.doRollover()
+    return handler
+
+
+def setup_logging(project_root: Path, log_level=logging.INFO, log_file_name: str = "legion_activity.log", policy: Optional[Dict[str, Any]] = None):
+    """
+    Sets up the central logging system. Every module logs into a queue; a single background
+    listener thread does the formatting and the terminal/disk I/O. An empty `log_file_name`
+    disables the file handler. `policy` is the `logging` section of settings.yaml.
+    """
+    global _ACTIVE_LISTENER, _ACTIVE_LOG_FILE
+    policy = policy or {}
+    shutdown_logging()
+
+    log_level = logging.getLevelName(policy['level']) if 'level' in policy else log_level
+    text_format = logging.Formatter(fmt=LOG_FORMAT, datefmt=LOG_DATE_FORMAT)
+    handlers = []
+
+    if policy.get('console', True):
+        stream_handler = logging.StreamHandler(sys.stdout)
+        stream_handler.setFormatter(text_format)
+        stream_handler.setLevel(logging.getLevelName(policy.get('console_level', 'NOTSET')))
+        handlers.append(stream_handler)
 
-    stream_handler = logging.StreamHandler(sys.stdout)
-    stream_handler.setFormatter(log_format)
-    
     # فایل لاگ در ریشه پروژه ساخته می‌شود
-    log_file_path = project_root / "legion_activity.log"
-    file_handler = logging.FileHandler(log_file_path, mode='w') # 'w' to overwrite
-    file_handler.setFormatter(log_format)
+    log_file_name = policy.get('file', log_file_name) if log_file_name else log_file_name
+    if log_file_name:
+        log_file_path = (project_root / log_file_name).resolve()
+        file_handler = _build_file_handler(log_file_path, policy, append=(log_file_path == _ACTIVE_LOG_FILE))
+        file_handler.setFormatter(JsonLinesFormatter() if policy.get('json', False) else text_format)
+        file_handler.setLevel(logging.getLevelName(policy.get('file_level', 'NOTSET')))
+        handlers.append(file_handler)
+        _ACTIVE_LOG_FILE = log_file_path
+
+    queue_handler = NonBlockingQueueHandler(queue.Queue(maxsize=int(policy.get('queue_size', 10000))))
+    if policy.get('rate_limits'): queue_handler.addFilter(TickRateLimiter(policy['rate_limits']))
 
     root_logger = logging.getLogger()
     root_logger.setLevel(log_level)
-    
+
     if root_logger.hasHandlers():
         root_logger.handlers.clear()
-        
-    root_logger.addHandler(stream_handler)
-    root_logger.addHandler(file_handler)
-    
-    logging.info("Logger configuration complete.")
\ No newline at end of file
+
+    root_logger.addHandler(queue_handler)
+    for name, level in policy.get('levels', {}).items(): logging.getLogger(name).setLevel(logging.getLevelName(level))
+
+    _ACTIVE_LISTENER = DrainingQueueListener(queue_handler.queue, *handlers, respect_handler_level=True)
+    _ACTIVE_LISTENER.start()
+    logging.info("Logger configuration complete.")
+
+
+def shutdown_logging():
+    """Drains the queue and stops the background writer. Safe to call more than once."""
+    global _ACTIVE_LISTENER
+    if _ACTIVE_LISTENER is None: return
+    # A forked child inherits the listener object but not its thread; there is nothing to drain there.
+    if _ACTIVE_LISTENER._thread is not None and _ACTIVE_LISTENER._thread.is_alive(): _ACTIVE_LISTENER.stop()
+    for handler in _ACTIVE_LISTENER.handlers:
+        # At interpreter exit a console stream may already be closed (a test runner's capture, a closed pipe).
+        try: handler.flush(); handler.close()
+        except (ValueError, OSError): pass
+    _ACTIVE_LISTENER = None
+
+
+atexit.register(shutdown_logging)
@@ -0,0 +1,135 @@
+# F:\ShadowVanguard_Legion_Godspeed\utils\tick_profiler.py
+# Version 1.1 - Prometheus, The Chronometer
+
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger("TickProfiler")
+
+# 128 exact buckets below 128ns; above, each power of two keeps the upper 64 of its 128 linear
+# sub-buckets (the lower half is the octave below), so a reported value is within 1/64 (~1.6%).
+SUB_BUCKET_BITS = 7
+SUB_BUCKET_COUNT = 1 << SUB_BUCKET_BITS
+SUB_BUCKET_HALF = SUB_BUCKET_COUNT >> 1
+MAX_EXPONENT = 42                        # ~73 minutes in nanoseconds; slower samples land in the last bucket.
+
+
+class LatencyHistogram:
+    """
+    THE CHRONOMETER'S DIAL: An HDR-style log-linear histogram of nanosecond latencies.
+    Values below 128ns are counted exactly; above that, every power of two is split into
+    64 linear sub-buckets, so any percentile is reported within 1/64 (~1.6%) of the true value
+    while recording stays a handful of integer operations and memory stays fixed.
+    """
+    __slots__ = ("counts", "total_count", "total_ns", "max_ns", "min_ns")
+
+    BUCKETS = SUB_BUCKET_COUNT + (MAX_EXPONENT - SUB_BUCKET_BITS + 1) * SUB_BUCKET_HALF
+
+    def __init__(self):
+        self.counts = np.zeros(self.BUCKETS, dtype=np.int64)
+        self.total_count = 0; self.total_ns = 0; self.max_ns = 0; self.min_ns = 0
+
+    @staticmethod
+    def bucket_index(value_ns: int) -> int:
+        if value_ns < SUB_BUCKET_COUNT: return max(0, value_ns)
+        shift = value_ns.bit_length() - SUB_BUCKET_BITS
+        return min(SUB_BUCKET_COUNT + (shift - 1) * SUB_BUCKET_HALF + (value_ns >> shift) - SUB_BUCKET_HALF, LatencyHistogram.BUCKETS - 1)
+
+    @staticmethod
+    def bucket_ceiling(index: int) -> int:
+        """The highest value a bucket can hold (percentiles are reported conservatively)."""
+        if index < SUB_BUCKET_COUNT: return index
+        shift, offset = divmod(index - SUB_BUCKET_COUNT, SUB_BUCKET_HALF); shift += 1
+        return ((offset + SUB_BUCKET_HALF + 1) << shift) - 1
+
+    def record(self, value_ns: int):
+        self.counts[self.bucket_index(value_ns)] += 1
+        if self.total_count == 0 or value_ns < self.min_ns: self.min_ns = value_ns
+        if value_ns > self.max_ns: self.max_ns = value_ns
+        self.total_count += 1; self.total_ns += value_ns
+
+    def percentile(self, pct: float) -> int:
+        if self.total_count == 0: return 0
+        rank = max(1, int(np.ceil(pct / 100.0 * self.total_count)))
+        index = int(np.searchsorted(np.cumsum(self.counts), rank, side='left'))
+        return min(self.bucket_ceiling(index), self.max_ns)
+
+    def mean(self) -> float:
+        return self.total_ns / self.total_count if self.total_count else 0.0
+
+    def merge(self, other: "LatencyHistogram"):
+        if other.total_count == 0: return
+        self.min_ns = other.min_ns if self.total_count == 0 else min(self.min_ns, other.min_ns)
+        self.counts += other.counts; self.total_count += other.total_count; self.total_ns += other.total_ns
+        self.max_ns = max(self.max_ns, other.max_ns)
+
+
+class TickProfiler:
+    """
+    THE CHRONOMETER: Lap-timer for the Oracle's tick pipeline. `begin_tick()` arms it and
+    every `lap(stage)` charges the time (and the net CPython memory blocks allocated) since
+    the previous lap to that stage, so each stage costs one clock read and one counter read.
+    `end_tick()` records the whole tick. When disabled, every call returns immediately.
+    """
+    TICK = "tick_total"
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        self.config = config or {}
+        self.enabled = self.config.get('enabled', False)
+        self.track_allocations = self.config.get('track_allocations', True)
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self.allocated_blocks: Dict[str, int] = {}
+        self._tick_start = 0; self._lap_start = 0; self._lap_blocks = 0
+        if self.enabled: logger.info("[TickProfiler] The Chronometer v1.1 is timing every tick stage.")
+
+    def _histogram(self, stage: str) -> LatencyHistogram:
+        histogram = self.histograms.get(stage)
+        if histogram is None:
+            histogram = self.histograms[stage] = LatencyHistogram(); self.allocated_blocks[stage] = 0
+        return histogram
+
+    def begin_tick(self):
+        if not self.enabled: return
+        self._tick_start = self._lap_start = time.perf_counter_ns()
+        if self.track_allocations: self._lap_blocks = sys.getallocatedblocks()
+
+    def lap(self, stage: str):
+        if not self.enabled: return
+        now = time.perf_counter_ns()
+        self._histogram(stage).record(now - self._lap_start)
+        if self.track_allocations:
+            blocks = sys.getallocatedblocks(); self.allocated_blocks[stage] += blocks - self._lap_blocks; self._lap_blocks = blocks
+        self._lap_start = time.perf_counter_ns()  # The profiler's own bookkeeping is not charged to the next stage.
+
+    def end_tick(self):
+        if not self.enabled or not self._tick_start: return
+        self._histogram(self.TICK).record(time.perf_counter_ns() - self._tick_start); self._tick_start = 0
+
+    # --- Reporting ---
+    def summary(self) -> List[Dict[str, Any]]:
+        """One row per stage, in pipeline order, with latencies in milliseconds and its share of the tick."""
+        tick_ns = self.histograms[self.TICK].total_ns if self.TICK in self.histograms else 0
+        rows = []
+        for stage, histogram in self.histograms.items():
+            if histogram.total_count == 0: continue
+            rows.append({
+                'stage': stage, 'count': histogram.total_count, 'mean_ms': histogram.mean() / 1e6,
+                'p50_ms': histogram.percentile(50) / 1e6, 'p95_ms': histogram.percentile(95) / 1e6,
+                'p99_ms': histogram.percentile(99) / 1e6, 'max_ms': histogram.max_ns / 1e6,
+                'share_pct': (histogram.total_ns / tick_ns * 100) if tick_ns and stage != self.TICK else 100.0 if stage == self.TICK else 0.0,
+                'net_blocks_per_call': self.allocated_blocks[stage] / histogram.total_count if self.track_allocations and stage != self.TICK else None})
+        rows.sort(key=lambda r: r['stage'] == self.TICK)  # The whole-tick line closes the report.
+        return rows
+
+    def export(self, path: Any) -> Optional[Path]:
+        if not self.enabled or not self.histograms: return None
+        path = Path(path)
+        with open(path, 'w', encoding='utf-8') as f: json.dump({'stages': self.summary()}, f, indent=2)
+        logger.info(f"[TickProfiler] Latency report written to '{path}'.")
+        return path
@@ -0,0 +1,185 @@
+# F:\ShadowVanguard_Legion_Godspeed\utils\validators.py
+# Version 1.8 - Prometheus, The Constitution Warden
+
+import difflib
+import logging
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional
+
+logger = logging.getLogger("ConstitutionWarden")
+
+Number = (int, float)
+Seq = (list, tuple)
+# A section whose keys are the Commander's own (timeframes, rule names, weights...): its keys are not checked.
+OPEN = dict
+
+# Every key the Legion reads from settings.yaml, and the type it expects there.
+SCHEMA: Dict[str, Any] = {
+    'simulation_mode': str, 'initial_capital': Number, 'target_symbol': str, 'tick_interval_seconds': Number,
+    'auto_start': bool, 'dashboard_enabled': bool,
+    'logging': {'level': str, 'console': bool, 'console_level': str, 'file': str, 'file_level': str, 'json': bool,
+                'max_bytes': int, 'backup_count': int, 'queue_size': int, 'levels': OPEN, 'rate_limits': OPEN},
+    'dashboard': {'mode': str, 'runner': str, 'frame_rate': Number, 'snapshot_file': str},
+    'profiler': {'enabled': bool, 'track_allocations': bool, 'report_file': str},
+    'checkpoint': {'enabled': bool, 'directory': str, 'every_ticks': int, 'keep': int, 'resume': bool},
+    'lifecycle': {'journal_file': str, 'journal_flush_every': int, 'telemetry_every_ticks': int, 'telemetry_history': int, 'measure_components': bool,
+                  'soak_laps': int, 'soak_rss_tolerance_mb': Number},
+    'trade_journal': {'enabled': bool, 'file': str, 'flush_every_records': int, 'idle_decisions': bool},
+    'doctrine_reload': {'watch': bool, 'check_every_ticks': int},
+    'parameter_sweep': {'mode': str, 'random_samples': int, 'seed': int, 'max_workers': int, 'max_ticks': int, 'rank_by': str,
+                        'top_n': int, 'worker_log_level': str, 'shared_memory': bool, 'space': OPEN},
+    'fleet': {'max_workers': int, 'fronts': Seq},
+    'research': {'max_ticks': int, 'fee_bps': Number, 'rules': Seq},
+    'live_engine': {
+        'exchange': str, 'market_type': str, 'api_key_env': str, 'secret_key_env': str, 'passphrase_env': str,
+        'data_fetch_interval_seconds': Number, 'max_retries': int, 'request_timeout_ms': Number, 'data_feed': str,
+        'stream': {'dialect': str, 'url': str, 'stream_symbol': str, 'book_depth': int, 'warmup_timeout_seconds': Number,
+                   'candle_timeout_seconds': Number, 'reconnect_delay_seconds': Number, 'max_reconnect_delay_seconds': Number,
+                   'skip_stale_candles': bool, 'reconnect': bool, 'replay_history_size': int, 'replay_candles_per_second': Number}},
+    'execution_engine': {'leverage': Number,
+                         'alchemist_lasso': {'flip_size_multiplier': Number, 'full_power_flip_threshold': Number, 'max_flips_allowed': int},
+                         'fill_simulator': {'enabled': bool, 'latency_ms': Number, 'stop_latency_ticks': int, 'taker_fee_bps': Number,
+                                            'slippage_bps': Number, 'impact_bps': Number, 'impact_exponent': Number,
+                                            'max_participation': Number, 'max_book_levels': int, 'partial_fills': bool,
+                                            'intrabar_path': str, 'seed': int}},
+    'data_provider': {'source': str, 'candle_store_path': str, 'store_symbol': str, 'campaign_start_date': str,
+                      'campaign_end_date': str, 'csv_files': Seq, 'timeframe_minutes': int, 'strategic_timeframes': Seq,
+                      'training_days': Number, 'data_window_size': int, 'random_seed': int, 'simulation_engine': OPEN},
+    'simulation_engine': {'base_bid_strength': Seq, 'base_ask_strength': Seq, 'ob_simulation_strength': OPEN,
+                          'fvg_vacuum_factor': Number, 'book_levels': int, 'level_spacing_volatility': Number,
+                          'trade_size_range': Seq, 'book_size_model': (str, dict), 'trade_size_model': (str, dict)},
+    'memory': {'strategic_memory_protocol': {'timeframes': Seq},
+               'strategic_map_store': {'enabled': bool, 'directory': str, 'keep': int},
+               'performance_auditor_protocol': {'memory_size': int, 'failure_threshold_count': int, 'cooldown_period_seconds': Number},
+               'max_size': int, 'refit_interval': int, 'min_similarity_threshold': Number},
+    'capital_allocator': {'risk_per_trade_percent': Number, 'max_exposure_percent': Number, 'max_symbol_exposure_percent': Number,
+                          'reinvestment_aggressiveness': Number, 'risk_level_multipliers': OPEN},
+    'risk_manager': {
+        'perimeter_architect': {'atr_period': int, 'atr_multiplier': Number, 'range_atr_multiplier': Number,
+                                'catastrophic_atr_extension': Number, 'strategic_timeframes': Seq, 'tactical_timeframe': str},
+        'take_profit_engine': {'min_rr_target': Number, 'exit_strategy': OPEN}},
+    'analyst_ai': {
+        'structure_analyzer': {'context_awareness': {'proximity_threshold_percent': Number}},
+        'multi_timeframe_synthesizer': {'base_timeframe': str, 'target_timeframes': Seq},
+        'order_block_analyzer': {'analysis_timeframes': Seq, 'tactical_timeframe': str, 'sensitivity': Number,
+                                 'mitigation_type': str, 'signal_memory_lifespan_candles': int, 'signal_memory_max_entries': int},
+        'fibonacci_helper': {'analysis_timeframes': Seq, 'tactical_timeframe': str, 'levels': Seq, 'swing_order': int,
+                             'confluence_tolerance_pct': Number, 'confirmation_atr_multiplier': Number,
+                             'signal_memory_lifespan_candles': int, 'signal_memory_max_entries': int, 'golden_pocket_levels': Seq, 'golden_pocket_strength_bonus': Number,
+                             'fvg_confluence_strength_bonus': Number, 'ob_confluence_strength_bonus': Number},
+        'divergence_detector': {'analysis_timeframes': Seq, 'tactical_timeframe': str, 'rsi_period': int, 'swing_order': int,
+                                'overbought_threshold': Number, 'oversold_threshold': Number,
+                                'signal_memory_lifespan_candles': int, 'signal_memory_max_entries': int, 'max_active_patterns': int},
+        'liquidity_analyzer': {'analysis_timeframes': Seq, 'tactical_timeframe': str, 'confirmation_atr_multiplier': Number,
+                               'signal_memory_lifespan_candles': int, 'signal_memory_max_entries': int, 'min_fvg_size_atr_multiplier': Number,
+                               'min_volume_multiplier': Number, 'volume_ma_period': int, 'atr_period': int, 'filled_fvg_memory': int}},
+    'tactical_controller': {'aov_proximity_percent': Number, 'strategic_protocol': OPEN, 'unified_entry_protocol': OPEN,
+                            'scoring_weights': OPEN, 'management_rules': OPEN},
+    'power_scanner': {'order_book_depth': int, 'tactical_timeframe': str, 'book_weight_decay': Number,
+                      'absorption_volume_threshold': Number, 'tape_confirmation_multiplier': Number, 'absorption_veto_strength': Number,
+                      'adrenaline_protocol': {'volume_ma_period': int, 'atr_period': int, 'force_multiplier': Number}},
+    'synthetic_emotion': {'tactical_timeframe': str, 'emotion_thresholds': OPEN},
+}
+
+
+class FrozenConfig(dict):
+    """
+    THE SEALED CONSTITUTION: A read-only view of a settings section. Nested sections are
+    sealed too and lists become tuples, so a unit can be handed the doctrine itself instead
+    of a deep copy of it: nothing it does can change what another unit reads. Keys read as
+    attributes as well (`config.data_provider.timeframe_minutes`). It is still a dict, so
+    every `.get()` in the Legion and every JSON fingerprint of it are unchanged; a changed
+    doctrine is a new FrozenConfig, handed over with `TacticalController.rearm`.
+    """
+    __slots__ = ()
+
+    def __init__(self, mapping: Any = (), **kwargs):
+        super().__init__((key, freeze(value)) for key, value in dict(mapping, **kwargs).items())
+
+    def __getattr__(self, name: str) -> Any:
+        try: return self[name]
+        except KeyError: raise AttributeError(f"The doctrine has no '{name}'.") from None
+
+    def _sealed(self, *args, **kwargs):
+        raise TypeError("The doctrine is frozen; build a new configuration instead.")
+
+    __setitem__ = __delitem__ = __setattr__ = __delattr__ = __ior__ = _sealed
+    clear = pop = popitem = setdefault = update = _sealed
+
+    def __reduce__(self):
+        return FrozenConfig, (dict(self),)
+
+    def __copy__(self) -> 'FrozenConfig':
+        return self
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> 'FrozenConfig':
+        return self
+
+    def thaw(self) -> Dict[str, Any]:
+        """A plain, mutable deep copy (dicts and lists), e.g. to derive a modified doctrine from."""
+        return thaw(self)
+
+
+def freeze(value: Any) -> Any:
+    if isinstance(value, FrozenConfig): return value
+    if isinstance(value, Mapping): return FrozenConfig(value)
+    if isinstance(value, Seq): return tuple(freeze(item) for item in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    if isinstance(value, Mapping): return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, Seq): return [thaw(item) for item in value]
+    return value
+
+
+@dataclass(frozen=True)
+class ConfigIssue:
+    path: str
+    problem: str
+    fatal: bool  # A value of the wrong type breaks the unit reading it; an unknown key is only ignored.
+
+    def __str__(self) -> str:
+        return f"{self.path}: {self.problem}"
+
+
+def _type_name(expected: Any) -> str:
+    if expected is Number: return 'a number'
+    if expected is Seq: return 'a list'
+    if expected is OPEN or isinstance(expected, dict): return 'a section'
+    if isinstance(expected, tuple): return ' or '.join(_type_name(e) for e in expected)
+    return f"a {expected.__name__}"
+
+
+def _matches(value: Any, expected: Any) -> bool:
+    if value is None: return True  # An empty YAML value: the unit falls back to its default.
+    if isinstance(expected, dict) or expected is OPEN: return isinstance(value, Mapping)
+    if expected is Number or expected is int: return isinstance(value, expected) and not isinstance(value, bool)
+    if isinstance(expected, tuple): return any(_matches(value, e) for e in expected)
+    return isinstance(value, expected)
+
+
+def validate_config(config: Optional[Mapping], schema: Dict[str, Any] = SCHEMA, path: str = '') -> List[ConfigIssue]:
+    """
+    Checks a configuration against the schema once, before any unit reads it: keys no unit
+    reads (a typo is silently replaced by the unit's default) and values of the wrong type.
+    """
+    issues: List[ConfigIssue] = []
+    if not isinstance(config, Mapping):
+        return [] if config is None else [ConfigIssue(path or '<root>', f"must be a section, not {type(config).__name__}", True)]
+    for key, value in config.items():
+        where = f"{path}.{key}" if path else str(key); expected = schema.get(key)
+        if key not in schema:
+            hint = difflib.get_close_matches(str(key), list(schema), n=1)
+            issues.append(ConfigIssue(where, "unknown key" + (f" (did you mean '{hint[0]}'?)" if hint else ""), False))
+        elif not _matches(value, expected):
+            issues.append(ConfigIssue(where, f"expected {_type_name(expected)}, got {type(value).__name__} {value!r}", True))
+        elif isinstance(expected, dict) and value is not None:
+            issues.extend(validate_config(value, expected, where))
+    return issues
+
+
+def report_issues(issues: List[ConfigIssue], source: str = 'settings'):
+    for issue in issues: (logger.error if issue.fatal else logger.warning)(f"[ConstitutionWarden] {source}: {issue}")
+    if not issues: logger.info(f"[ConstitutionWarden] {source} conforms to the constitution.")